@@ -0,0 +1,93 @@
+"""
+Times importing the headless InvoiceEngine, and the GUI's controller for comparison, each in a
+fresh interpreter, to keep the engine quick to load for services that embed the parser.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time_benchmark
+
+Each module is imported with python -X importtime several times and the fastest run is reported,
+along with the modules that took longest to import within it. A module that cannot be imported
+(e.g. the controller, where fishbowl_common or tkinter is not installed) is reported as such.
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Modules whose import is timed, in the order they are reported
+DEFAULT_MODULES = ["source.InvoiceEngine", "source.cli", "source.InvoiceAppController"]
+
+
+def time_import(module: str) -> list[tuple[int, str]] | None:
+    """
+    Imports a module in a fresh interpreter with -X importtime
+
+    Args:
+        module (str): The module to import
+
+    Returns:
+        list[tuple[int, str]] | None: The cumulative import time, in microseconds, of
+            each module imported, slowest first, or None if the import failed
+    """
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        return None
+
+    # Each line reads "import time: <self us> | <cumulative us> | <indented module name>"
+    timings = []
+    for line in completed.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            timings.append((int(fields[1]), fields[2].strip()))
+
+    return sorted(timings, reverse=True)
+
+
+def main():
+    """
+    Runs the benchmark and prints the results
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=DEFAULT_MODULES,
+        help="Modules to time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Imports per module; the fastest is reported (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=8,
+        help="Slowest imported modules to list for each (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [time_import(module) for _ in range(args.repeats)]
+        if any(run is None for run in runs):
+            print(f"{module}: could not be imported")
+            continue
+
+        # The slowest import of a run is the module itself, which includes all the rest
+        best = min(runs, key=lambda run: run[0][0])
+        print(f"{module}: {best[0][0] / 1000:.1f} ms")
+
+        for cumulative_us, name in best[1 : args.top + 1]:
+            print(f"    {cumulative_us / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
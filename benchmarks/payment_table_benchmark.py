@@ -0,0 +1,139 @@
+"""
+Times InvoiceProcessor.process_invoice() on synthetic invoices of increasing size, to check
+that parsing the payment table scales linearly with the number of rows.
+
+Run from the repository root:
+
+    python -m benchmarks.payment_table_benchmark
+
+Each size is parsed several times and the fastest run is reported, along with the time per
+row. With a linear scan the time per row stays roughly flat as the row count grows; a scan
+that re-reads the page for every row would instead see it grow with the number of rows on a
+page, which is why every row is put on a single page unless --rows-per-page is given.
+"""
+
+import argparse
+import time
+
+from source.Invoice import Invoice
+from source.InvoiceProcessor import InvoiceProcessor
+
+# Number of payment table rows in each synthetic invoice
+DEFAULT_ROW_COUNTS = [250, 500, 1000, 2000, 4000, 8000]
+
+
+class _NullFileIO:
+    """
+    Stands in for the File IO Controller, discarding debug output so only parsing is timed
+    """
+
+    def print_to_debug_file(self, contents: str):
+        pass
+
+
+def build_pages(row_count: int, rows_per_page: int | None = None) -> list[str]:
+    """
+    Builds the page text of an invoice with row_count payment table rows, mixing single
+    and multi-line rows with quantity and hourly costs
+
+    Args:
+        row_count (int): The number of rows in the payment table
+        rows_per_page (int | None): Rows to put on each page, or None for a single page
+
+    Returns:
+        list[str]: The text of each page of the invoice
+    """
+
+    pages = []
+    lines = ["Customer: Benchmark Co", "Ordered Total Price"]
+
+    for number in range(1, row_count + 1):
+        if number % 3 == 0:
+            lines.append(f"{number} LABOR install and commissioning")
+            lines.append(f"{number % 7 + 1} hr $ 85.00 $ {(number % 7 + 1) * 85}.00")
+        elif number % 3 == 1:
+            lines.append(f"{number} SHIPPING UPS Ground 1 ea $ 12.50 $ 12.50")
+        else:
+            lines.append(f"{number} BRACKET-{number:05d} galvanized steel")
+            lines.append("Special order, see drawing")
+            lines.append(f"{number % 9 + 1} ea $ 4.25 $ {(number % 9 + 1) * 4.25:.2f}")
+
+        if rows_per_page and number % rows_per_page == 0:
+            pages.append("\n".join(lines) + "\n")
+            lines = ["Ordered Total Price"]
+
+    lines += ["Total:Subtotal", "$0.00", "$0.00", "$0.00"]
+    pages.append("\n".join(lines) + "\n")
+
+    return pages
+
+
+def time_process_invoice(pages: list[str], repeats: int) -> float:
+    """
+    Parses an invoice with the given pages repeats times
+
+    Args:
+        pages (list[str]): The text of each page of the invoice
+        repeats (int): The number of times to parse it
+
+    Returns:
+        float: The fastest time taken to parse it, in seconds
+    """
+
+    processor = InvoiceProcessor(
+        file_io_controller=_NullFileIO(),
+        labor_criteria=["LABOR"],
+        labor_exclusions=["NO-LABOR"],
+        shipping_criteria=["SHIPPING"],
+    )
+
+    best = float("inf")
+    for _ in range(repeats):
+        invoice = Invoice(page_contents=pages)
+        start = time.perf_counter()
+        processor.process_invoice(invoice=invoice)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    """
+    Runs the benchmark and prints a table of the results
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=DEFAULT_ROW_COUNTS,
+        help="Row counts to time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rows-per-page",
+        type=int,
+        default=None,
+        help="Rows on each page (default: every row on a single page)",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Runs per row count; the fastest is reported (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'pages':>6}  {'best (ms)':>10}  {'us/row':>8}")
+
+    for row_count in args.rows:
+        pages = build_pages(row_count, rows_per_page=args.rows_per_page)
+        best = time_process_invoice(pages, repeats=args.repeats)
+        print(
+            f"{row_count:>8}  {len(pages):>6}  {best * 1000:>10.2f}  "
+            f"{best / row_count * 1e6:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from multiprocessing import freeze_support
+
 from source.InvoiceAppController import InvoiceAppController
 
 # Entry Point
@@ -6,6 +8,11 @@ if __name__ == "__main__":
     Entry point to the application. Initializes the InvoiceAppController and starts the application.
     """
 
+    # The batch engine parses invoices in worker processes. In the packaged executable
+    # each worker is a re-launch of this executable, and freeze_support() hands it off
+    # to the worker instead of opening a second copy of the application.
+    freeze_support()
+
     # Create the InvoiceProcessor instance
     invoice_processor = InvoiceAppController()
 
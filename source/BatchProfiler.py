@@ -0,0 +1,422 @@
+import argparse
+import cProfile
+import pstats
+import sys
+import threading
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable
+
+from source.constants import (
+    PROFILE_MODE_CPROFILE,
+    PROFILE_MODE_SAMPLE,
+    PROFILE_MODES,
+    PROFILE_SAMPLE_INTERVAL_S,
+)
+
+# Shortest time, in microseconds, spent below a call for the call to be written to the collapsed
+# stacks, so a profile of a large batch does not list every one of its many rare call paths
+_MIN_COLLAPSED_US = 1
+
+# How cProfile names the call that stops it, which it records as a call of its own
+_PROFILER_DISABLE = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+
+def profile_mode_from_argv(argv: list[str]) -> str | None:
+    """
+    Finds the profiling mode the application was started with, as --profile, or
+    --profile=sample for the low overhead sampling mode. Any other arguments are
+    left for the ArgumentProvider
+
+    Args:
+        argv (list[str]): The command line arguments, without the program name
+
+    Returns:
+        str | None: One of PROFILE_MODES, or None if batches are not profiled
+    """
+
+    parser = argparse.ArgumentParser(
+        add_help=False, allow_abbrev=False, exit_on_error=False
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_MODE_CPROFILE,
+        default=None,
+        choices=PROFILE_MODES,
+    )
+
+    try:
+        args, _unknown = parser.parse_known_args(argv)
+    except argparse.ArgumentError:
+        # An unknown mode is ignored rather than stopping the application from starting
+        return None
+
+    return args.profile
+
+
+# BatchProfiler class to profile a batch of invoices, so a slow customer's batch can be diagnosed from
+# the files it writes rather than from their PDFs. Code run through call() or iterate() is profiled on
+# whichever thread runs it, which covers both the batch's background thread and the output of each
+# result on the GUI thread. Parsing in worker processes is not seen, so a batch being profiled should
+# be parsed in-process.
+#
+# In cProfile mode every call is recorded, and stop() writes a .pstats file, for pstats or snakeviz,
+# along with the call stacks in flamegraph.pl's collapsed format, weighted by microseconds. cProfile
+# only records which function called which, so each stack's time is shared out in proportion to the
+# calls made along it. In sampling mode a background thread instead looks at the profiled threads'
+# stacks every sample_interval seconds, which costs little enough to leave running through a long
+# batch; only the collapsed stacks are written, weighted by the number of samples.
+class BatchProfiler:
+
+    ###########################################################################
+    ###                     BatchProfiler -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self,
+        mode: str | None = None,
+        sample_interval: float = PROFILE_SAMPLE_INTERVAL_S,
+    ):
+        """
+        Initializes the BatchProfiler object
+
+        Args:
+            mode (str | None): One of PROFILE_MODES, or None to profile nothing.
+                Defaults to None
+            sample_interval (float): Seconds between samples in sampling mode
+        """
+
+        self.mode = mode
+        self.sample_interval = sample_interval
+
+        # Guards the per-thread state below, which profiled threads and the sampler share
+        self._lock = threading.Lock()
+
+        # How deeply each thread is nested in profiling() blocks, by thread id
+        self._depth: dict[int, int] = {}
+
+        # cProfile mode: the profile recording each thread that has been profiled
+        self._profiles: dict[int, cProfile.Profile] = {}
+
+        # Sampling mode: how many samples found each collapsed stack, and the sampler thread
+        self._samples: Counter[str] = Counter()
+        self._sampler: threading.Thread | None = None
+        self._stop_sampling = threading.Event()
+
+    ###########################################################################
+    ###                     BatchProfiler -> enabled()                      ###
+    ###########################################################################
+    @property
+    def enabled(self) -> bool:
+        """
+        Returns whether batches are profiled
+
+        Returns:
+            bool: True if a profiling mode was chosen
+        """
+
+        return self.mode is not None
+
+    ###########################################################################
+    ###                      BatchProfiler -> start()                       ###
+    ###########################################################################
+    def start(self):
+        """
+        Starts profiling a batch, forgetting any batch profiled before. Does nothing if
+        batches are not profiled
+        """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._profiles = {}
+            self._samples = Counter()
+
+        if self.mode == PROFILE_MODE_SAMPLE and self._sampler is None:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_until_stopped, name="BatchProfiler", daemon=True
+            )
+            self._sampler.start()
+
+    ###########################################################################
+    ###                       BatchProfiler -> stop()                       ###
+    ###########################################################################
+    def stop(self, profile_dir: Path) -> list[Path]:
+        """
+        Stops profiling the batch and writes what was recorded to profile_dir, named
+        after the time the batch finished
+
+        Args:
+            profile_dir (Path): The folder to write the profile to
+
+        Returns:
+            list[Path]: The files written, none if nothing was profiled
+
+        Raises:
+            OSError: If the profile cannot be written
+        """
+
+        if not self.enabled:
+            return []
+
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+
+        with self._lock:
+            profiles = list(self._profiles.values())
+            samples = self._samples.copy()
+
+        if self.mode == PROFILE_MODE_CPROFILE:
+            if not profiles:
+                return []
+            stats = pstats.Stats(*profiles)
+            collapsed = self._collapse_stats(stats)
+        else:
+            stats = None
+            collapsed = samples
+
+        if not collapsed:
+            return []
+
+        # Ensure the profile directory exists, then write the profile
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        stem = profile_dir / f"batch_{datetime.now():%Y%m%d-%H%M%S}"
+        written = []
+
+        if stats is not None:
+            stats.dump_stats(stem.with_suffix(".pstats"))
+            written.append(stem.with_suffix(".pstats"))
+
+        with open(file=stem.with_suffix(".collapsed"), mode="w") as f:
+            for stack, weight in sorted(collapsed.items()):
+                f.write(f"{stack} {weight}\n")
+        written.append(stem.with_suffix(".collapsed"))
+
+        return written
+
+    ###########################################################################
+    ###                       BatchProfiler -> call()                       ###
+    ###########################################################################
+    def call(self, function: Callable, *args, **kwargs) -> Any:
+        """
+        Calls a function, profiling it on the calling thread. Calls may be nested, and
+        are simply made if batches are not profiled
+
+        Args:
+            function (Callable): The function to call
+            *args: Positional arguments to call it with
+            **kwargs: Keyword arguments to call it with
+
+        Returns:
+            Any: Whatever the function returns
+        """
+
+        if not self.enabled:
+            return function(*args, **kwargs)
+
+        thread_id = threading.get_ident()
+        profile = None
+
+        with self._lock:
+            depth = self._depth.get(thread_id, 0)
+            self._depth[thread_id] = depth + 1
+            if depth == 0 and self.mode == PROFILE_MODE_CPROFILE:
+                profile = self._profiles.setdefault(thread_id, cProfile.Profile())
+
+        try:
+            # Profiling from the call itself, rather than partway through the caller, makes
+            # the function the root of the stacks cProfile records
+            if profile is not None:
+                return profile.runcall(function, *args, **kwargs)
+            return function(*args, **kwargs)
+
+        finally:
+            with self._lock:
+                if depth == 0:
+                    del self._depth[thread_id]
+                else:
+                    self._depth[thread_id] = depth
+
+    ###########################################################################
+    ###                     BatchProfiler -> iterate()                      ###
+    ###########################################################################
+    def iterate(self, iterable: Iterable) -> Iterable:
+        """
+        Profiles producing each item of an iterable, on the thread that consumes it
+
+        Args:
+            iterable (Iterable): The items to produce, e.g. a batch's results
+
+        Returns:
+            Iterable: The same items. If batches are not profiled, the iterable itself
+        """
+
+        if not self.enabled:
+            return iterable
+
+        return self._iterate_profiled(iterable)
+
+    ###########################################################################
+    ###                 BatchProfiler -> _iterate_profiled()                ###
+    ###########################################################################
+    def _iterate_profiled(self, iterable: Iterable) -> Iterator:
+        """
+        Yields each item of an iterable, profiling the work of producing it but not of
+        handling it. Closing this iterator closes the iterable, as closing it directly
+        would
+
+        Args:
+            iterable (Iterable): The items to produce
+
+        Yields:
+            Any: Each item, in order
+        """
+
+        iterator = self.call(iter, iterable)
+
+        try:
+            while True:
+                try:
+                    item = self.call(next, iterator)
+                except StopIteration:
+                    return
+                yield item
+
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    ###########################################################################
+    ###                BatchProfiler -> _sample_until_stopped()             ###
+    ###########################################################################
+    def _sample_until_stopped(self):
+        """
+        Counts the stack of each thread being profiled every sample_interval seconds,
+        until stop() is called. Runs on the sampler thread
+        """
+
+        while not self._stop_sampling.wait(self.sample_interval):
+            with self._lock:
+                thread_ids = list(self._depth)
+
+            frames = sys._current_frames()
+            stacks = [
+                self._collapse_frame(frames[thread_id])
+                for thread_id in thread_ids
+                if thread_id in frames
+            ]
+
+            with self._lock:
+                self._samples.update(stacks)
+
+    ###########################################################################
+    ###                  BatchProfiler -> _collapse_frame()                 ###
+    ###########################################################################
+    def _collapse_frame(self, frame: FrameType | None) -> str:
+        """
+        Describes a running stack in the collapsed format, outermost call first
+
+        Args:
+            frame (FrameType | None): The innermost frame of the stack
+
+        Returns:
+            str: The calls of the stack, separated by semicolons
+        """
+
+        calls = []
+        while frame is not None:
+            code = frame.f_code
+            calls.append(
+                self._describe_call(code.co_filename, code.co_firstlineno, code.co_name)
+            )
+            frame = frame.f_back
+
+        return ";".join(reversed(calls))
+
+    ###########################################################################
+    ###                  BatchProfiler -> _collapse_stats()                 ###
+    ###########################################################################
+    def _collapse_stats(self, stats: pstats.Stats) -> dict[str, int]:
+        """
+        Rebuilds the call stacks cProfile recorded from which function called which,
+        starting from the functions nothing profiled called. The time a function spent
+        in itself is shared out among the stacks it was called along, in proportion
+        to the time spent in it along each. Recursive calls are folded into the first
+        call of the function in the stack
+
+        Args:
+            stats (pstats.Stats): The recorded profile
+
+        Returns:
+            dict[str, int]: The microseconds spent in each stack's innermost call
+        """
+
+        # Each function's own and cumulative time, and the time spent in each function it
+        # called, when called from it
+        own_time = {}
+        total_time = {}
+        callees: dict[tuple, dict[tuple, float]] = {}
+        for function, (_cc, _nc, tt, ct, callers) in stats.stats.items():
+            own_time[function] = tt
+            total_time[function] = ct
+            for caller, caller_stats in callers.items():
+                callees.setdefault(caller, {})[function] = caller_stats[3]
+
+        roots = [
+            function
+            for function, (*_totals, callers) in stats.stats.items()
+            if not callers and function[2] != _PROFILER_DISABLE
+        ]
+
+        collapsed: Counter[str] = Counter()
+
+        def walk(function: tuple, stack: list[tuple], share: float):
+            stack = stack + [function]
+            collapsed[";".join(self._describe_call(*call) for call in stack)] += round(
+                own_time[function] * share * 1_000_000
+            )
+
+            for callee, edge_time in callees.get(function, {}).items():
+                if callee in stack or not total_time.get(callee):
+                    continue
+                callee_share = share * edge_time / total_time[callee]
+                if total_time[callee] * callee_share * 1_000_000 >= _MIN_COLLAPSED_US:
+                    walk(callee, stack, callee_share)
+
+        for root in roots:
+            walk(root, [], 1.0)
+
+        return {stack: weight for stack, weight in collapsed.items() if weight > 0}
+
+    ###########################################################################
+    ###                  BatchProfiler -> _describe_call()                  ###
+    ###########################################################################
+    def _describe_call(self, filename: str, line_number: int, name: str) -> str:
+        """
+        Names a function for the collapsed stacks, e.g. "parse_invoice
+        (InvoiceBatchEngine.py:201)". Built-ins are named as cProfile names them
+
+        Args:
+            filename (str): The file the function is defined in, "~" for a built-in
+            line_number (int): The line the function is defined on
+            name (str): The function's name
+
+        Returns:
+            str: The function's name and where it is defined, without semicolons
+        """
+
+        if filename == "~":
+            description = name
+        else:
+            description = f"{name} ({Path(filename).name}:{line_number})"
+
+        # Semicolons separate the calls of a collapsed stack
+        return description.replace(";", ",")
@@ -0,0 +1,300 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Iterable
+
+from source.constants import BATCH_POLL_BUDGET_MS, BATCH_POLL_INTERVAL_MS
+
+
+# BatchProgress class to describe how far through a batch of invoices the BatchWorker is
+@dataclass
+class BatchProgress:
+
+    # fmt:off
+    completed: int          # Number of invoices finished so far
+    total: int              # Number of invoices in the batch
+    elapsed: float          # Seconds since the batch started
+    # fmt:on
+
+    ###########################################################################
+    ###               BatchProgress -> files_per_second()                   ###
+    ###########################################################################
+    @property
+    def files_per_second(self) -> float:
+        """
+        Returns the average rate invoices have been finished at so far
+
+        Returns:
+            float: Invoices finished per second, or 0.0 before any time has passed
+        """
+
+        if self.elapsed <= 0:
+            return 0.0
+
+        return self.completed / self.elapsed
+
+    ###########################################################################
+    ###                  BatchProgress -> eta_seconds()                     ###
+    ###########################################################################
+    @property
+    def eta_seconds(self) -> float | None:
+        """
+        Estimates the time left in the batch from the average rate so far
+
+        Returns:
+            float | None: Seconds until the batch is expected to finish, or None until
+                at least one invoice has finished
+        """
+
+        if self.files_per_second <= 0:
+            return None
+
+        return (self.total - self.completed) / self.files_per_second
+
+
+# BatchWorker class to run a batch of invoices off the GUI thread. The batch's results are produced
+# on a background thread and queued; the GUI thread drains the queue on a timer scheduled with Tk's
+# after(), so every callback (and therefore every widget update and file write) runs on the GUI
+# thread in the order the results were produced. Each pass of the timer handles callbacks for at
+# most BATCH_POLL_BUDGET_MS, so Tk gets to process events between passes however far behind the GUI
+# thread falls. A cancel request is honored between invoices.
+#
+# When not running in the background (integration test mode, where there is no Tk main loop to
+# drain the queue) the batch runs to completion inside start() and the callbacks are called directly.
+class BatchWorker:
+
+    ###########################################################################
+    ###                      BatchWorker -> __init__()                      ###
+    ###########################################################################
+    def __init__(
+        self,
+        after: Callable[[int, Callable[[], None]], Any],
+        run_in_background: bool = True,
+    ):
+        """
+        Initializes the BatchWorker object
+
+        Args:
+            after (Callable[[int, Callable[[], None]], Any]): Schedules a callback on the
+                GUI thread after a delay in milliseconds, i.e. the Tk window's after()
+            run_in_background (bool): Whether to run batches on a background thread.
+                Defaults to True; False runs each batch synchronously inside start()
+        """
+
+        self.after = after
+        self.run_in_background = run_in_background
+
+        # Whether a batch has been started and its completion not yet reported
+        self.is_running = False
+
+        # Callbacks produced by the background thread, waiting to be run on the GUI thread
+        self._pending: queue.Queue = queue.Queue()
+
+        # Set by cancel(), checked by the background thread before each invoice
+        self._cancel_requested = threading.Event()
+
+        # Reports an exception raised while producing or outputting the current batch
+        self._on_error: Callable[[Exception], None] = lambda _: None
+
+    ###########################################################################
+    ###                       BatchWorker -> start()                        ###
+    ###########################################################################
+    def start(
+        self,
+        total: int,
+        produce_results: Callable[[], Iterable],
+        on_result: Callable[[Any], None],
+        on_progress: Callable[[BatchProgress], None],
+        on_error: Callable[[Exception], None],
+        on_finished: Callable[[BatchProgress, bool], None],
+    ):
+        """
+        Starts a batch. produce_results is called on the background thread and the
+        results it yields are handed to on_result on the GUI thread, one at a time
+
+        Args:
+            total (int): The number of results the batch is expected to produce
+            produce_results (Callable[[], Iterable]): Produces the batch's results. If the
+                iterable it returns has a close() method, it is closed when the batch
+                ends, including when it is cancelled
+            on_result (Callable[[Any], None]): Called with each result, in order
+            on_progress (Callable[[BatchProgress], None]): Called after each result
+            on_error (Callable[[Exception], None]): Called if producing or handling a
+                result raises. A batch that fails while producing results stops there
+            on_finished (Callable[[BatchProgress, bool], None]): Called once when the batch
+                ends, with the final progress and whether the batch was cancelled
+
+        Raises:
+            RuntimeError: If a batch is already running
+        """
+
+        if self.is_running:
+            raise RuntimeError("A batch is already running")
+
+        self.is_running = True
+        self._cancel_requested.clear()
+        self._on_error = on_error
+
+        run = partial(
+            self._run,
+            total=total,
+            produce_results=produce_results,
+            on_result=on_result,
+            on_progress=on_progress,
+            on_finished=on_finished,
+        )
+
+        # Without a main loop to drain the queue, run the whole batch right here
+        if not self.run_in_background:
+            run(post=self._call)
+            return
+
+        threading.Thread(
+            target=run, kwargs={"post": self._pending.put}, daemon=True
+        ).start()
+        self.after(BATCH_POLL_INTERVAL_MS, self._poll)
+
+    ###########################################################################
+    ###                       BatchWorker -> cancel()                       ###
+    ###########################################################################
+    def cancel(self):
+        """
+        Asks the running batch to stop before its next invoice. The invoice being
+        processed when cancel() is called is still finished and output
+        """
+        self._cancel_requested.set()
+
+    ###########################################################################
+    ###                        BatchWorker -> _run()                        ###
+    ###########################################################################
+    def _run(
+        self,
+        total: int,
+        produce_results: Callable[[], Iterable],
+        on_result: Callable[[Any], None],
+        on_progress: Callable[[BatchProgress], None],
+        on_finished: Callable[[BatchProgress, bool], None],
+        post: Callable[[Callable[[], None]], None],
+    ):
+        """
+        Produces the batch's results, posting a callback for each one. Runs on the
+        background thread, or inline when not running in the background
+
+        Args:
+            total (int): The number of results the batch is expected to produce
+            produce_results (Callable[[], Iterable]): Produces the batch's results
+            on_result (Callable[[Any], None]): Called with each result
+            on_progress (Callable[[BatchProgress], None]): Called after each result
+            on_finished (Callable[[BatchProgress, bool], None]): Called when the batch ends
+            post (Callable[[Callable[[], None]], None]): Hands a callback to the GUI thread
+        """
+
+        start_time = time.monotonic()
+        completed = 0
+        cancelled = False
+
+        try:
+            results = iter(produce_results())
+
+            try:
+                while True:
+                    # Check between invoices, so a cancelled invoice is never half output
+                    if self._cancel_requested.is_set():
+                        cancelled = True
+                        break
+
+                    try:
+                        result = next(results)
+                    except StopIteration:
+                        break
+
+                    completed += 1
+                    progress = BatchProgress(
+                        completed=completed,
+                        total=total,
+                        elapsed=time.monotonic() - start_time,
+                    )
+                    post(partial(on_result, result))
+                    post(partial(on_progress, progress))
+
+            finally:
+                # Let the producer release its resources (e.g. drop queued invoices from
+                # a process pool) rather than finishing work that will never be output
+                close = getattr(results, "close", None)
+                if close is not None:
+                    close()
+
+        except Exception as error:
+            post(partial(self._on_error, error))
+
+        progress = BatchProgress(
+            completed=completed, total=total, elapsed=time.monotonic() - start_time
+        )
+        post(partial(self._finish, on_finished, progress, cancelled))
+
+    ###########################################################################
+    ###                       BatchWorker -> _poll()                        ###
+    ###########################################################################
+    def _poll(self):
+        """
+        Runs the callbacks the background thread has posted so far, for at most
+        BATCH_POLL_BUDGET_MS, then schedules itself again until the batch has finished.
+        Runs on the GUI thread
+        """
+
+        deadline = time.monotonic() + BATCH_POLL_BUDGET_MS / 1000
+        caught_up = False
+
+        while time.monotonic() < deadline:
+            try:
+                callback = self._pending.get_nowait()
+            except queue.Empty:
+                caught_up = True
+                break
+
+            self._call(callback)
+
+        # Carry on with what is left as soon as Tk has handled its pending events
+        if self.is_running:
+            self.after(BATCH_POLL_INTERVAL_MS if caught_up else 1, self._poll)
+
+    ###########################################################################
+    ###                       BatchWorker -> _call()                        ###
+    ###########################################################################
+    def _call(self, callback: Callable[[], None]):
+        """
+        Runs a posted callback, reporting anything it raises so one bad result does not
+        stop the results after it from being output
+
+        Args:
+            callback (Callable[[], None]): The callback to run
+        """
+
+        try:
+            callback()
+        except Exception as error:
+            self._on_error(error)
+
+    ###########################################################################
+    ###                      BatchWorker -> _finish()                       ###
+    ###########################################################################
+    def _finish(
+        self,
+        on_finished: Callable[[BatchProgress, bool], None],
+        progress: BatchProgress,
+        cancelled: bool,
+    ):
+        """
+        Marks the batch as finished and reports it. Runs on the GUI thread after every
+        result of the batch has been handled
+
+        Args:
+            on_finished (Callable[[BatchProgress, bool], None]): The batch's completion callback
+            progress (BatchProgress): The final progress of the batch
+            cancelled (bool): Whether the batch was cancelled before it completed
+        """
+
+        self.is_running = False
+        on_finished(progress, cancelled)
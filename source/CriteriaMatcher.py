@@ -0,0 +1,195 @@
+from dataclasses import dataclass
+
+
+# CriteriaMatch class to hold the first labor criteria, labor exclusion and shipping criteria found
+# in a payment line, where "first" means first in the order they are listed in the cost criteria
+@dataclass(frozen=True)
+class CriteriaMatch:
+
+    # fmt:off
+    labor_criteria: str | None      = None                              # First labor criteria found in the line
+    labor_exclusion: str | None     = None                              # First labor exclusion found in the line
+    shipping_criteria: str | None   = None                              # First shipping criteria found in the line
+    # fmt:on
+
+    @property
+    def is_labor_cost(self) -> bool:
+        """
+        bool: True if the line contains a labor criteria and no labor exclusions
+        """
+        return self.labor_criteria is not None and self.labor_exclusion is None
+
+    @property
+    def is_shipping_cost(self) -> bool:
+        """
+        bool: True if the line contains a shipping criteria
+        """
+        return self.shipping_criteria is not None
+
+
+# CriteriaMatcher class to find every cost criteria and exclusion in a payment line in a single pass.
+# All of the criteria are compiled into one Aho-Corasick automaton, so the time taken to classify a
+# line depends on the length of the line rather than on how many criteria are configured.
+#
+# The matcher is built from a snapshot of the criteria lists and never changes afterwards, so when the
+# cost criteria are reloaded a new matcher is built and swapped in, rather than this one being edited.
+class CriteriaMatcher:
+
+    ###########################################################################
+    ###                   CriteriaMatcher -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self, labor_criteria: list, labor_exclusions: list, shipping_criteria: list
+    ):
+        """
+        Initializes the CriteriaMatcher object, building the automaton for the criteria
+
+        Args:
+            labor_criteria (list): Criteria to determine if a payment line is a labor cost
+            labor_exclusions (list): Criteria to exclude a payment line from being a labor cost
+            shipping_criteria (list): Criteria to determine if a payment line is a shipping cost
+        """
+
+        self.criteria = (
+            tuple(labor_criteria),
+            tuple(labor_exclusions),
+            tuple(shipping_criteria),
+        )
+
+        # Trie transitions, failure links, and for each state the lowest index in each
+        # list of a criteria ending there (or None if no criteria end there)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._ranks: list[list[int] | None] = [None]
+
+        for kind, criteria in enumerate(self.criteria):
+            for rank, criterion in enumerate(criteria):
+                self._add(kind=kind, rank=rank, criterion=criterion)
+
+        self._link()
+
+        # The last line matched and its result, since each line is checked for both
+        # labor and shipping criteria in turn
+        self._last_match: tuple[str, CriteriaMatch] | None = None
+
+    ###########################################################################
+    ###                    CriteriaMatcher -> match()                       ###
+    ###########################################################################
+    def match(self, line: str) -> CriteriaMatch:
+        """
+        Finds the first labor criteria, labor exclusion and shipping criteria in a line
+
+        Args:
+            line (str): One line of text from the purchase table
+
+        Returns:
+            CriteriaMatch: The first of each kind of criteria contained in the line
+        """
+
+        last_match = self._last_match
+        if last_match is not None and last_match[0] == line:
+            return last_match[1]
+
+        goto = self._goto
+        fail = self._fail
+        ranks = self._ranks
+
+        # Lowest index found so far in each list, starting with any empty criteria
+        found = list(ranks[0]) if ranks[0] is not None else [None, None, None]
+
+        state = 0
+        for char in line:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            state_ranks = ranks[state]
+            if state_ranks is not None:
+                for kind, rank in enumerate(state_ranks):
+                    if rank is not None and (found[kind] is None or rank < found[kind]):
+                        found[kind] = rank
+
+        match = CriteriaMatch(
+            *(
+                None if rank is None else criteria[rank]
+                for criteria, rank in zip(self.criteria, found)
+            )
+        )
+
+        self._last_match = (line, match)
+        return match
+
+    ###########################################################################
+    ###                     CriteriaMatcher -> _add()                       ###
+    ###########################################################################
+    def _add(self, kind: int, rank: int, criterion: str):
+        """
+        Adds a criteria to the trie
+
+        Args:
+            kind (int): Which list the criteria is from, as its index in self.criteria
+            rank (int): The index of the criteria in its list
+            criterion (str): The criteria text
+        """
+
+        state = 0
+        for char in criterion:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._ranks.append(None)
+            state = next_state
+
+        self._merge_rank(state=state, kind=kind, rank=rank)
+
+    ###########################################################################
+    ###                     CriteriaMatcher -> _link()                      ###
+    ###########################################################################
+    def _link(self):
+        """
+        Sets the failure link of every state, breadth first, and merges the criteria
+        ending at each state's failure link into its own, so matching never has to
+        follow the failure links to find the criteria that end at a character
+        """
+
+        queue = list(self._goto[0].values())
+
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+
+            # Every criteria ending at the failure link (which is shallower, so already
+            # merged) also ends here
+            fail_ranks = self._ranks[self._fail[state]]
+            if fail_ranks is not None:
+                for kind, rank in enumerate(fail_ranks):
+                    if rank is not None:
+                        self._merge_rank(state=state, kind=kind, rank=rank)
+
+    ###########################################################################
+    ###                  CriteriaMatcher -> _merge_rank()                   ###
+    ###########################################################################
+    def _merge_rank(self, state: int, kind: int, rank: int):
+        """
+        Records that a criteria ends at a state, keeping the lowest index of each kind
+
+        Args:
+            state (int): The state of the automaton
+            kind (int): Which list the criteria is from, as its index in self.criteria
+            rank (int): The index of the criteria in its list
+        """
+
+        state_ranks = self._ranks[state]
+        if state_ranks is None:
+            state_ranks = self._ranks[state] = [None, None, None]
+
+        if state_ranks[kind] is None or rank < state_ranks[kind]:
+            state_ranks[kind] = rank
@@ -0,0 +1,311 @@
+import atexit
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from source.constants import (
+    DEBUG_LOG_PATH,
+    DEBUG_LOG_MAX_QUEUED,
+    DEBUG_LOG_FLUSH_INTERVAL_S,
+)
+
+# Queued to tell the writer thread to flush, close the log and stop
+_STOP = object()
+
+
+# DebugLogWriter class to append lines to the debug log from a background thread. Callers only put
+# each line on a bounded queue; the writer thread keeps the log open and writes whatever has queued up
+# in one go, so logging a line no longer costs a mkdir, open and close. The log is flushed to disk
+# periodically, whenever flush() is called, and when the writer is closed (including at exit).
+#
+# Failures writing the log are never raised on the writer thread. They are reported through
+# report_error on the next call from the caller's thread, since the reporter may be a GUI popup.
+class DebugLogWriter:
+
+    ###########################################################################
+    ###                    DebugLogWriter -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self,
+        log_path: Path = DEBUG_LOG_PATH,
+        report_error: Callable[[str, str], None] = lambda *_: None,
+        max_queued: int = DEBUG_LOG_MAX_QUEUED,
+        flush_interval: float = DEBUG_LOG_FLUSH_INTERVAL_S,
+    ):
+        """
+        Initializes the DebugLogWriter object. The writer thread is not started, and
+        the log is not opened, until the first line is written
+
+        Args:
+            log_path (Path): The log file to append to
+            report_error (Callable[[str, str], None]): Callback used to surface a
+                failure to write the log, taking an error title and message
+            max_queued (int): Lines that may be waiting to be written before write()
+                blocks until the writer thread catches up
+            flush_interval (float): Longest time, in seconds, a written line may sit in
+                the file buffer before it is flushed to disk
+        """
+
+        self.log_path = log_path
+        self.report_error = report_error
+        self.flush_interval = flush_interval
+
+        # Lines waiting to be written, along with flush and stop requests
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+
+        # Guards starting and stopping the writer thread
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+        # First failure hit by the writer thread, not yet reported
+        self._error: OSError | None = None
+
+    ###########################################################################
+    ###                     DebugLogWriter -> write()                       ###
+    ###########################################################################
+    def write(self, contents: str):
+        """
+        Queues contents to be appended to the log as a line of its own. Blocks only if
+        the queue is full, until the writer thread catches up
+
+        Args:
+            contents (str): The contents to be written to the log
+        """
+
+        self._report_error()
+
+        with self._lock:
+            self._start()
+            self._queue.put(contents + "\n")
+
+    ###########################################################################
+    ###                     DebugLogWriter -> flush()                       ###
+    ###########################################################################
+    def flush(self, wait: bool = True):
+        """
+        Asks the writer thread to write and flush every line written so far to disk
+
+        Args:
+            wait (bool): Whether to block until the lines are on disk. Defaults to True;
+                False only queues the request, which the writer thread handles in turn
+        """
+
+        with self._lock:
+            if self._thread is None:
+                return
+
+            flushed = threading.Event()
+            self._queue.put(flushed)
+
+        if wait:
+            flushed.wait()
+        self._report_error()
+
+    ###########################################################################
+    ###                     DebugLogWriter -> close()                       ###
+    ###########################################################################
+    def close(self):
+        """
+        Writes and flushes every line written so far, then closes the log and stops
+        the writer thread. Writing another line starts it again.
+        """
+
+        with self._lock:
+            if self._thread is None:
+                return
+
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+            atexit.unregister(self.close)
+
+        self._report_error()
+
+    ###########################################################################
+    ###                     DebugLogWriter -> _start()                      ###
+    ###########################################################################
+    def _start(self):
+        """
+        Starts the writer thread if it is not running. Must be called with the lock held
+        """
+
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name="DebugLogWriter", daemon=True
+        )
+        self._thread.start()
+
+        # Make sure nothing still queued is lost when the app exits
+        atexit.register(self.close)
+
+    ###########################################################################
+    ###                      DebugLogWriter -> _run()                       ###
+    ###########################################################################
+    def _run(self):
+        """
+        Writer thread. Writes each batch of queued lines in one go, and flushes them
+        to disk every flush_interval, or sooner when asked to
+        """
+
+        log_file = None
+        unflushed = False
+        last_flush = time.monotonic()
+
+        try:
+            while True:
+                # Wait for the next line, waking up in time to flush on schedule
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = None
+
+                lines: list[str] = []
+                flushed: list[threading.Event] = []
+                stop = False
+
+                # Take everything else that has queued up, so it is written in one go
+                while item is not None:
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        flushed.append(item)
+                    else:
+                        lines.append(item)
+
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+
+                if lines:
+                    log_file = self._write_lines(log_file=log_file, lines=lines)
+                    unflushed = log_file is not None
+
+                now = time.monotonic()
+                if unflushed and (
+                    flushed or stop or now - last_flush >= self.flush_interval
+                ):
+                    log_file = self._flush_file(log_file=log_file)
+                    unflushed = False
+                    last_flush = now
+
+                for event in flushed:
+                    event.set()
+
+                if stop:
+                    return
+
+        finally:
+            if log_file is not None:
+                try:
+                    log_file.close()
+                except OSError as error:
+                    self._record_error(error)
+
+    ###########################################################################
+    ###                  DebugLogWriter -> _write_lines()                   ###
+    ###########################################################################
+    def _write_lines(self, log_file, lines: list[str]):
+        """
+        Appends lines to the log, opening it first if it is not already open
+
+        Args:
+            log_file (TextIO | None): The open log, or None if it is not open
+            lines (list[str]): The lines to write, each ending in a newline
+
+        Returns:
+            TextIO | None: The open log, or None if it could not be written to, in
+                which case the lines are dropped and opening it is retried next time
+        """
+
+        try:
+            if log_file is None:
+                # Ensure the log directory exists, then open the log for appending
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                log_file = open(file=self.log_path, mode="a")
+
+            log_file.write("".join(lines))
+            return log_file
+
+        except OSError as error:
+            self._record_error(error)
+            return self._close_file(log_file)
+
+    ###########################################################################
+    ###                  DebugLogWriter -> _flush_file()                    ###
+    ###########################################################################
+    def _flush_file(self, log_file):
+        """
+        Flushes the log to disk
+
+        Args:
+            log_file (TextIO): The open log
+
+        Returns:
+            TextIO | None: The open log, or None if it could not be flushed
+        """
+
+        try:
+            log_file.flush()
+            return log_file
+
+        except OSError as error:
+            self._record_error(error)
+            return self._close_file(log_file)
+
+    ###########################################################################
+    ###                  DebugLogWriter -> _close_file()                    ###
+    ###########################################################################
+    def _close_file(self, log_file) -> None:
+        """
+        Closes the log after a failure, ignoring any further failure
+
+        Args:
+            log_file (TextIO | None): The open log, or None if it is not open
+
+        Returns:
+            None: So callers can return the result as the log's new state
+        """
+
+        if log_file is not None:
+            try:
+                log_file.close()
+            except OSError:
+                pass
+
+        return None
+
+    ###########################################################################
+    ###                 DebugLogWriter -> _record_error()                   ###
+    ###########################################################################
+    def _record_error(self, error: OSError):
+        """
+        Records a failure on the writer thread, to be reported from the caller's thread
+
+        Args:
+            error (OSError): The failure to record
+        """
+
+        if self._error is None:
+            self._error = error
+
+    ###########################################################################
+    ###                 DebugLogWriter -> _report_error()                   ###
+    ###########################################################################
+    def _report_error(self):
+        """
+        Reports the failure recorded by the writer thread, if any, through report_error
+        """
+
+        error, self._error = self._error, None
+
+        if error is not None:
+            self.report_error(
+                "File Error",
+                f"Could not write to the debug log at {self.log_path}: {error}",
+            )
@@ -1,9 +1,26 @@
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import NamedTuple
 
 from source.constants import DECIMAL_ZERO
 
 
+# LineItem class to hold a single costed row of an invoice's payment table. It is a named tuple, so
+# each record stays compact and immutable even on invoices with thousands of rows.
+class LineItem(NamedTuple):
+
+    # fmt:off
+    line_number: int                                                 # Number the row is listed under, e.g. 3
+    description: str                                                 # Text of the row's numbered line, without its number or cost
+    quantity: str                                                    # Quantity the cost is listed for, e.g. "2"
+    unit: str                                                        # "ea" for a quantity, "hr" for an hourly rate
+    amount: Decimal                                                  # Total cost of the row
+    category: str                                                    # LINE_ITEM_LABOR, LINE_ITEM_SHIPPING or LINE_ITEM_MATERIAL
+    matched_criteria: str | None                                     # Cost criteria that decided the category, or None for material
+    # fmt:on
+
+
 # Invoice class to hold all attributes of the invoice. This represents a single invoice generated by Fishbowl
 # Note that Decimal types are used for all currency values to avoid floating point precision issues caused
 # by the Fishbowl software. Every field has a default, so Invoice() default-constructs as before while callers
@@ -25,7 +42,8 @@ class Invoice:
     sales_tax: Decimal          = DECIMAL_ZERO                       # Additional sales tax
     total: Decimal              = DECIMAL_ZERO                       # Calculated as subtotal plus sales_tax
     listed_total: Decimal       = DECIMAL_ZERO                       # Total as listed on the invoice, to compare to the calculated total
-    page_contents: list[str]    = field(default_factory=list)        # List of strings, each string is the text from a page of the invoice PDF
+    line_items: list[LineItem]  = field(default_factory=list)        # Each costed row of the payment table, in order. Their amounts sum to subtotal
+    page_contents: Sequence[str] = field(default_factory=list)       # Text of each page of the invoice PDF, either a list or a LazyInvoicePages that extracts pages on demand
     # fmt:on
 
     ###########################################################################
@@ -1,19 +1,47 @@
 # Import necessary classes from modules
+import os
+import sys
 from pathlib import Path
 
 from source.gui.InvoiceAppDisplay import InvoiceAppDisplay
 from source.InvoiceAppFileIO import InvoiceAppFileIO
+from source.PageTextCache import PageTextCache
 from source.InvoiceProcessor import InvoiceProcessor
+from source.InvoiceBatchEngine import BatchResult, InvoiceBatchEngine
+from source.InvoiceFolderWatcher import InvoiceFolderWatcher
+from source.InvoiceImporter import InvoiceImporter
+from source.InvoiceManifest import InvoiceManifest
+from source.ResultsDatabase import ResultsDatabase
+from source.MismatchReport import MismatchReport
+from source.StageTimings import StageTimings
+from source.BatchProfiler import BatchProfiler, profile_mode_from_argv
+from source.MemoryReport import MemoryReport, memory_report_requested
+from source.InvoiceSearchIndex import InvoiceSearchIndex, SearchResult
+from source.BatchWorker import BatchProgress, BatchWorker
 from fishbowl_common import ArgumentProvider, SettingsRepository, UpdateCoordinator
 from source.Invoice import Invoice
 from source.constants import (
     COST_CRITERIA_PATH,
+    EXPORT_FORMAT_ENV_VAR,
+    EXPORT_FORMAT_NONE,
     GITHUB_REPO,
     INSTALLER_ASSET_PATTERN,
+    INVOICES_PATH,
+    MEMORY_REPORT_PATH,
     PAYMENT_TERMS_PATH,
     SALES_REPS_PATH,
     SETTINGS_DB_PATH,
+    SETTING_KEY_EXPORT_FORMAT,
+    SETTING_KEY_WATCH_FOLDER,
+    SETTING_KEY_STAGE_TIMINGS,
+    PROFILES_DIR,
+    STAGE_DISPLAY_INVOICE,
+    STAGE_TIMINGS_ON,
+    STAGE_TIMINGS_PATH,
+    STAGE_WRITE_RESULTS,
     VERSION,
+    WATCH_FOLDER_ON,
+    WATCH_POLL_INTERVAL_MS,
 )
 
 # TODO: See if there is a good logging method to add for debugging
@@ -36,8 +64,9 @@ class InvoiceAppController:
         # Argument provider to check for integration test mode
         self.argument_provider = ArgumentProvider()
 
-        # Create File IO Controller, which reads its file paths from source.constants
-        self.file_io_controller = InvoiceAppFileIO()
+        # Create File IO Controller, which reads its file paths from source.constants. It is
+        # given a page text cache so unchanged invoices are never re-extracted by pypdf.
+        self.file_io_controller = InvoiceAppFileIO(page_text_cache=PageTextCache())
 
         # Create InvoiceProcessor, provide it with the File IO Controller and criteria for processing invoices
         self.invoice_processor = InvoiceProcessor(
@@ -47,6 +76,54 @@ class InvoiceAppController:
             shipping_criteria=self.file_io_controller.shipping_criteria,
         )
 
+        # Create the Stage Timings, which record how long each stage of processing the last
+        # batch took while the user has them turned on. Until then, timing costs next to nothing
+        self.stage_timings = StageTimings()
+
+        # Create the Batch Engine, which parses invoices in-process for a single invoice and
+        # across a pool of worker processes for "Process All Invoices". Its manifest remembers
+        # each parsed invoice, so only new or changed invoices are parsed again.
+        self.batch_engine = InvoiceBatchEngine(
+            file_io_controller=self.file_io_controller,
+            invoice_processor=self.invoice_processor,
+            manifest=InvoiceManifest(),
+            stage_timings=self.stage_timings,
+        )
+
+        # Create the Batch Profiler and Memory Report, which profile each batch and account for
+        # its memory when the application is started with --profile or --memory-report. Both
+        # only see this process, so invoices are then parsed in-process
+        self.batch_profiler = BatchProfiler(mode=profile_mode_from_argv(sys.argv[1:]))
+        self.memory_report = MemoryReport(enabled=memory_report_requested(sys.argv[1:]))
+        if self.batch_profiler.enabled or self.memory_report.enabled:
+            self.batch_engine.max_workers = 1
+
+        # Create the Results Database, which keeps every processed invoice across launches so
+        # past results can be looked up without re-processing their PDFs
+        self.results_database = ResultsDatabase()
+
+        # Create the Search Index, a full-text index of every invoice's text kept alongside
+        # the results, which lets the user search the invoices without processing them
+        self.search_index = InvoiceSearchIndex()
+
+        # Create the Mismatch Report, which collects the invoices of each batch whose
+        # calculated total does not match their listed total
+        self.mismatch_report = MismatchReport()
+
+        # Create the Folder Watcher, which notices invoices as they land in the Invoices/ folder
+        # so they can be processed without processing the whole folder again
+        self.folder_watcher = InvoiceFolderWatcher(folder=INVOICES_PATH.resolve())
+
+        # Invoices the Folder Watcher has found that are waiting for a batch to finish
+        self.watched_invoices: list[Path] = []
+
+        # Identifier of the next scheduled check of the Invoices/ folder, while it is watched
+        self._watch_poll_id = None
+
+        # Create the Invoice Importer, which copies downloaded invoices into the Invoices/
+        # folder several at a time for the Invoice Discovery window
+        self.invoice_importer = InvoiceImporter()
+
         # Create the Settings Repository and load the user's persisted settings so
         # they can be handed to the display and restored on startup.
         self.settings_repository = SettingsRepository(db_path=SETTINGS_DB_PATH)
@@ -60,12 +137,16 @@ class InvoiceAppController:
             title="Invoice Processor",
             window_resolution="750x750",
             process_callback=self.handle_process_invoice,
+            process_all_callback=self.handle_process_all_invoices,
+            cancel_callback=self.handle_cancel_processing,
             read_file_callback=self.file_io_controller.read_text_file,
             save_config_callback=self.handle_save_config,
             save_settings_callback=self.handle_save_setting,
-            copy_invoice_callback=self.file_io_controller.copy_invoice_file,
+            import_invoices_callback=self.invoice_importer.import_files,
+            search_callback=self.handle_search,
             check_for_updates_callback=self.handle_check_for_updates,
             settings=saved_settings,
+            stage_timings=self.stage_timings,
         )
 
         # Wire the GUI's popup into the File IO Controller and Settings Repository
@@ -74,6 +155,16 @@ class InvoiceAppController:
         # parsed below so parse failures can be reported.
         self.file_io_controller.report_error = self.display.show_popup
         self.settings_repository.report_error = self.display.show_popup
+        self.results_database.report_error = self.display.show_popup
+        self.search_index.report_error = self.display.show_popup
+
+        # Create the Batch Worker, which runs the Batch Engine off the GUI thread so the
+        # window stays responsive, handing each result back through the display's after().
+        # Integration test mode never enters the GUI loop, so batches run synchronously.
+        self.batch_worker = BatchWorker(
+            after=self.display.after,
+            run_in_background=not self.argument_provider.integration_test_mode,
+        )
 
         # Create the Update Coordinator, which owns the background release check
         # and reports its outcome through the display created above. The asset
@@ -95,6 +186,24 @@ class InvoiceAppController:
         # Build sales_rep dictionary containing all possible payment terms that could appear on an invoice
         self.sales_reps = self.file_io_controller.parse_sales_reps_config()
 
+        # Export processed invoices in the user's chosen machine-readable format, if any. The
+        # environment variable lets headless integration test runs choose one without the GUI
+        self.file_io_controller.set_export_format(
+            os.environ.get(
+                EXPORT_FORMAT_ENV_VAR,
+                saved_settings.get(SETTING_KEY_EXPORT_FORMAT, EXPORT_FORMAT_NONE),
+            )
+        )
+
+        # Whether the user chose to have new invoices processed as they land in the Invoices/
+        # folder. Watching starts with the GUI loop, so integration test mode never watches
+        self.watch_folder = saved_settings.get(SETTING_KEY_WATCH_FOLDER) == WATCH_FOLDER_ON
+
+        # Time each stage of processing if the user chose to
+        self.stage_timings.enabled = (
+            saved_settings.get(SETTING_KEY_STAGE_TIMINGS) == STAGE_TIMINGS_ON
+        )
+
     ###########################################################################
     ###             InvoiceAppController -> start_application()             ###
     ###########################################################################
@@ -115,15 +224,35 @@ class InvoiceAppController:
         if self.argument_provider.integration_test_mode:
             # If in integration test mode, process all invoices directly without starting the GUI
             self.display.handle_process_all_invoices()
+
+            # Write out the rest of the debug log and results database before exiting
+            self.file_io_controller.close_debug_file()
+            self.results_database.close()
+            self.search_index.close()
         else:
             # Kick off a background check for a newer release before entering the
             # GUI loop. Confined to this branch so integration-test mode performs no
             # network I/O.
             self.update_coordinator.start()
 
+            # Process new invoices as they land in the Invoices/ folder, if the user chose to
+            if self.watch_folder:
+                self._set_watching(True)
+
+            # Index any invoices added or changed since the last launch, so they can be searched
+            self._update_search_index()
+
             # Else, normally start the GUI application
             self.display.mainloop()
 
+            # The window has closed, so stop any batch still running in the background
+            self.batch_worker.cancel()
+
+            # Write out the rest of the debug log and results database before exiting
+            self.file_io_controller.close_debug_file()
+            self.results_database.close()
+            self.search_index.close()
+
     ###########################################################################
     ###          InvoiceAppController -> handle_check_for_updates()         ###
     ###########################################################################
@@ -151,59 +280,296 @@ class InvoiceAppController:
                                     False: overwrite existing results.txt and output box
         """
 
-        invoice = Invoice()
+        self._start_batch(
+            invoice_filepaths=[invoice_filepath], append_output=append_output
+        )
+
+    ###########################################################################
+    ###        InvoiceAppController -> handle_process_all_invoices()        ###
+    ###########################################################################
+    def handle_process_all_invoices(self):
+        """
+        Directs components to process every invoice in the Invoices/ folder, appending
+        each invoice's output to results.txt and the output box
 
-        # Command the File IO Controller to read in the invoice located at invoice_filepath
-        invoice.page_contents = self.file_io_controller.read_invoice_file(
-            invoice_filepath=invoice_filepath
+        Invoices are parsed in parallel by the Batch Engine, but their results are output
+        here one at a time in filename order, so the output is identical to processing
+        each invoice in turn.
+        """
+
+        # Sort by name so the output order does not depend on the filesystem's listing order
+        invoice_filepaths = sorted(
+            INVOICES_PATH.resolve().iterdir(),
+            key=lambda path: (path.name.casefold(), path.name),
         )
 
-        # If there are no pages in the invoice, show an error and return early
-        if not invoice.page_contents or invoice.page_contents[0] is None:
-            self.display.show_popup(
-                title="Error",
-                message=f"No pages were found in the invoice PDF located at {invoice_filepath}.",
-            )
+        self._start_batch(invoice_filepaths=invoice_filepaths, append_output=True)
+
+    ###########################################################################
+    ###         InvoiceAppController -> handle_cancel_processing()          ###
+    ###########################################################################
+    def handle_cancel_processing(self):
+        """
+        Stops the running batch before its next invoice, triggered by the Cancel button
+        """
+
+        self.batch_worker.cancel()
+
+    ###########################################################################
+    ###               InvoiceAppController -> _start_batch()                ###
+    ###########################################################################
+    def _start_batch(self, invoice_filepaths: list[Path], append_output: bool):
+        """
+        Hands a batch of invoices to the Batch Worker, which parses them off the GUI
+        thread and outputs each result on the GUI thread as it arrives
+
+        Args:
+            invoice_filepaths (list[Path]): The invoice PDFs to process, in output order
+            append_output (bool): Whether to append the Invoice outputs to any existing outputs
+        """
+
+        # Only one batch runs at a time; the display disables processing while one runs
+        if self.batch_worker.is_running:
             return
 
-        # Print results of reading invoice to debug.txt if in debug mode
-        self.file_io_controller.print_to_debug_file(
-            f"Processing invoice: {invoice_filepath} with {len(invoice.page_contents)} pages."
+        # Parse with the configs as they are now, even if they are reloaded mid-batch
+        sales_reps = self.sales_reps
+        payment_terms = self.payment_terms
+
+        self.display.show_batch_started(total=len(invoice_filepaths))
+
+        # Stream the batch's results into results.txt through a single handle
+        self.file_io_controller.begin_results_batch()
+
+        # Report only the mismatches found, and the stage timings of, this batch
+        self.mismatch_report.clear()
+        self.stage_timings.clear()
+
+        # Profile parsing the batch on the background thread and outputting it on this one
+        self.batch_profiler.start()
+        self.memory_report.start()
+
+        self.batch_worker.start(
+            total=len(invoice_filepaths),
+            produce_results=lambda: self.batch_profiler.iterate(
+                self.batch_engine.process_files(
+                    invoice_filepaths=invoice_filepaths,
+                    sales_reps=sales_reps,
+                    payment_terms=payment_terms,
+                )
+            ),
+            on_result=lambda result: self.batch_profiler.call(
+                self._output_batch_result, result=result, append_output=append_output
+            ),
+            on_progress=self.display.show_batch_progress,
+            on_error=self._report_batch_error,
+            on_finished=self._finish_batch,
         )
 
-        # Populate other initial fields of the invoice from the first page of the PDF
-        self.invoice_processor.populate_invoice(
-            invoice=invoice,
-            sales_reps=self.sales_reps,
-            payment_terms=self.payment_terms,
+    ###########################################################################
+    ###               InvoiceAppController -> _finish_batch()               ###
+    ###########################################################################
+    def _finish_batch(self, progress: BatchProgress, cancelled: bool):
+        """
+        Commits the batch's results to results.txt, then reports the batch as finished
+
+        Args:
+            progress (BatchProgress): The final progress of the batch
+            cancelled (bool): Whether the batch was cancelled before it completed
+        """
+
+        # The results output so far are kept even if the batch was cancelled
+        self.file_io_controller.end_results_batch()
+        self.results_database.flush()
+
+        # Index the batch's invoices, whose text is now in the page text cache
+        self._update_search_index()
+
+        self.display.show_batch_finished(progress, cancelled)
+
+        # Summarize the batch's total mismatches in the mismatch panel and debug.txt
+        summary = self.mismatch_report.summary()
+        self.display.show_mismatch_summary(summary)
+        self.file_io_controller.print_to_debug_file(contents=f"{summary}\n")
+
+        # Keep a copy of how long each stage of the batch took, if they were timed
+        if self.stage_timings.enabled:
+            try:
+                self.stage_timings.dump(STAGE_TIMINGS_PATH)
+            except OSError as error:
+                self.display.show_popup(
+                    title="File Error",
+                    message=f"Could not write the stage timings to {STAGE_TIMINGS_PATH}: {error}",
+                )
+
+        # Write the batch's profile, if it was profiled, and note where it went in debug.txt
+        try:
+            profile_paths = self.batch_profiler.stop(PROFILES_DIR)
+        except OSError as error:
+            self.display.show_popup(
+                title="File Error",
+                message=f"Could not write the profile to {PROFILES_DIR}: {error}",
+            )
+        else:
+            for profile_path in profile_paths:
+                self.file_io_controller.print_to_debug_file(
+                    contents=f"Wrote the batch's profile to {profile_path}\n"
+                )
+
+        # Write the batch's memory report next to debug.txt, if its memory was accounted for
+        try:
+            report_path = self.memory_report.stop(MEMORY_REPORT_PATH)
+        except OSError as error:
+            self.display.show_popup(
+                title="File Error",
+                message=f"Could not write the memory report to {MEMORY_REPORT_PATH}: {error}",
+            )
+        else:
+            if report_path is not None:
+                self.file_io_controller.print_to_debug_file(
+                    contents=f"Wrote the batch's memory report to {report_path}\n"
+                )
+
+    ###########################################################################
+    ###            InvoiceAppController -> _report_batch_error()            ###
+    ###########################################################################
+    def _report_batch_error(self, error: Exception):
+        """
+        Shows an unexpected error raised while processing a batch of invoices
+
+        Args:
+            error (Exception): The error that was raised
+        """
+
+        self.display.show_popup(
+            title="Processing Error",
+            message=f"An error occurred while processing invoices: {error}",
         )
 
-        # Forward call to the Invoice Processor
-        self.invoice_processor.process_invoice(invoice=invoice)
+    ###########################################################################
+    ###           InvoiceAppController -> _output_batch_result()            ###
+    ###########################################################################
+    def _output_batch_result(self, result: BatchResult, append_output: bool):
+        """
+        Replays the debug messages and errors buffered while parsing an invoice, then
+        outputs the invoice exactly as if it had been parsed on the GUI thread. An
+        invoice that could not be parsed is left to the errors that say why
+
+        Args:
+            result (BatchResult): The outcome of parsing one invoice in the batch
+            append_output (bool): Whether to append the Invoice outputs to any existing outputs
+        """
+
+        for message in result.debug_messages:
+            self.file_io_controller.print_to_debug_file(contents=message)
+
+        for title, message in result.errors:
+            self.display.show_popup(title=title, message=message)
+
+        self.stage_timings.extend(result.stage_timings)
+
+        # The errors already explain an invoice that failed, so no pages are not claimed too
+        if result.invoice is not None or not result.errors:
+            self._output_invoice(
+                invoice_filepath=result.invoice_filepath,
+                invoice=result.invoice,
+                append_output=append_output,
+            )
+
+        # Note how much memory the invoice left behind, now that it is displayed and written
+        self.memory_report.record_invoice(result.invoice_filepath)
+
+    ###########################################################################
+    ###              InvoiceAppController -> _output_invoice()              ###
+    ###########################################################################
+    def _output_invoice(
+        self, invoice_filepath: Path, invoice: Invoice | None, append_output: bool
+    ):
+        """
+        Displays a parsed invoice, warns about a total mismatch, and writes the invoice
+        to results.txt. Shows an error instead if the invoice could not be parsed.
+
+        Args:
+            invoice_filepath (Path): The filepath of the invoice PDF that was parsed
+            invoice (Invoice | None): The parsed invoice, or None if no pages were found
+            append_output (bool): Whether to append the Invoice outputs to any existing outputs
+        """
+
+        # If there are no pages in the invoice, show an error and return early
+        if invoice is None:
+            self.display.show_popup(
+                title="Error",
+                message=f"No pages were found in the invoice PDF located at {invoice_filepath}.",
+            )
+            return
 
         # Display the calculated totals in the GUI
-        self.display.display_invoice_output(
-            invoice=invoice, append_output=append_output
-        )
+        with self.stage_timings.time(STAGE_DISPLAY_INVOICE):
+            self.display.display_invoice_output(
+                invoice=invoice, append_output=append_output
+            )
 
         # Invoices generated by Fishbowl are known to have rounding errors, likely due to floating point precision issues, so
         # we need to account for that and let the user know that the generated total may not match the listed total on the invoice.
-        # This is done by displaying an error popup window
-        if invoice.total != invoice.listed_total:
-            self.display.show_popup(
-                title="Calculated Total Mismatch",
-                message=f"The calculated total of ${invoice.total} does not match the listed total of ${invoice.listed_total} for invoice {invoice.order_number}.",
+        # This is done by listing the invoice in the mismatch panel, rather than a popup that would halt the batch until dismissed
+        mismatch = self.mismatch_report.check(
+            invoice_filepath=invoice_filepath, invoice=invoice
+        )
+        if mismatch is not None:
+            self.display.show_total_mismatch(mismatch)
+            self.file_io_controller.print_to_debug_file(
+                contents=f"The calculated total of ${invoice.total} does not match the listed total of ${invoice.listed_total} for invoice {invoice.order_number}.\n"
             )
 
-        # Print calculated invoice output to results.txt
-        self.file_io_controller.print_invoice_to_output_file(
+        # Print calculated invoice output to results.txt, and to the export if one is chosen
+        with self.stage_timings.time(STAGE_WRITE_RESULTS):
+            self.file_io_controller.print_invoice_to_output_file(
+                invoice=invoice, append_output=append_output
+            )
+        self.file_io_controller.export_invoice(
             invoice=invoice, append_output=append_output
         )
 
-        # Print completion notice to debug.txt if in debug mode
+        # Keep the invoice in the results database, which is written a batch at a time
+        self.results_database.record(invoice_filepath=invoice_filepath, invoice=invoice)
+
+        # Print completion notice to debug.txt if in debug mode, and have the invoice's debug
+        # output flushed to disk, without holding up the GUI thread until it is
         self.file_io_controller.print_to_debug_file(
             contents=f"Processed all sales for invoice: {invoice_filepath}\n"
         )
+        self.file_io_controller.flush_debug_file(wait=False)
+
+    ###########################################################################
+    ###               InvoiceAppController -> handle_search()               ###
+    ###########################################################################
+    def handle_search(self, query: str) -> list[SearchResult]:
+        """
+        Searches the text of the invoices in the Invoices/ folder that have been
+        indexed so far. Indexing runs in the background, so a search never waits on it
+
+        Args:
+            query (str): The words to search for
+
+        Returns:
+            list[SearchResult]: The matching invoice pages, best match first
+        """
+
+        return self.search_index.search(query)
+
+    ###########################################################################
+    ###           InvoiceAppController -> _update_search_index()            ###
+    ###########################################################################
+    def _update_search_index(self):
+        """
+        Brings the search index up to date with the invoice PDFs in the Invoices/
+        folder on a background thread, indexing those that are new or have changed
+        """
+
+        self.search_index.update_in_background(
+            list_invoices=self.folder_watcher.list_invoices,
+            read_pages=self.file_io_controller.read_invoice_text,
+        )
 
     ###########################################################################
     ###            InvoiceAppController -> handle_save_config()             ###
@@ -251,6 +617,82 @@ class InvoiceAppController:
 
         self.settings_repository.save_setting(key=key, value=value)
 
+        # The export format takes effect immediately, including for a batch in progress
+        if key == SETTING_KEY_EXPORT_FORMAT:
+            self.file_io_controller.set_export_format(value)
+
+        # Start or stop watching the Invoices/ folder straight away
+        elif key == SETTING_KEY_WATCH_FOLDER:
+            self._set_watching(value == WATCH_FOLDER_ON)
+
+        # Invoices already being parsed by a batch are timed as the batch started
+        elif key == SETTING_KEY_STAGE_TIMINGS:
+            self.stage_timings.enabled = value == STAGE_TIMINGS_ON
+
+    ###########################################################################
+    ###              InvoiceAppController -> _set_watching()                ###
+    ###########################################################################
+    def _set_watching(self, enabled: bool):
+        """
+        Starts or stops processing new invoices as they land in the Invoices/ folder.
+        Only invoices that land or change after watching starts are processed
+
+        Args:
+            enabled (bool): Whether to watch the Invoices/ folder
+        """
+
+        self.watch_folder = enabled
+
+        if self._watch_poll_id is not None:
+            self.display.after_cancel(self._watch_poll_id)
+            self._watch_poll_id = None
+
+        self.watched_invoices = []
+
+        if enabled:
+            # The invoices already in the folder are there to be processed by hand
+            self.folder_watcher.reset()
+            self._poll_invoices_folder()
+
+    ###########################################################################
+    ###           InvoiceAppController -> _poll_invoices_folder()           ###
+    ###########################################################################
+    def _poll_invoices_folder(self):
+        """
+        Checks the Invoices/ folder for new or changed invoices and processes them as
+        a batch, or once the running batch has finished. Schedules itself again every
+        WATCH_POLL_INTERVAL_MS while the folder is watched
+        """
+
+        try:
+            ready = self.folder_watcher.poll()
+        except OSError as error:
+            # The folder may be briefly unavailable; it is checked again next time
+            ready = []
+            self.file_io_controller.print_to_debug_file(
+                contents=f"Could not check {INVOICES_PATH} for new invoices: {error}\n"
+            )
+
+        for invoice_filepath in ready:
+            if invoice_filepath not in self.watched_invoices:
+                self.watched_invoices.append(invoice_filepath)
+
+        # Only one batch runs at a time, so invoices found during one wait for it to finish
+        if self.watched_invoices and not self.batch_worker.is_running:
+            invoice_filepaths = self.watched_invoices
+            self.watched_invoices = []
+
+            self.file_io_controller.print_to_debug_file(
+                contents=f"Processing {len(invoice_filepaths)} new or changed invoice(s) found in {INVOICES_PATH}\n"
+            )
+            self._start_batch(
+                invoice_filepaths=invoice_filepaths, append_output=True
+            )
+
+        self._watch_poll_id = self.display.after(
+            WATCH_POLL_INTERVAL_MS, self._poll_invoices_folder
+        )
+
     ###########################################################################
     ###           InvoiceAppController -> _reload_cost_criteria()           ###
     ###########################################################################
@@ -258,7 +700,9 @@ class InvoiceAppController:
         """
         Re-parses the cost criteria config into the File IO Controller's criteria
         lists (cleared and repopulated in place, so the InvoiceProcessor's
-        references stay valid).
+        references stay valid). Each batch snapshots the criteria as it starts, and
+        the batch engine builds a new criteria matcher for the first batch after they
+        have changed.
         """
         self.file_io_controller.parse_cost_criteria_file()
 
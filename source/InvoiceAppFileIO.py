@@ -1,16 +1,24 @@
-import shutil
+import io
 import pypdf
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Callable
 
+from source.DebugLogWriter import DebugLogWriter
 from source.Invoice import Invoice
+from source.InvoiceExporter import InvoiceExporter
+from source.LazyInvoicePages import LazyInvoicePages
+from source.PageTextCache import PageTextCache
+from source.ResultsWriter import ResultsWriter
 from source.constants import (
     DEBUG_LOG_PATH,
+    EXPORT_CSV_PATH,
+    EXPORT_FORMAT_NONE,
+    EXPORT_JSONL_PATH,
     RESULTS_LOG_PATH,
     PAYMENT_TERMS_PATH,
     SALES_REPS_PATH,
     COST_CRITERIA_PATH,
-    INVOICES_PATH,
 )
 
 
@@ -20,7 +28,11 @@ class InvoiceAppFileIO:
     ###########################################################################
     ###                   InvoiceAppFileIO -> __init__()                    ###
     ###########################################################################
-    def __init__(self, report_error: Callable[[str, str], None] = lambda *_: None):
+    def __init__(
+        self,
+        report_error: Callable[[str, str], None] = lambda *_: None,
+        page_text_cache: PageTextCache | None = None,
+    ):
         """
         Initializes the InvoiceAppFileIO object
 
@@ -29,11 +41,32 @@ class InvoiceAppFileIO:
                 file I/O failure to the user, taking an error title and message.
                 Defaults to a no-op so file I/O never depends on a reporter being
                 wired in (the controller injects the GUI's error popup)
+            page_text_cache (PageTextCache | None): Cache of previously extracted
+                invoice text, consulted before running pypdf. Defaults to None, in
+                which case every invoice is extracted from scratch
         """
 
         # Callback used to report file I/O failures to the user
         self.report_error = report_error
 
+        # Cache of previously extracted invoice text, if any
+        self.page_text_cache = page_text_cache
+
+        # Background writer for the debug log. Failures are reported through whichever
+        # reporter is wired in at the time, since the controller replaces it after construction
+        self.debug_log = DebugLogWriter(
+            log_path=DEBUG_LOG_PATH,
+            report_error=lambda title, message: self.report_error(title, message),
+        )
+
+        # Writer for the results of the batch in progress, if any
+        self._results_writer: ResultsWriter | None = None
+
+        # Exporter for the chosen machine-readable export format, or None if the results
+        # are not exported, and whether a batch of results is being written
+        self.invoice_exporter: InvoiceExporter | None = None
+        self._in_results_batch = False
+
         # Initialize cost criteria/exclusion lists
         self.labor_criteria = []
         self.labor_exclusions = []
@@ -52,6 +85,9 @@ class InvoiceAppFileIO:
         if not __debug__:
             return
 
+        # Write out and close the debug log first, since an open file cannot be deleted on Windows
+        self.debug_log.close()
+
         try:
             # Ensure the log directory exists, then delete the debug file if present
             DEBUG_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -69,27 +105,32 @@ class InvoiceAppFileIO:
     ###########################################################################
     def reset_results_file(self):
         """
-        Deletes the results.txt file if it exists, to reset the results log for the next execution
+        Deletes the results.txt file and the exports of every format if they exist, to
+        reset the results log for the next execution. The exports are appended to just
+        like results.txt, so keeping them would repeat every invoice on each launch
         """
 
-        try:
-            # Ensure the log directory exists, then delete the results file if present
-            RESULTS_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-            if RESULTS_LOG_PATH.is_file():
-                RESULTS_LOG_PATH.unlink()
+        for results_path in (RESULTS_LOG_PATH, EXPORT_CSV_PATH, EXPORT_JSONL_PATH):
+            try:
+                # Ensure the log directory exists, then delete the results file if present
+                results_path.parent.mkdir(parents=True, exist_ok=True)
+                if results_path.is_file():
+                    results_path.unlink()
 
-        except OSError as error:
-            self.report_error(
-                "File Error",
-                f"Could not reset the results log at {RESULTS_LOG_PATH}: {error}",
-            )
+            except OSError as error:
+                self.report_error(
+                    "File Error",
+                    f"Could not reset the results log at {results_path}: {error}",
+                )
 
     ###########################################################################
     ###              InvoiceAppFileIO -> print_to_debug_file()              ###
     ###########################################################################
     def print_to_debug_file(self, contents: str):
         """
-        Writes the string contents to the debug.txt file
+        Writes the string contents to the debug.txt file. The contents are handed to
+        the background debug log writer, so they may reach the file shortly afterwards;
+        call flush_debug_file() to wait for them
         Note: This function does nothing in the release configuration
 
         Args:
@@ -100,16 +141,79 @@ class InvoiceAppFileIO:
         if not __debug__:
             return
 
+        self.debug_log.write(contents)
+
+    ###########################################################################
+    ###              InvoiceAppFileIO -> flush_debug_file()                 ###
+    ###########################################################################
+    def flush_debug_file(self, wait: bool = True):
+        """
+        Flushes everything printed to the debug.txt file so far to disk
+        Note: This function does nothing in the release configuration
+
+        Args:
+            wait (bool): Whether to wait until it is on disk. Defaults to True; False
+                asks the debug log writer to flush without waiting for it
+        """
+
+        # If in release configuration, do nothing
+        if not __debug__:
+            return
+
+        self.debug_log.flush(wait=wait)
+
+    ###########################################################################
+    ###              InvoiceAppFileIO -> close_debug_file()                 ###
+    ###########################################################################
+    def close_debug_file(self):
+        """
+        Writes out everything printed to the debug.txt file so far and closes it,
+        e.g. when the application exits
+        """
+
+        self.debug_log.close()
+
+    ###########################################################################
+    ###              InvoiceAppFileIO -> begin_results_batch()              ###
+    ###########################################################################
+    def begin_results_batch(self):
+        """
+        Starts writing the results of a batch. Until end_results_batch() is called,
+        invoices printed to results.txt are streamed into a temporary file through one
+        buffered handle, rather than opening results.txt for each one
+        """
+
+        self.end_results_batch()
+        self._results_writer = ResultsWriter(results_path=RESULTS_LOG_PATH)
+        self._in_results_batch = True
+
+        if self.invoice_exporter is not None:
+            self.invoice_exporter.begin_batch()
+
+    ###########################################################################
+    ###               InvoiceAppFileIO -> end_results_batch()               ###
+    ###########################################################################
+    def end_results_batch(self):
+        """
+        Finishes writing the results of a batch, replacing results.txt (and the export
+        file, if any) with them in a single rename. Does nothing if no batch was started
+        """
+
+        self._in_results_batch = False
+        self._end_export_batch()
+
+        results_writer, self._results_writer = self._results_writer, None
+        if results_writer is None:
+            return
+
         try:
-            # Ensure the log directory exists, then append the contents
-            DEBUG_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with open(file=DEBUG_LOG_PATH, mode="a") as f:
-                f.write(contents + "\n")
+            results_writer.commit()
 
         except OSError as error:
+            results_writer.discard()
             self.report_error(
                 "File Error",
-                f"Could not write to the debug log at {DEBUG_LOG_PATH}: {error}",
+                f"Could not write to the results log at {RESULTS_LOG_PATH}: {error}",
             )
 
     ###########################################################################
@@ -119,7 +223,9 @@ class InvoiceAppFileIO:
         self, invoice: Invoice, append_output: bool = False
     ):
         """
-        Writes each field of the invoice object to results.txt
+        Writes each field of the invoice object to results.txt. During a batch, the
+        invoice is written to the batch's results, which reach results.txt when the
+        batch ends
 
         Args:
             invoice (Invoice): The invoice whose fields are to be output
@@ -127,6 +233,22 @@ class InvoiceAppFileIO:
                                     Defaults to False, meaning the results file will be overwritten
         """
 
+        if self._results_writer is not None:
+            try:
+                self._results_writer.write(
+                    contents=invoice.to_formatted_string(), append=append_output
+                )
+                return
+
+            except OSError as error:
+                # Drop the batch's results and write the rest of the batch directly
+                self._results_writer.discard()
+                self._results_writer = None
+                self.report_error(
+                    "File Error",
+                    f"Could not write to the results log at {RESULTS_LOG_PATH}: {error}",
+                )
+
         # If appending output, use "a" for the file open call, otherwise use "w"
         if append_output:
             write_or_append = "a"
@@ -145,6 +267,91 @@ class InvoiceAppFileIO:
                 f"Could not write to the results log at {RESULTS_LOG_PATH}: {error}",
             )
 
+    ###########################################################################
+    ###              InvoiceAppFileIO -> set_export_format()                ###
+    ###########################################################################
+    def set_export_format(self, export_format: str):
+        """
+        Chooses the machine-readable format processed invoices are exported in. If a
+        batch is being written, what was exported so far is kept and the rest of the
+        batch is exported in the new format
+
+        Args:
+            export_format (str): One of EXPORT_FORMATS. EXPORT_FORMAT_NONE, or an
+                unknown format, turns exporting off
+        """
+
+        if (
+            self.invoice_exporter is not None
+            and self.invoice_exporter.export_format == export_format
+        ):
+            return
+
+        self._end_export_batch()
+
+        try:
+            self.invoice_exporter = InvoiceExporter(export_format=export_format)
+        except ValueError:
+            self.invoice_exporter = None
+            if export_format != EXPORT_FORMAT_NONE:
+                self.report_error(
+                    "Export Error", f"Unknown export format: {export_format}"
+                )
+            return
+
+        if self._in_results_batch:
+            self.invoice_exporter.begin_batch()
+
+    ###########################################################################
+    ###                InvoiceAppFileIO -> export_invoice()                 ###
+    ###########################################################################
+    def export_invoice(self, invoice: Invoice, append_output: bool = False):
+        """
+        Writes the invoice to the machine-readable export, if an export format is
+        chosen. During a batch, the invoice is written to the batch's export, which
+        reaches the export file when the batch ends
+
+        Args:
+            invoice (Invoice): The invoice whose fields are to be exported
+            append_output (bool): Whether to append the invoice to the export or overwrite it
+                                    Defaults to False, meaning the export will be overwritten
+        """
+
+        if self.invoice_exporter is None:
+            return
+
+        try:
+            self.invoice_exporter.export(invoice=invoice, append=append_output)
+
+        except OSError as error:
+            # Drop the batch's export, if any, and write the rest of the batch directly
+            self.invoice_exporter.discard_batch()
+            self.report_error(
+                "File Error",
+                f"Could not write to the export at {self.invoice_exporter.export_path}: {error}",
+            )
+
+    ###########################################################################
+    ###              InvoiceAppFileIO -> _end_export_batch()                ###
+    ###########################################################################
+    def _end_export_batch(self):
+        """
+        Finishes exporting a batch, replacing the export file with the batch's export.
+        Does nothing if nothing is exported or no batch was started
+        """
+
+        if self.invoice_exporter is None:
+            return
+
+        try:
+            self.invoice_exporter.end_batch()
+
+        except OSError as error:
+            self.report_error(
+                "File Error",
+                f"Could not write to the export at {self.invoice_exporter.export_path}: {error}",
+            )
+
     ###########################################################################
     ###                InvoiceAppFileIO -> read_text_file()                 ###
     ###########################################################################
@@ -200,30 +407,36 @@ class InvoiceAppFileIO:
     ###########################################################################
     ###               InvoiceAppFileIO -> read_invoice_file()               ###
     ###########################################################################
-    def read_invoice_file(self, invoice_filepath: Path) -> list:
+    def read_invoice_file(self, invoice_filepath: Path) -> Sequence:
         """
-        Converts the given invoice PDF into a list of strings
-        Each string in the list represents a page of the invoice PDF
+        Opens the given invoice PDF as a sequence of strings
+        Each string in the sequence represents a page of the invoice PDF
+
+        Page text is extracted lazily, the first time each page is indexed or iterated
+        over. If a page text cache is configured, pages it already holds for this exact
+        PDF are never extracted again, and newly extracted pages are added to it once
+        the last page is extracted or the returned pages are closed.
 
         Args:
             invoice_filepath (Path): The file path of the invoice to read in
 
         Returns:
-            list: A list of strings where each string is the text from a page of the
-                invoice, or an empty list if the PDF could not be read
+            Sequence: The text of each page of the invoice, or an empty list if the PDF
+                could not be read. A page that fails to extract reads as None
         """
 
-        try:
-            # Read text from input PDF
-            pdf = pypdf.PdfReader(stream=invoice_filepath)
-
-            # Extract text from each page and append to list
-            pages = []
-            for page in pdf.pages:
-                text = page.extract_text()
-                pages.append(text)
+        # Report a page that fails to extract the same way as a PDF that fails to open
+        def report_page_error(index: int, error: Exception):
+            self.report_error(
+                "File Error",
+                f"Could not read page {index + 1} of the invoice PDF at "
+                f"{invoice_filepath}: {error}",
+            )
 
-            return pages
+        try:
+            return self._open_invoice_pages(
+                invoice_filepath=invoice_filepath, on_error=report_page_error
+            )
 
         except (OSError, pypdf.errors.PdfReadError) as error:
             self.report_error(
@@ -233,50 +446,84 @@ class InvoiceAppFileIO:
             return []
 
     ###########################################################################
-    ###               InvoiceAppFileIO -> copy_invoice_file()               ###
+    ###               InvoiceAppFileIO -> read_invoice_text()               ###
     ###########################################################################
-    def copy_invoice_file(self, source_path: Path, overwrite: bool = False) -> str:
+    def read_invoice_text(self, invoice_filepath: Path) -> list[str | None]:
+        """
+        Reads the text of every page of the given invoice PDF, through the page text
+        cache if one is configured. Unlike read_invoice_file(), failures are not
+        reported, so it is safe to call off the GUI thread, e.g. to index the invoice
+
+        Args:
+            invoice_filepath (Path): The file path of the invoice to read in
+
+        Returns:
+            list[str | None]: The text of each page, where a page that fails to
+                extract is None
+
+        Raises:
+            OSError: If the PDF cannot be read
+            pypdf.errors.PdfReadError: If the PDF cannot be parsed
         """
-        Copies an invoice PDF into the Invoices/ directory so it is ready for
-        processing, without the user having to leave the application.
 
-        The overwrite decision is left to the caller: when a file of the same
-        name already exists and overwrite is False, no copy is made and "exists"
-        is returned so the UI can confirm with the user before overwriting.
+        pages = self._open_invoice_pages(invoice_filepath=invoice_filepath)
+        text = list(pages)
+
+        close_pages = getattr(pages, "close", None)
+        if close_pages is not None:
+            close_pages()
+
+        return text
+
+    ###########################################################################
+    ###              InvoiceAppFileIO -> _open_invoice_pages()              ###
+    ###########################################################################
+    def _open_invoice_pages(
+        self,
+        invoice_filepath: Path,
+        on_error: Callable[[int, Exception], None] = lambda *_: None,
+    ) -> Sequence:
+        """
+        Opens the given invoice PDF as a sequence of the text of each page, served
+        from the page text cache where it can be
 
         Args:
-            source_path (Path): The path of the invoice PDF to copy in
-            overwrite (bool): Whether to replace an existing same-named file in
-                the Invoices/ directory. Defaults to False, in which case an
-                existing file is left untouched and "exists" is returned
+            invoice_filepath (Path): The file path of the invoice to read in
+            on_error (Callable[[int, Exception], None]): Called with the index of a
+                page that fails to extract, and the error. Defaults to a no-op
 
         Returns:
-            str: "copied" if the file was copied, "exists" if a same-named file
-                already exists and overwrite was False, or "error" if the copy
-                failed (the failure is also surfaced via report_error)
+            Sequence: The text of each page of the invoice
+
+        Raises:
+            OSError: If the PDF cannot be read
+            pypdf.errors.PdfReadError: If the PDF cannot be parsed
         """
 
-        destination_path = INVOICES_PATH / source_path.name
+        # Without a cache, let pypdf read the file directly
+        if self.page_text_cache is None:
+            return LazyInvoicePages(stream=invoice_filepath, on_error=on_error)
 
-        try:
-            # Ensure the Invoices/ directory exists before copying into it
-            INVOICES_PATH.mkdir(parents=True, exist_ok=True)
+        # The cache is keyed by the PDF's bytes, so read them once and hand the same
+        # bytes to pypdf if any page still needs extracting
+        contents = invoice_filepath.read_bytes()
+        cache_key = self.page_text_cache.key_for(contents)
 
-            # Leave an existing file untouched unless the caller confirmed an
-            # overwrite, so the user is never silently overwritten
-            if destination_path.exists() and not overwrite:
-                return "exists"
+        pages = self.page_text_cache.load(cache_key)
 
-            # copy2 preserves metadata (timestamps) and works across platforms
-            shutil.copy2(source_path, destination_path)
-            return "copied"
+        # Every page is already cached, so there is no need to even open the PDF
+        if pages is not None and None not in pages:
+            return pages
 
-        except (OSError, shutil.SameFileError) as error:
-            self.report_error(
-                "File Error",
-                f"Could not copy the invoice from {source_path} to {destination_path}: {error}",
-            )
-            return "error"
+        # Write the newly extracted pages to the cache once, when extraction is done
+        return LazyInvoicePages(
+            stream=io.BytesIO(contents),
+            pages=pages,
+            on_extract=lambda extracted: self.page_text_cache.store(
+                cache_key, extracted
+            ),
+            on_error=on_error,
+        )
 
     ###########################################################################
     ###            InvoiceAppFileIO -> parse_sales_reps_config()            ###
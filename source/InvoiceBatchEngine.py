@@ -0,0 +1,611 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from source.CriteriaMatcher import CriteriaMatcher
+from source.Invoice import Invoice
+from source.InvoiceAppFileIO import InvoiceAppFileIO
+from source.InvoiceManifest import InvoiceManifest
+from source.InvoiceProcessor import InvoiceProcessor
+from source.PageTextCache import PageTextCache
+from source.StageTimings import StageTimings
+from source.processor_utilities import HeaderExtractor
+from source.constants import (
+    BATCH_MAX_WORKERS,
+    STAGE_POPULATE_INVOICE,
+    STAGE_PROCESS_INVOICE,
+    STAGE_READ_INVOICE,
+)
+
+
+# BatchResult class to carry the outcome of parsing a single invoice back from the batch engine.
+# When the invoice was parsed in a worker process, the debug messages and errors it produced, and how
+# long each stage took, are carried back alongside it so the caller can replay them in filename order.
+@dataclass
+class BatchResult:
+
+    # fmt:off
+    invoice_filepath: Path                                                      # The invoice PDF that was parsed
+    invoice: Invoice | None                 = None                              # The parsed invoice, or None if the PDF had no readable pages
+    debug_messages: list[str]               = field(default_factory=list)       # Debug log lines produced while parsing, in order
+    errors: list[tuple[str, str]]           = field(default_factory=list)       # (title, message) pairs reported while parsing, in order
+    stage_timings: list[tuple[str, float]]  = field(default_factory=list)       # (stage, seconds) of each stage timed while parsing, if timing is on
+    # fmt:on
+
+
+# _BufferedFileIO class used inside pool workers. Rather than writing to debug.txt or popping up
+# errors from another process, it records both so they are handed back with the BatchResult and
+# replayed by the parent in the same order a serial run would have produced them.
+class _BufferedFileIO(InvoiceAppFileIO):
+
+    ###########################################################################
+    ###                   _BufferedFileIO -> __init__()                     ###
+    ###########################################################################
+    def __init__(self, page_text_cache: PageTextCache | None = None):
+        """
+        Initializes the _BufferedFileIO object with empty message buffers
+
+        Args:
+            page_text_cache (PageTextCache | None): Cache of previously extracted
+                invoice text, shared on disk with the parent and the other workers
+        """
+
+        super().__init__(
+            report_error=self._record_error, page_text_cache=page_text_cache
+        )
+
+        # Debug lines and (title, message) errors recorded for the current invoice
+        self.debug_messages: list[str] = []
+        self.errors: list[tuple[str, str]] = []
+
+    ###########################################################################
+    ###                 _BufferedFileIO -> _record_error()                  ###
+    ###########################################################################
+    def _record_error(self, title: str, message: str):
+        """
+        Records a file I/O failure so the parent process can report it
+
+        Args:
+            title (str): The error title
+            message (str): The error message
+        """
+        self.errors.append((title, message))
+
+    ###########################################################################
+    ###              _BufferedFileIO -> print_to_debug_file()               ###
+    ###########################################################################
+    def print_to_debug_file(self, contents: str):
+        """
+        Records a debug line so the parent process can write it to debug.txt
+        Note: This function does nothing in the release configuration
+
+        Args:
+            contents (str): The contents to be written to the debug file
+        """
+
+        # If in release configuration, do nothing
+        if not __debug__:
+            return
+
+        self.debug_messages.append(contents)
+
+
+# Engine owned by each worker process, built once by _init_worker() so the config is only
+# shipped to a worker once rather than with every invoice
+_worker_engine: "InvoiceBatchEngine | None" = None
+_worker_sales_reps: dict = {}
+_worker_payment_terms: list = []
+
+
+def _build_buffered_engine(
+    labor_criteria: list,
+    labor_exclusions: list,
+    shipping_criteria: list,
+    criteria_matcher: CriteriaMatcher,
+    header_extractor: HeaderExtractor,
+    page_text_cache: PageTextCache | None,
+    time_stages: bool,
+) -> "InvoiceBatchEngine":
+    """
+    Builds an engine whose File IO Controller buffers its debug messages and errors,
+    configured with a copy of the given criteria
+
+    Args:
+        labor_criteria (list): Criteria to determine if a payment line is a labor cost
+        labor_exclusions (list): Criteria to exclude a payment line from being a labor cost
+        shipping_criteria (list): Criteria to determine if a payment line is a shipping cost
+        criteria_matcher (CriteriaMatcher): The matcher built for the criteria
+        header_extractor (HeaderExtractor): The header extractor built for the configs
+        page_text_cache (PageTextCache | None): The page text cache to read invoices through
+        time_stages (bool): Whether to time each stage of parsing an invoice
+
+    Returns:
+        InvoiceBatchEngine: An engine that parses invoices without writing any output
+    """
+
+    file_io_controller = _BufferedFileIO(page_text_cache=page_text_cache)
+    file_io_controller.labor_criteria.extend(labor_criteria)
+    file_io_controller.labor_exclusions.extend(labor_exclusions)
+    file_io_controller.shipping_criteria.extend(shipping_criteria)
+
+    invoice_processor = InvoiceProcessor(
+        file_io_controller=file_io_controller,
+        labor_criteria=file_io_controller.labor_criteria,
+        labor_exclusions=file_io_controller.labor_exclusions,
+        shipping_criteria=file_io_controller.shipping_criteria,
+        criteria_matcher=criteria_matcher,
+        header_extractor=header_extractor,
+    )
+
+    return InvoiceBatchEngine(
+        file_io_controller=file_io_controller,
+        invoice_processor=invoice_processor,
+        stage_timings=StageTimings(enabled=time_stages),
+    )
+
+
+def _parse_buffered(
+    engine: "InvoiceBatchEngine",
+    invoice_filepath: Path,
+    sales_reps: dict,
+    payment_terms: list,
+) -> BatchResult:
+    """
+    Parses a single invoice with an engine from _build_buffered_engine(), collecting
+    the debug messages and errors it produced, and how long each stage took. An
+    invoice that fails to parse is recorded as an error on its result, so the rest
+    of the batch is still parsed
+
+    Args:
+        engine (InvoiceBatchEngine): An engine built by _build_buffered_engine()
+        invoice_filepath (Path): The filepath of the invoice PDF to be parsed
+        sales_reps (dict): All possible sales rep codes and names
+        payment_terms (list): All possible payment terms
+
+    Returns:
+        BatchResult: The parsed invoice along with its buffered debug messages and errors
+    """
+
+    file_io_controller = engine.file_io_controller
+
+    # Start each invoice with empty buffers so nothing leaks between invoices
+    file_io_controller.debug_messages = []
+    file_io_controller.errors = []
+    engine.stage_timings.clear()
+
+    try:
+        invoice = engine.parse_invoice(
+            invoice_filepath=invoice_filepath,
+            sales_reps=sales_reps,
+            payment_terms=payment_terms,
+        )
+
+    except Exception as error:
+        invoice = None
+        file_io_controller.errors.append(
+            (
+                "Processing Error",
+                f"An error occurred while processing {invoice_filepath}: {error}",
+            )
+        )
+
+    return BatchResult(
+        invoice_filepath=invoice_filepath,
+        invoice=invoice,
+        debug_messages=file_io_controller.debug_messages,
+        errors=file_io_controller.errors,
+        stage_timings=engine.stage_timings.samples,
+    )
+
+
+def _init_worker(
+    labor_criteria: list,
+    labor_exclusions: list,
+    shipping_criteria: list,
+    criteria_matcher: CriteriaMatcher,
+    header_extractor: HeaderExtractor,
+    page_text_cache: PageTextCache | None,
+    time_stages: bool,
+):
+    """
+    Process pool initializer. Builds the worker's engine from the parent's loaded configs
+
+    Args:
+        labor_criteria (list): Criteria to determine if a payment line is a labor cost
+        labor_exclusions (list): Criteria to exclude a payment line from being a labor cost
+        shipping_criteria (list): Criteria to determine if a payment line is a shipping cost
+        criteria_matcher (CriteriaMatcher): The parent's matcher for the criteria, which
+            arrives already built
+        header_extractor (HeaderExtractor): The parent's header extractor for the sales
+            reps and payment terms, which only has its combined regex compiled again
+        page_text_cache (PageTextCache | None): The parent's page text cache, if any
+        time_stages (bool): Whether to time each stage of parsing an invoice
+    """
+
+    global _worker_engine, _worker_sales_reps, _worker_payment_terms
+
+    _worker_engine = _build_buffered_engine(
+        labor_criteria=labor_criteria,
+        labor_exclusions=labor_exclusions,
+        shipping_criteria=shipping_criteria,
+        criteria_matcher=criteria_matcher,
+        header_extractor=header_extractor,
+        page_text_cache=page_text_cache,
+        time_stages=time_stages,
+    )
+
+    # Parse with the configs the extractor was built from, so it is used as it is
+    _worker_sales_reps = header_extractor.sales_reps
+    _worker_payment_terms = header_extractor.payment_terms
+
+
+def _parse_in_worker(invoice_filepath: Path) -> BatchResult:
+    """
+    Parses a single invoice inside a pool worker
+
+    Args:
+        invoice_filepath (Path): The filepath of the invoice PDF to be parsed
+
+    Returns:
+        BatchResult: The parsed invoice along with its buffered debug messages and errors
+    """
+
+    return _parse_buffered(
+        engine=_worker_engine,
+        invoice_filepath=invoice_filepath,
+        sales_reps=_worker_sales_reps,
+        payment_terms=_worker_payment_terms,
+    )
+
+
+# InvoiceBatchEngine class to parse invoices, either one at a time in-process or as a batch
+# fanned out over a pool of worker processes. It performs no output of its own; callers display
+# and write each result, so the output of a parallel batch is identical to a serial one. Given a
+# manifest, invoices that have not changed since they were last parsed are not parsed again.
+class InvoiceBatchEngine:
+
+    ###########################################################################
+    ###                 InvoiceBatchEngine -> __init__()                    ###
+    ###########################################################################
+    def __init__(
+        self,
+        file_io_controller: InvoiceAppFileIO,
+        invoice_processor: InvoiceProcessor,
+        max_workers: int | None = BATCH_MAX_WORKERS,
+        manifest: InvoiceManifest | None = None,
+        stage_timings: StageTimings | None = None,
+    ):
+        """
+        Initializes the InvoiceBatchEngine object
+
+        Args:
+            file_io_controller (InvoiceAppFileIO): The file IO controller used to read
+                invoices in-process, and whose criteria lists are shipped to the workers
+            invoice_processor (InvoiceProcessor): The invoice processor used in-process
+            max_workers (int | None): Upper bound on worker processes for a batch. None
+                uses one worker per CPU core, and 1 disables the pool entirely
+            manifest (InvoiceManifest | None): Remembers the result of each invoice
+                parsed, so unchanged invoices are not parsed again. None parses every
+                invoice every time
+            stage_timings (StageTimings | None): Times each stage of parsing an invoice
+                in-process, and decides whether a batch's invoices are timed. None
+                times nothing
+        """
+
+        self.file_io_controller = file_io_controller
+        self.invoice_processor = invoice_processor
+        self.max_workers = max_workers
+        self.manifest = manifest
+        self.stage_timings = StageTimings() if stage_timings is None else stage_timings
+
+        # Matcher for the criteria and header extractor for the configs of the last batch
+        # parsed, reused by the batches after it (and shipped to their workers) until the
+        # criteria or configs change
+        self._criteria_matcher: CriteriaMatcher | None = None
+        self._header_extractor: HeaderExtractor | None = None
+
+    ###########################################################################
+    ###                InvoiceBatchEngine -> parse_invoice()                ###
+    ###########################################################################
+    def parse_invoice(
+        self, invoice_filepath: Path, sales_reps: dict, payment_terms: list
+    ) -> Invoice | None:
+        """
+        Reads the invoice PDF located at invoice_filepath and parses it into an Invoice
+
+        Args:
+            invoice_filepath (Path): The filepath of the invoice PDF to be parsed
+            sales_reps (dict): All possible sales rep codes and names
+            payment_terms (list): All possible payment terms
+
+        Returns:
+            Invoice | None: The parsed invoice, or None if no pages could be read from the PDF
+        """
+
+        invoice = Invoice()
+
+        # Command the File IO Controller to read in the invoice located at invoice_filepath
+        with self.stage_timings.time(STAGE_READ_INVOICE):
+            invoice.page_contents = self.file_io_controller.read_invoice_file(
+                invoice_filepath=invoice_filepath
+            )
+
+        # If there are no pages in the invoice, there is nothing to parse
+        if not invoice.page_contents or invoice.page_contents[0] is None:
+            return None
+
+        # Print results of reading invoice to debug.txt if in debug mode
+        self.file_io_controller.print_to_debug_file(
+            f"Processing invoice: {invoice_filepath} with {len(invoice.page_contents)} pages."
+        )
+
+        try:
+            # Populate other initial fields of the invoice from the first page of the PDF
+            with self.stage_timings.time(STAGE_POPULATE_INVOICE):
+                self.invoice_processor.populate_invoice(
+                    invoice=invoice,
+                    sales_reps=sales_reps,
+                    payment_terms=payment_terms,
+                )
+
+            # Process the purchase table and end of invoice to calculate the totals
+            with self.stage_timings.time(STAGE_PROCESS_INVOICE):
+                self.invoice_processor.process_invoice(invoice=invoice)
+
+        finally:
+            # Save the pages extracted while parsing to the page text cache in one write,
+            # even if parsing stopped before the last page
+            close_pages = getattr(invoice.page_contents, "close", None)
+            if close_pages is not None:
+                close_pages()
+
+        return invoice
+
+    ###########################################################################
+    ###                InvoiceBatchEngine -> process_files()                ###
+    ###########################################################################
+    def process_files(
+        self, invoice_filepaths: list[Path], sales_reps: dict, payment_terms: list
+    ) -> Iterator[BatchResult]:
+        """
+        Parses every invoice in invoice_filepaths, yielding one BatchResult per invoice
+        in the same order as invoice_filepaths regardless of which finishes first
+
+        Invoices the manifest has an up to date result for are not parsed again; their
+        remembered results are yielded in their place, so the output is the same either
+        way. The rest are parsed as a batch, and their results recorded in the manifest.
+
+        Batches of more than one invoice are fanned out over a process pool. A batch of a
+        single invoice, or an engine limited to one worker, is parsed in-process since
+        starting a pool would cost more than it saves.
+
+        Either way, nothing is written through this engine's File IO Controller: the debug
+        messages, errors and stage timings of each invoice are buffered on its BatchResult,
+        so batches can be run off the GUI thread. Closing the returned generator early drops any invoices
+        that have not started parsing yet.
+
+        Args:
+            invoice_filepaths (list[Path]): The invoice PDFs to parse, in output order
+            sales_reps (dict): All possible sales rep codes and names
+            payment_terms (list): All possible payment terms
+
+        Yields:
+            BatchResult: The outcome of parsing each invoice, in input order
+        """
+
+        # Snapshot the criteria, so saving the cost criteria mid-batch cannot change how
+        # the rest of the batch is parsed
+        criteria = (
+            list(self.file_io_controller.labor_criteria),
+            list(self.file_io_controller.labor_exclusions),
+            list(self.file_io_controller.shipping_criteria),
+        )
+
+        # Without a manifest, every invoice is parsed
+        if self.manifest is None:
+            yield from self._parse_files(
+                invoice_filepaths=invoice_filepaths,
+                criteria=criteria,
+                sales_reps=sales_reps,
+                payment_terms=payment_terms,
+            )
+            return
+
+        fingerprint = self.manifest.fingerprint(*criteria, sales_reps, payment_terms)
+
+        # Look up every invoice first, so only the ones that missed are sent to the pool
+        remembered: dict[int, BatchResult] = {}
+        for index, invoice_filepath in enumerate(invoice_filepaths):
+            hit = self.manifest.lookup(
+                invoice_filepath=invoice_filepath, fingerprint=fingerprint
+            )
+            if hit is not None:
+                invoice, debug_messages = hit
+                remembered[index] = BatchResult(
+                    invoice_filepath=invoice_filepath,
+                    invoice=invoice,
+                    debug_messages=debug_messages,
+                )
+
+        # Nothing is parsed (and no pool is started) until the first missed invoice is reached
+        parsed_results = self._parse_files(
+            invoice_filepaths=[
+                invoice_filepath
+                for index, invoice_filepath in enumerate(invoice_filepaths)
+                if index not in remembered
+            ],
+            criteria=criteria,
+            sales_reps=sales_reps,
+            payment_terms=payment_terms,
+        )
+
+        try:
+            for index in range(len(invoice_filepaths)):
+                result = remembered.get(index)
+
+                if result is None:
+                    result = next(parsed_results)
+
+                    # Only remember clean parses, so an invoice that could not be read is
+                    # tried again (and its errors shown again) on the next run
+                    if result.invoice is not None and not result.errors:
+                        self.manifest.record(
+                            invoice_filepath=result.invoice_filepath,
+                            invoice=result.invoice,
+                            debug_messages=result.debug_messages,
+                            fingerprint=fingerprint,
+                        )
+
+                yield result
+
+        finally:
+            # Save whatever was parsed, even if the batch was cancelled part way through
+            parsed_results.close()
+            self.manifest.save()
+
+    ###########################################################################
+    ###                InvoiceBatchEngine -> _parse_files()                 ###
+    ###########################################################################
+    def _parse_files(
+        self,
+        invoice_filepaths: list[Path],
+        criteria: tuple[list, list, list],
+        sales_reps: dict,
+        payment_terms: list,
+    ) -> Iterator[BatchResult]:
+        """
+        Parses every invoice in invoice_filepaths, in-process or over a process pool,
+        yielding one BatchResult per invoice in the same order as invoice_filepaths
+
+        Args:
+            invoice_filepaths (list[Path]): The invoice PDFs to parse, in output order
+            criteria (tuple[list, list, list]): Snapshot of the labor criteria, labor
+                exclusions and shipping criteria to parse with
+            sales_reps (dict): All possible sales rep codes and names
+            payment_terms (list): All possible payment terms
+
+        Yields:
+            BatchResult: The outcome of parsing each invoice, in input order
+        """
+
+        worker_count = min(
+            self.max_workers or os.cpu_count() or 1, len(invoice_filepaths)
+        )
+
+        criteria_matcher = self._get_criteria_matcher(criteria=criteria)
+        header_extractor = self._get_header_extractor(
+            sales_reps=sales_reps, payment_terms=payment_terms
+        )
+
+        # Parse with the configs the extractor was built from, so it is used as it is
+        sales_reps = header_extractor.sales_reps
+        payment_terms = header_extractor.payment_terms
+
+        # Parse in-process when there is nothing to gain from a pool
+        if worker_count <= 1:
+            engine = _build_buffered_engine(
+                *criteria,
+                criteria_matcher=criteria_matcher,
+                header_extractor=header_extractor,
+                page_text_cache=self.file_io_controller.page_text_cache,
+                time_stages=self.stage_timings.enabled,
+            )
+            for invoice_filepath in invoice_filepaths:
+                yield _parse_buffered(
+                    engine=engine,
+                    invoice_filepath=invoice_filepath,
+                    sales_reps=sales_reps,
+                    payment_terms=payment_terms,
+                )
+            return
+
+        # Hand each worker a few chunks so a slow invoice cannot leave the others idle
+        # for long, while still amortizing the per-task overhead over several invoices
+        chunk_size = max(1, len(invoice_filepaths) // (worker_count * 4))
+
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            initializer=_init_worker,
+            initargs=(
+                *criteria,
+                criteria_matcher,
+                header_extractor,
+                self.file_io_controller.page_text_cache,
+                self.stage_timings.enabled,
+            ),
+        ) as executor:
+
+            try:
+                # map() yields results in submission order, so the output is merged back
+                # deterministically while later invoices are still being parsed
+                yield from executor.map(
+                    _parse_in_worker, invoice_filepaths, chunksize=chunk_size
+                )
+
+            finally:
+                # If the caller stopped early (e.g. the batch was cancelled), drop the
+                # chunks no worker has started rather than parsing them before exiting
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    ###########################################################################
+    ###            InvoiceBatchEngine -> _get_criteria_matcher()            ###
+    ###########################################################################
+    def _get_criteria_matcher(
+        self, criteria: tuple[list, list, list]
+    ) -> CriteriaMatcher:
+        """
+        Returns the criteria matcher for a batch's criteria, building a new one only
+        when they are not the criteria the current one was built from (i.e. after the
+        cost criteria have been reloaded)
+
+        Args:
+            criteria (tuple[list, list, list]): Snapshot of the labor criteria, labor
+                exclusions and shipping criteria to parse with
+
+        Returns:
+            CriteriaMatcher: The criteria matcher for criteria
+        """
+
+        matcher = self._criteria_matcher
+
+        if matcher is None or matcher.criteria != tuple(map(tuple, criteria)):
+            matcher = CriteriaMatcher(*criteria)
+            self._criteria_matcher = matcher
+
+        return matcher
+
+    ###########################################################################
+    ###            InvoiceBatchEngine -> _get_header_extractor()            ###
+    ###########################################################################
+    def _get_header_extractor(
+        self, sales_reps: dict, payment_terms: list
+    ) -> HeaderExtractor:
+        """
+        Returns the header extractor for a batch's configs, building a new one from a
+        copy of them only when they are not the configs the current one was built from
+        (i.e. after the configs have been reloaded)
+
+        Args:
+            sales_reps (dict): All possible sales rep codes and names
+            payment_terms (list): All possible payment terms
+
+        Returns:
+            HeaderExtractor: The header extractor for sales_reps and payment_terms
+        """
+
+        extractor = self._header_extractor
+
+        # The configs are compared in order, since earlier entries take priority
+        if (
+            extractor is None
+            or list(extractor.sales_reps.items()) != list(sales_reps.items())
+            or extractor.payment_terms != payment_terms
+        ):
+            extractor = HeaderExtractor(
+                payment_terms=list(payment_terms), sales_reps=dict(sales_reps)
+            )
+            self._header_extractor = extractor
+
+        return extractor
@@ -0,0 +1,151 @@
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Callable
+
+from source.Invoice import Invoice
+from source.InvoiceAppFileIO import InvoiceAppFileIO
+from source.InvoiceBatchEngine import BatchResult, InvoiceBatchEngine
+from source.InvoiceProcessor import InvoiceProcessor
+from source.PageTextCache import PageTextCache
+from source.constants import BATCH_MAX_WORKERS
+
+
+# InvoiceEngine class to turn invoice PDFs into Invoices without the GUI, so other services (and the
+# command line entry point) can embed the parser. It owns the File IO Controller, which loads the
+# configs and extracts each PDF's text, the Invoice Processor, which parses it, and the Batch Engine,
+# which fans a batch out over worker processes. Nothing it imports loads tkinter or fishbowl_common.
+#
+# The configs are loaded from Configs/ when the engine is created. Problems are reported through
+# report_error, as the GUI would show them, and an invoice that cannot be read is skipped rather than
+# raising, so one bad PDF never stops a batch. Nothing is written to results.txt or the exports.
+class InvoiceEngine:
+
+    ###########################################################################
+    ###                     InvoiceEngine -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self,
+        report_error: Callable[[str, str], None] = lambda *_: None,
+        max_workers: int | None = BATCH_MAX_WORKERS,
+        page_text_cache: PageTextCache | None = None,
+    ):
+        """
+        Initializes the InvoiceEngine object and loads the configs
+
+        Args:
+            report_error (Callable[[str, str], None]): Callback used to report a
+                problem, taking an error title and message. Defaults to a no-op
+            max_workers (int | None): Upper bound on worker processes for a batch. None
+                uses one worker per CPU core, and 1 parses every invoice in-process
+            page_text_cache (PageTextCache | None): Cache of previously extracted
+                invoice text. Defaults to None, in which case every invoice is
+                extracted from scratch
+        """
+
+        self.file_io_controller = InvoiceAppFileIO(
+            report_error=report_error, page_text_cache=page_text_cache
+        )
+
+        self.invoice_processor = InvoiceProcessor(
+            file_io_controller=self.file_io_controller,
+            labor_criteria=self.file_io_controller.labor_criteria,
+            labor_exclusions=self.file_io_controller.labor_exclusions,
+            shipping_criteria=self.file_io_controller.shipping_criteria,
+        )
+
+        self.batch_engine = InvoiceBatchEngine(
+            file_io_controller=self.file_io_controller,
+            invoice_processor=self.invoice_processor,
+            max_workers=max_workers,
+        )
+
+        # All possible sales rep codes and names, and payment terms, from the configs
+        self.sales_reps: dict = {}
+        self.payment_terms: list = []
+
+        self.load_configs()
+
+    ###########################################################################
+    ###                   InvoiceEngine -> load_configs()                   ###
+    ###########################################################################
+    def load_configs(self):
+        """
+        Reads the cost criteria, payment terms and sales reps configs, replacing any
+        loaded before. A config that cannot be read is reported and left empty
+        """
+
+        self.file_io_controller.parse_cost_criteria_file()
+
+        self.payment_terms = self.file_io_controller.parse_payment_terms_config()
+        self.sales_reps = self.file_io_controller.parse_sales_reps_config()
+
+    ###########################################################################
+    ###                   InvoiceEngine -> process_path()                   ###
+    ###########################################################################
+    def process_path(self, path: Path | str) -> Invoice | None:
+        """
+        Processes a single invoice PDF, in-process
+
+        Args:
+            path (Path | str): The invoice PDF to process
+
+        Returns:
+            Invoice | None: The processed invoice, or None if no pages could be read
+                from the PDF, which is reported
+        """
+
+        return next(self.process_many([path]), None)
+
+    ###########################################################################
+    ###                   InvoiceEngine -> process_many()                   ###
+    ###########################################################################
+    def process_many(self, paths: Iterable[Path | str]) -> Iterator[Invoice]:
+        """
+        Processes invoice PDFs as a batch, yielding each processed invoice in the
+        order the PDFs were given. PDFs that could not be read are reported and skipped
+
+        Args:
+            paths (Iterable[Path | str]): The invoice PDFs to process
+
+        Yields:
+            Invoice: Each invoice that was processed
+        """
+
+        for result in self.process_results(paths):
+            if result.invoice is not None:
+                yield result.invoice
+
+    ###########################################################################
+    ###                  InvoiceEngine -> process_results()                 ###
+    ###########################################################################
+    def process_results(self, paths: Iterable[Path | str]) -> Iterator[BatchResult]:
+        """
+        Processes invoice PDFs as a batch, yielding the outcome of each in the order
+        the PDFs were given, after reporting the errors raised while processing it.
+        Closing the iterator early drops any invoices that have not started yet
+
+        Args:
+            paths (Iterable[Path | str]): The invoice PDFs to process
+
+        Yields:
+            BatchResult: The outcome of each PDF, along with the debug messages it
+                produced. Its invoice is None if no pages could be read from the PDF
+        """
+
+        # Process with the configs as they are now, even if they are reloaded mid-batch
+        for result in self.batch_engine.process_files(
+            invoice_filepaths=[Path(path) for path in paths],
+            sales_reps=self.sales_reps,
+            payment_terms=self.payment_terms,
+        ):
+            for title, message in result.errors:
+                self.file_io_controller.report_error(title, message)
+
+            # The errors already explain an invoice that failed, so no pages are not claimed too
+            if result.invoice is None and not result.errors:
+                self.file_io_controller.report_error(
+                    "Error",
+                    f"No pages were found in the invoice PDF located at {result.invoice_filepath}.",
+                )
+
+            yield result
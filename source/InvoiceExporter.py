@@ -0,0 +1,215 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+from source.Invoice import Invoice, LineItem
+from source.ResultsWriter import ResultsWriter
+from source.constants import (
+    EXPORT_CSV_PATH,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+    EXPORT_JSONL_PATH,
+)
+
+# Invoice fields written to an export, in column order. The line items are only written to
+# JSON Lines exports, since they do not fit in a single CSV row, and the page text is never written.
+EXPORT_FIELDS = (
+    "customer_name",
+    "date",
+    "order_number",
+    "po_number",
+    "payment_terms",
+    "sales_rep",
+    "labor_cost",
+    "material_cost",
+    "shipping_cost",
+    "subtotal",
+    "sales_tax",
+    "total",
+    "listed_total",
+)
+
+
+# InvoiceExporter class to write each processed invoice to a machine-readable export, as one CSV row
+# or one JSON line, so other tools can import the results without scraping results.txt. Currency
+# values are written as the exact text of their Decimal, never converted through a float.
+#
+# Each invoice is written as soon as it is processed and nothing is kept once it has been written, so
+# memory use does not grow with the size of the batch. During a batch the export is streamed through
+# a ResultsWriter, so the export file is replaced all at once when the batch ends, just like results.txt.
+class InvoiceExporter:
+
+    ###########################################################################
+    ###                   InvoiceExporter -> __init__()                     ###
+    ###########################################################################
+    def __init__(self, export_format: str, export_path: Path | None = None):
+        """
+        Initializes the InvoiceExporter object
+
+        Args:
+            export_format (str): EXPORT_FORMAT_CSV or EXPORT_FORMAT_JSONL
+            export_path (Path | None): The file to export to. Defaults to the standard
+                export file for the format
+
+        Raises:
+            ValueError: If export_format is not an export format
+        """
+
+        default_paths = {
+            EXPORT_FORMAT_CSV: EXPORT_CSV_PATH,
+            EXPORT_FORMAT_JSONL: EXPORT_JSONL_PATH,
+        }
+        if export_format not in default_paths:
+            raise ValueError(f"Unknown export format: {export_format}")
+
+        self.export_format = export_format
+        self.export_path = export_path or default_paths[export_format]
+
+        # Column names written at the top of a CSV export. JSON lines name their own fields
+        if export_format == EXPORT_FORMAT_CSV:
+            self.header = self._to_csv_row(EXPORT_FIELDS)
+        else:
+            self.header = ""
+
+        # Writer for the export of the batch in progress, if any
+        self._batch_writer: ResultsWriter | None = None
+
+    ###########################################################################
+    ###                 InvoiceExporter -> format_invoice()                 ###
+    ###########################################################################
+    def format_invoice(self, invoice: Invoice) -> str:
+        """
+        Formats an invoice as a single record of the export
+
+        Args:
+            invoice (Invoice): The processed invoice
+
+        Returns:
+            str: The invoice as one CSV row or one JSON line, ending in a newline
+        """
+
+        values = {name: str(getattr(invoice, name)) for name in EXPORT_FIELDS}
+
+        if self.export_format == EXPORT_FORMAT_CSV:
+            return self._to_csv_row(values.values())
+
+        values["line_items"] = [
+            self._line_item_to_json(line_item) for line_item in invoice.line_items
+        ]
+        return json.dumps(values) + "\n"
+
+    ###########################################################################
+    ###                     InvoiceExporter -> export()                     ###
+    ###########################################################################
+    def export(self, invoice: Invoice, append: bool):
+        """
+        Writes an invoice to the export. During a batch, the invoice is written to the
+        batch's export, which reaches the export file when the batch ends
+
+        Args:
+            invoice (Invoice): The processed invoice
+            append (bool): Whether to append the invoice to the export or replace it
+
+        Raises:
+            OSError: If the export cannot be written
+        """
+
+        record = self.format_invoice(invoice)
+
+        if self._batch_writer is not None:
+            self._batch_writer.write(contents=record, append=append, header=self.header)
+            return
+
+        # Ensure the log directory exists, then write the invoice, starting a new
+        # export with its header
+        self.export_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file=self.export_path, mode="a" if append else "w") as f:
+            if f.tell() == 0:
+                f.write(self.header)
+            f.write(record)
+
+    ###########################################################################
+    ###                  InvoiceExporter -> begin_batch()                   ###
+    ###########################################################################
+    def begin_batch(self):
+        """
+        Starts exporting a batch. Until end_batch() is called, invoices are streamed
+        into a temporary file through one buffered handle
+        """
+
+        self.discard_batch()
+        self._batch_writer = ResultsWriter(results_path=self.export_path)
+
+    ###########################################################################
+    ###                   InvoiceExporter -> end_batch()                    ###
+    ###########################################################################
+    def end_batch(self):
+        """
+        Finishes exporting a batch, replacing the export file with the batch's export
+        in a single rename. Does nothing if no batch was started
+
+        Raises:
+            OSError: If the batch's export cannot be moved into place, in which case
+                it is dropped and the export file is left as it was
+        """
+
+        batch_writer, self._batch_writer = self._batch_writer, None
+        if batch_writer is None:
+            return
+
+        try:
+            batch_writer.commit()
+
+        except OSError:
+            batch_writer.discard()
+            raise
+
+    ###########################################################################
+    ###                 InvoiceExporter -> discard_batch()                  ###
+    ###########################################################################
+    def discard_batch(self):
+        """
+        Drops the batch's export, leaving the export file as it was before the batch.
+        Invoices exported afterwards are written to the export file directly
+        """
+
+        batch_writer, self._batch_writer = self._batch_writer, None
+        if batch_writer is not None:
+            batch_writer.discard()
+
+    ###########################################################################
+    ###                  InvoiceExporter -> _to_csv_row()                   ###
+    ###########################################################################
+    def _to_csv_row(self, values) -> str:
+        """
+        Formats values as a CSV row, quoting any that contain commas or quotes
+
+        Args:
+            values (Iterable[str]): The values of the row
+
+        Returns:
+            str: The CSV row, ending in a newline
+        """
+
+        row = io.StringIO()
+        csv.writer(row, lineterminator="\n").writerow(values)
+        return row.getvalue()
+
+    ###########################################################################
+    ###               InvoiceExporter -> _line_item_to_json()               ###
+    ###########################################################################
+    def _line_item_to_json(self, line_item: LineItem) -> dict:
+        """
+        Converts a line item to JSON-compatible values
+
+        Args:
+            line_item (LineItem): The line item
+
+        Returns:
+            dict: The line item's fields keyed by name, with its amount as a string
+        """
+
+        values = line_item._asdict()
+        values["amount"] = str(line_item.amount)
+        return values
@@ -0,0 +1,174 @@
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+from source.constants import INVOICES_PATH, WATCH_SETTLE_SECONDS
+
+
+# InvoiceFolderWatcher class to notice invoice PDFs as they land in the Invoices/ folder, so they can be
+# processed without the user rescanning the whole folder. Each poll() lists the folder once and compares
+# each PDF's size and modification time with what was last seen, which costs the same on every platform
+# and needs no OS-specific notification API.
+#
+# A new or changed PDF is only reported once it has gone unchanged for settle_seconds, so a PDF still
+# being downloaded or copied in is reported once, whole, rather than half-written. Hidden files, such as
+# the ".part" files invoices are imported through, are never reported.
+class InvoiceFolderWatcher:
+
+    ###########################################################################
+    ###                  InvoiceFolderWatcher -> __init__()                 ###
+    ###########################################################################
+    def __init__(
+        self,
+        folder: Path = INVOICES_PATH,
+        settle_seconds: float = WATCH_SETTLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the InvoiceFolderWatcher object. The first poll() records the
+        invoices already in the folder, which are not reported
+
+        Args:
+            folder (Path): The folder to watch
+            settle_seconds (float): Seconds a new or changed invoice must go
+                unchanged before it is reported
+            clock (Callable[[], float]): Returns the current time in seconds
+        """
+
+        self.folder = folder
+        self.settle_seconds = settle_seconds
+        self.clock = clock
+
+        # Size and modification time of each invoice as last reported, or as found by the
+        # first poll, keyed by file name
+        self._reported: dict[str, tuple[int, int]] = {}
+
+        # Size and modification time of each new or changed invoice not yet reported, and
+        # the time it was first seen that way, keyed by file name
+        self._settling: dict[str, tuple[tuple[int, int], float]] = {}
+
+        # Whether the invoices already in the folder have been recorded
+        self._primed = False
+
+    ###########################################################################
+    ###                   InvoiceFolderWatcher -> reset()                   ###
+    ###########################################################################
+    def reset(self):
+        """
+        Forgets everything seen so far, so the next poll() records the invoices then
+        in the folder without reporting them
+        """
+
+        self._reported = {}
+        self._settling = {}
+        self._primed = False
+
+    ###########################################################################
+    ###                    InvoiceFolderWatcher -> poll()                   ###
+    ###########################################################################
+    def poll(self) -> list[Path]:
+        """
+        Checks the folder for invoices that are new or have changed since they were
+        last reported, and have since gone unchanged for settle_seconds
+
+        Returns:
+            list[Path]: The invoices ready to be processed, in filename order
+
+        Raises:
+            OSError: If the folder cannot be listed
+        """
+
+        now = self.clock()
+        signatures = self._scan()
+
+        if not self._primed:
+            self._reported = signatures
+            self._primed = True
+            return []
+
+        ready = []
+        for name, signature in signatures.items():
+            if self._reported.get(name) == signature:
+                self._settling.pop(name, None)
+                continue
+
+            # Start timing the invoice again each time it is seen to change
+            settling = self._settling.get(name)
+            if settling is None or settling[0] != signature:
+                self._settling[name] = (signature, now)
+                continue
+
+            if now - settling[1] >= self.settle_seconds:
+                ready.append(name)
+                self._reported[name] = signature
+                del self._settling[name]
+
+        # Forget invoices that have been removed, so one put back is reported again
+        for seen in (self._reported, self._settling):
+            for name in seen.keys() - signatures.keys():
+                del seen[name]
+
+        # Sort by name, as "Process All Invoices" does, so results are output in the same order
+        ready.sort(key=lambda name: (name.casefold(), name))
+        return [self.folder / name for name in ready]
+
+    ###########################################################################
+    ###               InvoiceFolderWatcher -> list_invoices()               ###
+    ###########################################################################
+    def list_invoices(self) -> list[Path]:
+        """
+        Lists every invoice PDF in the folder, whether or not it has been reported.
+        Hidden files are left out, as poll() leaves them out. Safe to call from any
+        thread, as nothing seen by poll() is read or changed
+
+        Returns:
+            list[Path]: The visible PDFs in the folder, in filename order
+
+        Raises:
+            OSError: If the folder cannot be listed
+        """
+
+        names = sorted(self._scan(), key=lambda name: (name.casefold(), name))
+        return [self.folder / name for name in names]
+
+    ###########################################################################
+    ###                   InvoiceFolderWatcher -> _scan()                   ###
+    ###########################################################################
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """
+        Lists the invoice PDFs in the folder
+
+        Returns:
+            dict[str, tuple[int, int]]: The size and modification time (in ns) of
+                each visible PDF, keyed by file name. A folder that does not exist
+                yet holds no invoices
+
+        Raises:
+            OSError: If the folder cannot be listed
+        """
+
+        signatures = {}
+
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") or not entry.name.lower().endswith(
+                        ".pdf"
+                    ):
+                        continue
+
+                    # A file removed between listing and checking it is simply not there
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+
+                    signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+
+        except FileNotFoundError:
+            return {}
+
+        return signatures
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import shutil
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+from source.constants import IMPORT_MAX_WORKERS, INVOICES_PATH
+
+
+# ImportOutcome class to describe what happened to one invoice PDF the InvoiceImporter was given
+class ImportOutcome(NamedTuple):
+
+    # fmt:off
+    source_path: Path       # The invoice PDF that was to be copied in
+    status: str             # "copied", "identical", "exists", "duplicate" or "error"
+    error: str = ""         # Why the copy failed, when status is "error"
+    # fmt:on
+
+
+# InvoiceImporter class to copy invoice PDFs into the Invoices/ folder several at a time. Copies run on
+# a thread pool, so importing hundreds of PDFs from a network share is bound by the share rather than by
+# copying one file after another, and each outcome is yielded as soon as its file is done.
+#
+# A PDF whose name is already in Invoices/ is compared with the file there first: if the two are the
+# same size and have the same content hash it is skipped as "identical", without asking anyone. Only a
+# same-named file with different contents is left for the caller to decide on, as "exists".
+#
+# Each PDF is copied to a hidden ".part" file first and renamed into place, so a copy that fails partway
+# (e.g. the share drops) never leaves a truncated invoice behind to be processed.
+class InvoiceImporter:
+
+    ###########################################################################
+    ###                    InvoiceImporter -> __init__()                    ###
+    ###########################################################################
+    def __init__(
+        self,
+        invoices_dir: Path = INVOICES_PATH,
+        max_workers: int = IMPORT_MAX_WORKERS,
+    ):
+        """
+        Initializes the InvoiceImporter object
+
+        Args:
+            invoices_dir (Path): The folder invoices are copied into
+            max_workers (int): The most invoices copied at once
+        """
+
+        self.invoices_dir = invoices_dir
+        self.max_workers = max_workers
+
+    ###########################################################################
+    ###                  InvoiceImporter -> import_files()                  ###
+    ###########################################################################
+    def import_files(
+        self, source_paths: Iterable[Path], overwrite: bool = False
+    ) -> Iterator[ImportOutcome]:
+        """
+        Copies invoice PDFs into the Invoices/ folder, yielding the outcome of each
+        in the order they finish. Closing the iterator early cancels the copies not
+        yet started and waits for those in progress
+
+        Args:
+            source_paths (Iterable[Path]): The invoice PDFs to copy in. Only the
+                first of several PDFs with the same name is copied; the rest are
+                reported as "duplicate"
+            overwrite (bool): Whether to replace a same-named file in Invoices/ whose
+                contents differ. Defaults to False, in which case it is left
+                untouched and reported as "exists"
+
+        Yields:
+            ImportOutcome: The outcome of each PDF
+
+        Raises:
+            OSError: If the Invoices/ folder cannot be created
+        """
+
+        # Two PDFs of the same name would land on the same file, so only the first is copied
+        to_copy: dict[str, Path] = {}
+        for source_path in source_paths:
+            if source_path.name in to_copy:
+                yield ImportOutcome(source_path=source_path, status="duplicate")
+            else:
+                to_copy[source_path.name] = source_path
+
+        if not to_copy:
+            return
+
+        self.invoices_dir.mkdir(parents=True, exist_ok=True)
+
+        pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="InvoiceImporter"
+        )
+        try:
+            futures = [
+                pool.submit(self._import_file, source_path, overwrite)
+                for source_path in to_copy.values()
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    ###########################################################################
+    ###                  InvoiceImporter -> _import_file()                  ###
+    ###########################################################################
+    def _import_file(self, source_path: Path, overwrite: bool) -> ImportOutcome:
+        """
+        Copies one invoice PDF into the Invoices/ folder, unless the same file is
+        already there. Runs on a pool thread
+
+        Args:
+            source_path (Path): The invoice PDF to copy in
+            overwrite (bool): Whether to replace a same-named file whose contents differ
+
+        Returns:
+            ImportOutcome: The outcome of the copy. A failure is returned as "error"
+                rather than raised, so one unreadable PDF does not stop the rest
+        """
+
+        destination_path = self.invoices_dir / source_path.name
+        partial_path = destination_path.with_name(f".{destination_path.name}.part")
+
+        try:
+            if destination_path.exists():
+                if self._same_contents(source_path, destination_path):
+                    return ImportOutcome(source_path=source_path, status="identical")
+                if not overwrite:
+                    return ImportOutcome(source_path=source_path, status="exists")
+
+            # copy2 preserves metadata (timestamps) and works across platforms
+            try:
+                shutil.copy2(source_path, partial_path)
+                os.replace(partial_path, destination_path)
+            finally:
+                partial_path.unlink(missing_ok=True)
+
+            return ImportOutcome(source_path=source_path, status="copied")
+
+        except OSError as error:
+            return ImportOutcome(source_path=source_path, status="error", error=str(error))
+
+    ###########################################################################
+    ###                 InvoiceImporter -> _same_contents()                 ###
+    ###########################################################################
+    def _same_contents(self, first_path: Path, second_path: Path) -> bool:
+        """
+        Determines whether two files have the same contents. Files of different sizes
+        are told apart without reading either
+
+        Args:
+            first_path (Path): One file
+            second_path (Path): The other file
+
+        Returns:
+            bool: Whether the files are the same size and have the same SHA-256 hash
+
+        Raises:
+            OSError: If either file cannot be read
+        """
+
+        if first_path.stat().st_size != second_path.stat().st_size:
+            return False
+
+        return self._hash_file(first_path) == self._hash_file(second_path)
+
+    ###########################################################################
+    ###                   InvoiceImporter -> _hash_file()                   ###
+    ###########################################################################
+    def _hash_file(self, file_path: Path) -> str:
+        """
+        Computes the content hash of a file
+
+        Args:
+            file_path (Path): The file to hash
+
+        Returns:
+            str: The hex SHA-256 digest of the file's contents
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+
+        with open(file=file_path, mode="rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
@@ -0,0 +1,435 @@
+import dataclasses
+import hashlib
+import json
+import os
+import pypdf
+from decimal import Decimal
+from pathlib import Path
+
+from source.Invoice import Invoice, LineItem
+from source.constants import (
+    INVOICE_MANIFEST_COMPACT_RATIO,
+    INVOICE_MANIFEST_PATH,
+    VERSION,
+)
+
+# Lines the manifest log may hold regardless of how few entries it has, so a small manifest is not
+# compacted after nearly every batch
+_MIN_COMPACT_LINES = 64
+
+
+# InvoiceManifest class to remember the result of every invoice parsed, so a batch only has to re-parse
+# the invoices that are new or have changed since they were last processed. Each entry is keyed by the
+# invoice's path and records the size, modification time and content hash of the PDF it was parsed from,
+# along with a fingerprint of the configs and parser version it was parsed with. An entry is only reused
+# while all of those still match, so editing an invoice, a config file, or upgrading the app or pypdf
+# simply misses the manifest rather than returning a stale result.
+#
+# The manifest is kept as a log with one JSON line per saved entry, so saving after a batch only appends
+# the entries that batch changed. Reading it back replays the log, so the last line for an invoice wins.
+# Once the log is mostly superseded lines it is compacted, rewriting it with one line per entry and
+# dropping the entries of invoices that no longer exist.
+#
+# Like the page text cache, the manifest is purely an optimization: any failure to read or write it is
+# treated as a miss, since the worst outcome is re-parsing the invoice.
+class InvoiceManifest:
+
+    ###########################################################################
+    ###                   InvoiceManifest -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self,
+        manifest_path: Path = INVOICE_MANIFEST_PATH,
+        compact_ratio: int = INVOICE_MANIFEST_COMPACT_RATIO,
+    ):
+        """
+        Initializes the InvoiceManifest object. The manifest is not read from disk
+        until it is first used
+
+        Args:
+            manifest_path (Path): The JSON lines file the manifest is persisted to
+            compact_ratio (int): Lines the log may hold per entry before it is compacted
+        """
+
+        self.manifest_path = manifest_path
+        self.compact_ratio = compact_ratio
+
+        # Entries keyed by invoice path, loaded on first use
+        self._entries: dict[str, dict] | None = None
+
+        # (size, mtime_ns) of each invoice that missed, as it was when it was looked up, so
+        # record() can tell if the invoice changed while it was being parsed
+        self._looked_up: dict[str, tuple[int, int]] = {}
+
+        # Keys of the entries that have changed since they were last saved
+        self._changed: set[str] = set()
+
+        # Lines in the log on disk, and whether its last line was left unfinished
+        self._log_lines = 0
+        self._log_torn = False
+
+    ###########################################################################
+    ###                  InvoiceManifest -> fingerprint()                   ###
+    ###########################################################################
+    def fingerprint(
+        self,
+        labor_criteria: list,
+        labor_exclusions: list,
+        shipping_criteria: list,
+        sales_reps: dict,
+        payment_terms: list,
+    ) -> str:
+        """
+        Computes a fingerprint of everything besides the PDF itself that decides how an
+        invoice is parsed: the configs, the app version, and the pypdf version
+
+        Args:
+            labor_criteria (list): Criteria to determine if a payment line is a labor cost
+            labor_exclusions (list): Criteria to exclude a payment line from being a labor cost
+            shipping_criteria (list): Criteria to determine if a payment line is a shipping cost
+            sales_reps (dict): All possible sales rep codes and names
+            payment_terms (list): All possible payment terms
+
+        Returns:
+            str: A hex digest that changes whenever any of the inputs change
+        """
+
+        contents = json.dumps(
+            [
+                VERSION,
+                pypdf.__version__,
+                labor_criteria,
+                labor_exclusions,
+                shipping_criteria,
+                sales_reps,
+                payment_terms,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(contents.encode()).hexdigest()
+
+    ###########################################################################
+    ###                    InvoiceManifest -> lookup()                      ###
+    ###########################################################################
+    def lookup(
+        self, invoice_filepath: Path, fingerprint: str
+    ) -> tuple[Invoice, list[str]] | None:
+        """
+        Looks up the result of parsing invoice_filepath, if it has not changed since
+
+        The size and modification time are checked first, so an untouched invoice is
+        never read. If only the modification time differs (e.g. the invoice was copied
+        back into the folder), the content hash decides.
+
+        Args:
+            invoice_filepath (Path): The invoice PDF to look up
+            fingerprint (str): The fingerprint from fingerprint() for the current configs
+
+        Returns:
+            tuple[Invoice, list[str]] | None: The parsed invoice and the debug messages
+                produced while parsing it, or None if the invoice must be parsed
+        """
+
+        key = str(invoice_filepath)
+
+        try:
+            stat = invoice_filepath.stat()
+        except OSError:
+            return None
+
+        self._looked_up[key] = (stat.st_size, stat.st_mtime_ns)
+
+        entry = self._load().get(key)
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return None
+
+        if entry.get("size") != stat.st_size:
+            return None
+
+        if entry.get("mtime_ns") != stat.st_mtime_ns:
+            if entry.get("sha256") != self._hash_file(invoice_filepath):
+                return None
+
+            # Same contents, so remember the new modification time to skip the hash next time
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self._changed.add(key)
+
+        try:
+            invoice = self._invoice_from_json(entry["invoice"])
+            debug_messages = list(entry["debug_messages"])
+        except (KeyError, TypeError, ValueError, ArithmeticError):
+            return None
+
+        del self._looked_up[key]
+        return invoice, debug_messages
+
+    ###########################################################################
+    ###                    InvoiceManifest -> record()                      ###
+    ###########################################################################
+    def record(
+        self,
+        invoice_filepath: Path,
+        invoice: Invoice,
+        debug_messages: list[str],
+        fingerprint: str,
+    ):
+        """
+        Records the result of parsing invoice_filepath, which must have been passed to
+        lookup() first. Nothing is recorded if the invoice changed while it was being
+        parsed, since the result may not match its contents any more.
+
+        Args:
+            invoice_filepath (Path): The invoice PDF that was parsed
+            invoice (Invoice): The parsed invoice
+            debug_messages (list[str]): Debug messages produced while parsing it
+            fingerprint (str): The fingerprint from fingerprint() it was parsed with
+        """
+
+        key = str(invoice_filepath)
+        looked_up = self._looked_up.pop(key, None)
+
+        try:
+            stat = invoice_filepath.stat()
+            if looked_up != (stat.st_size, stat.st_mtime_ns):
+                return
+
+            sha256 = self._hash_file(invoice_filepath)
+
+        except OSError:
+            return
+
+        self._load()[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+            "fingerprint": fingerprint,
+            "invoice": self._invoice_to_json(invoice),
+            "debug_messages": list(debug_messages),
+        }
+        self._changed.add(key)
+
+    ###########################################################################
+    ###                     InvoiceManifest -> save()                       ###
+    ###########################################################################
+    def save(self):
+        """
+        Appends the entries that have changed since the last save to the manifest log,
+        or compacts the log instead once it is mostly superseded lines
+        """
+
+        if not self._changed:
+            return
+
+        entries = self._load()
+        log_lines = self._log_lines + len(self._changed)
+
+        # A torn last line would swallow the next line appended after it
+        if self._log_torn or log_lines > max(
+            self.compact_ratio * len(entries), _MIN_COMPACT_LINES
+        ):
+            self._compact()
+            return
+
+        lines = "".join(
+            self._entry_line(key=key, entry=entries[key])
+            for key in sorted(self._changed)
+        )
+
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(file=self.manifest_path, mode="a", encoding="utf-8") as f:
+                f.write(lines)
+
+        except OSError:
+            # The log may now end partway through a line, so rewrite it on the next save
+            self._log_torn = True
+            return
+
+        self._log_lines = log_lines
+        self._changed.clear()
+
+    ###########################################################################
+    ###                   InvoiceManifest -> _compact()                     ###
+    ###########################################################################
+    def _compact(self):
+        """
+        Rewrites the manifest log with one line per entry, dropping the entries of any
+        invoices that no longer exist
+        """
+
+        entries = {
+            key: entry for key, entry in self._load().items() if Path(key).exists()
+        }
+
+        temp_path = self.manifest_path.with_name(
+            f"{self.manifest_path.name}.{os.getpid()}.tmp"
+        )
+
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Write to a temporary file and rename it into place, so a crash mid-write
+            # never leaves a half-written manifest behind
+            with open(file=temp_path, mode="w", encoding="utf-8") as f:
+                for key, entry in entries.items():
+                    f.write(self._entry_line(key=key, entry=entry))
+
+            os.replace(temp_path, self.manifest_path)
+
+        except OSError:
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+
+        self._entries = entries
+        self._changed.clear()
+        self._log_lines = len(entries)
+        self._log_torn = False
+
+    ###########################################################################
+    ###                  InvoiceManifest -> _entry_line()                   ###
+    ###########################################################################
+    def _entry_line(self, key: str, entry: dict) -> str:
+        """
+        Formats an entry as a line of the manifest log
+
+        Args:
+            key (str): The invoice path the entry is keyed by
+            entry (dict): The entry
+
+        Returns:
+            str: The entry as a line of JSON, ending in a newline
+        """
+
+        return json.dumps({"key": key, "entry": entry}) + "\n"
+
+    ###########################################################################
+    ###                     InvoiceManifest -> _load()                      ###
+    ###########################################################################
+    def _load(self) -> dict[str, dict]:
+        """
+        Returns the manifest's entries, reading them from disk on first use by
+        replaying the log, where the last line for an invoice wins
+
+        Returns:
+            dict[str, dict]: The entries keyed by invoice path. Empty if the manifest
+                does not exist yet or could not be read
+        """
+
+        if self._entries is not None:
+            return self._entries
+
+        entries = {}
+        lines = []
+
+        try:
+            with open(file=self.manifest_path, mode="r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except (OSError, ValueError):
+            pass
+
+        # A line that cannot be read, e.g. one cut short by a crash, is skipped
+        for line in lines:
+            try:
+                line_values = json.loads(line)
+                key, entry = line_values["key"], line_values["entry"]
+            except (ValueError, KeyError, TypeError):
+                continue
+
+            if isinstance(key, str) and isinstance(entry, dict):
+                entries[key] = entry
+
+        self._entries = entries
+        self._log_lines = len(lines)
+        self._log_torn = bool(lines) and not lines[-1].endswith("\n")
+
+        return self._entries
+
+    ###########################################################################
+    ###                   InvoiceManifest -> _hash_file()                   ###
+    ###########################################################################
+    def _hash_file(self, file_path: Path) -> str:
+        """
+        Computes the content hash of a file
+
+        Args:
+            file_path (Path): The file to hash
+
+        Returns:
+            str: The hex SHA-256 digest of the file's contents
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+
+        with open(file=file_path, mode="rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    ###########################################################################
+    ###               InvoiceManifest -> _invoice_to_json()                 ###
+    ###########################################################################
+    def _invoice_to_json(self, invoice: Invoice) -> dict:
+        """
+        Converts a parsed invoice to JSON-compatible values. The page text is left
+        out, since it is already kept by the page text cache
+
+        Args:
+            invoice (Invoice): The parsed invoice
+
+        Returns:
+            dict: Each of the invoice's fields as a string, keyed by name, except its
+                line items, which are each stored as a list of their fields
+        """
+
+        values = {
+            field.name: str(getattr(invoice, field.name))
+            for field in dataclasses.fields(Invoice)
+            if field.name not in ("page_contents", "line_items")
+        }
+        values["line_items"] = [
+            [*line_item[:4], str(line_item.amount), *line_item[5:]]
+            for line_item in invoice.line_items
+        ]
+
+        return values
+
+    ###########################################################################
+    ###              InvoiceManifest -> _invoice_from_json()                ###
+    ###########################################################################
+    def _invoice_from_json(self, values: dict) -> Invoice:
+        """
+        Rebuilds a parsed invoice from the values produced by _invoice_to_json()
+
+        Args:
+            values (dict): The invoice's fields, as produced by _invoice_to_json()
+
+        Returns:
+            Invoice: The parsed invoice, with no page text
+
+        Raises:
+            KeyError: If any field is missing, e.g. from an entry recorded before the
+                field was added, so the invoice is parsed again to fill it in
+        """
+
+        invoice = Invoice()
+
+        for field in dataclasses.fields(Invoice):
+            if field.name == "page_contents":
+                continue
+
+            value = values[field.name]
+
+            if field.name == "line_items":
+                value = [
+                    LineItem(*line_item[:4], Decimal(line_item[4]), *line_item[5:])
+                    for line_item in value
+                ]
+            elif field.type is Decimal:
+                value = Decimal(value)
+
+            setattr(invoice, field.name, value)
+
+        return invoice
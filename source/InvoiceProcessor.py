@@ -1,15 +1,21 @@
 from decimal import Decimal
 
 from source.processor_utilities import (
-    search_text_by_re,
-    search_payment_line,
-    find_payment_terms,
-    find_sales_rep,
+    HeaderExtractor,
+    PaymentTableEnd,
+    PaymentTableRow,
+    scan_payment_table,
     format_currency,
 )
+from source.CriteriaMatcher import CriteriaMatcher
 from source.InvoiceAppFileIO import InvoiceAppFileIO
-from source.Invoice import Invoice
-from source.constants import DECIMAL_ZERO
+from source.Invoice import Invoice, LineItem
+from source.constants import (
+    DECIMAL_ZERO,
+    LINE_ITEM_LABOR,
+    LINE_ITEM_MATERIAL,
+    LINE_ITEM_SHIPPING,
+)
 
 
 # InvoiceProcessor class to handle all logic for text processing on invoices
@@ -24,6 +30,8 @@ class InvoiceProcessor:
         labor_criteria: list,
         labor_exclusions: list,
         shipping_criteria: list,
+        criteria_matcher: CriteriaMatcher | None = None,
+        header_extractor: HeaderExtractor | None = None,
     ):
         """
         Initializes the InvoiceProcessor object
@@ -33,6 +41,11 @@ class InvoiceProcessor:
             labor_criteria (list): Criteria to determine if a payment line is a labor cost
             labor_exclusions (list): Criteria to exclude a payment line from being a labor cost
             shipping_criteria (list): Criteria to determine if a payment line is a shipping cost
+            criteria_matcher (CriteriaMatcher | None): A matcher already built for these
+                criteria. Defaults to None, in which case one is built on first use
+            header_extractor (HeaderExtractor | None): A header extractor already built
+                for the configs invoices are parsed with. Defaults to None, in which
+                case one is built on first use
         """
 
         self.file_io_controller = file_io_controller
@@ -40,6 +53,78 @@ class InvoiceProcessor:
         self.labor_exclusions = labor_exclusions
         self.shipping_criteria = shipping_criteria
 
+        # Header extractor for the current sales reps and payment terms, built on first
+        # use if not given
+        self._header_extractor = header_extractor
+
+        # Matcher for the current cost criteria, built on first use if not given
+        self._criteria_matcher = criteria_matcher
+
+    ###########################################################################
+    ###           InvoiceProcessor -> rebuild_criteria_matcher()            ###
+    ###########################################################################
+    def rebuild_criteria_matcher(self):
+        """
+        Builds a new criteria matcher from the current cost criteria lists, and swaps
+        it in once it is complete. This must be called after the criteria lists are
+        re-parsed, so invoices are never classified with a partly built matcher.
+        """
+
+        self._criteria_matcher = CriteriaMatcher(
+            labor_criteria=self.labor_criteria,
+            labor_exclusions=self.labor_exclusions,
+            shipping_criteria=self.shipping_criteria,
+        )
+
+    ###########################################################################
+    ###             InvoiceProcessor -> get_criteria_matcher()              ###
+    ###########################################################################
+    def get_criteria_matcher(self) -> CriteriaMatcher:
+        """
+        Returns the criteria matcher for the cost criteria, building it on first use
+
+        Returns:
+            CriteriaMatcher: The criteria matcher for the cost criteria
+        """
+
+        if self._criteria_matcher is None:
+            self.rebuild_criteria_matcher()
+
+        return self._criteria_matcher
+
+    ###########################################################################
+    ###             InvoiceProcessor -> get_header_extractor()              ###
+    ###########################################################################
+    def get_header_extractor(
+        self, sales_reps: dict, payment_terms: list
+    ) -> HeaderExtractor:
+        """
+        Returns the header extractor for the given configs, building a new one only
+        when they are not the configs the current one was built from (i.e. after the
+        configs have been reloaded)
+
+        Args:
+            sales_reps (dict): All possible sales rep codes and names
+            payment_terms (list): All possible payment terms
+
+        Returns:
+            HeaderExtractor: The header extractor for sales_reps and payment_terms
+        """
+
+        extractor = self._header_extractor
+
+        if (
+            extractor is None
+            or extractor.sales_reps is not sales_reps
+            or extractor.payment_terms is not payment_terms
+        ):
+            extractor = HeaderExtractor(
+                payment_terms=payment_terms, sales_reps=sales_reps
+            )
+            self._header_extractor = extractor
+
+        return extractor
+
     ###########################################################################
     ###               InvoiceProcessor -> populate_invoice()                ###
     ###########################################################################
@@ -61,174 +146,105 @@ class InvoiceProcessor:
         # Get the first page of the invoice
         first_page = invoice.page_contents[0]
 
-        # Parse the first page to get the invoice attributes
-        invoice.order_number = search_text_by_re(
-            text=first_page, regex=r"S(\d{5})"
-        )
-        invoice.date = search_text_by_re(
-            text=first_page, regex=r"\d{2}/\d{2}/\d{4}"
-        )
+        # Parse the first page to get the invoice attributes, in a single scan
+        header = self.get_header_extractor(
+            sales_reps=sales_reps, payment_terms=payment_terms
+        ).extract(text=first_page)
 
-        # Customer name will also match "Customer: " to the string, so trim it off
-        invoice.customer_name = search_text_by_re(
-            text=first_page, regex=r"Customer: .+"
-        ).replace("Customer: ", "")
-
-        # PO Number will also match "PO Number: " to the string, so trim it off
-        # It will also match other strings, so need to take the last element only
-        invoice.po_number = (
-            search_text_by_re(text=first_page, regex=r"PO Number: .+S")[:-1]
-        ).replace("PO Number: ", "")
-        invoice.payment_terms = find_payment_terms(
-            text=first_page, payment_terms=payment_terms
-        )
-        invoice.sales_rep = find_sales_rep(
-            text=first_page, sales_reps=sales_reps
-        )
+        invoice.order_number = header.order_number
+        invoice.date = header.date
+        invoice.customer_name = header.customer_name
+        invoice.po_number = header.po_number
+        invoice.payment_terms = header.payment_terms
+        invoice.sales_rep = header.sales_rep
 
     ###########################################################################
     ###             InvoiceProcessor -> process_payment_line()              ###
     ###########################################################################
-    def process_payment_line(
-        self, text: str, line: str, invoice: Invoice, curr_line_num: int
-    ):
+    def process_payment_line(self, row: PaymentTableRow, invoice: Invoice):
         """
-        Takes a given line from the payment table and processes it.
-        This includes reading the entire row, determining if the payment line refers to a labor,
-        shipping, or material cost, and finding the cost. It then adds that cost to the invoice total
+        Takes a given row from the payment table and processes it.
+        This includes determining if the row refers to a labor, shipping, or material cost,
+        adding the cost found for it by scan_payment_table() to the invoice total, and
+        recording the row on the invoice as a line item
 
         Args:
-            text (str): The current page of the invoice
-            line (str): The line at which the payment line starts
+            row (PaymentTableRow): The row of the payment table to be processed
             invoice (Invoice): The invoice object to be modified
-            curr_line_num (int): The current payment line number being processed
         """
 
+        # The numbered line of the row determines what kind of cost it is
+        line = row.lines[0]
+
         # If this line contains a subtotal, do nothing
         if "subtotal" in line:
             return
 
-        # Only take the current payment line, remove everything before line,
-        # and everything right after the next payment line
-        text = text[(text.find(line)) :]
-        text = text[: text.find(f"\n{curr_line_num+1} ")]
-
-        # If the cost is listed as a quantity or hourly rate, find the cost
-        ea_cost = self.find_ea_cost(payment_lines=text)
-        hr_cost = self.find_hr_cost(payment_lines=text)
-
-        # Figure out which cost to use, if neither was found, return
-        if ea_cost > DECIMAL_ZERO:
-            line_cost = ea_cost
-        elif hr_cost > DECIMAL_ZERO:
-            line_cost = hr_cost
-        else:
+        # If no cost was found for the row, there is nothing to add
+        if row.amount <= DECIMAL_ZERO:
             return
 
-        # Determine if the payment line is a labor, shipping, or material cost
-        is_labor_cost = self.search_for_labor_criteria(line=line)
-        is_shipping_cost = self.search_for_shipping_criteria(line=line)
+        line_cost = row.amount
+
+        # Determine if the payment line is a labor, shipping, or material cost, finding
+        # the criteria that decide it in a single pass over the line
+        match = self.get_criteria_matcher().match(line=line)
 
         # Case: Payment line contains a labor cost
-        if is_labor_cost:
+        if match.is_labor_cost:
             self.file_io_controller.print_to_debug_file(
-                contents=f"Adding LABOR COST of {line_cost} from line {curr_line_num}"
+                contents=f"Adding LABOR COST of {line_cost} from line {row.line_number}"
             )
             invoice.labor_cost += format_currency(value=line_cost)
             invoice.subtotal += format_currency(value=line_cost)
+            category, matched_criteria = LINE_ITEM_LABOR, match.labor_criteria
 
         # Case: Payment line contains a shipping cost
-        elif is_shipping_cost:
+        elif match.is_shipping_cost:
             self.file_io_controller.print_to_debug_file(
-                contents=f"Adding SHIPPING COST of {line_cost} from line {curr_line_num}"
+                contents=f"Adding SHIPPING COST of {line_cost} from line {row.line_number}"
             )
             invoice.shipping_cost += format_currency(value=line_cost)
             invoice.subtotal += format_currency(value=line_cost)
+            category, matched_criteria = LINE_ITEM_SHIPPING, match.shipping_criteria
 
         # Case: Payment line contains a material cost
         else:
             self.file_io_controller.print_to_debug_file(
-                contents=f"Adding MATERIAL COST of {line_cost} from line {curr_line_num}"
+                contents=f"Adding MATERIAL COST of {line_cost} from line {row.line_number}"
             )
             invoice.material_cost += format_currency(value=line_cost)
             invoice.subtotal += format_currency(value=line_cost)
-
-    ###########################################################################
-    ###                 InvoiceProcessor -> find_ea_cost()                  ###
-    ###########################################################################
-    def find_ea_cost(self, payment_lines: str) -> Decimal:
-        """
-        Searches the payment_lines for any listing of cost listed in quantity
-
-        Args:
-            payment_lines (str): The lines of text that make up the payment line
-
-        Returns:
-            Decimal: The cost if found, 0.0 otherwise
-        """
-
-        # Search the payment lines for any line that contains a cost listed in quantity
-        for line in payment_lines.splitlines():
-            cost = search_payment_line(line=line, regex=r"[0-9]+\s*ea(.*)")
-
-            # If a valid cost is found, return it, no reason to continue searching
-            if cost > DECIMAL_ZERO:
-                return format_currency(value=cost)
-
-        # If no cost was found, return 0.0
-        return DECIMAL_ZERO
-
-    ###########################################################################
-    ###                 InvoiceProcessor -> find_hr_cost()                  ###
-    ###########################################################################
-    def find_hr_cost(self, payment_lines: str) -> Decimal:
-        """
-        Searches the payment_lines for any listing of cost listed in hourly rate
-
-        Args:
-            payment_lines (str): The lines of text that make up the payment line
-
-        Returns:
-            Decimal: The cost if found, 0.0 otherwise
-        """
-
-        # Search the payment lines for any line that contains a cost listed in hourly rate
-        for line in payment_lines.splitlines():
-            cost = search_payment_line(line=line, regex=r"[0-9]+\s*hr(.*)")
-
-            # If a valid cost is found, return it, no reason to continue searching
-            if cost > DECIMAL_ZERO:
-                return format_currency(value=cost)
-
-        # If no cost was found, return None
-        return DECIMAL_ZERO
+            category, matched_criteria = LINE_ITEM_MATERIAL, None
+
+        invoice.line_items.append(
+            LineItem(
+                line_number=row.line_number,
+                description=row.description,
+                quantity=row.quantity,
+                unit=row.unit,
+                amount=format_currency(value=line_cost),
+                category=category,
+                matched_criteria=matched_criteria,
+            )
+        )
 
     ###########################################################################
     ###            InvoiceProcessor -> process_end_of_invoice()             ###
     ###########################################################################
-    def process_end_of_invoice(
-        self, text: str, starting_line: str, invoice: Invoice
-    ):
+    def process_end_of_invoice(self, lines: list[str], invoice: Invoice):
         """
         Takes the ending of the invoice starting at "Total:subtotal" and searches for
         the sales tax and the listed total on the invoice
 
         Args:
-            text (str): The invoice page to be processed
-            starting_line (str): The line at which the end of the invoice starts
+            lines (list[str]): The lines of the invoice from the "Total:Subtotal" line on
             invoice (Invoice): The invoice object to be modified
         """
 
-        # Only need to process from the start of the subtotal to the end
-        text = text[(text.find(starting_line)) :]
-
         # Find sales tax and listed total and place into invoice
-        invoice.sales_tax = Decimal(
-            text.splitlines()[2].replace("$", "").replace(",", "")
-        )
-        invoice.listed_total = Decimal(
-            text.splitlines()[3].replace("$", "").replace(",", "")
-        )
+        invoice.sales_tax = Decimal(lines[2].replace("$", "").replace(",", ""))
+        invoice.listed_total = Decimal(lines[3].replace("$", "").replace(",", ""))
 
         # Calculate the total of all processed listed costs
         invoice.total = format_currency(
@@ -250,20 +266,9 @@ class InvoiceProcessor:
             bool: True if a labor cost, False otherwise
         """
 
-        # Check if the line contains any of the labor criteria
-        for criteria in self.labor_criteria:
-            if criteria in line:
-
-                # If the line contains any of the labor exclusions, return False
-                for exclusion in self.labor_exclusions:
-                    if exclusion in line:
-                        return False
-
-                # If the line does not contain any of the exclusions, return True
-                return True
-
-        # If no labor criteria was found, return False
-        return False
+        # The line is a labor cost if it contains any of the labor criteria, and none
+        # of the labor exclusions
+        return self.get_criteria_matcher().match(line=line).is_labor_cost
 
     ###########################################################################
     ###         InvoiceProcessor -> search_for_shipping_criteria()          ###
@@ -280,12 +285,8 @@ class InvoiceProcessor:
             bool: True if a shipping cost, False otherwise
         """
 
-        # Check if the line contains any of the shipping criteria
-        for criteria in self.shipping_criteria:
-            if criteria in line:
-                return True
-
-        return False
+        # The line is a shipping cost if it contains any of the shipping criteria
+        return self.get_criteria_matcher().match(line=line).is_shipping_cost
 
     ###########################################################################
     ###                InvoiceProcessor -> process_invoice()                ###
@@ -298,33 +299,15 @@ class InvoiceProcessor:
             invoice (Invoice): The empty invoice object to be populated
         """
 
-        # Keep track of next expected payment line number
-        next_line_num = 1
-
-        # Loop through each page to read purchase table
-        for page in invoice.page_contents:
-
-            # At this point, can disregard everything before the purchase table
-            # Trim off everything before purchase table (before the line Ordered Total Price)
-            if len(page[(page.find("Ordered Total Price")) :]) > 1:
-                page = page[(page.find("Ordered Total Price")) :]
-
-            # Loop through each line in the table. Some table entries may have multiple lines that need
-            # to be processed
-            for line in page.splitlines():
-
-                # Check if at beginning of the line in the table. If so, process this payment item
-                if line.startswith(f"{next_line_num} "):
-                    self.process_payment_line(
-                        text=page,
-                        line=line,
-                        invoice=invoice,
-                        curr_line_num=next_line_num,
-                    )
-                    next_line_num += 1  # Update next_line_num
-
-                # "Total:Subtotal" is the beginning of the end of the invoice
-                if "Total:Subtotal" in line:
-                    self.process_end_of_invoice(
-                        text=page, starting_line=line, invoice=invoice
-                    )
+        # Walk the purchase table once, row by row. Pages are pulled one at a time, so with
+        # lazily extracted page contents only the pages up to the end of the invoice are
+        # ever extracted
+        for record in scan_payment_table(pages=invoice.page_contents):
+
+            # The end of the invoice holds its sales tax and listed total. Nothing after it
+            # contributes to the totals, and the table scan stops there
+            if isinstance(record, PaymentTableEnd):
+                self.process_end_of_invoice(lines=record.lines, invoice=invoice)
+                return
+
+            self.process_payment_line(row=record, invoice=invoice)
@@ -0,0 +1,513 @@
+import pypdf
+import sqlite3
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from source.constants import (
+    RESULTS_DB_PATH,
+    SEARCH_RESULTS_LIMIT,
+    SEARCH_SNIPPET_WORDS,
+)
+
+# Each page of every indexed invoice is a row of invoice_pages, whose text the invoice_text full-text
+# index reads by rowid. The triggers keep the full-text index in step with invoice_pages, so an invoice's
+# pages are removed through the index on invoice_path rather than by scanning the full-text index.
+# indexed_invoices records the size and modification time of each PDF as it was when it was indexed, so
+# a PDF is only read again once it changes.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS indexed_invoices (
+    invoice_path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS invoice_pages (
+    page_id INTEGER PRIMARY KEY,
+    invoice_path TEXT NOT NULL,
+    page_number INTEGER NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS invoice_pages_invoice_path ON invoice_pages (invoice_path);
+CREATE VIRTUAL TABLE IF NOT EXISTS invoice_text USING fts5 (
+    content, content = 'invoice_pages', content_rowid = 'page_id'
+);
+CREATE TRIGGER IF NOT EXISTS invoice_pages_insert AFTER INSERT ON invoice_pages BEGIN
+    INSERT INTO invoice_text (rowid, content) VALUES (new.page_id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS invoice_pages_delete AFTER DELETE ON invoice_pages BEGIN
+    INSERT INTO invoice_text (invoice_text, rowid, content)
+    VALUES ('delete', old.page_id, old.content);
+END;
+"""
+
+# Marks the matched words in a snippet
+SNIPPET_START = "["
+SNIPPET_END = "]"
+
+
+# SearchResult class to hold a single page of an invoice that matched a full-text search
+class SearchResult(NamedTuple):
+
+    # fmt:off
+    invoice_filepath: Path                                           # The invoice PDF the page is from
+    page_number: int                                                 # Number of the page in the PDF, starting from 1
+    snippet: str                                                     # Text around the match, with the matched words in [brackets]
+    # fmt:on
+
+
+# InvoiceSearchIndex class to search the text of every invoice PDF, using an SQLite FTS5 full-text
+# index kept in the results database. The index is updated incrementally: each PDF is read once, when
+# it first appears or after it changes, so a search never waits on re-extracting text that is already
+# indexed. The text itself is read through the File IO Controller, so a PDF the page text cache already
+# holds is not opened with pypdf even the first time it is indexed. An invoice that cannot be read, or
+# has a page that cannot be read, is not recorded as indexed, so it is read again on the next update.
+# An invoice whose text pypdf fails to extract for any other reason is skipped the same way and
+# reported, so one malformed PDF never stops the invoices after it from being indexed.
+#
+# update_in_background() indexes on a background thread with a connection of its own, so the GUI thread
+# only ever runs searches, which find whatever has been indexed so far. An update requested while one
+# is running is run again once it finishes.
+#
+# Like the results database, failures are reported through report_error rather than raised. Failures on
+# the background thread are reported on the next call from the caller's thread, since the reporter may
+# be a GUI popup.
+class InvoiceSearchIndex:
+
+    ###########################################################################
+    ###                 InvoiceSearchIndex -> __init__()                    ###
+    ###########################################################################
+    def __init__(
+        self,
+        db_path: Path = RESULTS_DB_PATH,
+        report_error: Callable[[str, str], None] = lambda *_: None,
+    ):
+        """
+        Initializes the InvoiceSearchIndex object. The index is not opened until it
+        is first used
+
+        Args:
+            db_path (Path): The SQLite database file the index is kept in
+            report_error (Callable[[str, str], None]): Callback used to surface an
+                index failure, taking an error title and message
+        """
+
+        self.db_path = db_path
+        self.report_error = report_error
+
+        # Connection to the database, once opened
+        self._connection: sqlite3.Connection | None = None
+
+        # Guards the background indexer's state below
+        self._lock = threading.Lock()
+        self._indexer: threading.Thread | None = None
+
+        # Whether another update was requested while the background indexer was running,
+        # and whether it should stop before its next invoice
+        self._update_requested = False
+        self._stop_indexing = threading.Event()
+
+        # First failure hit by the background indexer, not yet reported
+        self._error: Exception | None = None
+
+        # First invoice whose text could not be extracted, and why, not yet reported
+        self._invoice_error: tuple[Path, Exception] | None = None
+
+    ###########################################################################
+    ###                  InvoiceSearchIndex -> update()                     ###
+    ###########################################################################
+    def update(
+        self,
+        invoice_filepaths: list[Path],
+        read_pages: Callable[[Path], Sequence[str | None]],
+    ) -> int:
+        """
+        Brings the index up to date with the given invoice PDFs, indexing those that
+        are new or have changed and dropping any that no longer exist
+
+        Args:
+            invoice_filepaths (list[Path]): Every invoice PDF that should be searchable
+            read_pages (Callable[[Path], Sequence[str | None]]): Reads the text of each
+                page of an invoice PDF, where a page that could not be read is None.
+                Raises OSError or pypdf.errors.PdfReadError if the PDF cannot be read
+
+        Returns:
+            int: The number of invoice PDFs that were (re)indexed
+        """
+
+        try:
+            return self._update(
+                connection=self._connect(),
+                invoice_filepaths=invoice_filepaths,
+                read_pages=read_pages,
+            )
+
+        except (sqlite3.Error, OSError) as error:
+            self.report_error(
+                "Database Error",
+                f"Could not update the invoice search index at {self.db_path}: {error}",
+            )
+            return 0
+
+        finally:
+            self._report_error()
+
+    ###########################################################################
+    ###            InvoiceSearchIndex -> update_in_background()             ###
+    ###########################################################################
+    def update_in_background(
+        self,
+        list_invoices: Callable[[], list[Path]],
+        read_pages: Callable[[Path], Sequence[str | None]],
+    ):
+        """
+        Brings the index up to date on a background thread, as update() does. If an
+        update is already running, it is run again once it finishes, so invoices
+        that appeared in the meantime are indexed too
+
+        Args:
+            list_invoices (Callable[[], list[Path]]): Lists every invoice PDF that
+                should be searchable. Called on the background thread
+            read_pages (Callable[[Path], Sequence[str | None]]): Reads the text of each
+                page of an invoice PDF, as for update(). Called on the background thread
+        """
+
+        self._report_error()
+
+        with self._lock:
+            if self._indexer is not None:
+                self._update_requested = True
+                return
+
+            self._indexer = threading.Thread(
+                target=self._index_until_up_to_date,
+                kwargs={"list_invoices": list_invoices, "read_pages": read_pages},
+                name="InvoiceSearchIndex",
+                daemon=True,
+            )
+            self._indexer.start()
+
+    ###########################################################################
+    ###                  InvoiceSearchIndex -> search()                     ###
+    ###########################################################################
+    def search(
+        self, query: str, limit: int = SEARCH_RESULTS_LIMIT
+    ) -> list[SearchResult]:
+        """
+        Finds the invoice pages containing every word of the query, where a word
+        also matches any longer word it begins. Each word is matched as written, so
+        part numbers such as "BRACKET-00012" need no quoting
+
+        Args:
+            query (str): The words to search for
+            limit (int): The most pages to return
+
+        Returns:
+            list[SearchResult]: The matching pages, best match first. Empty if nothing
+                matched or the index could not be read
+        """
+
+        # Quote each word, so punctuation in it is never read as FTS5 query syntax, and
+        # match it as a prefix
+        words = ['"' + word.replace('"', '""') + '"*' for word in query.split()]
+        if not words:
+            return []
+
+        self._report_error()
+
+        try:
+            rows = self._connect().execute(
+                "SELECT invoice_pages.invoice_path, invoice_pages.page_number, "
+                "snippet(invoice_text, 0, ?, ?, ?, ?) "
+                "FROM invoice_text JOIN invoice_pages "
+                "ON invoice_pages.page_id = invoice_text.rowid "
+                "WHERE invoice_text MATCH ? ORDER BY rank LIMIT ?",
+                (
+                    SNIPPET_START,
+                    SNIPPET_END,
+                    "...",
+                    SEARCH_SNIPPET_WORDS,
+                    " ".join(words),
+                    limit,
+                ),
+            ).fetchall()
+
+        except (sqlite3.Error, OSError) as error:
+            self.report_error(
+                "Database Error",
+                f"Could not search the invoice search index at {self.db_path}: {error}",
+            )
+            return []
+
+        return [
+            SearchResult(
+                invoice_filepath=Path(invoice_path),
+                page_number=page_number,
+                snippet=" ".join(snippet.split()),
+            )
+            for invoice_path, page_number, snippet in rows
+        ]
+
+    ###########################################################################
+    ###                   InvoiceSearchIndex -> close()                     ###
+    ###########################################################################
+    def close(self):
+        """
+        Closes the index, first stopping any background update before its next
+        invoice. Using it again reopens it
+        """
+
+        with self._lock:
+            indexer = self._indexer
+            self._update_requested = False
+            self._stop_indexing.set()
+
+        if indexer is not None:
+            indexer.join()
+        self._stop_indexing.clear()
+
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+
+    ###########################################################################
+    ###                  InvoiceSearchIndex -> _connect()                   ###
+    ###########################################################################
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns the connection to the database, opening it and creating the index
+        first if it is not already open
+
+        Returns:
+            sqlite3.Connection: The open connection
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+            OSError: If its directory cannot be created
+        """
+
+        if self._connection is None:
+            self._connection = self._open()
+
+        return self._connection
+
+    ###########################################################################
+    ###                   InvoiceSearchIndex -> _open()                     ###
+    ###########################################################################
+    def _open(self) -> sqlite3.Connection:
+        """
+        Opens a new connection to the database, creating the index first if needed.
+        A connection may only be used on the thread that opened it
+
+        Returns:
+            sqlite3.Connection: The open connection
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+            OSError: If its directory cannot be created
+        """
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+
+        try:
+            # Shares the results database, which runs in WAL mode
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(SCHEMA)
+
+        except sqlite3.Error:
+            connection.close()
+            raise
+
+        return connection
+
+    ###########################################################################
+    ###                  InvoiceSearchIndex -> _remove()                    ###
+    ###########################################################################
+    def _remove(self, connection: sqlite3.Connection, invoice_path: str):
+        """
+        Removes an invoice's text from the index
+
+        Args:
+            connection (sqlite3.Connection): The open connection, in a transaction
+            invoice_path (str): The path of the invoice PDF
+        """
+
+        connection.execute(
+            "DELETE FROM invoice_pages WHERE invoice_path = ?", (invoice_path,)
+        )
+        connection.execute(
+            "DELETE FROM indexed_invoices WHERE invoice_path = ?", (invoice_path,)
+        )
+
+    ###########################################################################
+    ###                   InvoiceSearchIndex -> _update()                   ###
+    ###########################################################################
+    def _update(
+        self,
+        connection: sqlite3.Connection,
+        invoice_filepaths: list[Path],
+        read_pages: Callable[[Path], Sequence[str | None]],
+    ) -> int:
+        """
+        Brings the index up to date with the given invoice PDFs through connection
+
+        Args:
+            connection (sqlite3.Connection): The open connection
+            invoice_filepaths (list[Path]): Every invoice PDF that should be searchable
+            read_pages (Callable[[Path], Sequence[str | None]]): Reads the text of each
+                page of an invoice PDF, as for update()
+
+        Returns:
+            int: The number of invoice PDFs that were (re)indexed
+
+        Raises:
+            sqlite3.Error: If the index cannot be read or written
+        """
+
+        indexed_count = 0
+        indexed = {
+            invoice_path: (size, mtime_ns)
+            for invoice_path, size, mtime_ns in connection.execute(
+                "SELECT invoice_path, size, mtime_ns FROM indexed_invoices"
+            )
+        }
+
+        # Drop the text of invoices that have been removed
+        current_paths = {str(filepath) for filepath in invoice_filepaths}
+        with connection:
+            for invoice_path in indexed.keys() - current_paths:
+                if not Path(invoice_path).exists():
+                    self._remove(connection=connection, invoice_path=invoice_path)
+
+        for invoice_filepath in invoice_filepaths:
+            if self._stop_indexing.is_set():
+                break
+
+            invoice_path = str(invoice_filepath)
+
+            try:
+                stat = invoice_filepath.stat()
+            except OSError:
+                continue
+
+            if indexed.get(invoice_path) == (stat.st_size, stat.st_mtime_ns):
+                continue
+
+            # An invoice that cannot be read is left as it was, to be read again next time
+            try:
+                pages = list(read_pages(invoice_filepath))
+            except (OSError, pypdf.errors.PdfReadError):
+                continue
+
+            # pypdf raises all sorts on a malformed PDF (e.g. TypeError for a bad /Font),
+            # which is reported rather than stopping the invoices after it being indexed
+            except Exception as error:
+                if self._invoice_error is None:
+                    self._invoice_error = (invoice_filepath, error)
+                continue
+
+            # Each invoice is indexed in its own transaction, so the invoices indexed so
+            # far are kept even if a later one fails
+            with connection:
+                self._remove(connection=connection, invoice_path=invoice_path)
+                connection.executemany(
+                    "INSERT INTO invoice_pages (invoice_path, page_number, content) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (invoice_path, page_number, page)
+                        for page_number, page in enumerate(pages, start=1)
+                        if page
+                    ],
+                )
+
+                # The pages that were read are searchable, but a page that could not be
+                # read leaves the invoice to be read again next time
+                if None not in pages:
+                    connection.execute(
+                        "INSERT INTO indexed_invoices (invoice_path, size, mtime_ns) "
+                        "VALUES (?, ?, ?)",
+                        (invoice_path, stat.st_size, stat.st_mtime_ns),
+                    )
+
+            if None not in pages:
+                indexed_count += 1
+
+        return indexed_count
+
+    ###########################################################################
+    ###           InvoiceSearchIndex -> _index_until_up_to_date()           ###
+    ###########################################################################
+    def _index_until_up_to_date(
+        self,
+        list_invoices: Callable[[], list[Path]],
+        read_pages: Callable[[Path], Sequence[str | None]],
+    ):
+        """
+        Updates the index through a connection of its own, again for as long as more
+        updates are requested while it runs. Runs on the background thread
+
+        Args:
+            list_invoices (Callable[[], list[Path]]): Lists every invoice PDF that
+                should be searchable
+            read_pages (Callable[[Path], Sequence[str | None]]): Reads the text of each
+                page of an invoice PDF
+        """
+
+        try:
+            while True:
+                try:
+                    connection = self._open()
+                    try:
+                        self._update(
+                            connection=connection,
+                            invoice_filepaths=list_invoices(),
+                            read_pages=read_pages,
+                        )
+                    finally:
+                        connection.close()
+
+                except (sqlite3.Error, OSError) as error:
+                    if self._error is None:
+                        self._error = error
+
+                with self._lock:
+                    if not self._update_requested or self._stop_indexing.is_set():
+                        self._indexer = None
+                        return
+
+                    self._update_requested = False
+
+        finally:
+            # Should anything else escape, a later update must still start a new indexer
+            with self._lock:
+                if self._indexer is threading.current_thread():
+                    self._indexer = None
+
+    ###########################################################################
+    ###                InvoiceSearchIndex -> _report_error()                ###
+    ###########################################################################
+    def _report_error(self):
+        """
+        Reports the failures recorded while indexing, if any, through report_error
+        """
+
+        invoice_error, self._invoice_error = self._invoice_error, None
+        if invoice_error is not None:
+            invoice_filepath, error = invoice_error
+            self.report_error(
+                "File Error",
+                f"Could not index {invoice_filepath} for searching: {error}",
+            )
+
+        error, self._error = self._error, None
+
+        if error is not None:
+            self.report_error(
+                "Database Error",
+                f"Could not update the invoice search index at {self.db_path}: {error}",
+            )
@@ -0,0 +1,213 @@
+import pypdf
+from collections.abc import Sequence
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+
+# Marks a page whose text has not been extracted yet, since None marks a page that failed to extract
+_NOT_EXTRACTED = object()
+
+
+# LazyInvoicePages class to stand in for the list of page text of an invoice PDF. Rather than
+# extracting every page up front, each page's text is extracted the first time it is indexed or
+# iterated over and remembered from then on. populate_invoice() only ever needs the first page and
+# process_invoice() stops at the end of the invoice, so trailing terms or attachment pages of a long
+# invoice are never extracted at all.
+#
+# A page that cannot be extracted is reported through on_error and reads as None. The pages extracted
+# are handed to on_extract in one go, once the last page has been extracted or close() is called,
+# rather than after every page, so saving them costs one write however long the invoice is.
+class LazyInvoicePages(Sequence):
+
+    ###########################################################################
+    ###                  LazyInvoicePages -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self,
+        stream: Path | BinaryIO,
+        pages: list | None = None,
+        on_extract: Callable[[list], None] = lambda _: None,
+        on_error: Callable[[int, Exception], None] = lambda *_: None,
+    ):
+        """
+        Initializes the LazyInvoicePages object. The PDF is opened immediately so an
+        unreadable file fails here, but no page text is extracted until it is needed
+
+        Args:
+            stream (Path | BinaryIO): The invoice PDF's file path, or its contents
+            pages (list | None): Text already known for each page, e.g. from the page text
+                cache, with None for pages still to be extracted. Defaults to None, in
+                which case every page is extracted on demand
+            on_extract (Callable[[list], None]): Called with the text of every page, None
+                for those not extracted yet, once newly extracted pages are to be saved:
+                when the last page is extracted, or on close(). Defaults to a no-op
+            on_error (Callable[[int, Exception], None]): Called with the page index and the
+                error when a page cannot be extracted. Defaults to a no-op
+
+        Raises:
+            OSError: If the PDF cannot be opened
+            pypdf.errors.PdfReadError: If the PDF cannot be parsed
+        """
+
+        self._reader = pypdf.PdfReader(stream=stream)
+        self.on_extract = on_extract
+        self.on_error = on_error
+
+        # Whether pages have been extracted since on_extract was last called
+        self._unsaved = False
+
+        if pages is None:
+            self._pages = [_NOT_EXTRACTED] * len(self._reader.pages)
+        else:
+            self._pages = [_NOT_EXTRACTED if page is None else page for page in pages]
+
+    ###########################################################################
+    ###                   LazyInvoicePages -> __len__()                     ###
+    ###########################################################################
+    def __len__(self) -> int:
+        """
+        Returns the number of pages in the invoice, without extracting any of them
+
+        Returns:
+            int: The number of pages in the invoice PDF
+        """
+        return len(self._pages)
+
+    ###########################################################################
+    ###                 LazyInvoicePages -> __getitem__()                   ###
+    ###########################################################################
+    def __getitem__(self, index: int | slice) -> str | None | list:
+        """
+        Returns the text of the page at index, extracting it first if this is the first
+        time the page has been asked for
+
+        Args:
+            index (int | slice): The index of the page, or a slice of pages
+
+        Returns:
+            str | None | list: The text of the page, None if the page could not be
+                extracted, or a list of these for a slice
+
+        Raises:
+            IndexError: If index is out of range
+        """
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        page = self._pages[index]
+
+        if page is _NOT_EXTRACTED:
+            page = self._extract(index=index % len(self))
+
+        return page
+
+    ###########################################################################
+    ###                   LazyInvoicePages -> __iter__()                    ###
+    ###########################################################################
+    def __iter__(self):
+        """
+        Yields the text of each page in order, extracting each page only when the
+        iteration reaches it
+
+        Yields:
+            str | None: The text of each page, or None if it could not be extracted
+        """
+
+        for index in range(len(self)):
+            yield self[index]
+
+    ###########################################################################
+    ###                 LazyInvoicePages -> __getstate__()                  ###
+    ###########################################################################
+    def __getstate__(self) -> dict:
+        """
+        Returns the state to pickle when an invoice is sent back from a batch worker.
+        The open PDF and the callbacks belong to the worker and are left behind, so a
+        copy carries only the pages extracted so far and reads any others as None
+
+        Returns:
+            dict: The picklable state of the object
+        """
+        return {"_pages": self.extracted_pages()}
+
+    ###########################################################################
+    ###                 LazyInvoicePages -> __setstate__()                  ###
+    ###########################################################################
+    def __setstate__(self, state: dict):
+        """
+        Restores a copy pickled by __getstate__()
+
+        Args:
+            state (dict): The state returned by __getstate__()
+        """
+
+        self._reader = None
+        self.on_extract = lambda _: None
+        self.on_error = lambda *_: None
+        self._unsaved = False
+        self._pages = [
+            _NOT_EXTRACTED if page is None else page for page in state["_pages"]
+        ]
+
+    ###########################################################################
+    ###                    LazyInvoicePages -> close()                      ###
+    ###########################################################################
+    def close(self):
+        """
+        Hands the pages extracted so far to on_extract, if any were extracted since it
+        was last called. Pages can still be extracted afterwards, and are handed over
+        on the next close()
+        """
+
+        if not self._unsaved:
+            return
+
+        self._unsaved = False
+        self.on_extract(self.extracted_pages())
+
+    ###########################################################################
+    ###               LazyInvoicePages -> extracted_pages()                 ###
+    ###########################################################################
+    def extracted_pages(self) -> list:
+        """
+        Returns the text of every page extracted so far, without extracting any others
+
+        Returns:
+            list: The text of each page, or None for pages not (successfully) extracted
+        """
+        return [None if page is _NOT_EXTRACTED else page for page in self._pages]
+
+    ###########################################################################
+    ###                   LazyInvoicePages -> _extract()                    ###
+    ###########################################################################
+    def _extract(self, index: int) -> str | None:
+        """
+        Extracts and remembers the text of the page at index
+
+        Args:
+            index (int): The non-negative index of the page to extract
+
+        Returns:
+            str | None: The text of the page, or None if it could not be extracted
+        """
+
+        # A copy sent back from a worker has no PDF left to extract from
+        if self._reader is None:
+            return None
+
+        try:
+            page = self._reader.pages[index].extract_text()
+        except (OSError, pypdf.errors.PdfReadError) as error:
+            self.on_error(index, error)
+            page = None
+        else:
+            self._unsaved = True
+
+        self._pages[index] = page
+
+        # Once every page has been extracted there is nothing left to wait for
+        if _NOT_EXTRACTED not in self._pages:
+            self.close()
+
+        return page
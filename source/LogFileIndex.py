@@ -0,0 +1,235 @@
+import mmap
+import os
+from array import array
+from contextlib import contextmanager
+from itertools import accumulate, islice
+from pathlib import Path
+
+from source.constants import LOG_INDEX_CHUNK_BYTES
+
+
+# LogFileIndex class to read any range of lines of a log file without reading the rest of it. The file
+# is memory-mapped and scanned once for where each line ends, keeping just those offsets, so a viewer
+# can show lines 4,000,000 to 4,000,030 of a multi-hundred-MB log by reading only those 30 lines.
+#
+# refresh() indexes only what has been appended since the last call, which lets a viewer follow a log
+# while a batch is still writing it. It can also index a little at a time, so a viewer can show the
+# start of a huge log, and keep responding, while the rest is still being indexed.
+#
+# The file is only mapped while it is being read, never held open in between, so the results log can
+# still be replaced when a batch commits, including on Windows.
+class LogFileIndex:
+
+    ###########################################################################
+    ###                     LogFileIndex -> __init__()                      ###
+    ###########################################################################
+    def __init__(self, log_path: Path):
+        """
+        Initializes the LogFileIndex object. Nothing is read until refresh()
+
+        Args:
+            log_path (Path): The log file to index
+        """
+
+        self.log_path = log_path
+
+        # Offset just past the newline ending each complete line, in order
+        self._line_ends = array("Q")
+
+        # Offset just past the last complete line, and how far the file has been scanned.
+        # Once the whole file is scanned, anything between the two is a last line still
+        # being written
+        self._indexed_to = 0
+        self._size = 0
+
+        # Size of the file when last refreshed
+        self.file_size = 0
+
+        # Identity of the file indexed, to notice when it is replaced rather than appended to
+        self._file_id: tuple[int, int] | None = None
+
+    ###########################################################################
+    ###                    LogFileIndex -> line_count()                     ###
+    ###########################################################################
+    @property
+    def line_count(self) -> int:
+        """
+        int: The number of lines indexed, including a last line without a newline
+        """
+
+        return len(self._line_ends) + (self._size > self._indexed_to)
+
+    ###########################################################################
+    ###                  LogFileIndex -> fully_indexed()                    ###
+    ###########################################################################
+    @property
+    def fully_indexed(self) -> bool:
+        """
+        bool: Whether the whole log, as of the last refresh, has been indexed
+        """
+
+        return self._size == self.file_size
+
+    ###########################################################################
+    ###                      LogFileIndex -> refresh()                      ###
+    ###########################################################################
+    def refresh(self, max_bytes: int | None = None) -> bool:
+        """
+        Indexes whatever has been written to the log since the last refresh. If the
+        log has been replaced or truncated, it is indexed again from the start
+
+        Args:
+            max_bytes (int | None): The most bytes to index, after which the rest is
+                left for the next refresh. None indexes the whole log
+
+        Returns:
+            bool: Whether any lines were indexed or dropped, i.e. whether the log
+                changed since the last refresh
+
+        Raises:
+            OSError: If the log cannot be read
+        """
+
+        stat = self.log_path.stat()
+        file_id = (stat.st_dev, stat.st_ino)
+        self.file_size = stat.st_size
+
+        # A replaced or truncated log drops every line indexed so far
+        changed = False
+        if file_id != self._file_id or stat.st_size < self._size:
+            changed = self.line_count > 0
+            self._line_ends = array("Q")
+            self._indexed_to = 0
+            self._size = 0
+            self._file_id = file_id
+
+        if stat.st_size != self._size:
+            with self._mapped() as log_map:
+                self._index(log_map=log_map, max_bytes=max_bytes)
+            changed = True
+
+        return changed
+
+    ###########################################################################
+    ###                       LogFileIndex -> lines()                       ###
+    ###########################################################################
+    def lines(self, start: int, count: int) -> list[str]:
+        """
+        Reads a range of the lines indexed, without their newlines
+
+        Args:
+            start (int): The number of the first line, from 0
+            count (int): The most lines to read
+
+        Returns:
+            list[str]: Up to count lines, without any Windows line ending. Bytes that
+                are not valid UTF-8 are replaced
+
+        Raises:
+            OSError: If the log cannot be read
+        """
+
+        start = max(start, 0)
+        end = min(start + count, self.line_count)
+        if start >= end:
+            return []
+
+        if end <= len(self._line_ends):
+            last = self._line_ends[end - 1]
+        else:
+            last = self._size
+
+        with self._mapped() as log_map:
+            contents = log_map[self._line_start(start) : last]
+
+        return [
+            line.decode("utf-8", errors="replace").removesuffix("\r")
+            for line in contents.split(b"\n")[: end - start]
+        ]
+
+    ###########################################################################
+    ###                      LogFileIndex -> _index()                       ###
+    ###########################################################################
+    def _index(self, log_map: mmap.mmap, max_bytes: int | None):
+        """
+        Records where each complete line ends, from the end of the last complete line
+        indexed to the end of the mapped log
+
+        Args:
+            log_map (mmap.mmap): The log, mapped
+            max_bytes (int | None): The most bytes to index, or None for no limit
+        """
+
+        position = self._indexed_to
+        size = len(log_map)
+        self.file_size = size
+
+        stop = size if max_bytes is None else min(size, position + max_bytes)
+
+        while position < stop:
+            chunk = log_map[position : min(position + LOG_INDEX_CHUNK_BYTES, stop)]
+            last_newline = chunk.rfind(b"\n")
+
+            # A line longer than a chunk: find where it ends, if it has ended yet. If it
+            # has not, it is the last line, still being written, and the log is scanned
+            if last_newline == -1:
+                newline = log_map.find(b"\n", position + len(chunk))
+                if newline == -1:
+                    stop = size
+                    break
+                position = newline + 1
+                self._line_ends.append(position)
+                continue
+
+            # Every line in the chunk ends its own length (plus newline) after the last
+            lengths = (len(line) + 1 for line in chunk[:last_newline].split(b"\n"))
+            line_ends = accumulate(lengths, initial=position)
+            self._line_ends.extend(islice(line_ends, 1, None))
+            position += last_newline + 1
+
+        # A log scanned only partway has no last line still being written yet
+        self._indexed_to = position
+        self._size = size if stop == size else position
+
+    ###########################################################################
+    ###                    LogFileIndex -> _line_start()                    ###
+    ###########################################################################
+    def _line_start(self, line_number: int) -> int:
+        """
+        Returns the offset a line starts at
+
+        Args:
+            line_number (int): The number of the line, from 0
+
+        Returns:
+            int: The offset of the line's first byte
+        """
+
+        return self._line_ends[line_number - 1] if line_number else 0
+
+    ###########################################################################
+    ###                      LogFileIndex -> _mapped()                      ###
+    ###########################################################################
+    @contextmanager
+    def _mapped(self):
+        """
+        Maps the log read-only for the duration of a with block
+
+        Yields:
+            mmap.mmap | bytes: The log, mapped. An empty log, which cannot be mapped,
+                is empty bytes
+
+        Raises:
+            OSError: If the log cannot be read
+        """
+
+        with open(self.log_path, mode="rb") as log_file:
+            if os.fstat(log_file.fileno()).st_size == 0:
+                yield b""
+                return
+
+            log_map = mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield log_map
+            finally:
+                log_map.close()
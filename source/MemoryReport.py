@@ -0,0 +1,313 @@
+import ctypes
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from source.constants import MEMORY_REPORT_TOP_SITES, MEMORY_RSS_SAMPLE_INTERVAL_S
+
+# Allocations made while tracing that are left out of the allocation sites, as they are the cost of
+# tracing, importing or this report rather than of processing the batch
+_IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def memory_report_requested(argv: list[str]) -> bool:
+    """
+    Finds whether the application was started with --memory-report. Any other
+    arguments are left for the ArgumentProvider
+
+    Args:
+        argv (list[str]): The command line arguments, without the program name
+
+    Returns:
+        bool: True if each batch's memory should be reported
+    """
+
+    return "--memory-report" in argv
+
+
+def current_rss() -> int | None:
+    """
+    Reads how much of this process's memory is resident, i.e. its working set on
+    Windows. Read from the operating system, as psutil is not a dependency
+
+    Returns:
+        int | None: The resident memory in bytes, or None where it cannot be read
+    """
+
+    if sys.platform == "win32":
+        from ctypes import wintypes
+
+        # PROCESS_MEMORY_COUNTERS, as filled in by GetProcessMemoryInfo()
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters(cb=ctypes.sizeof(ProcessMemoryCounters))
+        get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_current_process.restype = wintypes.HANDLE
+        get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_process_memory_info.argtypes = [
+            wintypes.HANDLE,
+            ctypes.POINTER(ProcessMemoryCounters),
+            wintypes.DWORD,
+        ]
+
+        if not get_process_memory_info(
+            get_current_process(), ctypes.byref(counters), counters.cb
+        ):
+            return None
+        return counters.WorkingSetSize
+
+    # Elsewhere, the second field of statm is the resident memory in pages (Linux only)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# MemoryReport class to account for the memory a batch of invoices used, so a batch that balloons can
+# be pinned on a component. While a batch runs, every allocation Python makes in this process is
+# traced with tracemalloc, and a background thread samples the process's resident memory, which also
+# covers what Python does not allocate itself (e.g. the text held by the Tk widgets). Worker processes
+# are not seen, so a batch being reported on should be parsed in-process.
+#
+# record_invoice() is called as each invoice is output, noting how much more memory is traced than
+# after the invoice before it, i.e. how much each invoice leaves behind. stop() writes the report:
+# peak traced memory, the allocation sites still holding the most memory by file and by line, the
+# memory kept per invoice and the resident memory over time.
+class MemoryReport:
+
+    ###########################################################################
+    ###                      MemoryReport -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self,
+        enabled: bool = False,
+        top_sites: int = MEMORY_REPORT_TOP_SITES,
+        sample_interval: float = MEMORY_RSS_SAMPLE_INTERVAL_S,
+    ):
+        """
+        Initializes the MemoryReport object
+
+        Args:
+            enabled (bool): Whether batches are reported on. Defaults to False
+            top_sites (int): How many allocation sites to list by file and by line
+            sample_interval (float): Seconds between samples of the resident memory
+        """
+
+        self.enabled = enabled
+        self.top_sites = top_sites
+        self.sample_interval = sample_interval
+
+        # Whether tracing was started here, rather than e.g. with python -X tracemalloc
+        self._started_tracing = False
+
+        # When the batch started, and the traced memory then and after the last invoice
+        self._start_time = 0.0
+        self._start_traced = 0
+        self._last_traced = 0
+
+        # The memory each invoice left behind, and the traced memory after it, in bytes
+        self.invoice_deltas: list[tuple[str, int, int]] = []
+
+        # The resident memory, in bytes, sampled every sample_interval seconds into the batch
+        self.rss_samples: list[tuple[float, int]] = []
+        self._sampler: threading.Thread | None = None
+        self._stop_sampling = threading.Event()
+
+    ###########################################################################
+    ###                       MemoryReport -> start()                       ###
+    ###########################################################################
+    def start(self):
+        """
+        Starts tracing the memory of a batch, forgetting any batch reported on before.
+        Does nothing if batches are not reported on
+        """
+
+        if not self.enabled:
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+
+        self._start_time = time.monotonic()
+        self._start_traced = self._last_traced = tracemalloc.get_traced_memory()[0]
+        self.invoice_deltas = []
+        self.rss_samples = []
+
+        if self._sampler is None:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_until_stopped, name="MemoryReport", daemon=True
+            )
+            self._sampler.start()
+
+    ###########################################################################
+    ###                   MemoryReport -> record_invoice()                  ###
+    ###########################################################################
+    def record_invoice(self, invoice_filepath: Path):
+        """
+        Notes how much memory an invoice left behind, once it has been output. Does
+        nothing if batches are not reported on
+
+        Args:
+            invoice_filepath (Path): The invoice that was output
+        """
+
+        if not self.enabled or not tracemalloc.is_tracing():
+            return
+
+        traced = tracemalloc.get_traced_memory()[0]
+        self.invoice_deltas.append(
+            (Path(invoice_filepath).name, traced - self._last_traced, traced)
+        )
+        self._last_traced = traced
+
+    ###########################################################################
+    ###                        MemoryReport -> stop()                       ###
+    ###########################################################################
+    def stop(self, report_path: Path) -> Path | None:
+        """
+        Stops tracing the batch and writes its report, replacing the last one
+
+        Args:
+            report_path (Path): The file to write the report to
+
+        Returns:
+            Path | None: The report written, or None if batches are not reported on
+
+        Raises:
+            OSError: If the report cannot be written
+        """
+
+        if not self.enabled or not tracemalloc.is_tracing():
+            return None
+
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+        self._sample_rss()
+
+        traced, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES)
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        growth = self._format_bytes(traced - self._start_traced, signed=True)
+        lines = [
+            f"Memory report for a batch of {len(self.invoice_deltas)} invoice(s), "
+            f"written {datetime.now():%Y-%m-%d %H:%M:%S}",
+            "",
+            f"Peak traced memory:     {self._format_bytes(peak)}",
+            f"Traced memory at end:   {self._format_bytes(traced)} "
+            f"({growth} over the batch)",
+        ]
+        if self.rss_samples:
+            peak_rss = max(rss for _elapsed, rss in self.rss_samples)
+            lines.append(f"Peak RSS sampled:       {self._format_bytes(peak_rss)}")
+
+        # Grouping by file points at a component, and by line at the allocation within it
+        for key_type in ("filename", "lineno"):
+            title = "file" if key_type == "filename" else "line"
+            lines += ["", f"Top allocation sites by {title}, still allocated at the end:"]
+            for stat in snapshot.statistics(key_type)[: self.top_sites]:
+                frame = stat.traceback[0]
+                site = frame.filename
+                if key_type == "lineno":
+                    site += f":{frame.lineno}"
+                lines.append(
+                    f"  {self._format_bytes(stat.size):>12}  "
+                    f"{stat.count:>10,} blocks  {site}"
+                )
+
+        lines += ["", "Memory kept per invoice, and traced memory after it:"]
+        for invoice_name, delta, traced_after in self.invoice_deltas:
+            lines.append(
+                f"  {self._format_bytes(delta, signed=True):>12}  "
+                f"{self._format_bytes(traced_after):>12}  {invoice_name}"
+            )
+
+        lines += ["", "Resident memory (RSS) over the batch:"]
+        for elapsed, rss in self.rss_samples:
+            lines.append(f"  {elapsed:>10.1f} s  {self._format_bytes(rss):>12}")
+
+        # Ensure the log directory exists, then write the report
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file=report_path, mode="w") as f:
+            f.write("\n".join(lines) + "\n")
+
+        return report_path
+
+    ###########################################################################
+    ###                MemoryReport -> _sample_until_stopped()              ###
+    ###########################################################################
+    def _sample_until_stopped(self):
+        """
+        Samples the resident memory every sample_interval seconds, from the start of
+        the batch until stop() is called. Runs on the sampler thread
+        """
+
+        self._sample_rss()
+        while not self._stop_sampling.wait(self.sample_interval):
+            self._sample_rss()
+
+    ###########################################################################
+    ###                     MemoryReport -> _sample_rss()                   ###
+    ###########################################################################
+    def _sample_rss(self):
+        """
+        Notes the resident memory now, if it can be read on this platform
+        """
+
+        rss = current_rss()
+        if rss is not None:
+            self.rss_samples.append((time.monotonic() - self._start_time, rss))
+
+    ###########################################################################
+    ###                    MemoryReport -> _format_bytes()                  ###
+    ###########################################################################
+    def _format_bytes(self, size: int, signed: bool = False) -> str:
+        """
+        Formats a number of bytes for the report, in the largest of bytes, KiB or MiB
+        that keeps it at least 1, so the little each invoice keeps is not shown as 0
+
+        Args:
+            size (int): The number of bytes
+            signed (bool): Whether to show the sign of a positive size, for changes
+
+        Returns:
+            str: The size, e.g. "12.3 MiB", or "+40.2 KiB" or "-512 B" if signed
+        """
+
+        sign = "+" if signed else ""
+        if abs(size) < 1024:
+            return f"{size:{sign},d} B"
+        if abs(size) < 1024 * 1024:
+            return f"{size / 1024:{sign},.1f} KiB"
+        return f"{size / 1024 / 1024:{sign},.1f} MiB"
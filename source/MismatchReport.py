@@ -0,0 +1,115 @@
+from decimal import Decimal
+from pathlib import Path
+from typing import NamedTuple
+
+from source.Invoice import Invoice
+
+
+# TotalMismatch class to hold an invoice whose calculated total does not match the total listed on it.
+# Invoices generated by Fishbowl are known to have rounding errors, so these are usually a cent or two.
+class TotalMismatch(NamedTuple):
+
+    # fmt:off
+    invoice_filepath: Path                                           # The invoice PDF the invoice was parsed from
+    order_number: str                                                # Order Number, e.g. S12345
+    customer_name: str                                               # Name of customer on invoice
+    total: Decimal                                                   # Total calculated from the invoice's costs
+    listed_total: Decimal                                            # Total as listed on the invoice
+    # fmt:on
+
+    ###########################################################################
+    ###                TotalMismatch -> difference_cents()                  ###
+    ###########################################################################
+    @property
+    def difference_cents(self) -> int:
+        """
+        Returns how far the calculated total is from the listed total
+
+        Returns:
+            int: The calculated total minus the listed total, in whole cents
+        """
+
+        return int((self.total - self.listed_total).scaleb(2).to_integral_value())
+
+
+# MismatchReport class to collect the invoices of a batch whose calculated total does not match their
+# listed total, so they can be reviewed together once the batch has run rather than each one
+# interrupting it with a popup.
+class MismatchReport:
+
+    ###########################################################################
+    ###                    MismatchReport -> __init__()                     ###
+    ###########################################################################
+    def __init__(self):
+        """
+        Initializes the MismatchReport object, holding no mismatches
+        """
+
+        # Mismatches found so far, in the order their invoices were checked
+        self.mismatches: list[TotalMismatch] = []
+
+        # Number of invoices checked so far, mismatched or not
+        self.checked_count = 0
+
+    ###########################################################################
+    ###                      MismatchReport -> check()                      ###
+    ###########################################################################
+    def check(self, invoice_filepath: Path, invoice: Invoice) -> TotalMismatch | None:
+        """
+        Checks an invoice's calculated total against its listed total, keeping it in
+        the report if they do not match
+
+        Args:
+            invoice_filepath (Path): The invoice PDF the invoice was parsed from
+            invoice (Invoice): The processed invoice
+
+        Returns:
+            TotalMismatch | None: The mismatch, or None if the totals match
+        """
+
+        self.checked_count += 1
+
+        if invoice.total == invoice.listed_total:
+            return None
+
+        mismatch = TotalMismatch(
+            invoice_filepath=invoice_filepath,
+            order_number=invoice.order_number,
+            customer_name=invoice.customer_name,
+            total=invoice.total,
+            listed_total=invoice.listed_total,
+        )
+        self.mismatches.append(mismatch)
+        return mismatch
+
+    ###########################################################################
+    ###                      MismatchReport -> clear()                      ###
+    ###########################################################################
+    def clear(self):
+        """
+        Empties the report, e.g. at the start of a batch
+        """
+
+        self.mismatches = []
+        self.checked_count = 0
+
+    ###########################################################################
+    ###                     MismatchReport -> summary()                     ###
+    ###########################################################################
+    def summary(self) -> str:
+        """
+        Summarizes the mismatches found, for the end of a batch
+
+        Returns:
+            str: How many of the invoices checked did not match, and by how much
+        """
+
+        if not self.mismatches:
+            return f"All {self.checked_count} calculated totals match the listed totals"
+
+        differences = [abs(mismatch.difference_cents) for mismatch in self.mismatches]
+        return (
+            f"{len(self.mismatches)} of {self.checked_count} calculated totals do not "
+            f"match the listed total, by {sum(differences)}¢ in all "
+            f"(at most {max(differences)}¢ on one invoice)"
+        )
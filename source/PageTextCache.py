@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import pypdf
+import threading
+from pathlib import Path
+
+from source.constants import PAGE_TEXT_CACHE_DIR, PAGE_TEXT_CACHE_MAX_BYTES
+
+
+# PageTextCache class to persist the text extracted from each invoice PDF, so re-processing an
+# unchanged invoice never has to run pypdf again. Entries are addressed by a hash of the PDF's
+# bytes and the pypdf version, so editing or replacing a PDF (or upgrading pypdf) simply misses
+# the cache rather than returning stale text. The cache is bounded in size, evicting the least
+# recently used entries first.
+#
+# The cache is purely an optimization: any failure to read or write it is treated as a miss,
+# since the worst outcome is re-extracting the text.
+class PageTextCache:
+
+    ###########################################################################
+    ###                    PageTextCache -> __init__()                      ###
+    ###########################################################################
+    def __init__(
+        self,
+        cache_dir: Path = PAGE_TEXT_CACHE_DIR,
+        max_bytes: int = PAGE_TEXT_CACHE_MAX_BYTES,
+    ):
+        """
+        Initializes the PageTextCache object
+
+        Args:
+            cache_dir (Path): Directory holding one file per cached PDF
+            max_bytes (int): Total size the cache entries may occupy before the least
+                recently used entries are evicted
+        """
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        # Running total of the entries' sizes, measured from disk on first store. Each
+        # worker process keeps its own total, so the bound is enforced approximately
+        # during a parallel batch and exactly on the next eviction scan.
+        self._total_bytes: int | None = None
+
+    ###########################################################################
+    ###                    PageTextCache -> key_for()                       ###
+    ###########################################################################
+    def key_for(self, contents: bytes) -> str:
+        """
+        Computes the cache key for a PDF from its bytes and the installed pypdf version
+
+        Args:
+            contents (bytes): The full contents of the PDF file
+
+        Returns:
+            str: A hex digest identifying this exact PDF as extracted by this pypdf version
+        """
+
+        digest = hashlib.sha256(f"pypdf {pypdf.__version__}\n".encode())
+        digest.update(contents)
+        return digest.hexdigest()
+
+    ###########################################################################
+    ###                      PageTextCache -> load()                        ###
+    ###########################################################################
+    def load(self, key: str) -> list | None:
+        """
+        Looks up the page text cached under key, marking the entry as recently used
+
+        Args:
+            key (str): The cache key from key_for()
+
+        Returns:
+            list | None: The cached text of each page, with None for any page not
+                extracted yet, or None on a cache miss
+        """
+
+        entry_path = self._entry_path(key)
+
+        try:
+            with open(file=entry_path, mode="r", encoding="utf-8") as f:
+                pages = json.load(f)["pages"]
+
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry_path)
+
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        return pages
+
+    ###########################################################################
+    ###                      PageTextCache -> store()                       ###
+    ###########################################################################
+    def store(self, key: str, pages: list):
+        """
+        Caches the text of each page under key, evicting old entries if the cache
+        has grown past its size bound
+
+        Args:
+            key (str): The cache key from key_for()
+            pages (list): The text of each page of the PDF, with None for any page not
+                extracted yet
+        """
+
+        entry_path = self._entry_path(key)
+        temp_path = entry_path.with_name(
+            f"{entry_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Write to a temporary file and rename it into place, so a reader (possibly
+            # another worker process or thread) never sees a half-written entry
+            with open(file=temp_path, mode="w", encoding="utf-8") as f:
+                json.dump({"pages": pages}, f)
+
+            # An entry is rewritten as more of its pages are extracted, so only count the
+            # growth of an existing entry
+            replaced_size = entry_path.stat().st_size if entry_path.exists() else 0
+            os.replace(temp_path, entry_path)
+
+            if self._total_bytes is None:
+                self._total_bytes = self._measure()
+            else:
+                self._total_bytes += entry_path.stat().st_size - replaced_size
+
+        except OSError:
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    ###########################################################################
+    ###                   PageTextCache -> _entry_path()                    ###
+    ###########################################################################
+    def _entry_path(self, key: str) -> Path:
+        """
+        Returns the file path holding the entry for key
+
+        Args:
+            key (str): The cache key from key_for()
+
+        Returns:
+            Path: The entry's file path inside the cache directory
+        """
+        return self.cache_dir / f"{key}.json"
+
+    ###########################################################################
+    ###                     PageTextCache -> _measure()                     ###
+    ###########################################################################
+    def _measure(self) -> int:
+        """
+        Sums the sizes of every entry currently in the cache directory
+
+        Returns:
+            int: The total size of the cache entries in bytes
+        """
+
+        total = 0
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                total += entry_path.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    ###########################################################################
+    ###                      PageTextCache -> _evict()                      ###
+    ###########################################################################
+    def _evict(self):
+        """
+        Deletes the least recently used entries until the cache is back under three
+        quarters of its size bound. Evicting past the bound means the next several
+        stores do not each trigger another scan of the cache directory.
+        """
+
+        entries = []
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        # Oldest (least recently used) first
+        entries.sort(key=lambda entry: entry[0])
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 3 // 4
+
+        for _, size, entry_path in entries:
+            if total <= target:
+                break
+
+            # Another worker may have evicted this entry already, which is just as good
+            try:
+                entry_path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            total -= size
+
+        self._total_bytes = total
@@ -0,0 +1,400 @@
+import sqlite3
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from source.Invoice import Invoice, LineItem
+from source.constants import RESULTS_DB_PATH, RESULTS_DB_BATCH_SIZE
+
+# Text fields of an invoice stored as columns of the invoices table, and its currency fields, which
+# are stored as the exact text of their Decimal so they read back unchanged
+TEXT_COLUMNS = (
+    "order_number",
+    "customer_name",
+    "date",
+    "po_number",
+    "payment_terms",
+    "sales_rep",
+)
+CURRENCY_COLUMNS = (
+    "labor_cost",
+    "material_cost",
+    "shipping_cost",
+    "subtotal",
+    "sales_tax",
+    "total",
+    "listed_total",
+)
+INVOICE_COLUMNS = TEXT_COLUMNS + CURRENCY_COLUMNS
+
+# Invoices are keyed by the path of their PDF, so processing an invoice again replaces its result.
+# invoice_date holds the invoice's date as YYYY-MM-DD, so date ranges can be looked up through its index.
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS invoices (
+    invoice_path TEXT PRIMARY KEY,
+    {", ".join(f"{column} TEXT NOT NULL" for column in INVOICE_COLUMNS)},
+    invoice_date TEXT,
+    processed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS invoices_order_number ON invoices (order_number);
+CREATE INDEX IF NOT EXISTS invoices_customer_name ON invoices (customer_name);
+CREATE INDEX IF NOT EXISTS invoices_invoice_date ON invoices (invoice_date);
+CREATE INDEX IF NOT EXISTS invoices_sales_rep ON invoices (sales_rep);
+CREATE INDEX IF NOT EXISTS invoices_payment_terms ON invoices (payment_terms);
+
+CREATE TABLE IF NOT EXISTS line_items (
+    invoice_path TEXT NOT NULL REFERENCES invoices (invoice_path) ON DELETE CASCADE,
+    line_number INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    quantity TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    category TEXT NOT NULL,
+    matched_criteria TEXT
+);
+CREATE INDEX IF NOT EXISTS line_items_invoice_path ON line_items (invoice_path);
+"""
+
+UPSERT_INVOICE = f"""
+INSERT INTO invoices (invoice_path, {", ".join(INVOICE_COLUMNS)}, invoice_date, processed_at)
+VALUES ({", ".join("?" * (len(INVOICE_COLUMNS) + 3))})
+ON CONFLICT (invoice_path) DO UPDATE SET
+    {", ".join(f"{column} = excluded.{column}" for column in INVOICE_COLUMNS)},
+    invoice_date = excluded.invoice_date,
+    processed_at = excluded.processed_at
+"""
+
+DELETE_LINE_ITEMS = "DELETE FROM line_items WHERE invoice_path = ?"
+
+INSERT_LINE_ITEM = f"""
+INSERT INTO line_items (invoice_path, {", ".join(LineItem._fields)})
+VALUES ({", ".join("?" * (len(LineItem._fields) + 1))})
+"""
+
+
+# InvoiceRecord class to hold an invoice looked up from the results database, along with the PDF it was
+# processed from and when it was processed
+class InvoiceRecord(NamedTuple):
+
+    # fmt:off
+    invoice_filepath: Path                                           # The invoice PDF the invoice was processed from
+    processed_at: str                                                # When it was last processed, as an ISO 8601 UTC timestamp
+    invoice: Invoice                                                 # The processed invoice, without its page text
+    # fmt:on
+
+
+# ResultsDatabase class to keep every processed invoice in an indexed SQLite database, so past results
+# can be looked up by order number, customer, date, sales rep or payment terms in milliseconds, rather
+# than by re-processing their PDFs. Unlike results.txt, the database is kept across launches.
+#
+# Processed invoices are queued and written batch_size at a time, each batch in a single transaction,
+# and the database runs in WAL mode so writing a batch never blocks a lookup. Call flush() at the end of
+# a batch of invoices to write whatever is still queued.
+#
+# Failures are reported through report_error, and never interrupt processing: an invoice that cannot be
+# recorded is simply missing from the database until it is processed again.
+class ResultsDatabase:
+
+    ###########################################################################
+    ###                   ResultsDatabase -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self,
+        db_path: Path = RESULTS_DB_PATH,
+        report_error: Callable[[str, str], None] = lambda *_: None,
+        batch_size: int = RESULTS_DB_BATCH_SIZE,
+    ):
+        """
+        Initializes the ResultsDatabase object. The database is not opened until it
+        is first used
+
+        Args:
+            db_path (Path): The SQLite database file
+            report_error (Callable[[str, str], None]): Callback used to surface a
+                database failure, taking an error title and message
+            batch_size (int): Processed invoices written to the database per transaction
+        """
+
+        self.db_path = db_path
+        self.report_error = report_error
+        self.batch_size = batch_size
+
+        # Connection to the database, once opened
+        self._connection: sqlite3.Connection | None = None
+
+        # Processed invoices waiting to be written, as (invoice path, invoice, processed at)
+        self._pending: list[tuple[str, Invoice, str]] = []
+
+    ###########################################################################
+    ###                    ResultsDatabase -> record()                      ###
+    ###########################################################################
+    def record(self, invoice_filepath: Path, invoice: Invoice):
+        """
+        Queues a processed invoice to be written to the database, replacing any
+        earlier result for the same PDF. Writes the queue once batch_size invoices
+        are waiting
+
+        Args:
+            invoice_filepath (Path): The invoice PDF that was processed
+            invoice (Invoice): The processed invoice
+        """
+
+        processed_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._pending.append((str(invoice_filepath), invoice, processed_at))
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    ###########################################################################
+    ###                     ResultsDatabase -> flush()                      ###
+    ###########################################################################
+    def flush(self):
+        """
+        Writes every queued invoice to the database in a single transaction
+        """
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        invoice_rows = []
+        line_item_rows = []
+        for invoice_path, invoice, processed_at in pending:
+            invoice_rows.append(
+                (
+                    invoice_path,
+                    *(str(getattr(invoice, column)) for column in INVOICE_COLUMNS),
+                    self._to_iso_date(invoice.date),
+                    processed_at,
+                )
+            )
+            line_item_rows.extend(
+                (invoice_path, *line_item._replace(amount=str(line_item.amount)))
+                for line_item in invoice.line_items
+            )
+
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany(UPSERT_INVOICE, invoice_rows)
+                connection.executemany(
+                    DELETE_LINE_ITEMS, [(row[0],) for row in invoice_rows]
+                )
+                connection.executemany(INSERT_LINE_ITEM, line_item_rows)
+
+        except (sqlite3.Error, OSError) as error:
+            self.report_error(
+                "Database Error",
+                f"Could not save {len(pending)} processed invoice(s) to the results "
+                f"database at {self.db_path}: {error}",
+            )
+
+    ###########################################################################
+    ###                      ResultsDatabase -> find()                      ###
+    ###########################################################################
+    def find(
+        self,
+        order_number: str | None = None,
+        customer_name: str | None = None,
+        sales_rep: str | None = None,
+        payment_terms: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[InvoiceRecord]:
+        """
+        Looks up the processed invoices matching every criteria given. Any invoices
+        still queued are written first, so they are included
+
+        Args:
+            order_number (str | None): The exact order number, e.g. "S12345"
+            customer_name (str | None): The exact customer name
+            sales_rep (str | None): The exact sales rep
+            payment_terms (str | None): The exact payment terms
+            start_date (date | None): The earliest invoice date, inclusive
+            end_date (date | None): The latest invoice date, inclusive
+
+        Returns:
+            list[InvoiceRecord]: The matching invoices, oldest invoice date first. Empty
+                if the database could not be read
+        """
+
+        self.flush()
+
+        conditions = []
+        parameters = []
+        for column, value in (
+            ("order_number", order_number),
+            ("customer_name", customer_name),
+            ("sales_rep", sales_rep),
+            ("payment_terms", payment_terms),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+
+        if start_date is not None:
+            conditions.append("invoice_date >= ?")
+            parameters.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append("invoice_date <= ?")
+            parameters.append(end_date.isoformat())
+
+        query = (
+            f"SELECT invoice_path, processed_at, {', '.join(INVOICE_COLUMNS)} "
+            "FROM invoices"
+        )
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY invoice_date, invoice_path"
+
+        try:
+            connection = self._connect()
+            rows = connection.execute(query, parameters).fetchall()
+            line_items = self._load_line_items(
+                connection=connection, invoice_paths=[row[0] for row in rows]
+            )
+
+        except (sqlite3.Error, OSError) as error:
+            self.report_error(
+                "Database Error",
+                f"Could not read the results database at {self.db_path}: {error}",
+            )
+            return []
+
+        records = []
+        for invoice_path, processed_at, *values in rows:
+            invoice = Invoice(
+                **dict(zip(TEXT_COLUMNS, values)),
+                **{
+                    column: Decimal(value)
+                    for column, value in zip(
+                        CURRENCY_COLUMNS, values[len(TEXT_COLUMNS) :]
+                    )
+                },
+                line_items=line_items.get(invoice_path, []),
+            )
+            records.append(
+                InvoiceRecord(
+                    invoice_filepath=Path(invoice_path),
+                    processed_at=processed_at,
+                    invoice=invoice,
+                )
+            )
+
+        return records
+
+    ###########################################################################
+    ###                     ResultsDatabase -> close()                      ###
+    ###########################################################################
+    def close(self):
+        """
+        Writes any queued invoices and closes the database. Using it again reopens it
+        """
+
+        self.flush()
+
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+
+    ###########################################################################
+    ###                    ResultsDatabase -> _connect()                    ###
+    ###########################################################################
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns the connection to the database, opening it and creating its tables
+        first if it is not already open
+
+        Returns:
+            sqlite3.Connection: The open connection
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+            OSError: If its directory cannot be created
+        """
+
+        if self._connection is not None:
+            return self._connection
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+
+        try:
+            # WAL lets lookups read while a batch is being written, and only needs the
+            # log synced at checkpoints rather than on every commit
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.executescript(SCHEMA)
+
+        except sqlite3.Error:
+            connection.close()
+            raise
+
+        self._connection = connection
+        return connection
+
+    ###########################################################################
+    ###                ResultsDatabase -> _load_line_items()                ###
+    ###########################################################################
+    def _load_line_items(
+        self, connection: sqlite3.Connection, invoice_paths: list[str]
+    ) -> dict[str, list[LineItem]]:
+        """
+        Loads the line items of each of the given invoices
+
+        Args:
+            connection (sqlite3.Connection): The open connection
+            invoice_paths (list[str]): The paths of the invoices
+
+        Returns:
+            dict[str, list[LineItem]]: Each invoice's line items, in order, keyed by path
+        """
+
+        line_items: dict[str, list[LineItem]] = {}
+
+        # Look the invoices up in chunks, staying under SQLite's limit on parameters
+        for start in range(0, len(invoice_paths), 500):
+            chunk = invoice_paths[start : start + 500]
+            rows = connection.execute(
+                f"SELECT invoice_path, {', '.join(LineItem._fields)} FROM line_items "
+                f"WHERE invoice_path IN ({', '.join('?' * len(chunk))}) "
+                "ORDER BY invoice_path, rowid",
+                chunk,
+            )
+
+            for invoice_path, line_number, *values, amount, category, criteria in rows:
+                line_items.setdefault(invoice_path, []).append(
+                    LineItem(
+                        line_number,
+                        *values,
+                        amount=Decimal(amount),
+                        category=category,
+                        matched_criteria=criteria,
+                    )
+                )
+
+        return line_items
+
+    ###########################################################################
+    ###                  ResultsDatabase -> _to_iso_date()                  ###
+    ###########################################################################
+    def _to_iso_date(self, invoice_date: str) -> str | None:
+        """
+        Converts an invoice's date to a sortable YYYY-MM-DD date
+
+        Args:
+            invoice_date (str): The date as listed on the invoice, e.g. "01/02/2024"
+
+        Returns:
+            str | None: The date as YYYY-MM-DD, or None if it is not a MM/DD/YYYY date
+        """
+
+        try:
+            return datetime.strptime(invoice_date, "%m/%d/%Y").date().isoformat()
+        except ValueError:
+            return None
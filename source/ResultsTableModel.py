@@ -0,0 +1,307 @@
+import bisect
+import dataclasses
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from source.Invoice import Invoice
+
+# Columns of the results table: the Invoice field each one shows, and its heading
+RESULTS_TABLE_COLUMNS = (
+    ("order_number", "Order"),
+    ("date", "Date"),
+    ("customer_name", "Customer"),
+    ("sales_rep", "Sales Rep"),
+    ("subtotal", "Subtotal"),
+    ("sales_tax", "Sales Tax"),
+    ("total", "Total"),
+    ("listed_total", "Listed Total"),
+)
+
+
+# ResultsRow class to hold one invoice in the results table, along with everything needed to show,
+# sort and filter it, all worked out once when the invoice is added rather than on every redraw
+class ResultsRow(NamedTuple):
+
+    # fmt:off
+    invoice: Invoice                                                 # The processed invoice, without its page text
+    values: tuple[str, ...]                                          # Text shown in each column
+    sort_keys: tuple[Any, ...]                                       # Key each column sorts by, e.g. a Decimal for currency
+    filter_text: str                                                 # Every column's text, casefolded, for filtering
+    # fmt:on
+
+
+# ResultsTableModel class to hold every invoice shown in the results table, and the order they are
+# shown in once sorted and filtered. It knows nothing about tkinter: the table asks it for just the
+# rows in view, so the table's cost stays the same however many invoices it holds.
+#
+# The rows in view are kept sorted in ascending order, so each new invoice is inserted in place with a
+# binary search rather than re-sorting, and a descending sort simply reads them from the other end.
+class ResultsTableModel:
+
+    ###########################################################################
+    ###                  ResultsTableModel -> __init__()                    ###
+    ###########################################################################
+    def __init__(self, columns: tuple = RESULTS_TABLE_COLUMNS):
+        """
+        Initializes the ResultsTableModel object, holding no invoices
+
+        Args:
+            columns (tuple): The (Invoice field, heading) of each column
+        """
+
+        self.columns = columns
+
+        # Column the rows are sorted by, or None to keep them in the order added
+        self.sort_column: int | None = None
+        self.descending = False
+
+        # Casefolded words every row in view must contain
+        self.filter_words: list[str] = []
+
+        # Every row, in the order added, and the rows in view, sorted in ascending order
+        # along with their sort keys so new rows can be inserted with a binary search
+        self._rows: list[ResultsRow] = []
+        self._view: list[ResultsRow] = []
+        self._view_keys: list = []
+
+    ###########################################################################
+    ###                  ResultsTableModel -> __len__()                     ###
+    ###########################################################################
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The number of rows in view, i.e. that pass the filter
+        """
+
+        return len(self._view)
+
+    ###########################################################################
+    ###                 ResultsTableModel -> total_rows()                   ###
+    ###########################################################################
+    @property
+    def total_rows(self) -> int:
+        """
+        int: The number of rows held, including those hidden by the filter
+        """
+
+        return len(self._rows)
+
+    ###########################################################################
+    ###                    ResultsTableModel -> add()                       ###
+    ###########################################################################
+    def add(self, invoice: Invoice) -> int | None:
+        """
+        Adds an invoice to the table
+
+        Args:
+            invoice (Invoice): The processed invoice
+
+        Returns:
+            int | None: The position of its row in view, or None if the filter hides it
+        """
+
+        row = self._make_row(invoice)
+        self._rows.append(row)
+
+        if not self._matches(row):
+            return None
+
+        if self.sort_column is None:
+            self._view.append(row)
+            return self._to_position(len(self._view) - 1)
+
+        key = row.sort_keys[self.sort_column]
+        index = bisect.bisect_right(self._view_keys, key)
+        self._view.insert(index, row)
+        self._view_keys.insert(index, key)
+        return self._to_position(index)
+
+    ###########################################################################
+    ###                   ResultsTableModel -> clear()                      ###
+    ###########################################################################
+    def clear(self):
+        """
+        Removes every invoice from the table, keeping the sort and filter
+        """
+
+        self._rows = []
+        self._view = []
+        self._view_keys = []
+
+    ###########################################################################
+    ###                    ResultsTableModel -> row()                       ###
+    ###########################################################################
+    def row(self, position: int) -> ResultsRow:
+        """
+        Returns the row at a position in view
+
+        Args:
+            position (int): The position, from 0 at the top of the table
+
+        Returns:
+            ResultsRow: The row shown at that position
+        """
+
+        return self._view[self._to_position(position)]
+
+    ###########################################################################
+    ###                   ResultsTableModel -> window()                     ###
+    ###########################################################################
+    def window(self, start: int, count: int) -> list[ResultsRow]:
+        """
+        Returns the rows in view from a position onwards
+
+        Args:
+            start (int): The position of the first row, from 0 at the top of the table
+            count (int): The most rows to return
+
+        Returns:
+            list[ResultsRow]: Up to count rows, top first
+        """
+
+        end = min(start + count, len(self._view))
+        return [self.row(position) for position in range(max(start, 0), end)]
+
+    ###########################################################################
+    ###                    ResultsTableModel -> sort()                      ###
+    ###########################################################################
+    def sort(self, column: int | None, descending: bool = False):
+        """
+        Sorts the rows in view by a column
+
+        Args:
+            column (int | None): The index of the column, or None for the order added
+            descending (bool): Whether to show the largest values first
+        """
+
+        self.sort_column = column
+        self.descending = descending
+        self._refresh_view()
+
+    ###########################################################################
+    ###                 ResultsTableModel -> set_filter()                   ###
+    ###########################################################################
+    def set_filter(self, text: str):
+        """
+        Shows only the rows containing every word of text, in any column and ignoring
+        case. An empty text shows every row
+
+        Args:
+            text (str): The words to filter by
+        """
+
+        self.filter_words = text.casefold().split()
+        self._refresh_view()
+
+    ###########################################################################
+    ###               ResultsTableModel -> _refresh_view()                  ###
+    ###########################################################################
+    def _refresh_view(self):
+        """
+        Rebuilds the rows in view from every row, with the current filter and sort
+        """
+
+        view = [row for row in self._rows if self._matches(row)]
+
+        if self.sort_column is None:
+            self._view = view
+            self._view_keys = []
+            return
+
+        column = self.sort_column
+        view.sort(key=lambda row: row.sort_keys[column])
+        self._view = view
+        self._view_keys = [row.sort_keys[column] for row in view]
+
+    ###########################################################################
+    ###                ResultsTableModel -> _to_position()                  ###
+    ###########################################################################
+    def _to_position(self, index: int) -> int:
+        """
+        Converts between an index into the ascending rows in view and a position in
+        the table, which are the same unless the table is sorted in descending order
+
+        Args:
+            index (int): The index, or position, to convert
+
+        Returns:
+            int: The position, or index
+        """
+
+        if self.descending and self.sort_column is not None:
+            return len(self._view) - 1 - index
+        return index
+
+    ###########################################################################
+    ###                  ResultsTableModel -> _matches()                    ###
+    ###########################################################################
+    def _matches(self, row: ResultsRow) -> bool:
+        """
+        Checks a row against the filter
+
+        Args:
+            row (ResultsRow): The row to check
+
+        Returns:
+            bool: True if the row contains every word of the filter
+        """
+
+        return all(word in row.filter_text for word in self.filter_words)
+
+    ###########################################################################
+    ###                  ResultsTableModel -> _make_row()                   ###
+    ###########################################################################
+    def _make_row(self, invoice: Invoice) -> ResultsRow:
+        """
+        Works out how an invoice is shown, sorted and filtered
+
+        Args:
+            invoice (Invoice): The processed invoice
+
+        Returns:
+            ResultsRow: The invoice's row
+        """
+
+        # The page text is not needed to show the invoice, so it is not kept alive
+        invoice = dataclasses.replace(invoice, page_contents=[])
+
+        values = []
+        sort_keys = []
+        for field, _heading in self.columns:
+            value = getattr(invoice, field)
+            values.append(str(value))
+
+            # Currency sorts by amount, dates by date, and text ignoring case
+            if not isinstance(value, str):
+                sort_keys.append(value)
+            elif field == "date":
+                sort_keys.append(self._date_key(value))
+            else:
+                sort_keys.append(value.casefold())
+
+        return ResultsRow(
+            invoice=invoice,
+            values=tuple(values),
+            sort_keys=tuple(sort_keys),
+            filter_text="\t".join(values).casefold(),
+        )
+
+    ###########################################################################
+    ###                  ResultsTableModel -> _date_key()                   ###
+    ###########################################################################
+    def _date_key(self, invoice_date: str) -> str:
+        """
+        Converts an invoice's date to a key that sorts in date order
+
+        Args:
+            invoice_date (str): The date as listed on the invoice, e.g. "01/02/2024"
+
+        Returns:
+            str: The date as YYYY-MM-DD, or an empty key sorting first if it is not a
+                MM/DD/YYYY date
+        """
+
+        try:
+            return datetime.strptime(invoice_date, "%m/%d/%Y").date().isoformat()
+        except ValueError:
+            return ""
@@ -0,0 +1,122 @@
+import os
+import shutil
+from pathlib import Path
+
+from source.constants import RESULTS_LOG_PATH, RESULTS_WRITE_BUFFER_BYTES
+
+
+# ResultsWriter class to write the results of a whole batch of invoices to results.txt through a
+# single buffered handle. The results are streamed into a temporary file next to results.txt, which
+# only replaces results.txt once the batch is committed, so results.txt always holds either the
+# results from before the batch or every result of it, never a half-written block, even if the
+# application is killed part way through the batch. A batch that appends starts its temporary file as
+# a copy of results.txt, made by the operating system rather than read through Python.
+class ResultsWriter:
+
+    ###########################################################################
+    ###                    ResultsWriter -> __init__()                      ###
+    ###########################################################################
+    def __init__(self, results_path: Path = RESULTS_LOG_PATH):
+        """
+        Initializes the ResultsWriter object. Nothing is opened until the first write
+
+        Args:
+            results_path (Path): The results file the batch is committed to
+        """
+
+        self.results_path = results_path
+
+        # Temporary file the batch is written to, replacing any left by an interrupted batch
+        self.temp_path = results_path.with_name(f"{results_path.name}.tmp")
+
+        # Handle to the temporary file, once the first result is written
+        self._file = None
+
+    ###########################################################################
+    ###                      ResultsWriter -> write()                       ###
+    ###########################################################################
+    def write(self, contents: str, append: bool, header: str = ""):
+        """
+        Writes contents to the batch's results
+
+        Args:
+            contents (str): The contents to be written
+            append (bool): Whether to append the contents to the results so far, or
+                replace them. The first write of a batch appends to (or replaces) the
+                results from before the batch
+            header (str): Written ahead of the contents when the results are otherwise
+                empty, e.g. the column names of a CSV file. Defaults to no header
+
+        Raises:
+            OSError: If the temporary file cannot be written
+        """
+
+        if self._file is None:
+            # Ensure the log directory exists, then start the batch's temporary file
+            self.results_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Carry the existing results over, so they are kept when the batch is committed
+            if append and self.results_path.is_file():
+                shutil.copyfile(self.results_path, self.temp_path)
+                mode = "a"
+            else:
+                mode = "w"
+
+            self._file = open(
+                file=self.temp_path, mode=mode, buffering=RESULTS_WRITE_BUFFER_BYTES
+            )
+
+        elif not append:
+            self._file.seek(0)
+            self._file.truncate()
+
+        if header and self._file.tell() == 0:
+            self._file.write(header)
+
+        self._file.write(contents)
+
+    ###########################################################################
+    ###                     ResultsWriter -> commit()                       ###
+    ###########################################################################
+    def commit(self):
+        """
+        Replaces results.txt with the batch's results, once they are synced to disk.
+        Does nothing if nothing was written during the batch
+
+        Raises:
+            OSError: If the batch's results cannot be written out or moved into place,
+                in which case results.txt is left as it was
+        """
+
+        if self._file is None:
+            return
+
+        temp_file, self._file = self._file, None
+        try:
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        finally:
+            temp_file.close()
+
+        os.replace(self.temp_path, self.results_path)
+
+    ###########################################################################
+    ###                     ResultsWriter -> discard()                      ###
+    ###########################################################################
+    def discard(self):
+        """
+        Drops the batch's results, leaving results.txt as it was before the batch
+        """
+
+        temp_file, self._file = self._file, None
+
+        try:
+            if temp_file is not None:
+                temp_file.close()
+        except OSError:
+            pass
+
+        try:
+            self.temp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
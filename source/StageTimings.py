@@ -0,0 +1,228 @@
+import json
+import math
+import time
+from collections.abc import Iterable
+from contextlib import nullcontext
+from pathlib import Path
+from typing import NamedTuple
+
+from source.constants import TIMED_STAGES
+
+# Stands in for a timer while timing is off, so a stage that is not timed costs one call
+_NOT_TIMED = nullcontext()
+
+
+# StageStats class to summarize how long one stage of processing took across a batch of invoices
+class StageStats(NamedTuple):
+
+    # fmt:off
+    stage: str                  # The stage, e.g. "process_invoice"
+    count: int                  # Number of times the stage ran
+    total_seconds: float        # Time spent in the stage in all
+    p50_seconds: float          # Median time the stage took
+    p95_seconds: float          # Time 95% of runs of the stage took at most
+    max_seconds: float          # Longest time the stage took
+    # fmt:on
+
+
+# _StageTimer class to time one run of a stage for a with block, recording it when the block exits.
+# A class rather than a @contextmanager generator, which would cost several times as much per use.
+class _StageTimer:
+
+    __slots__ = ("timings", "stage", "start")
+
+    ###########################################################################
+    ###                     _StageTimer -> __init__()                       ###
+    ###########################################################################
+    def __init__(self, timings: "StageTimings", stage: str):
+        """
+        Initializes the _StageTimer object
+
+        Args:
+            timings (StageTimings): The timings to record the run in
+            stage (str): The stage being timed
+        """
+
+        self.timings = timings
+        self.stage = stage
+        self.start = 0.0
+
+    ###########################################################################
+    ###                     _StageTimer -> __enter__()                      ###
+    ###########################################################################
+    def __enter__(self):
+        """
+        Starts timing the stage
+        """
+
+        self.start = time.perf_counter()
+
+    ###########################################################################
+    ###                      _StageTimer -> __exit__()                      ###
+    ###########################################################################
+    def __exit__(self, *_exc_info):
+        """
+        Records how long the stage took, even if it raised
+        """
+
+        self.timings.record(self.stage, time.perf_counter() - self.start)
+
+
+# StageTimings class to record how long each stage of processing an invoice takes, so a slow batch can
+# be pinned on extracting text, parsing, drawing the results or writing them out. Every run of a stage
+# is kept as a (stage, seconds) sample, which lets the samples recorded in a worker process be handed
+# back with its BatchResult and added to the parent's, and stats() summarizes them per stage.
+#
+# Timing is off unless enabled, in which case time() hands back a shared do-nothing context manager and
+# nothing is recorded, so leaving the timers in place costs next to nothing.
+class StageTimings:
+
+    ###########################################################################
+    ###                     StageTimings -> __init__()                      ###
+    ###########################################################################
+    def __init__(self, enabled: bool = False):
+        """
+        Initializes the StageTimings object, with nothing recorded
+
+        Args:
+            enabled (bool): Whether stages are timed. Defaults to False
+        """
+
+        self.enabled = enabled
+
+        # How long each run of each stage took, in the order they finished
+        self.samples: list[tuple[str, float]] = []
+
+    ###########################################################################
+    ###                       StageTimings -> time()                        ###
+    ###########################################################################
+    def time(self, stage: str):
+        """
+        Times a run of a stage for the duration of a with block
+
+        Args:
+            stage (str): The stage being run, usually one of TIMED_STAGES
+
+        Returns:
+            ContextManager: A timer that records the run when the block exits, or a
+                context manager that does nothing if timing is off
+        """
+
+        if not self.enabled:
+            return _NOT_TIMED
+
+        return _StageTimer(self, stage)
+
+    ###########################################################################
+    ###                      StageTimings -> record()                       ###
+    ###########################################################################
+    def record(self, stage: str, seconds: float):
+        """
+        Records how long a run of a stage took
+
+        Args:
+            stage (str): The stage that was run
+            seconds (float): How long it took
+        """
+
+        self.samples.append((stage, seconds))
+
+    ###########################################################################
+    ###                      StageTimings -> extend()                       ###
+    ###########################################################################
+    def extend(self, samples: Iterable[tuple[str, float]]):
+        """
+        Records runs timed elsewhere, e.g. in a worker process
+
+        Args:
+            samples (Iterable[tuple[str, float]]): The (stage, seconds) of each run
+        """
+
+        self.samples.extend(samples)
+
+    ###########################################################################
+    ###                       StageTimings -> clear()                       ###
+    ###########################################################################
+    def clear(self):
+        """
+        Forgets every run recorded so far
+        """
+
+        self.samples = []
+
+    ###########################################################################
+    ###                       StageTimings -> stats()                       ###
+    ###########################################################################
+    def stats(self) -> list[StageStats]:
+        """
+        Summarizes the runs recorded of each stage
+
+        Returns:
+            list[StageStats]: A summary of each stage that ran, the stages of
+                TIMED_STAGES first in processing order, then any others by name
+        """
+
+        durations: dict[str, list[float]] = {}
+        for stage, seconds in self.samples:
+            durations.setdefault(stage, []).append(seconds)
+
+        order = {stage: index for index, stage in enumerate(TIMED_STAGES)}
+        stages = sorted(
+            durations, key=lambda stage: (order.get(stage, len(order)), stage)
+        )
+
+        summaries = []
+        for stage in stages:
+            runs = sorted(durations[stage])
+            summaries.append(
+                StageStats(
+                    stage=stage,
+                    count=len(runs),
+                    total_seconds=math.fsum(runs),
+                    p50_seconds=self._percentile(runs, 50),
+                    p95_seconds=self._percentile(runs, 95),
+                    max_seconds=runs[-1],
+                )
+            )
+
+        return summaries
+
+    ###########################################################################
+    ###                       StageTimings -> dump()                        ###
+    ###########################################################################
+    def dump(self, dump_path: Path):
+        """
+        Writes the summary of each stage to a JSON file, replacing it
+
+        Args:
+            dump_path (Path): The file to write
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+
+        contents = {"stages": [stats._asdict() for stats in self.stats()]}
+
+        # Ensure the log directory exists, then write the summary
+        dump_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file=dump_path, mode="w") as f:
+            json.dump(contents, f, indent=2)
+            f.write("\n")
+
+    ###########################################################################
+    ###                    StageTimings -> _percentile()                    ###
+    ###########################################################################
+    def _percentile(self, runs: list[float], percent: int) -> float:
+        """
+        Finds a percentile of the runs of a stage, by the nearest-rank method
+
+        Args:
+            runs (list[float]): How long each run took, sorted, of which there is at
+                least one
+            percent (int): The percentile to find, from 1 to 100
+
+        Returns:
+            float: The shortest run that at least percent% of the runs took no longer than
+        """
+
+        return runs[math.ceil(percent / 100 * len(runs)) - 1]
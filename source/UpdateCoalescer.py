@@ -0,0 +1,115 @@
+from typing import Any, Callable
+
+from source.constants import GUI_UPDATE_INTERVAL_MS
+
+
+# UpdateCoalescer class to gather updates to the window as they arrive and apply them together on a
+# fixed cadence scheduled with Tk's after(), rather than redrawing once per update. However many
+# invoices a batch finishes per second, the window is redrawn at most once per interval, so the time
+# spent drawing stays the same as processing gets faster. Runs entirely on the GUI thread.
+class UpdateCoalescer:
+
+    ###########################################################################
+    ###                    UpdateCoalescer -> __init__()                    ###
+    ###########################################################################
+    def __init__(
+        self,
+        after: Callable[[int, Callable[[], None]], Any],
+        flush: Callable[[list], None],
+        interval_ms: int = GUI_UPDATE_INTERVAL_MS,
+    ):
+        """
+        Initializes the UpdateCoalescer object, with no updates pending
+
+        Args:
+            after (Callable[[int, Callable[[], None]], Any]): Schedules a callback on the
+                GUI thread after a delay in milliseconds, i.e. the Tk window's after()
+            flush (Callable[[list], None]): Applies the updates posted since the last
+                flush, oldest first. Called with an empty list if only schedule() was
+                called, e.g. because just the progress changed
+            interval_ms (int): The least time between flushes, in milliseconds
+        """
+
+        self.after = after
+        self.flush = flush
+        self.interval_ms = interval_ms
+
+        # Number of updates posted, and of flushes that applied them, since reset_counts()
+        self.posted_count = 0
+        self.flush_count = 0
+
+        # Updates posted since the last flush, and whether a flush is due
+        self._pending: list = []
+        self._dirty = False
+
+        # Whether a flush has been scheduled with after() and has not yet run
+        self._scheduled = False
+
+    ###########################################################################
+    ###                      UpdateCoalescer -> post()                      ###
+    ###########################################################################
+    def post(self, update: Any):
+        """
+        Queues an update to be applied with the next flush
+
+        Args:
+            update (Any): The update, passed on to flush as is
+        """
+
+        self._pending.append(update)
+        self.posted_count += 1
+        self.schedule()
+
+    ###########################################################################
+    ###                    UpdateCoalescer -> schedule()                    ###
+    ###########################################################################
+    def schedule(self):
+        """
+        Makes sure a flush runs within the interval, without queueing an update
+        """
+
+        self._dirty = True
+
+        if not self._scheduled:
+            self._scheduled = True
+            self.after(self.interval_ms, self._on_timer)
+
+    ###########################################################################
+    ###                   UpdateCoalescer -> flush_now()                    ###
+    ###########################################################################
+    def flush_now(self):
+        """
+        Applies every pending update straight away, e.g. before reporting that a
+        batch has finished. Does nothing if no flush is due
+        """
+
+        if not self._dirty:
+            return
+
+        pending, self._pending = self._pending, []
+        self._dirty = False
+        self.flush_count += 1
+        self.flush(pending)
+
+    ###########################################################################
+    ###                 UpdateCoalescer -> reset_counts()                   ###
+    ###########################################################################
+    def reset_counts(self):
+        """
+        Restarts the counts of updates posted and flushes, e.g. at the start of a batch
+        """
+
+        self.posted_count = 0
+        self.flush_count = 0
+
+    ###########################################################################
+    ###                   UpdateCoalescer -> _on_timer()                    ###
+    ###########################################################################
+    def _on_timer(self):
+        """
+        Runs the scheduled flush. A flush_now() since it was scheduled leaves it
+        nothing to do
+        """
+
+        self._scheduled = False
+        self.flush_now()
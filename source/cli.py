@@ -0,0 +1,287 @@
+"""
+Processes invoices without the GUI, writing the results as text, CSV or JSON Lines.
+
+Run from the application folder, which holds the Configs/ folder:
+
+    python -m source.cli                                 # every invoice in Invoices/
+    python -m source.cli Archive/2026 --jobs 4 --format csv --output nightly.csv
+    python -m source.cli "Archive/**/*.pdf" --format jsonl
+
+Invoices are processed by an InvoiceEngine, which never loads tkinter or the GUI, so it starts
+quickly and runs on a machine without a display. Each input is a folder (every PDF in it), a PDF,
+or a glob pattern, which is expanded here so it may be quoted on any shell.
+
+Results are written to stdout, or to --output, in the order the invoices were given; folders and
+glob patterns are expanded in filename order. An --output file is only replaced once the whole
+batch has been written. Errors, and a summary of the calculated totals that do not match the
+listed totals, are written to stderr. The exit status is 0 if every invoice was processed, 1 if
+an error was reported, and 2 if the arguments were not valid.
+
+With --profile the run is profiled with cProfile, or with --profile sample by sampling its stacks,
+which costs far less on a long run. The profile is written under logs/profiles/, and the invoices
+are parsed in-process so that it covers them. --memory-report likewise parses them in-process and
+writes a report of the memory the run used to logs/memory_report.txt.
+"""
+
+import argparse
+import glob
+import sys
+from multiprocessing import freeze_support
+from pathlib import Path
+
+from source.BatchProfiler import BatchProfiler
+from source.InvoiceEngine import InvoiceEngine
+from source.InvoiceBatchEngine import BatchResult
+from source.InvoiceExporter import InvoiceExporter
+from source.MemoryReport import MemoryReport
+from source.MismatchReport import MismatchReport
+from source.PageTextCache import PageTextCache
+from source.ResultsWriter import ResultsWriter
+from source.constants import (
+    BATCH_MAX_WORKERS,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+    INVOICES_PATH,
+    MEMORY_REPORT_PATH,
+    PROFILE_MODE_CPROFILE,
+    PROFILE_MODES,
+    PROFILES_DIR,
+)
+
+# Output formats that may be chosen with --format, and the export format each is written in.
+# Text is the same format as results.txt
+OUTPUT_FORMATS = {
+    "text": None,
+    "csv": EXPORT_FORMAT_CSV,
+    "jsonl": EXPORT_FORMAT_JSONL,
+}
+
+
+def find_invoices(inputs: list[str]) -> tuple[list[Path], list[str]]:
+    """
+    Expands folders and glob patterns into the invoice PDFs they hold
+
+    Args:
+        inputs (list[str]): Folders, PDFs and glob patterns, in output order
+
+    Returns:
+        tuple[list[Path], list[str]]: The invoice PDFs, in output order and each listed
+            once, and the inputs that matched no invoices
+    """
+
+    invoice_filepaths: dict[Path, None] = {}
+    unmatched = []
+
+    for entry in inputs:
+        path = Path(entry)
+
+        if path.is_dir():
+            matches = [
+                child
+                for child in path.iterdir()
+                if child.suffix.lower() == ".pdf"
+                and not child.name.startswith(".")
+                and child.is_file()
+            ]
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = [
+                Path(match)
+                for match in glob.glob(entry, recursive=True)
+                if Path(match).is_file()
+            ]
+
+        if not matches:
+            unmatched.append(entry)
+
+        # Sort by name, as "Process All Invoices" does, so the output order does not depend
+        # on the filesystem's listing order
+        matches.sort(key=lambda match: (match.name.casefold(), match.name, str(match)))
+        invoice_filepaths.update(dict.fromkeys(matches))
+
+    return list(invoice_filepaths), unmatched
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the parser for the command line arguments
+
+    Returns:
+        argparse.ArgumentParser: The argument parser
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m source.cli",
+        description=__doc__.strip().splitlines()[0],
+    )
+    parser.add_argument(
+        "invoices",
+        nargs="*",
+        default=[str(INVOICES_PATH)],
+        help="Folders, PDFs or glob patterns to process (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=BATCH_MAX_WORKERS,
+        help="Worker processes to parse invoices with; 1 parses them in-process "
+        "(default: one per CPU core)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Format to write the results in (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=None,
+        help="File to write the results to (default: stdout)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_MODE_CPROFILE,
+        default=None,
+        choices=PROFILE_MODES,
+        help=f"Profile the run, writing the profile under {PROFILES_DIR} "
+        "(default mode: %(const)s)",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help=f"Write a report of the memory the run used to {MEMORY_REPORT_PATH}",
+    )
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Processes the invoices named on the command line and writes their results
+
+    Args:
+        argv (list[str] | None): The command line arguments. Defaults to sys.argv
+
+    Returns:
+        int: The exit status: 0 if every invoice was processed, otherwise 1
+    """
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    invoice_filepaths, unmatched = find_invoices(args.invoices)
+    for entry in unmatched:
+        print(f"No invoices found at {entry}", file=sys.stderr)
+
+    # Errors are reported as they happen, and fail the run once it has finished
+    error_count = len(unmatched)
+
+    def report_error(title: str, message: str):
+        nonlocal error_count
+        error_count += 1
+        print(f"{title}: {message}", file=sys.stderr)
+
+    # Profiling and the memory report only see this process, so either one parses every
+    # invoice in-process
+    profiler = BatchProfiler(mode=args.profile)
+    memory_report = MemoryReport(enabled=args.memory_report)
+
+    invoice_engine = InvoiceEngine(
+        report_error=report_error,
+        max_workers=1 if profiler.enabled or memory_report.enabled else args.jobs,
+        page_text_cache=PageTextCache(),
+    )
+
+    export_format = OUTPUT_FORMATS[args.format]
+    exporter = InvoiceExporter(export_format) if export_format else None
+    header = exporter.header if exporter else ""
+
+    # Stream the results into --output through a temporary file, so a failed run leaves the
+    # previous results in place. Starting with the header replaces them even if nothing is found
+    results_writer = ResultsWriter(results_path=args.output) if args.output else None
+    if results_writer is None:
+        sys.stdout.write(header)
+    else:
+        results_writer.write(contents="", append=False, header=header)
+
+    mismatch_report = MismatchReport()
+
+    def write_result(result: BatchResult):
+        mismatch_report.check(
+            invoice_filepath=result.invoice_filepath, invoice=result.invoice
+        )
+
+        if exporter is None:
+            record = result.invoice.to_formatted_string()
+        else:
+            record = exporter.format_invoice(result.invoice)
+
+        if results_writer is None:
+            sys.stdout.write(record)
+        else:
+            results_writer.write(contents=record, append=True)
+
+    profiler.start()
+    memory_report.start()
+
+    try:
+        for result in profiler.iterate(
+            invoice_engine.process_results(invoice_filepaths)
+        ):
+            if result.invoice is not None:
+                profiler.call(write_result, result)
+            memory_report.record_invoice(result.invoice_filepath)
+
+        if results_writer is not None:
+            results_writer.commit()
+
+    except Exception as error:
+        if results_writer is not None:
+            results_writer.discard()
+        report_error(
+            "Processing Error", f"An error occurred while processing invoices: {error}"
+        )
+
+    finally:
+        sys.stdout.flush()
+        invoice_engine.file_io_controller.close_debug_file()
+
+    if mismatch_report.checked_count:
+        print(mismatch_report.summary(), file=sys.stderr)
+
+    try:
+        for profile_path in profiler.stop(PROFILES_DIR):
+            print(f"Profile written to {profile_path}", file=sys.stderr)
+    except OSError as error:
+        report_error(
+            "File Error", f"Could not write the profile to {PROFILES_DIR}: {error}"
+        )
+
+    try:
+        report_path = memory_report.stop(MEMORY_REPORT_PATH)
+    except OSError as error:
+        report_error(
+            "File Error",
+            f"Could not write the memory report to {MEMORY_REPORT_PATH}: {error}",
+        )
+    else:
+        if report_path is not None:
+            print(f"Memory report written to {report_path}", file=sys.stderr)
+
+    return 1 if error_count else 0
+
+
+if __name__ == "__main__":
+    # The batch engine's worker processes import this module without running main(). When it
+    # is frozen into an executable, freeze_support() hands each worker off to the pool instead
+    freeze_support()
+    sys.exit(main())
@@ -32,8 +32,32 @@ DATA_DIR = Path("data")
 
 # Log files
 DEBUG_LOG_PATH = LOGS_DIR / "debug.txt"
+
+# Lines that may be waiting to be written to the debug log before logging blocks, and the
+# longest time, in seconds, a written line may go without being flushed to disk
+DEBUG_LOG_MAX_QUEUED = 10_000
+DEBUG_LOG_FLUSH_INTERVAL_S = 1.0
+
+# Size of the buffer results are written through during a batch, so results.txt is written in a
+# few large writes rather than one per invoice
+RESULTS_WRITE_BUFFER_BYTES = 1024 * 1024
 RESULTS_LOG_PATH = LOGS_DIR / "results.txt"
 
+# Machine-readable exports of the processed invoices, written alongside results.txt when an
+# export format is chosen. Each processed invoice is one CSV row or one JSON line.
+EXPORT_CSV_PATH = LOGS_DIR / "results.csv"
+EXPORT_JSONL_PATH = LOGS_DIR / "results.jsonl"
+
+# Export formats that may be chosen under Preferences -> Export
+EXPORT_FORMAT_NONE = "None"
+EXPORT_FORMAT_CSV = "CSV"
+EXPORT_FORMAT_JSONL = "JSON Lines"
+EXPORT_FORMATS = [EXPORT_FORMAT_NONE, EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL]
+
+# Environment variable that overrides the saved export format, so headless integration test
+# runs can choose one without a settings database
+EXPORT_FORMAT_ENV_VAR = "INVOICE_EXPORT_FORMAT"
+
 # Config files
 PAYMENT_TERMS_PATH = CONFIGS_DIR / "Payment_Terms.txt"
 SALES_REPS_PATH = CONFIGS_DIR / "Sales_Reps.txt"
@@ -42,6 +66,27 @@ COST_CRITERIA_PATH = CONFIGS_DIR / "Cost_Criteria.txt"
 # Database file holding persisted user settings (theme, font, etc.)
 SETTINGS_DB_PATH = DATA_DIR / "settings.db"
 
+# Database of every invoice processed, kept across launches so past results can be looked up
+# without re-processing their PDFs, and how many processed invoices are written to it per transaction
+RESULTS_DB_PATH = DATA_DIR / "results.db"
+RESULTS_DB_BATCH_SIZE = 100
+
+# Most matching pages a full-text search of the invoices returns, and the number of words of
+# context shown around the match in each
+SEARCH_RESULTS_LIMIT = 50
+SEARCH_SNIPPET_WORDS = 12
+
+# Directory holding the cached text extracted from each invoice PDF, and the total size
+# the cache may grow to before its least recently used entries are evicted
+PAGE_TEXT_CACHE_DIR = DATA_DIR / "page_cache"
+PAGE_TEXT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Manifest of every invoice parsed so far, so a batch only re-parses new or changed invoices. Saving
+# appends the entries that changed, and the log is rewritten without its superseded lines once it
+# holds more than INVOICE_MANIFEST_COMPACT_RATIO lines per entry.
+INVOICE_MANIFEST_PATH = DATA_DIR / "invoice_manifest.jsonl"
+INVOICE_MANIFEST_COMPACT_RATIO = 2
+
 # User guide shipped next to the executable; surfaced in-app via Help -> Open User Guide.
 USER_GUIDE_PATH = Path("USER_GUIDE.txt")
 
@@ -51,3 +96,114 @@ USER_GUIDE_PATH = Path("USER_GUIDE.txt")
 SETTING_KEY_THEME = "theme"
 SETTING_KEY_FONT_FAMILY = "font_family"
 SETTING_KEY_FONT_SIZE = "font_size"
+SETTING_KEY_EXPORT_FORMAT = "export_format"
+SETTING_KEY_WATCH_FOLDER = "watch_folder"
+SETTING_KEY_STAGE_TIMINGS = "stage_timings"
+
+# Values the watch folder setting is persisted as
+WATCH_FOLDER_ON = "on"
+WATCH_FOLDER_OFF = "off"
+
+# Values the stage timings setting is persisted as
+STAGE_TIMINGS_ON = "on"
+STAGE_TIMINGS_OFF = "off"
+
+# How often, in milliseconds, the Invoices/ folder is checked for new or changed invoices while
+# it is being watched. Listing one folder is cheap enough to do every couple of seconds
+WATCH_POLL_INTERVAL_MS = 2000
+
+# Seconds a new or changed invoice must go unchanged before it is processed, so a PDF that is
+# still being downloaded or copied into the Invoices/ folder is never processed half-written
+WATCH_SETTLE_SECONDS = 2.0
+
+# Upper bound on the worker processes used to parse invoices during "Process All
+# Invoices". None uses one worker per CPU core; 1 parses every invoice in-process.
+BATCH_MAX_WORKERS = None
+
+# Stages of processing an invoice that are timed while Preferences -> Record Stage Timings is on, in
+# processing order. Reading an invoice only opens the PDF (or its cached text); the text of each page
+# is extracted when first used, which counts towards populating or processing the invoice. During a
+# batch, displaying an invoice only queues its row, which is drawn along with the others around it.
+STAGE_READ_INVOICE = "read_invoice_file"
+STAGE_POPULATE_INVOICE = "populate_invoice"
+STAGE_PROCESS_INVOICE = "process_invoice"
+STAGE_DISPLAY_INVOICE = "display_invoice_output"
+STAGE_DRAW_RESULTS = "draw_batch_updates"
+STAGE_WRITE_RESULTS = "print_invoice_to_output_file"
+TIMED_STAGES = [
+    STAGE_READ_INVOICE,
+    STAGE_POPULATE_INVOICE,
+    STAGE_PROCESS_INVOICE,
+    STAGE_DISPLAY_INVOICE,
+    STAGE_DRAW_RESULTS,
+    STAGE_WRITE_RESULTS,
+]
+
+# Summary of each stage's timings, written at the end of every batch while they are recorded
+STAGE_TIMINGS_PATH = LOGS_DIR / "stage_timings.json"
+
+# Ways a batch can be profiled when the application or command line is started with --profile.
+# cProfile records every call, writing a .pstats file along with the collapsed stacks; sampling
+# only looks at the running stacks every PROFILE_SAMPLE_INTERVAL_S, so it suits long runs.
+PROFILE_MODE_CPROFILE = "cprofile"
+PROFILE_MODE_SAMPLE = "sample"
+PROFILE_MODES = [PROFILE_MODE_CPROFILE, PROFILE_MODE_SAMPLE]
+PROFILE_SAMPLE_INTERVAL_S = 0.005
+
+# Folder each profiled batch's .pstats and collapsed-stack (flamegraph.pl) files are written to
+PROFILES_DIR = LOGS_DIR / "profiles"
+
+# Report of the memory each batch used, written next to the debug log when the application or
+# command line is started with --memory-report. It lists the top allocation sites by file and by
+# line, and samples the process's resident memory every MEMORY_RSS_SAMPLE_INTERVAL_S, which also
+# covers memory Python does not allocate itself, such as the Tk widgets' contents.
+MEMORY_REPORT_PATH = LOGS_DIR / "memory_report.txt"
+MEMORY_REPORT_TOP_SITES = 15
+MEMORY_RSS_SAMPLE_INTERVAL_S = 0.5
+
+# How often, in milliseconds, the GUI thread picks up results from a batch running in the
+# background. Short enough that output appears to stream in, long enough to stay idle cheaply.
+BATCH_POLL_INTERVAL_MS = 50
+
+# Longest time, in milliseconds, each pick up of batch results may spend handling them. Results
+# still waiting afterwards are picked up on the next pass, scheduled straight away, so a batch that
+# produces results faster than they are output never keeps the window from responding.
+BATCH_POLL_BUDGET_MS = 10
+
+# How often, in milliseconds, the window is redrawn with the results and progress of a batch.
+# Results arriving in between are drawn together, so redrawing costs the same however fast
+# invoices are processed, while ten updates a second still looks live.
+GUI_UPDATE_INTERVAL_MS = 100
+
+# Rows of the results table shown at once. Only this many rows are ever built in the table,
+# however many invoices it holds, and scrolling refills them from the invoices in view
+RESULTS_TABLE_VISIBLE_ROWS = 12
+
+# Rows scrolled by each notch of the mouse wheel in the results table
+RESULTS_TABLE_WHEEL_ROWS = 3
+
+# Bytes of a log scanned at a time while indexing where its lines start. Large enough that
+# indexing a multi-hundred-MB log takes a few hundred chunks, small enough to never matter
+LOG_INDEX_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Bytes of a log the log viewer indexes between redraws, so the start of a huge log is shown,
+# and the window keeps responding, while the rest of it is still being indexed
+LOG_VIEWER_INDEX_STEP_BYTES = 16 * 1024 * 1024
+
+# Lines of a log shown at once in the log viewer, which only ever draws the lines in view
+LOG_VIEWER_VISIBLE_LINES = 30
+
+# Lines scrolled by each notch of the mouse wheel in the log viewer
+LOG_VIEWER_WHEEL_LINES = 3
+
+# How often, in milliseconds, the log viewer checks its log for new lines to follow
+LOG_FOLLOW_INTERVAL_MS = 500
+
+# Invoices copied in at once by Discover Invoices. Copying is bound by the disk or network share,
+# not the CPU, so several copies in flight keep a slow share busy without tying up the machine
+IMPORT_MAX_WORKERS = 8
+
+# Category of cost each line item on an invoice is classified as
+LINE_ITEM_LABOR = "Labor"
+LINE_ITEM_SHIPPING = "Shipping"
+LINE_ITEM_MATERIAL = "Material"
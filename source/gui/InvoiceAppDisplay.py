@@ -1,9 +1,15 @@
 import tkinter as tk
-from tkinter import filedialog, scrolledtext
+from tkinter import filedialog, scrolledtext, ttk
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable
 
 from source.Invoice import Invoice
+from source.InvoiceImporter import ImportOutcome
+from source.InvoiceSearchIndex import SearchResult
+from source.BatchWorker import BatchProgress
+from source.UpdateCoalescer import UpdateCoalescer
+from source.MismatchReport import TotalMismatch
+from source.StageTimings import StageTimings
 from fishbowl_common import ArgumentProvider
 from fishbowl_common.gui import (
     ALL_THEMES,
@@ -22,6 +28,10 @@ from fishbowl_common.gui import (
     UpdateWindow,
 )
 from source.gui.InvoiceDiscoveryWindow import InvoiceDiscoveryWindow
+from source.gui.LogViewerWindow import LogViewerWindow
+from source.gui.MismatchPanel import MismatchPanel
+from source.gui.PerformanceWindow import PerformanceWindow
+from source.gui.ResultsTable import ResultsTable
 from source.constants import (
     APP_NAME,
     VERSION,
@@ -35,6 +45,16 @@ from source.constants import (
     SETTING_KEY_THEME,
     SETTING_KEY_FONT_FAMILY,
     SETTING_KEY_FONT_SIZE,
+    SETTING_KEY_EXPORT_FORMAT,
+    SETTING_KEY_WATCH_FOLDER,
+    SETTING_KEY_STAGE_TIMINGS,
+    WATCH_FOLDER_OFF,
+    WATCH_FOLDER_ON,
+    STAGE_TIMINGS_OFF,
+    STAGE_TIMINGS_ON,
+    STAGE_DRAW_RESULTS,
+    EXPORT_FORMATS,
+    EXPORT_FORMAT_NONE,
 )
 
 # Future TODO: Add second output window for errors, instead of cluttering the screen with
@@ -51,39 +71,52 @@ class InvoiceAppDisplay(tk.Tk):
     def __init__(
         self,
         process_callback,
+        process_all_callback: Callable[[], None],
+        cancel_callback: Callable[[], None],
         read_file_callback: Callable[[Path], str],
         save_config_callback: Callable[[Path, str], None],
         save_settings_callback: Callable[[str, str], None],
-        copy_invoice_callback: Callable[[Path, bool], str],
+        import_invoices_callback: Callable[[list[Path], bool], Iterable[ImportOutcome]],
+        search_callback: Callable[[str], list[SearchResult]],
         check_for_updates_callback: Callable[[], None],
         title: str,
         window_resolution: str,
         settings: dict | None = None,
+        stage_timings: StageTimings | None = None,
     ):
         """
         Initializes the InvoiceAppDisplay object
 
         Args:
             process_callback (callable): Callback function to process the selected invoice file
+            process_all_callback (Callable[[], None]): Callback that processes every invoice
+                in the Invoices/ folder, appending each result to the output
+            cancel_callback (Callable[[], None]): Callback that asks the running batch
+                to stop before its next invoice, invoked by the Cancel button
             read_file_callback (Callable[[Path], str]): Callback that reads a file's
                 full contents, used to populate the native file editor/viewer window
             save_config_callback (Callable[[Path, str], None]): Callback that persists
                 edited config contents (and reloads them), invoked when the user saves
             save_settings_callback (Callable[[str, str], None]): Callback that persists
                 a single user setting (key, value), invoked when the user changes a
-                theme/font/font-size preference
-            copy_invoice_callback (Callable[[Path, bool], str]): Callback that copies
-                a selected invoice PDF (source path, overwrite flag) into the
-                Invoices/ folder, used by the Invoice Discovery window. Returns
-                "copied", "exists", or "error"
+                theme/font/font-size/export preference
+            import_invoices_callback (Callable[[list[Path], bool], Iterable[ImportOutcome]]):
+                Callback that copies the selected invoice PDFs (source paths, overwrite
+                flag) into the Invoices/ folder, used by the Invoice Discovery window.
+                Yields the outcome of each file as it finishes
+            search_callback (Callable[[str], list[SearchResult]]): Callback that
+                searches the text of every invoice, invoked from the search box
             check_for_updates_callback (Callable[[], None]): Callback that triggers
                 an on-demand update check, invoked when the user selects
                 "Check for Updates" from the Help menu
             title (str): Title of the application window
             window_resolution (str): Resolution of the application window (e.g., "750x750")
-            settings (dict | None): Previously persisted settings (theme/font/font-size)
+            settings (dict | None): Previously persisted settings (theme/font/font-size/export)
                 used to restore the user's last choices on startup. Missing or unknown
                 values fall back to the application defaults.
+            stage_timings (StageTimings | None): Records how long each stage of
+                processing takes, shown under Help -> Performance. The results drawn
+                during a batch are timed through it too. None records nothing
         """
 
         super().__init__()
@@ -104,9 +137,18 @@ class InvoiceAppDisplay(tk.Tk):
         # Holds the last selected invoice filepath
         self.selected_file = tk.StringVar()
 
+        # Holds the words typed into the search box
+        self.search_query = tk.StringVar()
+
         # Callback function to process the selected invoice file
         self.process_callback = process_callback
 
+        # Callback function to process every invoice in the Invoices/ folder
+        self.process_all_callback = process_all_callback
+
+        # Callback function to cancel the batch of invoices being processed
+        self.cancel_callback = cancel_callback
+
         # Callback to read a file's contents for the native editor/viewer window
         self.read_file_callback = read_file_callback
 
@@ -116,13 +158,19 @@ class InvoiceAppDisplay(tk.Tk):
         # Callback to persist a single changed user setting (theme/font/size)
         self.save_settings_callback = save_settings_callback
 
-        # Callback to copy a selected invoice into the Invoices/ folder, used by
+        # Callback to copy the selected invoices into the Invoices/ folder, used by
         # the Invoice Discovery window
-        self.copy_invoice_callback = copy_invoice_callback
+        self.import_invoices_callback = import_invoices_callback
+
+        # Callback to search the text of every invoice, used by the search box
+        self.search_callback = search_callback
 
         # Callback to trigger an on-demand update check from the Help menu
         self.check_for_updates_callback = check_for_updates_callback
 
+        # How long each stage of processing took, shown in the Performance window
+        self.stage_timings = StageTimings() if stage_timings is None else stage_timings
+
         # Restore the user's last-chosen settings, falling back to the defaults
         # for anything missing or unrecognized. These are set before build_widgets()
         # so every widget is created already using the restored theme and font.
@@ -134,6 +182,31 @@ class InvoiceAppDisplay(tk.Tk):
         self.current_font_size = self._parse_font_size(
             settings.get(SETTING_KEY_FONT_SIZE)
         )
+        self.current_export_format = settings.get(
+            SETTING_KEY_EXPORT_FORMAT, EXPORT_FORMAT_NONE
+        )
+        if self.current_export_format not in EXPORT_FORMATS:
+            self.current_export_format = EXPORT_FORMAT_NONE
+
+        # Whether new invoices are processed as they land in the Invoices/ folder, shown as
+        # a checkbox in the Preferences menu
+        self.watch_folder = tk.BooleanVar(
+            value=settings.get(SETTING_KEY_WATCH_FOLDER) == WATCH_FOLDER_ON
+        )
+
+        # Whether each stage of processing is timed, shown as a checkbox in the Preferences menu
+        self.record_stage_timings = tk.BooleanVar(
+            value=settings.get(SETTING_KEY_STAGE_TIMINGS) == STAGE_TIMINGS_ON
+        )
+
+        # The results and progress of a batch are drawn together on a fixed cadence,
+        # rather than redrawing the window as each invoice finishes
+        self.batch_updates = UpdateCoalescer(
+            after=self.after, flush=self._draw_batch_updates
+        )
+
+        # Latest progress of the running batch, waiting to be drawn
+        self.pending_progress: BatchProgress | None = None
 
         # Tkinter Widgets
         # fmt:off
@@ -147,15 +220,28 @@ class InvoiceAppDisplay(tk.Tk):
         self.file_frame:                  tk.Frame                   | None = None
         self.file_entry:                  tk.Entry                   | None = None
         self.browse_button:               tk.Button                  | None = None
+        self.search_frame:                tk.Frame                   | None = None
+        self.search_entry:                tk.Entry                   | None = None
+        self.search_button:               tk.Button                  | None = None
         self.button_frame:                tk.Frame                   | None = None
         self.process_invoice_button:      tk.Button                  | None = None
         self.exit_button:                 tk.Button                  | None = None
         self.process_all_invoices_button: tk.Button                  | None = None
         self.discover_invoices_button:    tk.Button                  | None = None
+        self.progress_frame:              tk.Frame                   | None = None
+        self.progress_bar:                ttk.Progressbar            | None = None
+        self.progress_label:              tk.Label                   | None = None
+        self.cancel_button:               tk.Button                  | None = None
         self.output_label:                tk.Label                   | None = None
+        self.results_table:               ResultsTable               | None = None
+        self.mismatch_panel:              MismatchPanel              | None = None
         self.output_box:                  scrolledtext.ScrolledText  | None = None
         # fmt:on
 
+        # Style for the progress bar, which as a ttk widget is themed through a ttk.Style
+        # rather than its own options
+        self.progress_style: ttk.Style | None = None
+
         # Hover tooltips attached to the buttons, kept so they can be restyled
         # when the user changes the theme or font at runtime
         self.tooltips: list[Tooltip] = []
@@ -213,6 +299,9 @@ class InvoiceAppDisplay(tk.Tk):
         #  -> Theme option to select from available color themes
         #  -> Font option to select the font family used throughout the application
         #  -> Font Size option to adjust the text size throughout the application
+        #  -> Export option to also write each processed invoice to a CSV or JSON Lines file
+        #  -> Watch Invoices Folder option to process new invoices as they land in Invoices/
+        #  -> Record Stage Timings option to time each stage of processing, for Help -> Performance
         self.preferences_menu = tk.Menu(self.menu_bar, tearoff=0)
 
         theme_menu = tk.Menu(self.preferences_menu, tearoff=0)
@@ -239,12 +328,33 @@ class InvoiceAppDisplay(tk.Tk):
             )
         self.preferences_menu.add_cascade(label="Font Size", menu=font_size_menu)
 
+        export_menu = tk.Menu(self.preferences_menu, tearoff=0)
+        for export_format in EXPORT_FORMATS:
+            export_menu.add_command(
+                label=export_format,
+                command=lambda f=export_format: self.apply_export_format(f),
+            )
+        self.preferences_menu.add_cascade(label="Export", menu=export_menu)
+
+        self.preferences_menu.add_checkbutton(
+            label="Watch Invoices Folder",
+            variable=self.watch_folder,
+            command=lambda: self.apply_watch_folder(self.watch_folder.get()),
+        )
+
+        self.preferences_menu.add_checkbutton(
+            label="Record Stage Timings",
+            variable=self.record_stage_timings,
+            command=lambda: self.apply_stage_timings(self.record_stage_timings.get()),
+        )
+
         self.menu_bar.add_cascade(label="Preferences", menu=self.preferences_menu)
 
         # Help dropdown
         #  -> About option to show the current application version
         #  -> Check for Updates option to manually check for a newer release
         #  -> Open User Guide option to view the bundled USER_GUIDE.txt in-app
+        #  -> Performance option to show how long each stage of the last batch took
         self.help_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.help_menu.add_command(label="About", command=self.handle_about)
         self.help_menu.add_command(
@@ -253,6 +363,7 @@ class InvoiceAppDisplay(tk.Tk):
         self.help_menu.add_command(
             label="Open User Guide", command=self.handle_open_user_guide
         )
+        self.help_menu.add_command(label="Performance", command=self.handle_performance)
         self.menu_bar.add_cascade(label="Help", menu=self.help_menu)
 
         # Configure the menu bar
@@ -298,6 +409,36 @@ class InvoiceAppDisplay(tk.Tk):
         )
         self.browse_button.pack(side="left", padx=(10, 0), pady=8)
 
+        # Search frame, to search the text of every invoice for e.g. a part number
+        self.search_frame = tk.Frame(self, bg=self.current_theme.bg_main)
+        self.search_frame.pack(padx=20, fill="x")
+
+        self.search_entry = tk.Entry(
+            self.search_frame,
+            textvariable=self.search_query,
+            width=50,
+            bg=self.current_theme.bg_entry,
+            fg=self.current_theme.fg_text,
+            insertbackground=self.current_theme.fg_text,
+            relief="flat",
+        )
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=(0, 5), pady=8)
+        self.search_entry.bind("<Return>", lambda _event: self.handle_search())
+
+        # Search button to search the invoices for the words in the search box
+        self.search_button = tk.Button(
+            self.search_frame,
+            text="Search",
+            command=self.handle_search,
+            bg=self.current_theme.button_bg,
+            fg=self.current_theme.button_fg,
+            activebackground=self.current_theme.accent,
+            activeforeground=self.current_theme.fg_text,
+            relief="flat",
+            font=(self.current_font_family, self.current_font_size, "bold"),
+        )
+        self.search_button.pack(side="left", padx=(10, 0), pady=8)
+
         # Action buttons frame
         self.button_frame = tk.Frame(self, bg=self.current_theme.bg_main)
         self.button_frame.pack(pady=20)
@@ -361,6 +502,48 @@ class InvoiceAppDisplay(tk.Tk):
         )
         self.discover_invoices_button.grid(row=0, column=2, padx=10)
 
+        # Progress of the batch being processed: a bar, a status line with the rate and
+        # estimated time left, and a button to cancel the batch between invoices
+        self.progress_frame = tk.Frame(self, bg=self.current_theme.bg_main)
+        self.progress_frame.pack(padx=20, pady=(0, 10), fill="x")
+
+        self.progress_style = ttk.Style(self)
+        self._style_progress_bar()
+
+        self.progress_bar = ttk.Progressbar(
+            self.progress_frame,
+            style="Invoice.Horizontal.TProgressbar",
+            mode="determinate",
+        )
+        self.progress_bar.grid(row=0, column=0, sticky="ew")
+
+        self.cancel_button = tk.Button(
+            self.progress_frame,
+            text="Cancel",
+            command=self.handle_cancel,
+            state="disabled",
+            bg=self.current_theme.bg_entry,
+            fg=self.current_theme.fg_text,
+            activebackground=RED,
+            activeforeground=self.current_theme.fg_text,
+            relief="flat",
+            font=(self.current_font_family, self.current_font_size, "bold"),
+        )
+        self.cancel_button.grid(row=0, column=1, padx=(10, 0))
+
+        self.progress_label = tk.Label(
+            self.progress_frame,
+            text="",
+            anchor="w",
+            font=(self.current_font_family, self.current_font_size),
+            bg=self.current_theme.bg_main,
+            fg=self.current_theme.label_fg,
+        )
+        self.progress_label.grid(row=1, column=0, columnspan=2, sticky="w")
+
+        # Let the bar take up whatever width the Cancel button leaves
+        self.progress_frame.columnconfigure(0, weight=1)
+
         # Output Label before text results
         self.output_label = tk.Label(
             self,
@@ -371,7 +554,28 @@ class InvoiceAppDisplay(tk.Tk):
         )
         self.output_label.pack(anchor="w", padx=22, pady=(0, 2))
 
-        # Output box to display invoice results
+        # Table with a row per processed invoice, which can be sorted and filtered.
+        # Selecting a row shows that invoice's breakdown in the output box below
+        self.results_table = ResultsTable(
+            self,
+            theme=self.current_theme,
+            font_family=self.current_font_family,
+            font_size=self.current_font_size,
+            on_select=self.show_invoice_detail,
+        )
+        self.results_table.pack(padx=20, pady=(0, 6), fill="both", expand=True)
+
+        # Invoices whose calculated total does not match their listed total, listed as
+        # they are found rather than each halting the batch with a popup
+        self.mismatch_panel = MismatchPanel(
+            self,
+            theme=self.current_theme,
+            font_family=self.current_font_family,
+            font_size=self.current_font_size,
+        )
+        self.mismatch_panel.pack(padx=20, pady=(0, 6), fill="x")
+
+        # Output box to display the breakdown of the selected invoice, or search results
         self.output_box = scrolledtext.ScrolledText(
             self,
             height=8,
@@ -401,7 +605,15 @@ class InvoiceAppDisplay(tk.Tk):
             self.discover_invoices_button,
             "Copy downloaded invoice PDFs into the Invoices/ folder",
         )
+        self._attach_tooltip(
+            self.search_button,
+            "Search the text of every invoice in the Invoices/ folder",
+        )
         self._attach_tooltip(self.exit_button, "Close the application")
+        self._attach_tooltip(
+            self.cancel_button,
+            "Stop processing after the invoice currently being processed",
+        )
 
     ###########################################################################
     ###               InvoiceAppDisplay -> _attach_tooltip()               ###
@@ -440,6 +652,19 @@ class InvoiceAppDisplay(tk.Tk):
                 self.current_font_size,
             )
 
+    ###########################################################################
+    ###             InvoiceAppDisplay -> _style_progress_bar()              ###
+    ###########################################################################
+    def _style_progress_bar(self):
+        """
+        Colors the progress bar with the current theme
+        """
+        self.progress_style.configure(
+            "Invoice.Horizontal.TProgressbar",
+            troughcolor=self.current_theme.bg_entry,
+            background=self.current_theme.accent,
+        )
+
     ###########################################################################
     ###             InvoiceAppDisplay -> handle_browse_button()             ###
     ###########################################################################
@@ -466,27 +691,100 @@ class InvoiceAppDisplay(tk.Tk):
     ###########################################################################
     def display_invoice_output(self, invoice: Invoice, append_output: bool = False):
         """
-        Displays the calculated totals of the invoice in the output box
+        Adds a processed invoice to the results table. A single invoice replaces the
+        table and has its breakdown shown in the output box straight away, while each
+        invoice of a batch is only added as a row, so its breakdown is not formatted
+        unless the user selects it
 
         Args:
             invoice (Invoice): The processed invoice containing calculated totals
-            append_output (bool): Whether to append to the output box or clear it first before writing
-                                    Defaults to False, meaning the output box will be cleared before writing
+            append_output (bool): Whether to add to the invoices already in the table or clear it first.
+                                    Invoices added are drawn every GUI_UPDATE_INTERVAL_MS, not immediately
+                                    Defaults to False, meaning the table will be cleared before adding
         """
 
-        # Clear the output box if not appending
-        if not append_output:
-            # Make sure output box was initialized before trying to clear it
-            if self.output_box:
-                self.output_box.delete(1.0, tk.END)
-                self.output_box.insert(tk.END, invoice.to_formatted_string())
+        # Each invoice of a batch is drawn along with the others that finish around it
+        if append_output:
+            self.batch_updates.post(invoice)
+            return
 
-        # If appending, insert a newline before adding the new output
-        else:
-            # Make sure output_box was initialized before trying to insert
-            if self.output_box:
-                self.output_box.insert(tk.END, "\n")
-                self.output_box.insert(tk.END, invoice.to_formatted_string())
+        # Draw any invoices still waiting first, so they are cleared along with the rest
+        self.batch_updates.flush_now()
+
+        # Make sure the results table was initialized before trying to add to it
+        if self.results_table:
+            self.results_table.clear()
+            self.results_table.add(invoice)
+
+        self.show_invoice_detail(invoice)
+
+    ###########################################################################
+    ###             InvoiceAppDisplay -> show_invoice_detail()              ###
+    ###########################################################################
+    def show_invoice_detail(self, invoice: Invoice):
+        """
+        Shows the full breakdown of an invoice in the output box
+
+        Args:
+            invoice (Invoice): The processed invoice to show
+        """
+
+        # Make sure output box was initialized before trying to write to it
+        if self.output_box:
+            self.output_box.delete(1.0, tk.END)
+            self.output_box.insert(tk.END, invoice.to_formatted_string())
+
+    ###########################################################################
+    ###                InvoiceAppDisplay -> handle_search()                 ###
+    ###########################################################################
+    def handle_search(self):
+        """
+        On "Search" button press (or Enter in the search box), searches the text of
+        every invoice for the words in the search box by forwarding the call to the
+        provided search_callback, then lists the matching pages in the output box
+        """
+
+        query = self.search_query.get().strip()
+
+        # If nothing was typed, there is nothing to search for
+        if not query:
+            return
+
+        try:
+            results = self.search_callback(query)
+
+        except Exception as e:
+            self.show_popup(
+                title="Search Error",
+                message=f"An error occurred while searching invoices: {e}",
+            )
+            return
+
+        self.display_search_results(query=query, results=results)
+
+    ###########################################################################
+    ###            InvoiceAppDisplay -> display_search_results()            ###
+    ###########################################################################
+    def display_search_results(self, query: str, results: list[SearchResult]):
+        """
+        Replaces the contents of the output box with the results of a search
+
+        Args:
+            query (str): The words that were searched for
+            results (list[SearchResult]): The matching invoice pages, best match first
+        """
+
+        lines = [f'Search results for "{query}": {len(results)} match(es)']
+        for result in results:
+            lines.append(
+                f"{result.invoice_filepath.name}, page {result.page_number}: "
+                f"{result.snippet}"
+            )
+
+        # Make sure output box was initialized before trying to write to it
+        if self.output_box:
+            self.output_box.delete(1.0, tk.END)
+            self.output_box.insert(tk.END, "\n".join(lines) + "\n")
 
     ###########################################################################
     ###            InvoiceAppDisplay -> handle_process_invoice()            ###
@@ -519,16 +817,13 @@ class InvoiceAppDisplay(tk.Tk):
     def handle_process_all_invoices(self):
         """
         On "Process All Invoices" button press, processes all invoice PDF files in the specified invoices directory
-        by iterating through each file and calling the process_callback function for each one.
+        by forwarding the call to the provided process_all_callback function specified during construction.
         This will append the output to the results.txt file and output widget.
         """
 
         try:
-            # Loop through all invoice files in the invoices directory and process each one
-            for file_path in INVOICES_PATH.resolve().iterdir():
-
-                # Process each invoice, appending output to the results.txt file and output widget
-                self.process_callback(file_path, append_output=True)
+            # Process every invoice, appending output to the results.txt file and output widget
+            self.process_all_callback()
 
         except Exception as e:
             self.show_popup(
@@ -536,6 +831,185 @@ class InvoiceAppDisplay(tk.Tk):
                 message=f"An error occurred while processing invoices: {e}",
             )
 
+    ###########################################################################
+    ###                InvoiceAppDisplay -> handle_cancel()                 ###
+    ###########################################################################
+    def handle_cancel(self):
+        """
+        On "Cancel" button press, asks the running batch to stop before its next invoice
+        by forwarding the call to the provided cancel_callback function specified during
+        construction. The invoice already being processed is still finished and output.
+        """
+
+        self.cancel_button.configure(state="disabled")
+        self.progress_label.configure(text="Cancelling after the current invoice...")
+        self.cancel_callback()
+
+    ###########################################################################
+    ###             InvoiceAppDisplay -> show_batch_started()               ###
+    ###########################################################################
+    def show_batch_started(self, total: int):
+        """
+        Prepares the window for a batch of invoices being processed in the background:
+        the process buttons are disabled until it finishes, and Cancel is enabled
+
+        Args:
+            total (int): The number of invoices in the batch
+        """
+
+        self.process_invoice_button.configure(state="disabled")
+        self.process_all_invoices_button.configure(state="disabled")
+        self.cancel_button.configure(state="normal")
+
+        self.progress_bar.configure(maximum=max(total, 1), value=0)
+        self.progress_label.configure(text=f"Processing 0 of {total} invoices...")
+
+        self.pending_progress = None
+        self.batch_updates.reset_counts()
+
+        # Only the mismatches of the batch being processed are listed
+        self.mismatch_panel.clear()
+
+    ###########################################################################
+    ###             InvoiceAppDisplay -> show_batch_progress()              ###
+    ###########################################################################
+    def show_batch_progress(self, progress: BatchProgress):
+        """
+        Updates the progress bar and status line as each invoice in the batch finishes.
+        Only the latest progress is drawn, along with the batch's other updates
+
+        Args:
+            progress (BatchProgress): How far through the batch processing is
+        """
+
+        self.pending_progress = progress
+        self.batch_updates.schedule()
+
+    ###########################################################################
+    ###             InvoiceAppDisplay -> _draw_batch_updates()              ###
+    ###########################################################################
+    def _draw_batch_updates(self, invoices: list[Invoice]):
+        """
+        Draws the invoices finished since the last update as rows of the results table,
+        redrawing it once, then the latest progress of the batch
+
+        Args:
+            invoices (list[Invoice]): The invoices finished since the last update
+        """
+
+        if invoices and self.results_table:
+            with self.stage_timings.time(STAGE_DRAW_RESULTS):
+                self.results_table.add_many(invoices)
+
+        progress, self.pending_progress = self.pending_progress, None
+        if progress is not None:
+            self._draw_batch_progress(progress)
+
+    ###########################################################################
+    ###             InvoiceAppDisplay -> _draw_batch_progress()             ###
+    ###########################################################################
+    def _draw_batch_progress(self, progress: BatchProgress):
+        """
+        Draws the progress bar and status line
+
+        Args:
+            progress (BatchProgress): How far through the batch processing is
+        """
+
+        if progress.eta_seconds is None:
+            eta = "--:--"
+        else:
+            eta = self._format_duration(progress.eta_seconds)
+
+        self.progress_bar.configure(value=progress.completed)
+        self.progress_label.configure(
+            text=(
+                f"Processed {progress.completed} of {progress.total} invoices  |  "
+                f"{progress.files_per_second:.1f} files/sec  |  ETA {eta}"
+            )
+        )
+
+    ###########################################################################
+    ###             InvoiceAppDisplay -> show_batch_finished()              ###
+    ###########################################################################
+    def show_batch_finished(self, progress: BatchProgress, cancelled: bool):
+        """
+        Restores the window once a batch has finished or been cancelled, first drawing
+        any results still waiting, and reports how many screen updates the batch's
+        results were drawn in
+
+        Args:
+            progress (BatchProgress): The final progress of the batch
+            cancelled (bool): Whether the batch was cancelled before it completed
+        """
+
+        self.batch_updates.flush_now()
+
+        self.process_invoice_button.configure(state="normal")
+        self.process_all_invoices_button.configure(state="normal")
+        self.cancel_button.configure(state="disabled")
+
+        if cancelled:
+            text = f"Cancelled after {progress.completed} of {progress.total} invoices"
+        else:
+            text = (
+                f"Processed {progress.completed} of {progress.total} invoices in "
+                f"{self._format_duration(progress.elapsed)}"
+            )
+
+        # Results shown immediately, e.g. a single invoice, need no mention
+        if self.batch_updates.posted_count:
+            text += (
+                f"  |  {self.batch_updates.posted_count} results drawn in "
+                f"{self.batch_updates.flush_count} screen updates"
+            )
+
+        self.progress_label.configure(text=text)
+
+    ###########################################################################
+    ###             InvoiceAppDisplay -> show_total_mismatch()              ###
+    ###########################################################################
+    def show_total_mismatch(self, mismatch: TotalMismatch):
+        """
+        Lists an invoice whose calculated total does not match its listed total in
+        the mismatch panel, without interrupting the batch
+
+        Args:
+            mismatch (TotalMismatch): The invoice whose totals do not match
+        """
+
+        self.mismatch_panel.add(mismatch)
+
+    ###########################################################################
+    ###            InvoiceAppDisplay -> show_mismatch_summary()             ###
+    ###########################################################################
+    def show_mismatch_summary(self, summary: str):
+        """
+        Shows the summary of a finished batch's total mismatches in the mismatch panel
+
+        Args:
+            summary (str): The summary of the batch's mismatches
+        """
+
+        self.mismatch_panel.set_summary(summary)
+
+    ###########################################################################
+    ###              InvoiceAppDisplay -> _format_duration()                ###
+    ###########################################################################
+    def _format_duration(self, seconds: float) -> str:
+        """
+        Formats a duration for the progress status line
+
+        Args:
+            seconds (float): The duration in seconds
+
+        Returns:
+            str: The duration as minutes and seconds, e.g. "2:05"
+        """
+
+        minutes, seconds = divmod(round(seconds), 60)
+        return f"{minutes}:{seconds:02d}"
+
     ###########################################################################
     ###          InvoiceAppDisplay -> handle_discover_invoices()            ###
     ###########################################################################
@@ -551,7 +1025,7 @@ class InvoiceAppDisplay(tk.Tk):
             theme=self.current_theme,
             font_family=self.current_font_family,
             font_size=self.current_font_size,
-            copy_callback=self.copy_invoice_callback,
+            import_callback=self.import_invoices_callback,
         )
 
     ###########################################################################
@@ -601,6 +1075,23 @@ class InvoiceAppDisplay(tk.Tk):
             text_height=35,
         )
 
+    ###########################################################################
+    ###              InvoiceAppDisplay -> handle_performance()              ###
+    ###########################################################################
+    def handle_performance(self):
+        """
+        On "Performance" menu press, opens a window showing how long each stage of
+        processing took during the last batch, themed to match the rest of the
+        application.
+        """
+        PerformanceWindow(
+            parent=self,
+            stage_timings=self.stage_timings,
+            theme=self.current_theme,
+            font_family=self.current_font_family,
+            font_size=self.current_font_size,
+        )
+
     ###########################################################################
     ###                  InvoiceAppDisplay -> show_popup()                  ###
     ###########################################################################
@@ -684,9 +1175,12 @@ class InvoiceAppDisplay(tk.Tk):
     ###########################################################################
     def handle_clear(self):
         """
-        Clears the output box and resets the selected file path
+        Clears the results table and output box, and resets the selected file path
         """
         self.selected_file.set("")
+        self.batch_updates.flush_now()
+        if self.results_table:
+            self.results_table.clear()
         if self.output_box:
             self.output_box.delete(1.0, tk.END)
 
@@ -759,6 +1253,37 @@ class InvoiceAppDisplay(tk.Tk):
                 message=missing_message,
             )
 
+    ###########################################################################
+    ###               InvoiceAppDisplay -> _open_log_viewer()               ###
+    ###########################################################################
+    def _open_log_viewer(self, log_path: Path, title: str, missing_message: str):
+        """
+        Opens a log viewer window following the given log file if it exists. Unlike
+        the read-only file viewer, the log is never read in full, so logs of any size
+        open straight away. Shows an error popup with the provided message if the
+        file is not present.
+
+        Args:
+            log_path (Path): The log file to view
+            title (str): The title to display on the viewer window
+            missing_message (str): The popup message shown when the file does not
+                exist
+        """
+        if log_path.exists():
+            LogViewerWindow(
+                parent=self,
+                title=title,
+                log_path=log_path,
+                theme=self.current_theme,
+                font_family=self.current_font_family,
+                font_size=self.current_font_size,
+            )
+        else:
+            self.show_popup(
+                title="File Not Found",
+                message=missing_message,
+            )
+
     ###########################################################################
     ###             InvoiceAppDisplay -> handle_cost_criteria()             ###
     ###########################################################################
@@ -791,10 +1316,10 @@ class InvoiceAppDisplay(tk.Tk):
     ###########################################################################
     def handle_results_log(self):
         """
-        Opens the results log file in a native read-only viewer window if it
-        exists. Shows an error popup if the file has not been created yet.
+        Opens the results log file in a log viewer window if it exists. Shows an
+        error popup if the file has not been created yet.
         """
-        self._open_readonly_file_viewer(
+        self._open_log_viewer(
             RESULTS_LOG_PATH,
             "Results Log",
             f"Log not found at: {RESULTS_LOG_PATH}. Process an invoice to generate the log.",
@@ -805,10 +1330,10 @@ class InvoiceAppDisplay(tk.Tk):
     ###########################################################################
     def handle_debug_log(self):
         """
-        Opens the debug log file in a native read-only viewer window if it exists.
-        Shows an error popup if the file has not been created yet.
+        Opens the debug log file in a log viewer window if it exists. Shows an
+        error popup if the file has not been created yet.
         """
-        self._open_readonly_file_viewer(
+        self._open_log_viewer(
             DEBUG_LOG_PATH,
             "Debug Log",
             f"Log not found at: {DEBUG_LOG_PATH}. Process an invoice to generate the log.",
@@ -838,6 +1363,16 @@ class InvoiceAppDisplay(tk.Tk):
             activebackground=theme.accent,
             activeforeground=theme.fg_text,
         )
+        self.search_frame.configure(bg=theme.bg_main)
+        self.search_entry.configure(
+            bg=theme.bg_entry, fg=theme.fg_text, insertbackground=theme.fg_text
+        )
+        self.search_button.configure(
+            bg=theme.button_bg,
+            fg=theme.button_fg,
+            activebackground=theme.accent,
+            activeforeground=theme.fg_text,
+        )
         self.button_frame.configure(bg=theme.bg_main)
         self.process_invoice_button.configure(
             bg=theme.button_bg,
@@ -862,7 +1397,25 @@ class InvoiceAppDisplay(tk.Tk):
             activebackground=theme.accent,
             activeforeground=theme.fg_text,
         )
+        self.progress_frame.configure(bg=theme.bg_main)
+        self.progress_label.configure(bg=theme.bg_main, fg=theme.label_fg)
+        self.cancel_button.configure(
+            bg=theme.bg_entry,
+            fg=theme.fg_text,
+            activeforeground=theme.fg_text,
+        )
+        self._style_progress_bar()
         self.output_label.configure(bg=theme.bg_main, fg=theme.label_fg)
+        self.results_table.apply_style(
+            theme=theme,
+            font_family=self.current_font_family,
+            font_size=self.current_font_size,
+        )
+        self.mismatch_panel.apply_style(
+            theme=theme,
+            font_family=self.current_font_family,
+            font_size=self.current_font_size,
+        )
         self.output_box.configure(
             bg=theme.bg_entry, fg=theme.fg_text, insertbackground=theme.fg_text
         )
@@ -873,6 +1426,59 @@ class InvoiceAppDisplay(tk.Tk):
         # Persist the choice so it is restored on the next launch
         self.save_settings_callback(SETTING_KEY_THEME, theme.name)
 
+    ###########################################################################
+    ###             InvoiceAppDisplay -> apply_export_format()              ###
+    ###########################################################################
+    def apply_export_format(self, export_format: str):
+        """
+        Chooses the machine-readable format each processed invoice is exported in,
+        alongside results.txt
+
+        Args:
+            export_format (str): One of EXPORT_FORMATS, where EXPORT_FORMAT_NONE
+                turns exporting off
+        """
+        self.current_export_format = export_format
+
+        # Persist the choice, which also applies it to the invoices processed from now on
+        self.save_settings_callback(SETTING_KEY_EXPORT_FORMAT, export_format)
+
+    ###########################################################################
+    ###              InvoiceAppDisplay -> apply_watch_folder()              ###
+    ###########################################################################
+    def apply_watch_folder(self, enabled: bool):
+        """
+        Turns on or off processing new invoices as they land in the Invoices/ folder
+
+        Args:
+            enabled (bool): Whether to watch the Invoices/ folder
+        """
+        self.watch_folder.set(enabled)
+
+        # Persist the choice, which also starts or stops the controller watching the folder
+        self.save_settings_callback(
+            SETTING_KEY_WATCH_FOLDER, WATCH_FOLDER_ON if enabled else WATCH_FOLDER_OFF
+        )
+
+    ###########################################################################
+    ###             InvoiceAppDisplay -> apply_stage_timings()              ###
+    ###########################################################################
+    def apply_stage_timings(self, enabled: bool):
+        """
+        Turns on or off timing each stage of processing, for the Performance window
+        and the stage timings written at the end of each batch
+
+        Args:
+            enabled (bool): Whether to time each stage of processing
+        """
+        self.record_stage_timings.set(enabled)
+
+        # Persist the choice, which also starts or stops the controller timing each stage
+        self.save_settings_callback(
+            SETTING_KEY_STAGE_TIMINGS,
+            STAGE_TIMINGS_ON if enabled else STAGE_TIMINGS_OFF,
+        )
+
     ###########################################################################
     ###              InvoiceAppDisplay -> apply_font_family()               ###
     ###########################################################################
@@ -937,11 +1543,26 @@ class InvoiceAppDisplay(tk.Tk):
         font = (self.current_font_family, self.current_font_size, "bold")
         self.title_label.configure(font=font)
         self.browse_button.configure(font=font)
+        self.search_button.configure(font=font)
         self.process_invoice_button.configure(font=font)
         self.exit_button.configure(font=font)
         self.process_all_invoices_button.configure(font=font)
         self.discover_invoices_button.configure(font=font)
+        self.cancel_button.configure(font=font)
+        self.progress_label.configure(
+            font=(self.current_font_family, self.current_font_size)
+        )
         self.output_label.configure(font=font)
+        self.results_table.apply_style(
+            theme=self.current_theme,
+            font_family=self.current_font_family,
+            font_size=self.current_font_size,
+        )
+        self.mismatch_panel.apply_style(
+            theme=self.current_theme,
+            font_family=self.current_font_family,
+            font_size=self.current_font_size,
+        )
         self.output_box.configure(font=font)
 
         # Keep the hover tooltips consistent with the new font
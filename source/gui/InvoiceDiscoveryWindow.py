@@ -1,16 +1,29 @@
 import tkinter as tk
+from collections import Counter
 from tkinter import filedialog, messagebox, scrolledtext
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterable
 
 from fishbowl_common.gui import Theme, ThemedSubwindow, Tooltip
 
+from source.BatchWorker import BatchProgress, BatchWorker
+from source.InvoiceImporter import ImportOutcome
+
+# Most names of conflicting invoices listed in the overwrite confirmation
+OVERWRITE_PROMPT_MAX_NAMES = 10
+
 
 # InvoiceDiscoveryWindow class to let the user copy downloaded invoice PDFs into
 # the application's Invoices/ folder without leaving the app. The user browses to
 # wherever invoices were downloaded, selects one or more PDFs, copies them in, and
 # can repeat as many times as needed before closing. A running status area shows
 # the outcome of each copy so the workflow needs no other window than ours.
+#
+# Copies run in the background through a BatchWorker, so the window keeps responding
+# while hundreds of PDFs come in from a network share. Files already in Invoices/ with
+# the same contents are skipped without asking; files that would replace different
+# contents are gathered up and the user is asked once, at the end, whether to
+# overwrite all of them.
 # Theme/font snapshotting and centering over the parent are handled by
 # ThemedSubwindow.
 class InvoiceDiscoveryWindow(ThemedSubwindow):
@@ -25,7 +38,7 @@ class InvoiceDiscoveryWindow(ThemedSubwindow):
         theme: Theme,
         font_family: str,
         font_size: int,
-        copy_callback: Callable[[Path, bool], str],
+        import_callback: Callable[[list[Path], bool], Iterable[ImportOutcome]],
     ):
         """
         Initializes the InvoiceDiscoveryWindow object
@@ -37,16 +50,32 @@ class InvoiceDiscoveryWindow(ThemedSubwindow):
                 at open time
             font_family (str): The font family to display the text with
             font_size (int): The font size to display the text with
-            copy_callback (Callable[[Path, bool], str]): Called with a source PDF
-                path and an overwrite flag to copy the file into the Invoices/
-                folder. Returns "copied", "exists", or "error" so this window can
-                confirm overwrites and report each outcome to the user
+            import_callback (Callable[[list[Path], bool], Iterable[ImportOutcome]]):
+                Called on a background thread with the source PDF paths and an
+                overwrite flag to copy the files into the Invoices/ folder. Yields
+                the outcome of each file as it finishes, so this window can report
+                progress and confirm overwrites
         """
 
         super().__init__(parent, title, theme, font_family, font_size)
 
-        # Callback used to copy a selected invoice into the Invoices/ folder
-        self.copy_callback = copy_callback
+        # Callback used to copy the selected invoices into the Invoices/ folder
+        self.import_callback = import_callback
+
+        # Runs each import off the GUI thread. Its polling is scheduled on the parent
+        # window, which outlives this one, so closing mid-import cannot strand it
+        self.import_worker = BatchWorker(after=parent.after)
+
+        # Whether the import in progress is replacing files the user agreed to overwrite
+        self._overwriting = False
+
+        # Number of files of the import in progress with each outcome, and the files
+        # that already exist in Invoices/ with different contents
+        self._outcome_counts: Counter = Counter()
+        self._conflicts: list[Path] = []
+
+        # Set once the window is closed, after which a running import is no longer reported
+        self._closed = False
 
         # Source paths the user has selected and not yet copied. Browsing again
         # adds to this list so the user can gather invoices from several folders
@@ -62,6 +91,7 @@ class InvoiceDiscoveryWindow(ThemedSubwindow):
         self.browse_button:     tk.Button                  | None = None
         self.copy_button:       tk.Button                  | None = None
         self.close_button:      tk.Button                  | None = None
+        self.progress_label:    tk.Label                   | None = None
         self.status_box:        scrolledtext.ScrolledText  | None = None
         # fmt:on
 
@@ -77,7 +107,8 @@ class InvoiceDiscoveryWindow(ThemedSubwindow):
     def build_widgets(self):
         """
         Creates the instruction label, selection display, action buttons
-        (Browse / Copy Invoice(s) / Close), and the read-only status area
+        (Browse / Copy Invoice(s) / Close), the import progress line, and the
+        read-only status area
         """
 
         # Instruction label explaining the workflow
@@ -149,6 +180,16 @@ class InvoiceDiscoveryWindow(ThemedSubwindow):
         )
         self.close_button.grid(row=0, column=2, padx=10)
 
+        # Progress of the import in progress, e.g. "Imported 120 of 500 (40.0 files/s)"
+        self.progress_label = tk.Label(
+            self,
+            text="",
+            font=(self.font_family, self.font_size),
+            bg=self.theme.bg_main,
+            fg=self.theme.label_fg,
+        )
+        self.progress_label.pack(padx=20, pady=(0, 10))
+
         # Read-only status area reporting the outcome of each copy so the user
         # gets feedback without leaving the window
         self.status_box = scrolledtext.ScrolledText(
@@ -238,44 +279,197 @@ class InvoiceDiscoveryWindow(ThemedSubwindow):
     ###########################################################################
     def handle_copy(self):
         """
-        On "Copy Invoice(s)" press, copies each pending invoice into the
-        Invoices/ folder. If a same-named file already exists, asks the user to
-        confirm an overwrite before replacing it. Reports the outcome of each
-        file in the status area, then clears the pending selection.
+        On "Copy Invoice(s)" press, starts copying every pending invoice into the
+        Invoices/ folder in the background, then clears the pending selection. The
+        outcome of each file is reported in the status area as it finishes
         """
 
+        # Only one import runs at a time; the Copy button is disabled during one
+        if self.import_worker.is_running:
+            return
+
         # Nothing to do if the user has not selected any files yet
         if not self.pending_files:
             self._append_status("No files selected. Use Browse to select invoices.")
             return
 
-        for source_path in self.pending_files:
-
-            # Attempt the copy without overwriting first
-            result = self.copy_callback(source_path, False)
-
-            # If a same-named file already exists, confirm before overwriting
-            if result == "exists":
-                overwrite = messagebox.askyesno(
-                    "File Exists",
-                    f"{source_path.name} already exists in the Invoices/ folder. Overwrite it?",
-                )
-                if overwrite:
-                    result = self.copy_callback(source_path, True)
-                else:
-                    self._append_status(f"Skipped {source_path.name} (already exists).")
-                    continue
-
-            # Report the outcome of the copy
-            if result == "copied":
-                self._append_status(f"Copied {source_path.name}.")
-            elif result == "error":
-                self._append_status(f"Failed to copy {source_path.name}.")
-
-        # Clear the pending selection now that it has been processed
+        source_paths = list(self.pending_files)
+
+        # Clear the pending selection now that it is being copied
         self.pending_files.clear()
         self.selection_var.set("")
 
+        self._start_import(source_paths=source_paths, overwrite=False)
+
+    ###########################################################################
+    ###                   InvoiceDiscoveryWindow -> destroy()               ###
+    ###########################################################################
+    def destroy(self):
+        """
+        Stops the import in progress before its next file, then closes the window
+        """
+
+        self._closed = True
+        self.import_worker.cancel()
+        super().destroy()
+
+    ###########################################################################
+    ###               InvoiceDiscoveryWindow -> _start_import()             ###
+    ###########################################################################
+    def _start_import(self, source_paths: list[Path], overwrite: bool):
+        """
+        Starts copying invoices into the Invoices/ folder in the background
+
+        Args:
+            source_paths (list[Path]): The invoice PDFs to copy in
+            overwrite (bool): Whether to replace same-named files whose contents differ
+        """
+
+        self._overwriting = overwrite
+        self._outcome_counts = Counter()
+        self._conflicts = []
+
+        self.copy_button.configure(state="disabled")
+        if overwrite:
+            self._append_status(f"Overwriting {len(source_paths)} invoice(s)...")
+        else:
+            self._append_status(f"Copying {len(source_paths)} invoice(s)...")
+
+        self.import_worker.start(
+            total=len(source_paths),
+            produce_results=lambda: self.import_callback(source_paths, overwrite),
+            on_result=self._report_outcome,
+            on_progress=self._show_progress,
+            on_error=self._report_error,
+            on_finished=self._finish_import,
+        )
+
+    ###########################################################################
+    ###              InvoiceDiscoveryWindow -> _report_outcome()            ###
+    ###########################################################################
+    def _report_outcome(self, outcome: ImportOutcome):
+        """
+        Reports what happened to one file in the status area, remembering files
+        that would need overwriting
+
+        Args:
+            outcome (ImportOutcome): The outcome of copying the file
+        """
+
+        if self._closed:
+            return
+
+        self._outcome_counts[outcome.status] += 1
+        name = outcome.source_path.name
+
+        if outcome.status == "copied":
+            self._append_status(f"Copied {name}.")
+        elif outcome.status == "identical":
+            self._append_status(f"Skipped {name} (identical copy already present).")
+        elif outcome.status == "duplicate":
+            self._append_status(f"Skipped {name} (another file of that name is selected).")
+        elif outcome.status == "exists":
+            self._conflicts.append(outcome.source_path)
+            self._append_status(f"{name} already exists with different contents.")
+        else:
+            self._append_status(f"Failed to copy {name}: {outcome.error}")
+
+    ###########################################################################
+    ###               InvoiceDiscoveryWindow -> _show_progress()            ###
+    ###########################################################################
+    def _show_progress(self, progress: BatchProgress):
+        """
+        Shows how many files of the import have finished, and how fast
+
+        Args:
+            progress (BatchProgress): The progress of the import
+        """
+
+        if self._closed:
+            return
+
+        self.progress_label.configure(
+            text=(
+                f"Imported {progress.completed} of {progress.total} "
+                f"({progress.files_per_second:.1f} files/s)"
+            )
+        )
+
+    ###########################################################################
+    ###                InvoiceDiscoveryWindow -> _report_error()            ###
+    ###########################################################################
+    def _report_error(self, error: Exception):
+        """
+        Reports a failure that stopped the import, e.g. the Invoices/ folder could
+        not be created
+
+        Args:
+            error (Exception): The failure
+        """
+
+        if self._closed:
+            return
+
+        self._append_status(f"Import failed: {error}")
+
+    ###########################################################################
+    ###               InvoiceDiscoveryWindow -> _finish_import()            ###
+    ###########################################################################
+    def _finish_import(self, progress: BatchProgress, cancelled: bool):
+        """
+        Summarizes a finished import, then asks once whether to overwrite every file
+        that already exists with different contents
+
+        Args:
+            progress (BatchProgress): The final progress of the import
+            cancelled (bool): Whether the import was stopped early
+        """
+
+        if self._closed:
+            return
+
+        counts = self._outcome_counts
+        self._append_status(
+            f"Done in {progress.elapsed:.1f}s: {counts['copied']} copied, "
+            f"{counts['identical'] + counts['duplicate']} skipped, "
+            f"{counts['error']} failed."
+        )
+
+        conflicts = self._conflicts
+        if conflicts and not self._overwriting and not cancelled:
+            if self._confirm_overwrite(conflicts):
+                self._start_import(source_paths=conflicts, overwrite=True)
+                return
+
+            self._append_status(f"Skipped {len(conflicts)} invoice(s) (already exist).")
+
+        self.copy_button.configure(state="normal")
+
+    ###########################################################################
+    ###             InvoiceDiscoveryWindow -> _confirm_overwrite()          ###
+    ###########################################################################
+    def _confirm_overwrite(self, conflicts: list[Path]) -> bool:
+        """
+        Asks the user once whether to overwrite every invoice that already exists in
+        the Invoices/ folder with different contents
+
+        Args:
+            conflicts (list[Path]): The invoices that would replace existing files
+
+        Returns:
+            bool: Whether the user chose to overwrite all of them
+        """
+
+        names = "\n".join(path.name for path in conflicts[:OVERWRITE_PROMPT_MAX_NAMES])
+        if len(conflicts) > OVERWRITE_PROMPT_MAX_NAMES:
+            names += f"\n...and {len(conflicts) - OVERWRITE_PROMPT_MAX_NAMES} more"
+
+        return messagebox.askyesno(
+            "Files Exist",
+            f"{len(conflicts)} invoice(s) already exist in the Invoices/ folder with "
+            f"different contents:\n\n{names}\n\nOverwrite all of them?",
+        )
+
     ###########################################################################
     ###               InvoiceDiscoveryWindow -> _append_status()            ###
     ###########################################################################
@@ -0,0 +1,324 @@
+import tkinter as tk
+from tkinter import ttk
+from pathlib import Path
+
+from fishbowl_common.gui import Theme, ThemedSubwindow
+
+from source.LogFileIndex import LogFileIndex
+from source.constants import (
+    LOG_FOLLOW_INTERVAL_MS,
+    LOG_VIEWER_INDEX_STEP_BYTES,
+    LOG_VIEWER_VISIBLE_LINES,
+    LOG_VIEWER_WHEEL_LINES,
+)
+
+
+# LogViewerWindow class to show a log file of any size, read-only. The log is indexed by a LogFileIndex
+# a step at a time, and only the lines in view are ever read from disk and drawn, so opening a
+# multi-hundred-MB debug log shows its first lines straight away rather than hanging the app.
+#
+# While "Follow" is ticked, the window checks the log for new lines every LOG_FOLLOW_INTERVAL_MS and
+# keeps the newest lines in view, so a batch's output can be watched as it is written. Scrolling up
+# stops following; scrolling back to the end, or ticking "Follow" again, resumes it.
+class LogViewerWindow(ThemedSubwindow):
+
+    ###########################################################################
+    ###                   LogViewerWindow -> __init__()                     ###
+    ###########################################################################
+    def __init__(
+        self,
+        parent: tk.Misc,
+        title: str,
+        log_path: Path,
+        theme: Theme,
+        font_family: str,
+        font_size: int,
+        visible_lines: int = LOG_VIEWER_VISIBLE_LINES,
+    ):
+        """
+        Initializes the LogViewerWindow object and starts indexing the log
+
+        Args:
+            parent (tk.Misc): The parent window this window is attached to
+            title (str): Title of the viewer window
+            log_path (Path): The log file to show
+            theme (Theme): The color theme to style the window with, snapshotted
+                at open time
+            font_family (str): The font family to display the log with
+            font_size (int): The font size to display the log with
+            visible_lines (int): The number of lines shown at once
+        """
+
+        super().__init__(parent, title, theme, font_family, font_size)
+
+        self.log_index = LogFileIndex(log_path)
+        self.visible_lines = visible_lines
+
+        # Number of the line shown at the top of the window
+        self.first_line = 0
+
+        # Identifier of the scheduled check for new lines, cancelled when the window closes
+        self._poll_id = None
+
+        # Tkinter Widgets
+        # fmt:off
+        self.text_box:          tk.Text         | None = None
+        self.scrollbar:         ttk.Scrollbar   | None = None
+        self.x_scrollbar:       ttk.Scrollbar   | None = None
+        self.control_frame:     tk.Frame        | None = None
+        self.follow:            tk.BooleanVar   | None = None
+        self.follow_checkbox:   tk.Checkbutton  | None = None
+        self.status_label:      tk.Label        | None = None
+        self.close_button:      tk.Button       | None = None
+        # fmt:on
+
+        self.build_widgets()
+
+        # Position the window over the main application window rather than letting
+        # it default to the top-left corner of the screen
+        self._center_over_parent()
+
+        self._poll()
+
+    ###########################################################################
+    ###                 LogViewerWindow -> build_widgets()                  ###
+    ###########################################################################
+    def build_widgets(self):
+        """
+        Creates the read-only text box showing the lines in view with its scrollbar,
+        and the Follow checkbox, status line and Close button beneath it
+        """
+
+        self.text_box = tk.Text(
+            self,
+            height=self.visible_lines,
+            width=100,
+            wrap="none",
+            font=(self.font_family, self.font_size),
+            bg=self.theme.bg_entry,
+            fg=self.theme.fg_text,
+            insertbackground=self.theme.fg_text,
+            relief="flat",
+            state="disabled",
+        )
+        self.text_box.grid(row=0, column=0, sticky="nsew", padx=(20, 0), pady=(20, 0))
+
+        self.text_box.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.text_box.bind("<Button-4>", self._on_mouse_wheel)
+        self.text_box.bind("<Button-5>", self._on_mouse_wheel)
+
+        # The scrollbar moves through every line of the log, not just those drawn
+        self.scrollbar = ttk.Scrollbar(
+            self, orient="vertical", command=self._on_scrollbar
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns", padx=(0, 20), pady=(20, 0))
+
+        # Long lines are not wrapped, so each line of the log is one line on screen
+        self.x_scrollbar = ttk.Scrollbar(
+            self, orient="horizontal", command=self.text_box.xview
+        )
+        self.text_box.configure(xscrollcommand=self.x_scrollbar.set)
+        self.x_scrollbar.grid(row=1, column=0, sticky="ew", padx=(20, 0), pady=(0, 10))
+
+        self.control_frame = tk.Frame(self, bg=self.theme.bg_main)
+        self.control_frame.grid(
+            row=2, column=0, columnspan=2, sticky="ew", padx=20, pady=(0, 20)
+        )
+
+        self.follow = tk.BooleanVar(value=True)
+        self.follow_checkbox = tk.Checkbutton(
+            self.control_frame,
+            text="Follow",
+            variable=self.follow,
+            command=self._on_follow_toggled,
+            bg=self.theme.bg_main,
+            fg=self.theme.label_fg,
+            selectcolor=self.theme.bg_entry,
+            activebackground=self.theme.bg_main,
+            activeforeground=self.theme.label_fg,
+            font=(self.font_family, self.font_size, "bold"),
+        )
+        self.follow_checkbox.pack(side="left")
+
+        self.status_label = tk.Label(
+            self.control_frame,
+            text="",
+            anchor="w",
+            font=(self.font_family, self.font_size),
+            bg=self.theme.bg_main,
+            fg=self.theme.label_fg,
+        )
+        self.status_label.pack(side="left", padx=10, fill="x", expand=True)
+
+        self.close_button = tk.Button(
+            self.control_frame,
+            text="Close",
+            command=self.destroy,
+            bg=self.theme.button_bg,
+            fg=self.theme.button_fg,
+            activebackground=self.theme.accent,
+            activeforeground=self.theme.fg_text,
+            relief="flat",
+            font=(self.font_family, self.font_size, "bold"),
+        )
+        self.close_button.pack(side="right")
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+    ###########################################################################
+    ###                    LogViewerWindow -> destroy()                     ###
+    ###########################################################################
+    def destroy(self):
+        """
+        Stops checking the log for new lines, then closes the window
+        """
+
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+
+        super().destroy()
+
+    ###########################################################################
+    ###                    LogViewerWindow -> refresh()                     ###
+    ###########################################################################
+    def refresh(self):
+        """
+        Draws the lines in view, starting at first_line, and updates the scrollbar
+        and status line to match
+        """
+
+        line_count = self.log_index.line_count
+        last_first_line = max(line_count - self.visible_lines, 0)
+        self.first_line = min(max(self.first_line, 0), last_first_line)
+
+        try:
+            lines = self.log_index.lines(self.first_line, self.visible_lines)
+        except OSError as error:
+            self.status_label.configure(text=f"Could not read the log: {error}")
+            return
+
+        self.text_box.configure(state="normal")
+        self.text_box.delete(1.0, tk.END)
+        self.text_box.insert(tk.END, "\n".join(lines))
+        self.text_box.configure(state="disabled")
+
+        if line_count <= self.visible_lines:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(
+                self.first_line / line_count,
+                (self.first_line + self.visible_lines) / line_count,
+            )
+
+        status = (
+            f"Lines {min(self.first_line + 1, line_count)}-"
+            f"{self.first_line + len(lines)} of {line_count}"
+        )
+        if not self.log_index.fully_indexed:
+            status += (
+                f"  |  Indexing {self.log_index.file_size // (1024 * 1024)} MB log..."
+            )
+        self.status_label.configure(text=status)
+
+    ###########################################################################
+    ###                     LogViewerWindow -> _poll()                      ###
+    ###########################################################################
+    def _poll(self):
+        """
+        Indexes the next step of the log, or any lines written since the last check,
+        redrawing if anything changed. Schedules itself again straight away while
+        there is more of the log to index, or after LOG_FOLLOW_INTERVAL_MS otherwise
+        """
+
+        try:
+            changed = self.log_index.refresh(max_bytes=LOG_VIEWER_INDEX_STEP_BYTES)
+        except OSError as error:
+            # The log may be mid-replace at the end of a batch; try again next time
+            self.status_label.configure(text=f"Could not read the log: {error}")
+            changed = False
+
+        if changed:
+            if self.follow.get():
+                self.first_line = self.log_index.line_count
+            self.refresh()
+
+        if self.log_index.fully_indexed:
+            self._poll_id = self.after(LOG_FOLLOW_INTERVAL_MS, self._poll)
+        else:
+            self._poll_id = self.after(1, self._poll)
+
+    ###########################################################################
+    ###                 LogViewerWindow -> _scroll_to_line()                ###
+    ###########################################################################
+    def _scroll_to_line(self, first_line: int):
+        """
+        Scrolls so a line is at the top. Scrolling away from the end stops following
+        the log, and scrolling back to the end resumes it
+
+        Args:
+            first_line (int): The number of the line to show at the top
+        """
+
+        last_first_line = max(self.log_index.line_count - self.visible_lines, 0)
+        self.follow.set(first_line >= last_first_line)
+
+        if first_line != self.first_line:
+            self.first_line = first_line
+            self.refresh()
+
+    ###########################################################################
+    ###               LogViewerWindow -> _on_follow_toggled()               ###
+    ###########################################################################
+    def _on_follow_toggled(self):
+        """
+        Jumps to the end of the log when Follow is ticked
+        """
+
+        if self.follow.get():
+            self.first_line = self.log_index.line_count
+            self.refresh()
+
+    ###########################################################################
+    ###                  LogViewerWindow -> _on_scrollbar()                 ###
+    ###########################################################################
+    def _on_scrollbar(self, action: str, amount: str, unit: str = ""):
+        """
+        Scrolls as the scrollbar is dragged or clicked
+
+        Args:
+            action (str): "moveto" to jump to a fraction of the way through the log,
+                or "scroll" to move by lines or pages
+            amount (str): The fraction to jump to, or number of lines or pages to move
+            unit (str): "units" or "pages" when scrolling
+        """
+
+        if action == "moveto":
+            self._scroll_to_line(round(float(amount) * self.log_index.line_count))
+        elif action == "scroll":
+            step = self.visible_lines if unit == "pages" else 1
+            self._scroll_to_line(self.first_line + int(amount) * step)
+
+    ###########################################################################
+    ###                 LogViewerWindow -> _on_mouse_wheel()                ###
+    ###########################################################################
+    def _on_mouse_wheel(self, event: tk.Event) -> str:
+        """
+        Scrolls with the mouse wheel, which arrives as a MouseWheel delta on Windows
+        and macOS and as Button-4/Button-5 presses on Linux
+
+        Args:
+            event (tk.Event): The wheel event
+
+        Returns:
+            str: "break", so the text box does not also scroll its own lines
+        """
+
+        if getattr(event, "num", None) == 5 or getattr(event, "delta", 0) < 0:
+            direction = 1
+        else:
+            direction = -1
+
+        self._scroll_to_line(self.first_line + direction * LOG_VIEWER_WHEEL_LINES)
+        return "break"
@@ -0,0 +1,224 @@
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+from fishbowl_common.gui import Theme
+
+from source.MismatchReport import TotalMismatch
+from source.gui.ResultsTable import SORT_ASCENDING_ARROW, SORT_DESCENDING_ARROW
+
+# Columns of the mismatch panel: heading, the text shown for a mismatch, and the key it sorts by
+MISMATCH_COLUMNS = (
+    ("Order", lambda m: m.order_number, lambda m: m.order_number.casefold()),
+    ("Customer", lambda m: m.customer_name, lambda m: m.customer_name.casefold()),
+    ("Calculated", lambda m: f"${m.total}", lambda m: m.total),
+    ("Listed", lambda m: f"${m.listed_total}", lambda m: m.listed_total),
+    ("Difference", lambda m: f"{m.difference_cents:+}¢", lambda m: m.difference_cents),
+)
+
+# Rows of the mismatch panel shown at once
+MISMATCH_PANEL_ROWS = 4
+
+
+# MismatchPanel class to list the invoices whose calculated total does not match their listed total as
+# they are processed, with column headings that sort them, and a summary line once the batch is done.
+# Unlike a popup, nothing here waits on the user, so a batch is never held up by a mismatch.
+#
+# The table shares the "Invoice.Treeview" style the results table configures, so both are themed alike.
+class MismatchPanel(tk.Frame):
+
+    ###########################################################################
+    ###                    MismatchPanel -> __init__()                      ###
+    ###########################################################################
+    def __init__(
+        self, parent: tk.Misc, theme: Theme, font_family: str, font_size: int
+    ):
+        """
+        Initializes the MismatchPanel object, listing no mismatches
+
+        Args:
+            parent (tk.Misc): The widget the panel is placed in
+            theme (Theme): The color theme to style the panel with
+            font_family (str): The font family to display the summary with
+            font_size (int): The font size to display the summary with
+        """
+
+        super().__init__(parent, bg=theme.bg_main)
+
+        # Mismatches listed, in the order shown, along with the key each sorts by
+        self.mismatches: list[TotalMismatch] = []
+        self._sort_keys: list = []
+
+        # Column the mismatches are sorted by, or None to keep them in the order found
+        self.sort_column: int | None = None
+        self.descending = False
+
+        # Tkinter Widgets
+        # fmt:off
+        self.summary_label: tk.Label        | None = None
+        self.tree:          ttk.Treeview    | None = None
+        self.scrollbar:     ttk.Scrollbar   | None = None
+        # fmt:on
+
+        self.build_widgets()
+        self.apply_style(theme=theme, font_family=font_family, font_size=font_size)
+
+    ###########################################################################
+    ###                  MismatchPanel -> build_widgets()                   ###
+    ###########################################################################
+    def build_widgets(self):
+        """
+        Creates the summary line, and the table of mismatches with its scrollbar
+        """
+
+        self.summary_label = tk.Label(self, text="Total mismatches:", anchor="w")
+        self.summary_label.grid(row=0, column=0, columnspan=2, sticky="w")
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=[heading for heading, _text, _key in MISMATCH_COLUMNS],
+            show="headings",
+            height=MISMATCH_PANEL_ROWS,
+            selectmode="browse",
+            style="Invoice.Treeview",
+        )
+        for column, (heading, _text, _key) in enumerate(MISMATCH_COLUMNS):
+            self.tree.heading(
+                heading,
+                text=heading,
+                command=lambda column=column: self.sort_by(column),
+            )
+            self.tree.column(heading, width=90, stretch=True)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(
+            self, orient="vertical", command=self.tree.yview
+        )
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.columnconfigure(0, weight=1)
+
+    ###########################################################################
+    ###                       MismatchPanel -> add()                        ###
+    ###########################################################################
+    def add(self, mismatch: TotalMismatch):
+        """
+        Lists a mismatch, in its sorted position if the panel is sorted
+
+        Args:
+            mismatch (TotalMismatch): The invoice whose totals do not match
+        """
+
+        if self.sort_column is None:
+            index = len(self.mismatches)
+        else:
+            key = MISMATCH_COLUMNS[self.sort_column][2](mismatch)
+            if self.descending:
+                # Keys are stored ascending; the table reads them from the other end
+                index = bisect.bisect_left(self._sort_keys, key)
+                self._sort_keys.insert(index, key)
+                index = len(self._sort_keys) - 1 - index
+            else:
+                index = bisect.bisect_right(self._sort_keys, key)
+                self._sort_keys.insert(index, key)
+
+        self.mismatches.insert(index, mismatch)
+        self.tree.insert("", index, values=self._values(mismatch))
+
+        self.summary_label.configure(
+            text=f"Total mismatches: {len(self.mismatches)} so far"
+        )
+
+    ###########################################################################
+    ###                      MismatchPanel -> clear()                       ###
+    ###########################################################################
+    def clear(self):
+        """
+        Removes every mismatch from the panel, keeping the sort
+        """
+
+        self.mismatches = []
+        self._sort_keys = []
+        self.tree.delete(*self.tree.get_children())
+        self.summary_label.configure(text="Total mismatches:")
+
+    ###########################################################################
+    ###                   MismatchPanel -> set_summary()                    ###
+    ###########################################################################
+    def set_summary(self, summary: str):
+        """
+        Shows the summary of a finished batch's mismatches
+
+        Args:
+            summary (str): The summary, from MismatchReport.summary()
+        """
+
+        self.summary_label.configure(text=f"Total mismatches: {summary}")
+
+    ###########################################################################
+    ###                     MismatchPanel -> sort_by()                      ###
+    ###########################################################################
+    def sort_by(self, column: int):
+        """
+        Sorts the mismatches by a column, reversing the order if they are already
+        sorted by that column
+
+        Args:
+            column (int): The index of the column
+        """
+
+        self.descending = self.sort_column == column and not self.descending
+        self.sort_column = column
+
+        key = MISMATCH_COLUMNS[column][2]
+        ascending = sorted(self.mismatches, key=key)
+        self._sort_keys = [key(mismatch) for mismatch in ascending]
+        self.mismatches = ascending[::-1] if self.descending else ascending
+
+        self.tree.delete(*self.tree.get_children())
+        for mismatch in self.mismatches:
+            self.tree.insert("", tk.END, values=self._values(mismatch))
+
+        for index, (heading, _text, _key) in enumerate(MISMATCH_COLUMNS):
+            if index == column:
+                heading += (
+                    SORT_DESCENDING_ARROW if self.descending else SORT_ASCENDING_ARROW
+                )
+            self.tree.heading(MISMATCH_COLUMNS[index][0], text=heading)
+
+    ###########################################################################
+    ###                   MismatchPanel -> apply_style()                    ###
+    ###########################################################################
+    def apply_style(self, theme: Theme, font_family: str, font_size: int):
+        """
+        Styles the panel with a theme and font
+
+        Args:
+            theme (Theme): The color theme to style the panel with
+            font_family (str): The font family to display the summary with
+            font_size (int): The font size to display the summary with
+        """
+
+        self.configure(bg=theme.bg_main)
+        self.summary_label.configure(
+            bg=theme.bg_main,
+            fg=theme.label_fg,
+            font=(font_family, font_size, "bold"),
+        )
+
+    ###########################################################################
+    ###                     MismatchPanel -> _values()                      ###
+    ###########################################################################
+    def _values(self, mismatch: TotalMismatch) -> tuple[str, ...]:
+        """
+        Returns the text shown in each column for a mismatch
+
+        Args:
+            mismatch (TotalMismatch): The mismatch to show
+
+        Returns:
+            tuple[str, ...]: The text of each column
+        """
+
+        return tuple(text(mismatch) for _heading, text, _key in MISMATCH_COLUMNS)
@@ -0,0 +1,158 @@
+import tkinter as tk
+from tkinter import ttk
+
+from fishbowl_common.gui import Theme, ThemedSubwindow
+
+from source.StageTimings import StageTimings
+from source.constants import TIMED_STAGES
+
+# Columns of the performance table: heading, and the text shown for a stage's summary
+PERFORMANCE_COLUMNS = (
+    ("Stage", lambda stats: stats.stage),
+    ("Runs", lambda stats: f"{stats.count:,}"),
+    ("Total (s)", lambda stats: f"{stats.total_seconds:,.3f}"),
+    ("Median (ms)", lambda stats: f"{stats.p50_seconds * 1000:,.2f}"),
+    ("95th % (ms)", lambda stats: f"{stats.p95_seconds * 1000:,.2f}"),
+    ("Max (ms)", lambda stats: f"{stats.max_seconds * 1000:,.2f}"),
+)
+
+
+# PerformanceWindow class to show how long each stage of processing took during the last batch, so a
+# slow batch can be pinned on extracting text, parsing, drawing the results or writing them out. The
+# figures are read from the StageTimings when the window opens and whenever Refresh is pressed.
+#
+# The table shares the "Invoice.Treeview" style the results table configures, so both are themed alike.
+class PerformanceWindow(ThemedSubwindow):
+
+    ###########################################################################
+    ###                  PerformanceWindow -> __init__()                    ###
+    ###########################################################################
+    def __init__(
+        self,
+        parent: tk.Misc,
+        stage_timings: StageTimings,
+        theme: Theme,
+        font_family: str,
+        font_size: int,
+    ):
+        """
+        Initializes the PerformanceWindow object, showing the timings recorded so far
+
+        Args:
+            parent (tk.Misc): The parent window this window is attached to
+            stage_timings (StageTimings): The timings of the last batch
+            theme (Theme): The color theme to style the window with, snapshotted
+                at open time
+            font_family (str): The font family to display the timings with
+            font_size (int): The font size to display the timings with
+        """
+
+        super().__init__(parent, "Performance", theme, font_family, font_size)
+
+        self.stage_timings = stage_timings
+
+        # Tkinter Widgets
+        # fmt:off
+        self.tree:              ttk.Treeview    | None = None
+        self.control_frame:     tk.Frame        | None = None
+        self.status_label:      tk.Label        | None = None
+        self.refresh_button:    tk.Button       | None = None
+        self.close_button:      tk.Button       | None = None
+        # fmt:on
+
+        self.build_widgets()
+
+        # Position the window over the main application window rather than letting
+        # it default to the top-left corner of the screen
+        self._center_over_parent()
+
+        self.refresh()
+
+    ###########################################################################
+    ###                PerformanceWindow -> build_widgets()                 ###
+    ###########################################################################
+    def build_widgets(self):
+        """
+        Creates the table of stages, and the status line, Refresh and Close buttons
+        beneath it
+        """
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=[heading for heading, _text in PERFORMANCE_COLUMNS],
+            show="headings",
+            height=len(TIMED_STAGES),
+            selectmode="none",
+            style="Invoice.Treeview",
+        )
+        for heading, _text in PERFORMANCE_COLUMNS:
+            self.tree.heading(heading, text=heading)
+            self.tree.column(heading, width=110, anchor="e", stretch=True)
+        self.tree.column("Stage", width=200, anchor="w")
+        self.tree.grid(row=0, column=0, sticky="nsew", padx=20, pady=(20, 10))
+
+        self.control_frame = tk.Frame(self, bg=self.theme.bg_main)
+        self.control_frame.grid(row=1, column=0, sticky="ew", padx=20, pady=(0, 20))
+
+        self.status_label = tk.Label(
+            self.control_frame,
+            text="",
+            anchor="w",
+            font=(self.font_family, self.font_size),
+            bg=self.theme.bg_main,
+            fg=self.theme.label_fg,
+        )
+        self.status_label.pack(side="left", fill="x", expand=True)
+
+        self.close_button = tk.Button(
+            self.control_frame,
+            text="Close",
+            command=self.destroy,
+            bg=self.theme.button_bg,
+            fg=self.theme.button_fg,
+            activebackground=self.theme.accent,
+            activeforeground=self.theme.fg_text,
+            relief="flat",
+            font=(self.font_family, self.font_size, "bold"),
+        )
+        self.close_button.pack(side="right")
+
+        self.refresh_button = tk.Button(
+            self.control_frame,
+            text="Refresh",
+            command=self.refresh,
+            bg=self.theme.button_bg,
+            fg=self.theme.button_fg,
+            activebackground=self.theme.accent,
+            activeforeground=self.theme.fg_text,
+            relief="flat",
+            font=(self.font_family, self.font_size, "bold"),
+        )
+        self.refresh_button.pack(side="right", padx=10)
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+    ###########################################################################
+    ###                   PerformanceWindow -> refresh()                    ###
+    ###########################################################################
+    def refresh(self):
+        """
+        Lists the latest summary of each stage, and says where the figures came from
+        """
+
+        summaries = self.stage_timings.stats()
+
+        self.tree.delete(*self.tree.get_children())
+        for stats in summaries:
+            self.tree.insert(
+                "", "end", values=[text(stats) for _heading, text in PERFORMANCE_COLUMNS]
+            )
+
+        if summaries:
+            status = "Timings of the last batch processed"
+        elif self.stage_timings.enabled:
+            status = "No timings yet. Process some invoices to record them"
+        else:
+            status = "No timings recorded. Turn on Preferences -> Record Stage Timings"
+        self.status_label.configure(text=status)
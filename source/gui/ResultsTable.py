@@ -0,0 +1,420 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+from fishbowl_common.gui import Theme
+
+from source.Invoice import Invoice
+from source.ResultsTableModel import ResultsTableModel
+from source.constants import RESULTS_TABLE_VISIBLE_ROWS, RESULTS_TABLE_WHEEL_ROWS
+
+# Shown after the heading of the column the table is sorted by
+SORT_ASCENDING_ARROW = " ▲"
+SORT_DESCENDING_ARROW = " ▼"
+
+
+# ResultsTable class to show one row per processed invoice, with a box to filter the rows and column
+# headings that sort them. The invoices are held by a ResultsTableModel, and the Treeview only ever
+# holds the handful of rows that fit on screen: scrolling fills those same rows from the model rather
+# than building a row for every invoice, so a batch of tens of thousands of invoices scrolls, sorts and
+# filters as quickly as a batch of ten. The full breakdown of an invoice is only formatted when its row
+# is selected, through on_select.
+class ResultsTable(tk.Frame):
+
+    ###########################################################################
+    ###                     ResultsTable -> __init__()                      ###
+    ###########################################################################
+    def __init__(
+        self,
+        parent: tk.Misc,
+        theme: Theme,
+        font_family: str,
+        font_size: int,
+        on_select: Callable[[Invoice], None] = lambda _: None,
+        visible_rows: int = RESULTS_TABLE_VISIBLE_ROWS,
+    ):
+        """
+        Initializes the ResultsTable object, holding no invoices
+
+        Args:
+            parent (tk.Misc): The widget the table is placed in
+            theme (Theme): The color theme to style the table with
+            font_family (str): The font family to display the rows with
+            font_size (int): The font size to display the rows with
+            on_select (Callable[[Invoice], None]): Called with the invoice of a row
+                when the user selects it
+            visible_rows (int): The number of rows shown at once
+        """
+
+        super().__init__(parent, bg=theme.bg_main)
+
+        self.on_select = on_select
+        self.visible_rows = visible_rows
+
+        # Every invoice in the table, and the order they are shown in
+        self.model = ResultsTableModel()
+
+        # Position of the row shown at the top of the table
+        self.first_row = 0
+
+        # Position of the invoice the user selected, followed as invoices are added
+        # above it, or None if nothing is selected
+        self.selected_row: int | None = None
+
+        # Tkinter Widgets
+        # fmt:off
+        self.filter_label:  tk.Label        | None = None
+        self.filter_text:   tk.StringVar    | None = None
+        self.filter_entry:  tk.Entry        | None = None
+        self.tree:          ttk.Treeview    | None = None
+        self.scrollbar:     ttk.Scrollbar   | None = None
+        self.style:         ttk.Style       | None = None
+        # fmt:on
+
+        self.build_widgets()
+        self.apply_style(theme=theme, font_family=font_family, font_size=font_size)
+
+    ###########################################################################
+    ###                   ResultsTable -> build_widgets()                   ###
+    ###########################################################################
+    def build_widgets(self):
+        """
+        Creates the filter box, the table with its fixed set of rows, and its
+        scrollbar
+        """
+
+        self.filter_label = tk.Label(self, text="Filter:")
+        self.filter_label.grid(row=0, column=0, sticky="w", pady=(0, 4))
+
+        # Filter the rows as the user types
+        self.filter_text = tk.StringVar()
+        self.filter_text.trace_add(
+            "write", lambda *_: self.set_filter(self.filter_text.get())
+        )
+        self.filter_entry = tk.Entry(
+            self, textvariable=self.filter_text, relief="flat"
+        )
+        self.filter_entry.grid(
+            row=0, column=1, columnspan=2, sticky="ew", padx=(6, 0), pady=(0, 4)
+        )
+
+        self.style = ttk.Style(self)
+
+        column_ids = [field for field, _heading in self.model.columns]
+        self.tree = ttk.Treeview(
+            self,
+            columns=column_ids,
+            show="headings",
+            height=self.visible_rows,
+            selectmode="browse",
+            style="Invoice.Treeview",
+        )
+        for column, (field, heading) in enumerate(self.model.columns):
+            self.tree.heading(
+                field,
+                text=heading,
+                command=lambda column=column: self.sort_by(column),
+            )
+            self.tree.column(field, width=90, stretch=True)
+        self.tree.grid(row=1, column=0, columnspan=2, sticky="nsew")
+
+        # The rows of the table are built once, and refilled as it scrolls
+        for index in range(self.visible_rows):
+            self.tree.insert("", tk.END, iid=str(index))
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.tree.bind("<Button-4>", self._on_mouse_wheel)
+        self.tree.bind("<Button-5>", self._on_mouse_wheel)
+
+        # The scrollbar moves through every invoice in view, not just the rows built
+        self.scrollbar = ttk.Scrollbar(
+            self, orient="vertical", command=self._on_scrollbar
+        )
+        self.scrollbar.grid(row=1, column=2, sticky="ns")
+
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self.refresh()
+
+    ###########################################################################
+    ###                        ResultsTable -> add()                        ###
+    ###########################################################################
+    def add(self, invoice: Invoice):
+        """
+        Adds a processed invoice to the table
+
+        Args:
+            invoice (Invoice): The processed invoice
+        """
+
+        self.add_many([invoice])
+
+    ###########################################################################
+    ###                      ResultsTable -> add_many()                     ###
+    ###########################################################################
+    def add_many(self, invoices: list[Invoice]):
+        """
+        Adds processed invoices to the table, redrawing it at most once. The rows are
+        only redrawn if a new invoice lands on or above those on screen; otherwise
+        just the scrollbar changes
+
+        Args:
+            invoices (list[Invoice]): The processed invoices, in the order processed
+        """
+
+        last_row_on_screen = self.first_row + self.visible_rows
+        redraw = False
+        for invoice in invoices:
+            position = self.model.add(invoice)
+            if position is None:
+                continue
+
+            if position < last_row_on_screen:
+                redraw = True
+
+            # A new invoice at or above the selected one pushes it down a row
+            if self.selected_row is not None and position <= self.selected_row:
+                self.selected_row += 1
+
+        if redraw:
+            self.refresh(keep_selection=True)
+        else:
+            self._update_scrollbar()
+
+    ###########################################################################
+    ###                       ResultsTable -> clear()                       ###
+    ###########################################################################
+    def clear(self):
+        """
+        Removes every invoice from the table
+        """
+
+        self.model.clear()
+        self.first_row = 0
+        self.refresh()
+
+    ###########################################################################
+    ###                     ResultsTable -> sort_by()                       ###
+    ###########################################################################
+    def sort_by(self, column: int):
+        """
+        Sorts the table by a column, reversing the order if it is already sorted by
+        that column
+
+        Args:
+            column (int): The index of the column
+        """
+
+        descending = self.model.sort_column == column and not self.model.descending
+        self.model.sort(column=column, descending=descending)
+
+        for index, (field, heading) in enumerate(self.model.columns):
+            if index == column:
+                heading += SORT_DESCENDING_ARROW if descending else SORT_ASCENDING_ARROW
+            self.tree.heading(field, text=heading)
+
+        self.first_row = 0
+        self.refresh()
+
+    ###########################################################################
+    ###                    ResultsTable -> set_filter()                     ###
+    ###########################################################################
+    def set_filter(self, text: str):
+        """
+        Shows only the invoices containing every word of text, in any column
+
+        Args:
+            text (str): The words to filter by
+        """
+
+        self.model.set_filter(text)
+        self.first_row = 0
+        self.refresh()
+
+    ###########################################################################
+    ###                      ResultsTable -> refresh()                      ###
+    ###########################################################################
+    def refresh(self, keep_selection: bool = False):
+        """
+        Fills the rows on screen from the invoices in view, starting at first_row,
+        and hides any rows left over
+
+        Args:
+            keep_selection (bool): Whether to keep the selected invoice selected at
+                its position now, rather than clearing the selection because the
+                invoices have been reordered
+        """
+
+        # Keep the last page of rows full rather than scrolling past the end
+        last_first_row = max(len(self.model) - self.visible_rows, 0)
+        self.first_row = min(max(self.first_row, 0), last_first_row)
+
+        rows = self.model.window(self.first_row, self.visible_rows)
+        for index in range(self.visible_rows):
+            iid = str(index)
+            if index < len(rows):
+                # Moving a row also re-attaches it if it was hidden
+                self.tree.item(iid, values=rows[index].values)
+                self.tree.move(iid, "", index)
+            else:
+                self.tree.detach(iid)
+
+        # The selection belongs to the invoice, which may no longer be in the same row
+        if not keep_selection:
+            self.selected_row = None
+
+        selected_index = (
+            self.selected_row - self.first_row if self.selected_row is not None else -1
+        )
+        if 0 <= selected_index < len(rows):
+            self.tree.selection_set((str(selected_index),))
+        else:
+            self.tree.selection_set(())
+
+        self._update_scrollbar()
+
+    ###########################################################################
+    ###                    ResultsTable -> apply_style()                    ###
+    ###########################################################################
+    def apply_style(self, theme: Theme, font_family: str, font_size: int):
+        """
+        Styles the table with a theme and font
+
+        Args:
+            theme (Theme): The color theme to style the table with
+            font_family (str): The font family to display the rows with
+            font_size (int): The font size to display the rows with
+        """
+
+        self.configure(bg=theme.bg_main)
+        self.filter_label.configure(
+            bg=theme.bg_main,
+            fg=theme.label_fg,
+            font=(font_family, font_size, "bold"),
+        )
+        self.filter_entry.configure(
+            bg=theme.bg_entry,
+            fg=theme.fg_text,
+            insertbackground=theme.fg_text,
+            font=(font_family, font_size),
+        )
+
+        self.style.configure(
+            "Invoice.Treeview",
+            background=theme.bg_entry,
+            fieldbackground=theme.bg_entry,
+            foreground=theme.fg_text,
+            font=(font_family, font_size),
+            rowheight=font_size * 2 + 4,
+        )
+        self.style.configure(
+            "Invoice.Treeview.Heading",
+            background=theme.button_bg,
+            foreground=theme.button_fg,
+            font=(font_family, font_size, "bold"),
+        )
+        self.style.map(
+            "Invoice.Treeview",
+            background=[("selected", theme.accent)],
+            foreground=[("selected", theme.fg_text)],
+        )
+
+    ###########################################################################
+    ###                ResultsTable -> _update_scrollbar()                  ###
+    ###########################################################################
+    def _update_scrollbar(self):
+        """
+        Sizes and places the scrollbar's slider to match the rows on screen out of
+        every invoice in view
+        """
+
+        total = len(self.model)
+        if total <= self.visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+            return
+
+        self.scrollbar.set(
+            self.first_row / total,
+            (self.first_row + self.visible_rows) / total,
+        )
+
+    ###########################################################################
+    ###                 ResultsTable -> _scroll_to_row()                    ###
+    ###########################################################################
+    def _scroll_to_row(self, first_row: int):
+        """
+        Scrolls the table so a row is at the top, redrawing only if it moved
+
+        Args:
+            first_row (int): The position of the row to show at the top
+        """
+
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.refresh()
+
+    ###########################################################################
+    ###                   ResultsTable -> _on_scrollbar()                   ###
+    ###########################################################################
+    def _on_scrollbar(self, action: str, amount: str, unit: str = ""):
+        """
+        Scrolls the table as the scrollbar is dragged or clicked
+
+        Args:
+            action (str): "moveto" to jump to a fraction of the way through the
+                invoices, or "scroll" to move by rows or pages
+            amount (str): The fraction to jump to, or number of rows or pages to move
+            unit (str): "units" or "pages" when scrolling
+        """
+
+        if action == "moveto":
+            self._scroll_to_row(round(float(amount) * len(self.model)))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self._scroll_to_row(self.first_row + int(amount) * step)
+
+    ###########################################################################
+    ###                 ResultsTable -> _on_mouse_wheel()                   ###
+    ###########################################################################
+    def _on_mouse_wheel(self, event: tk.Event) -> str:
+        """
+        Scrolls the table with the mouse wheel, which arrives as a MouseWheel delta
+        on Windows and macOS and as Button-4/Button-5 presses on Linux
+
+        Args:
+            event (tk.Event): The wheel event
+
+        Returns:
+            str: "break", so the Treeview does not also scroll its own rows
+        """
+
+        if getattr(event, "num", None) == 5 or getattr(event, "delta", 0) < 0:
+            direction = 1
+        else:
+            direction = -1
+
+        self._scroll_to_row(self.first_row + direction * RESULTS_TABLE_WHEEL_ROWS)
+        return "break"
+
+    ###########################################################################
+    ###                 ResultsTable -> _on_tree_select()                   ###
+    ###########################################################################
+    def _on_tree_select(self, _event: tk.Event):
+        """
+        Shows the invoice of the row the user selected
+        """
+
+        selection = self.tree.selection()
+        if not selection:
+            return
+
+        # Re-selecting the selected invoice after a redraw leaves it shown as it is
+        position = self.first_row + int(selection[0])
+        if position == self.selected_row:
+            return
+
+        self.selected_row = position
+        if position < len(self.model):
+            self.on_select(self.model.row(position).invoice)
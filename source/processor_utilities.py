@@ -1,8 +1,269 @@
+import re
 from re import search
+from dataclasses import dataclass, field
 from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, Iterator
 
 from source.constants import DECIMAL_ZERO
 
+# Registry of the compiled patterns for the fields read from the first page of an invoice. Each is
+# compiled once here rather than on every search, and HeaderExtractor combines them into one scan.
+HEADER_PATTERNS = {
+    "order_number": re.compile(r"S(\d{5})"),
+    "date": re.compile(r"\d{2}/\d{2}/\d{4}"),
+    "customer_name": re.compile(r"Customer: .+"),
+    "po_number": re.compile(r"PO Number: .+S"),
+}
+
+# A payment line's cost, listed either as a quantity ("2 ea 10.00 20.00") or as an hourly rate
+# ("3 hr 50.00 150.00"). The total cost of the line is the last word on the line.
+EA_COST_PATTERN = re.compile(r"([0-9]+)\s*(ea)(.*)")
+HR_COST_PATTERN = re.compile(r"([0-9]+)\s*(hr)(.*)")
+
+
+# PaymentTableRow class to hold one numbered row of an invoice's payment table, as found by
+# scan_payment_table(). A row spans every line from its numbered line up to the next row, the
+# end of the page, or the end of the invoice, whichever comes first.
+@dataclass
+class PaymentTableRow:
+
+    # fmt:off
+    line_number: int            = 0                                  # Number the row is listed under, e.g. 3
+    lines: list[str]            = field(default_factory=list)        # Lines of text in the row, starting with its numbered line
+    description: str            = ""                                 # Text of the numbered line, without its number or cost
+    quantity: str               = ""                                 # Quantity the cost is listed for, e.g. "2", or "" if no cost was found
+    unit: str                   = ""                                 # "ea" for a quantity, "hr" for an hourly rate, or "" if no cost was found
+    amount: Decimal             = DECIMAL_ZERO                       # Total cost of the row, or DECIMAL_ZERO if no cost was found
+    # fmt:on
+
+
+# InvoiceHeader class to hold the fields read from the first page of an invoice by HeaderExtractor
+@dataclass
+class InvoiceHeader:
+
+    # fmt:off
+    order_number: str           = ""                                 # Order Number, e.g. S12345
+    date: str                   = ""                                 # Date of invoice
+    customer_name: str          = ""                                 # Name of customer on invoice
+    po_number: str              = ""                                 # PO Number
+    payment_terms: str          = ""                                 # Listed payment terms
+    sales_rep: str              = ""                                 # Name of the sales rep
+    # fmt:on
+
+
+# HeaderExtractor class to read every header field from the first page of an invoice in a single scan.
+# The patterns in HEADER_PATTERNS, every payment term and every sales rep code are compiled into one
+# regex, so it is built once per set of configs and reused for every invoice parsed with them.
+#
+# The results match searching for each field separately: the fixed fields take their first match on
+# the page, while the payment terms and sales reps take the first entry, in config order, that
+# matches anywhere on the page. A config entry with groups of its own (which could change what the
+# combined regex matches) or that is not a valid regex is searched for separately instead, as are
+# both configs if the combined regex cannot be compiled (e.g. an entry starts with a global flag
+# such as "(?i)", which is only allowed at the start of the whole regex).
+class HeaderExtractor:
+
+    ###########################################################################
+    ###                   HeaderExtractor -> __init__()                     ###
+    ###########################################################################
+    def __init__(self, payment_terms: list, sales_reps: dict):
+        """
+        Initializes the HeaderExtractor object, compiling the combined header regex
+
+        Args:
+            payment_terms (list): All possible payment terms, in priority order
+            sales_reps (dict): All possible sales rep codes and names, in priority order
+        """
+
+        self.payment_terms = payment_terms
+        self.sales_reps = sales_reps
+
+        # Whether each config is searched for by the combined regex
+        self._combined_terms = self._can_combine(payment_terms)
+        self._combined_reps = self._can_combine(sales_reps)
+
+        # Group name of each config entry in the combined regex, and the entry it finds
+        self._term_groups = [f"term_{index}" for index in range(len(payment_terms))]
+        self._rep_groups = [f"rep_{index}" for index in range(len(sales_reps))]
+
+        try:
+            self._pattern = self._compile_combined()
+        except re.error:
+            # An entry that compiles on its own can still break the combined regex
+            self._combined_terms = self._combined_reps = False
+            self._pattern = self._compile_combined()
+
+    ###########################################################################
+    ###                HeaderExtractor -> _compile_combined()               ###
+    ###########################################################################
+    def _compile_combined(self) -> re.Pattern:
+        """
+        Compiles the combined header regex, including each config searched for by it
+
+        Returns:
+            re.Pattern: The combined regex
+
+        Raises:
+            re.error: If a config entry cannot be part of the combined regex
+        """
+
+        # Each field is captured in an optional lookahead, so every field starting at a
+        # position is captured even when they overlap, and the leading lookahead skips
+        # straight to the next position where any field starts
+        captures = {
+            name: f"(?P<{name}>{pattern.pattern})"
+            for name, pattern in HEADER_PATTERNS.items()
+        }
+        if self._combined_terms and self.payment_terms:
+            captures["payment_terms"] = "|".join(
+                f"(?P<{group}>{term})"
+                for group, term in zip(self._term_groups, self.payment_terms)
+            )
+        if self._combined_reps and self.sales_reps:
+            captures["sales_rep"] = "|".join(
+                f"(?P<{group}>{code})"
+                for group, code in zip(self._rep_groups, self.sales_reps)
+            )
+
+        any_field = "|".join(f"(?:{capture})" for capture in captures.values())
+        return re.compile(
+            f"(?=(?:{self._strip_names(any_field)}))"
+            + "".join(
+                f"(?:(?=(?P<{name}_at>{capture})))?"
+                for name, capture in captures.items()
+            )
+        )
+
+    ###########################################################################
+    ###                    HeaderExtractor -> extract()                     ###
+    ###########################################################################
+    def extract(self, text: str) -> InvoiceHeader:
+        """
+        Reads every header field from the first page of an invoice
+
+        Args:
+            text (str): The first page of the invoice
+
+        Returns:
+            InvoiceHeader: The fields found, with an empty string for any not found
+        """
+
+        found: dict[str, str] = {}
+
+        # Index of the highest priority config entry found so far
+        term_index = len(self.payment_terms)
+        rep_index = len(self.sales_reps)
+
+        for match in self._pattern.finditer(text):
+            for name in HEADER_PATTERNS:
+                if name not in found and match.group(f"{name}_at") is not None:
+                    found[name] = match.group(f"{name}_at")
+
+            if self._combined_terms and self.payment_terms:
+                if match.group("payment_terms_at") is not None:
+                    term_index = self._first_matched(match, self._term_groups, term_index)
+
+            if self._combined_reps and self.sales_reps:
+                if match.group("sales_rep_at") is not None:
+                    rep_index = self._first_matched(match, self._rep_groups, rep_index)
+
+        if self._combined_terms:
+            payment_terms = (
+                self.payment_terms[term_index]
+                if term_index < len(self.payment_terms)
+                else str()
+            )
+        else:
+            payment_terms = find_payment_terms(
+                text=text, payment_terms=self.payment_terms
+            )
+
+        if self._combined_reps:
+            sales_rep = (
+                list(self.sales_reps.values())[rep_index]
+                if rep_index < len(self.sales_reps)
+                else str()
+            )
+        else:
+            sales_rep = find_sales_rep(text=text, sales_reps=self.sales_reps)
+
+        return InvoiceHeader(
+            order_number=found.get("order_number", ""),
+            date=found.get("date", ""),
+            # Customer name will also match "Customer: " to the string, so trim it off
+            customer_name=found.get("customer_name", "").replace("Customer: ", ""),
+            # PO Number will also match "PO Number: " and the "S" after it, so trim both off
+            po_number=found.get("po_number", "")[:-1].replace("PO Number: ", ""),
+            payment_terms=payment_terms,
+            sales_rep=sales_rep,
+        )
+
+    ###########################################################################
+    ###                 HeaderExtractor -> _first_matched()                 ###
+    ###########################################################################
+    def _first_matched(self, match: re.Match, groups: list[str], best: int) -> int:
+        """
+        Finds the highest priority config entry captured at a match
+
+        Args:
+            match (re.Match): A match of the combined regex
+            groups (list[str]): The group name of each config entry, in priority order
+            best (int): Index of the highest priority entry found so far
+
+        Returns:
+            int: Index of the highest priority entry found, including this match
+        """
+
+        for index in range(best):
+            if match.group(groups[index]) is not None:
+                return index
+
+        return best
+
+    ###########################################################################
+    ###                  HeaderExtractor -> _can_combine()                  ###
+    ###########################################################################
+    def _can_combine(self, patterns) -> bool:
+        """
+        Checks whether config entries can be searched for by the combined regex
+
+        Args:
+            patterns (Iterable[str]): The config entries, each a regex
+
+        Returns:
+            bool: True if every entry is a valid regex without groups of its own
+        """
+
+        try:
+            return all(re.compile(pattern).groups == 0 for pattern in patterns)
+        except re.error:
+            return False
+
+    ###########################################################################
+    ###                  HeaderExtractor -> _strip_names()                  ###
+    ###########################################################################
+    def _strip_names(self, pattern: str) -> str:
+        """
+        Turns the named groups of a pattern into non-capturing groups, so the same
+        captures can be reused in the leading lookahead without repeating group names
+
+        Args:
+            pattern (str): A pattern built from the captures
+
+        Returns:
+            str: The pattern with every "(?P<name>" replaced by "(?:"
+        """
+        return re.sub(r"\(\?P<\w+>", "(?:", pattern)
+
+
+# PaymentTableEnd class to mark the end of an invoice's payment table, as found by scan_payment_table()
+@dataclass
+class PaymentTableEnd:
+
+    # fmt:off
+    lines: list[str]            = field(default_factory=list)        # The "Total:Subtotal" line and up to three lines after it
+    # fmt:on
+
 
 def search_text_by_re(text: str, regex: str) -> str:
     """
@@ -120,3 +381,106 @@ def format_currency(value) -> Decimal:
         res = DECIMAL_ZERO
 
     return res
+
+
+def find_row_cost(row: PaymentTableRow):
+    """
+    Searches the lines of a payment table row for its cost, preferring a cost listed as
+    a quantity over one listed as an hourly rate, and fills in the row's quantity, unit
+    and amount from the first line that lists a valid cost. The row's description is
+    filled in from its numbered line, stopping short of the cost if it is listed there.
+
+    Args:
+        row (PaymentTableRow): The row to be searched, modified in place
+    """
+
+    # Describe the row by its numbered line, without the number it is listed under
+    prefix = f"{row.line_number} "
+    if row.lines:
+        row.description = row.lines[0].removeprefix(prefix).strip()
+
+    for pattern in (EA_COST_PATTERN, HR_COST_PATTERN):
+        for index, line in enumerate(row.lines):
+            res = pattern.search(line)
+            if not res:
+                continue
+
+            # Take the last word in the match (total payment amount for this item)
+            amount = format_currency(res.group().split()[-1].replace(",", ""))
+
+            # If a valid cost is found, no reason to continue searching
+            if amount > DECIMAL_ZERO:
+                row.quantity = res.group(1)
+                row.unit = res.group(2)
+                row.amount = amount
+
+                # If the cost is listed on the numbered line, leave it out of the description
+                if index == 0:
+                    row.description = line[: res.start()].removeprefix(prefix).strip()
+                return
+
+
+def scan_payment_table(
+    pages: Iterable[str | None],
+) -> Iterator[PaymentTableRow | PaymentTableEnd]:
+    """
+    Walks the payment table of an invoice once, line by line, yielding each numbered row
+    as soon as it is complete and then the end of the table
+
+    Rows are numbered consecutively from 1, and a line only starts a row if it begins
+    with the next expected number, so numbers appearing elsewhere in the table are read
+    as part of the row above. Pages are read one at a time and nothing is read after the
+    "Total:Subtotal" line, so with lazily extracted pages no later page is extracted.
+
+    Args:
+        pages (Iterable[str | None]): The text of each page of the invoice. None marks a
+            page that could not be extracted, which is skipped
+
+    Yields:
+        PaymentTableRow | PaymentTableEnd: Each row of the table in order, with its cost
+            filled in, followed by the end of the table if the invoice has one
+    """
+
+    next_line_num = 1
+
+    for page in pages:
+
+        # A page that could not be extracted has already been reported, skip it
+        if page is None:
+            continue
+
+        # Disregard everything before the purchase table (before the line Ordered Total Price)
+        table_start = page.find("Ordered Total Price")
+        lines = page[max(table_start, 0) :].splitlines()
+
+        row = None
+
+        for index, line in enumerate(lines):
+
+            # Check if at the beginning of the next row in the table
+            if line.startswith(f"{next_line_num} "):
+                if row is not None:
+                    find_row_cost(row)
+                    yield row
+
+                row = PaymentTableRow(line_number=next_line_num, lines=[line])
+                next_line_num += 1
+
+            # Some rows span multiple lines, which all belong to the current row
+            elif row is not None and "Total:Subtotal" not in line:
+                row.lines.append(line)
+
+            # "Total:Subtotal" is the beginning of the end of the invoice, which also ends
+            # the row above it
+            if "Total:Subtotal" in line:
+                if row is not None:
+                    find_row_cost(row)
+                    yield row
+
+                yield PaymentTableEnd(lines=lines[index : index + 4])
+                return
+
+        # A row never continues onto the next page
+        if row is not None:
+            find_row_cost(row)
+            yield row
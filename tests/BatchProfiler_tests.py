@@ -0,0 +1,199 @@
+import pstats
+import time
+import pytest
+from pathlib import Path
+
+from source.BatchProfiler import BatchProfiler, profile_mode_from_argv
+
+
+###############################################################################
+###                      BatchProfiler -> Test Helpers                      ###
+###############################################################################
+def _parse_slowly(count):
+    """
+    Stands in for parsing a batch, yielding each invoice number after a short wait
+    that releases the GIL, so a sampling profiler gets to look at the stack
+
+    Args:
+        count (int): The number of invoices to parse
+
+    Yields:
+        int: Each invoice number, in order
+    """
+
+    for number in range(count):
+        time.sleep(0.02)
+        yield number
+
+
+def _output_result(number):
+    """
+    Stands in for outputting a parsed invoice
+
+    Args:
+        number (int): The invoice number
+
+    Returns:
+        int: The invoice number, doubled
+    """
+
+    return sum(range(1000)) and number * 2
+
+
+###############################################################################
+###                      Tests profile_mode_from_argv()                     ###
+###############################################################################
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        ([], None),
+        (["--integration-test"], None),
+        (["--integration-test", "--profile"], "cprofile"),
+        (["--profile", "sample"], "sample"),
+        (["--profile=sample", "--integration-test"], "sample"),
+        (["--profile", "everything"], None),
+    ],
+)
+def test_profile_mode_from_argv(argv, expected):
+    """
+    Verifies that --profile selects cProfile, or the mode given with it, that other
+    arguments are left alone, and that an unknown mode profiles nothing.
+
+    Args:
+        argv (list[str]): The command line arguments
+        expected (str | None): The expected profiling mode
+    """
+
+    assert profile_mode_from_argv(argv) == expected
+
+
+###############################################################################
+###                     Tests BatchProfiler -> disabled                     ###
+###############################################################################
+def test_disabled_profiler_only_passes_calls_through(tmp_path):
+    """
+    Verifies that with no mode, calls are simply made, iterables are handed back
+    unwrapped, and nothing is written.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    profiler = BatchProfiler()
+    results = iter([1, 2])
+
+    profiler.start()
+
+    assert profiler.enabled is False
+    assert profiler.iterate(results) is results
+    assert profiler.call(_output_result, 3) == 6
+    assert profiler.stop(tmp_path) == []
+    assert list(tmp_path.iterdir()) == []
+
+
+###############################################################################
+###                   Tests BatchProfiler -> cProfile mode                  ###
+###############################################################################
+def test_cprofile_writes_pstats_and_collapsed_stacks(tmp_path):
+    """
+    Verifies that in cProfile mode the work of producing and outputting each result
+    is recorded, and written as a .pstats file and as collapsed stacks rooted at
+    the profiled calls.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    profiler = BatchProfiler(mode="cprofile")
+
+    profiler.start()
+    outputs = [
+        profiler.call(_output_result, number)
+        for number in profiler.iterate(_parse_slowly(3))
+    ]
+    pstats_path, collapsed_path = profiler.stop(tmp_path / "profiles")
+
+    assert outputs == [0, 2, 4]
+    assert (pstats_path.suffix, collapsed_path.suffix) == (".pstats", ".collapsed")
+
+    # The .pstats file records both functions
+    profiled = {name for _file, _line, name in pstats.Stats(str(pstats_path)).stats}
+    assert {"_parse_slowly", "_output_result"} <= profiled
+
+    # Each line is a stack and its microseconds; the wait is under parsing
+    stacks = {}
+    for line in collapsed_path.read_text().splitlines():
+        stack, weight = line.rsplit(" ", 1)
+        stacks[stack] = int(weight)
+
+    sleep_stacks = [stack for stack in stacks if stack.endswith("time.sleep>")]
+    assert len(sleep_stacks) == 1
+    assert sleep_stacks[0].startswith(
+        "<built-in method builtins.next>;_parse_slowly (BatchProfiler_tests.py:"
+    )
+    assert stacks[sleep_stacks[0]] >= 50_000
+    assert any(stack.startswith("_output_result (") for stack in stacks)
+
+
+def test_cprofile_forgets_previous_batch(tmp_path):
+    """
+    Verifies that starting a batch forgets what was recorded for the one before, and
+    that a batch in which nothing was profiled writes nothing.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    profiler = BatchProfiler(mode="cprofile")
+    profiler.start()
+    profiler.call(_output_result, 1)
+
+    profiler.start()
+
+    assert profiler.stop(tmp_path) == []
+
+
+###############################################################################
+###                   Tests BatchProfiler -> sampling mode                  ###
+###############################################################################
+def test_sampling_writes_collapsed_stacks_only(tmp_path):
+    """
+    Verifies that in sampling mode the stacks of the profiled thread are sampled
+    while it is inside a profiled call, and written as collapsed stacks weighted
+    by the number of samples, with no .pstats file.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    profiler = BatchProfiler(mode="sample", sample_interval=0.001)
+
+    profiler.start()
+    assert list(profiler.iterate(_parse_slowly(5))) == [0, 1, 2, 3, 4]
+    written = profiler.stop(tmp_path)
+
+    assert [path.suffix for path in written] == [".collapsed"]
+
+    lines = written[0].read_text().splitlines()
+    assert lines
+    assert any(";_parse_slowly (BatchProfiler_tests.py:" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) >= 10
+
+
+###############################################################################
+###                     Tests BatchProfiler -> iterate()                    ###
+###############################################################################
+def test_iterate_closes_iterable_when_closed():
+    """
+    Verifies that closing the profiled iterator early closes the iterable it wraps,
+    so a process pool can drop the invoices it had queued.
+    """
+
+    profiler = BatchProfiler(mode="cprofile")
+    results = _parse_slowly(5)
+
+    profiled = profiler.iterate(results)
+    assert next(profiled) == 0
+    profiled.close()
+
+    assert results.gi_frame is None
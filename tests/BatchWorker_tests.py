@@ -0,0 +1,305 @@
+import threading
+import time
+import pytest
+from functools import partial
+from unittest.mock import patch, call, MagicMock
+
+from source.BatchWorker import BatchProgress, BatchWorker
+from source.constants import BATCH_POLL_INTERVAL_MS
+
+
+###############################################################################
+###                       BatchWorker -> Test Helpers                       ###
+###############################################################################
+class _FakeAfter:
+    """
+    Stand-in for Tk's after() that records scheduled callbacks instead of running
+    them, so a test can play the part of the Tk main loop with run_until_idle()
+    """
+
+    def __init__(self):
+        self.scheduled = []
+        self.delays = []
+
+    def __call__(self, delay_ms, callback):
+        self.scheduled.append(callback)
+        self.delays.append(delay_ms)
+
+    def run_until_idle(self, worker, timeout=5.0):
+        """
+        Runs scheduled callbacks until the worker reports its batch has finished
+        """
+
+        deadline = time.monotonic() + timeout
+        while worker.is_running and time.monotonic() < deadline:
+            if self.scheduled:
+                self.scheduled.pop(0)()
+
+
+@pytest.fixture
+def callbacks():
+    """
+    Returns a mock whose attributes receive the batch callbacks, so tests can
+    assert the order they were called in
+    """
+    return MagicMock()
+
+
+def _start(worker, callbacks, produce_results, total):
+    """
+    Starts a batch on worker with every callback routed to the callbacks mock
+
+    Args:
+        worker (BatchWorker): The worker under test
+        callbacks (unittest.mock.MagicMock): Receives every callback
+        produce_results (Callable): Produces the batch's results
+        total (int): The number of results expected
+    """
+
+    worker.start(
+        total=total,
+        produce_results=produce_results,
+        on_result=callbacks.on_result,
+        on_progress=callbacks.on_progress,
+        on_error=callbacks.on_error,
+        on_finished=callbacks.on_finished,
+    )
+
+
+###############################################################################
+###                    Tests BatchProgress -> properties                    ###
+###############################################################################
+def test_batch_progress_rate_and_eta():
+    """
+    Verifies that the rate is the average so far and the ETA extrapolates it over
+    the invoices left
+    """
+
+    progress = BatchProgress(completed=4, total=10, elapsed=2.0)
+
+    assert progress.files_per_second == 2.0
+    assert progress.eta_seconds == 3.0
+
+
+def test_batch_progress_no_eta_before_first_result():
+    """
+    Verifies that there is no rate or ETA until an invoice has finished
+    """
+
+    progress = BatchProgress(completed=0, total=10, elapsed=0.0)
+
+    assert progress.files_per_second == 0.0
+    assert progress.eta_seconds is None
+
+
+###############################################################################
+###                        Tests BatchWorker -> start()                     ###
+###############################################################################
+@patch("source.BatchWorker.time.monotonic", side_effect=[0.0, 1.0, 2.0, 2.0])
+def test_start_synchronous_runs_batch_inline(_mock_monotonic, callbacks):
+    """
+    Verifies that a worker not running in the background completes the batch inside
+    start(), calling each callback in order without scheduling anything
+
+    Args:
+        _mock_monotonic (unittest.mock.MagicMock): Mocks the clock
+        callbacks (pytest.fixture): Receives every callback
+    """
+
+    after = MagicMock()
+    worker = BatchWorker(after=after, run_in_background=False)
+
+    _start(worker, callbacks, lambda: iter(["a", "b"]), total=2)
+
+    assert callbacks.mock_calls == [
+        call.on_result("a"),
+        call.on_progress(BatchProgress(completed=1, total=2, elapsed=1.0)),
+        call.on_result("b"),
+        call.on_progress(BatchProgress(completed=2, total=2, elapsed=2.0)),
+        call.on_finished(BatchProgress(completed=2, total=2, elapsed=2.0), False),
+    ]
+    assert worker.is_running is False
+    after.assert_not_called()
+
+
+def test_start_background_delivers_results_through_after(callbacks):
+    """
+    Verifies that a background batch is produced off the calling thread, and its
+    results are only handed over when the scheduled poll runs
+
+    Args:
+        callbacks (pytest.fixture): Receives every callback
+    """
+
+    after = _FakeAfter()
+    worker = BatchWorker(after=after)
+    producer_threads = []
+
+    def produce_results():
+        producer_threads.append(threading.current_thread())
+        yield "a"
+        yield "b"
+
+    _start(worker, callbacks, produce_results, total=2)
+
+    # Nothing is delivered until the GUI thread polls
+    assert worker.is_running is True
+    assert after.scheduled
+
+    after.run_until_idle(worker)
+
+    assert producer_threads[0] is not threading.current_thread()
+    assert [c.args[0] for c in callbacks.on_result.call_args_list] == ["a", "b"]
+    callbacks.on_finished.assert_called_once()
+    assert callbacks.on_finished.call_args.args[1] is False
+    assert worker.is_running is False
+
+
+def test_start_while_running_raises(callbacks):
+    """
+    Verifies that only one batch can run at a time
+
+    Args:
+        callbacks (pytest.fixture): Receives every callback
+    """
+
+    worker = BatchWorker(after=_FakeAfter())
+    release = threading.Event()
+
+    def produce_results():
+        release.wait(timeout=5)
+        return iter([])
+
+    _start(worker, callbacks, produce_results, total=0)
+
+    with pytest.raises(RuntimeError):
+        _start(worker, callbacks, lambda: iter([]), total=0)
+
+    release.set()
+
+
+###############################################################################
+###                       Tests BatchWorker -> cancel()                     ###
+###############################################################################
+def test_cancel_stops_between_results_and_closes_producer(callbacks):
+    """
+    Verifies that cancelling stops the batch before its next result and closes the
+    producer so it can drop any queued work
+
+    Args:
+        callbacks (pytest.fixture): Receives every callback
+    """
+
+    worker = BatchWorker(after=MagicMock(), run_in_background=False)
+    closed = []
+
+    def produce_results():
+        try:
+            yield "a"
+            yield "b"
+        finally:
+            closed.append(True)
+
+    # Cancel while the first result is being output
+    callbacks.on_result.side_effect = lambda _: worker.cancel()
+
+    _start(worker, callbacks, produce_results, total=2)
+
+    callbacks.on_result.assert_called_once_with("a")
+    assert closed == [True]
+    progress, cancelled = callbacks.on_finished.call_args.args
+    assert progress.completed == 1
+    assert cancelled is True
+
+
+###############################################################################
+###                       Tests BatchWorker -> _run()                       ###
+###############################################################################
+def test_run_producer_error_is_reported_and_batch_finishes(callbacks):
+    """
+    Verifies that an error raised while producing results is reported, and the
+    batch still finishes so the window is not left waiting on it
+
+    Args:
+        callbacks (pytest.fixture): Receives every callback
+    """
+
+    worker = BatchWorker(after=MagicMock(), run_in_background=False)
+    error = OSError("Invoices folder missing")
+
+    def produce_results():
+        yield "a"
+        raise error
+
+    _start(worker, callbacks, produce_results, total=2)
+
+    callbacks.on_error.assert_called_once_with(error)
+    assert callbacks.on_finished.call_args.args[0].completed == 1
+    assert worker.is_running is False
+
+
+def test_run_output_error_is_reported_and_batch_continues(callbacks):
+    """
+    Verifies that an error raised while outputting one result is reported without
+    stopping the results after it
+
+    Args:
+        callbacks (pytest.fixture): Receives every callback
+    """
+
+    worker = BatchWorker(after=MagicMock(), run_in_background=False)
+    error = ValueError("bad invoice")
+    callbacks.on_result.side_effect = [error, None]
+
+    _start(worker, callbacks, lambda: iter(["a", "b"]), total=2)
+
+    callbacks.on_error.assert_called_once_with(error)
+    assert callbacks.on_result.call_count == 2
+    assert callbacks.on_finished.call_args.args[1] is False
+
+
+###############################################################################
+###                        Tests BatchWorker -> _poll()                     ###
+###############################################################################
+@patch("source.BatchWorker.time.monotonic", side_effect=[0.0, 0.0, 0.005, 0.011])
+def test_poll_stops_at_budget_and_reschedules_straight_away(_mock_monotonic):
+    """
+    Verifies that a poll stops handling callbacks once its time budget is spent, and
+    schedules the next poll straight away to pick up the rest
+
+    Args:
+        _mock_monotonic (unittest.mock.MagicMock): Mocks time.monotonic
+    """
+
+    after = _FakeAfter()
+    worker = BatchWorker(after=after)
+    worker.is_running = True
+
+    handled = []
+    for index in range(5):
+        worker._pending.put(partial(handled.append, index))
+
+    worker._poll()
+
+    assert handled == [0, 1]
+    assert worker._pending.qsize() == 3
+    assert after.delays == [1]
+
+
+def test_poll_waits_for_the_interval_once_caught_up():
+    """
+    Verifies that a poll that handles every posted callback waits the usual interval
+    before polling again
+    """
+
+    after = _FakeAfter()
+    worker = BatchWorker(after=after)
+    worker.is_running = True
+
+    handled = []
+    worker._pending.put(partial(handled.append, "a"))
+
+    worker._poll()
+
+    assert handled == ["a"]
+    assert after.delays == [BATCH_POLL_INTERVAL_MS]
@@ -0,0 +1,86 @@
+from source.CriteriaMatcher import CriteriaMatch, CriteriaMatcher
+
+
+###############################################################################
+###                    Tests CriteriaMatcher -> match()                     ###
+###############################################################################
+def test_match_finds_first_criteria_in_list_order():
+    """
+    Verifies that the first criteria of each kind, in the order they are listed, is
+    found rather than the first to appear in the line, including overlapping criteria
+    """
+
+    matcher = CriteriaMatcher(
+        labor_criteria=["INSTALL", "LABOR", "AB"],
+        labor_exclusions=["NO-LABOR", "LAB"],
+        shipping_criteria=["UPS", "SHIP"],
+    )
+
+    match = matcher.match(line="1 SHIPPING LABOR UPS INSTALLATION")
+
+    assert match == CriteriaMatch(
+        labor_criteria="INSTALL",
+        labor_exclusion="LAB",
+        shipping_criteria="UPS",
+    )
+
+
+def test_match_labor_exclusions():
+    """
+    Verifies that a line is only a labor cost if it contains a labor criteria and no
+    labor exclusions, and that an excluded labor line can still be a shipping cost
+    """
+
+    matcher = CriteriaMatcher(
+        labor_criteria=["LABOR"],
+        labor_exclusions=["NO-LABOR"],
+        shipping_criteria=["SHIPPING"],
+    )
+
+    assert matcher.match(line="1 LABOR install").is_labor_cost is True
+
+    match = matcher.match(line="2 NO-LABOR SHIPPING charge")
+    assert match.is_labor_cost is False
+    assert match.is_shipping_cost is True
+
+    # An exclusion alone does not make a line a labor or shipping cost
+    match = matcher.match(line="3 NO-LABOR part")
+    assert match.labor_exclusion == "NO-LABOR"
+    assert match.is_labor_cost is False
+    assert match.is_shipping_cost is False
+
+
+def test_match_matches_substring_search():
+    """
+    Verifies that the matcher finds the same criteria as checking each criteria in
+    turn with "in", for criteria that share prefixes and suffixes with each other
+    """
+
+    labor_criteria = ["ABC", "BC", "C", "ABCD"]
+    labor_exclusions = ["CDA", "DAB"]
+    shipping_criteria = ["BCDAB", "AB", "DA"]
+
+    matcher = CriteriaMatcher(
+        labor_criteria=labor_criteria,
+        labor_exclusions=labor_exclusions,
+        shipping_criteria=shipping_criteria,
+    )
+
+    for line in ["", "A", "ABCDAB", "DDAB", "XBCX", "CDA", "ABD ABCD"]:
+        assert matcher.match(line=line) == CriteriaMatch(
+            labor_criteria=next((c for c in labor_criteria if c in line), None),
+            labor_exclusion=next((c for c in labor_exclusions if c in line), None),
+            shipping_criteria=next((c for c in shipping_criteria if c in line), None),
+        )
+
+
+def test_match_with_no_criteria():
+    """
+    Verifies that with no criteria configured, every line is a material cost
+    """
+
+    matcher = CriteriaMatcher(
+        labor_criteria=[], labor_exclusions=[], shipping_criteria=[]
+    )
+
+    assert matcher.match(line="1 LABOR install") == CriteriaMatch()
@@ -0,0 +1,181 @@
+import pytest
+import threading
+from unittest.mock import MagicMock, patch
+
+from source.DebugLogWriter import DebugLogWriter
+
+
+###############################################################################
+###                     DebugLogWriter -> Test Fixture                      ###
+###############################################################################
+@pytest.fixture
+def writer(tmp_path):
+    """
+    Returns a DebugLogWriter appending to a log in a temporary directory, closed once
+    the test is done
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    debug_log_writer = DebugLogWriter(
+        log_path=tmp_path / "logs" / "debug.txt", report_error=MagicMock()
+    )
+    yield debug_log_writer
+    debug_log_writer.close()
+
+
+###############################################################################
+###                Tests DebugLogWriter -> write() / flush()                ###
+###############################################################################
+def test_write_appends_lines_in_order(writer):
+    """
+    Verifies that every line written is appended to the log in order, in the same
+    format as writing each one directly, once the log is flushed
+
+    Args:
+        writer (pytest.fixture): The DebugLogWriter under test
+    """
+
+    writer.log_path.parent.mkdir()
+    writer.log_path.write_text("existing line\n")
+
+    for index in range(1000):
+        writer.write(f"line {index}")
+    writer.flush()
+
+    assert writer.log_path.read_text() == "existing line\n" + "".join(
+        f"line {index}\n" for index in range(1000)
+    )
+
+
+def test_write_opens_the_log_once(writer):
+    """
+    Verifies that the log is opened once and kept open, rather than once per line
+
+    Args:
+        writer (pytest.fixture): The DebugLogWriter under test
+    """
+
+    with patch("builtins.open", wraps=open) as mock_open:
+        for index in range(100):
+            writer.write(f"line {index}")
+        writer.flush()
+
+    mock_open.assert_called_once_with(file=writer.log_path, mode="a")
+
+
+def test_write_blocks_while_queue_is_full(tmp_path):
+    """
+    Verifies that writing to a full queue waits for the writer thread to catch up,
+    rather than dropping lines
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    writer = DebugLogWriter(log_path=tmp_path / "debug.txt", max_queued=1)
+
+    # Hold up the writer thread until every line has been queued
+    release = threading.Event()
+    write_lines = writer._write_lines
+    writer._write_lines = lambda **kwargs: release.wait() and write_lines(**kwargs)
+
+    thread = threading.Thread(
+        target=lambda: [writer.write(f"line {index}") for index in range(5)]
+    )
+    thread.start()
+    thread.join(timeout=0.2)
+    assert thread.is_alive()
+
+    release.set()
+    thread.join()
+    writer.close()
+
+    assert writer.log_path.read_text() == "".join(f"line {i}\n" for i in range(5))
+
+
+def test_write_failure_is_reported_on_callers_thread(writer):
+    """
+    Verifies that a failure to write the log is reported on the next call from the
+    caller's thread, and that writing is retried afterwards
+
+    Args:
+        writer (pytest.fixture): The DebugLogWriter under test
+    """
+
+    with patch("builtins.open", side_effect=OSError("disk full")):
+        writer.write("dropped line")
+        writer.flush()
+
+    writer.report_error.assert_called_once()
+    assert "disk full" in writer.report_error.call_args[0][1]
+
+    writer.write("written line")
+    writer.flush()
+
+    assert writer.log_path.read_text() == "written line\n"
+    writer.report_error.assert_called_once()
+
+
+def test_flush_without_waiting_only_queues_the_request(writer):
+    """
+    Verifies that flush(wait=False) returns while the writer thread is still busy,
+    and that the lines are flushed to disk once the writer thread gets to them
+
+    Args:
+        writer (pytest.fixture): The DebugLogWriter under test
+    """
+
+    # Hold up the writer thread until the flush has been requested
+    release = threading.Event()
+    write_lines = writer._write_lines
+    writer._write_lines = lambda **kwargs: release.wait() and write_lines(**kwargs)
+
+    writer.write("line")
+    writer.flush(wait=False)
+
+    release.set()
+    writer.flush()
+
+    assert writer.log_path.read_text() == "line\n"
+
+
+###############################################################################
+###                     Tests DebugLogWriter -> close()                     ###
+###############################################################################
+def test_close_writes_out_and_releases_the_log(writer):
+    """
+    Verifies that closing writes out every line, stops the writer thread and closes
+    the log so it can be deleted, and that writing again starts a new writer thread
+
+    Args:
+        writer (pytest.fixture): The DebugLogWriter under test
+    """
+
+    writer.write("first line")
+    writer.close()
+
+    assert writer._thread is None
+    assert writer.log_path.read_text() == "first line\n"
+    writer.log_path.unlink()
+
+    writer.write("second line")
+    writer.flush()
+
+    assert writer.log_path.read_text() == "second line\n"
+
+
+def test_flush_and_close_before_any_write(writer):
+    """
+    Verifies that flushing or closing a writer that never wrote does nothing, and
+    never creates the log
+
+    Args:
+        writer (pytest.fixture): The DebugLogWriter under test
+    """
+
+    writer.flush()
+    writer.close()
+
+    assert not writer.log_path.exists()
@@ -1,18 +1,31 @@
 import pytest
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import call, patch, MagicMock
 from decimal import Decimal
 
 from source.InvoiceAppController import InvoiceAppController
+from source.InvoiceBatchEngine import BatchResult
+from source.BatchWorker import BatchWorker
 from source.constants import (
     COST_CRITERIA_PATH,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_ENV_VAR,
+    EXPORT_FORMAT_JSONL,
+    EXPORT_FORMAT_NONE,
     GITHUB_REPO,
     INSTALLER_ASSET_PATTERN,
+    MEMORY_REPORT_PATH,
     PAYMENT_TERMS_PATH,
+    PROFILES_DIR,
     SALES_REPS_PATH,
     SETTINGS_DB_PATH,
+    STAGE_TIMINGS_OFF,
+    STAGE_TIMINGS_ON,
     VERSION,
+    WATCH_FOLDER_OFF,
+    WATCH_FOLDER_ON,
+    WATCH_POLL_INTERVAL_MS,
 )
 
 
@@ -20,29 +33,47 @@ from source.constants import (
 ###                   InvoiceAppController -> Test Fixture                  ###
 ###############################################################################
 @pytest.fixture
-def controller():
+def controller(monkeypatch):
     """
     Builds an InvoiceAppController with every collaborator it constructs replaced
     by a mock, so the controller is exercised in complete isolation (no real file
-    I/O, no tkinter window, no PDF parsing).
+    I/O, no tkinter window, no PDF parsing). The Batch Worker is a real one that
+    runs each batch synchronously, so a batch has been fully output by the time the
+    handler that started it returns.
+
+    Args:
+        monkeypatch (pytest.fixture): Clears any export format set in the environment
 
     Returns:
         types.SimpleNamespace: Holds the constructed controller (`controller`) and
             the mocked collaborator instances (`arg_provider`, `file_io`,
-            `processor`, `display`, `coordinator`) plus the patched `Invoice` class
-            so individual tests can configure return values and assert calls.
+            `processor`, `display`, `coordinator`, `engine`, `results_db`) so
+            individual tests can configure return values and assert calls.
     """
 
     with (
         patch("source.InvoiceAppController.ArgumentProvider") as mock_arg_provider_cls,
         patch("source.InvoiceAppController.InvoiceAppFileIO") as mock_file_io_cls,
+        patch("source.InvoiceAppController.PageTextCache") as mock_cache_cls,
         patch("source.InvoiceAppController.InvoiceProcessor") as mock_processor_cls,
         patch("source.InvoiceAppController.InvoiceAppDisplay") as mock_display_cls,
         patch("source.InvoiceAppController.SettingsRepository") as mock_settings_repo_cls,
         patch("source.InvoiceAppController.UpdateCoordinator") as mock_coordinator_cls,
-        patch("source.InvoiceAppController.Invoice") as mock_invoice_cls,
+        patch("source.InvoiceAppController.InvoiceManifest") as mock_manifest_cls,
+        patch("source.InvoiceAppController.ResultsDatabase") as mock_results_db_cls,
+        patch("source.InvoiceAppController.InvoiceSearchIndex") as mock_search_cls,
+        patch("source.InvoiceAppController.InvoiceBatchEngine") as mock_engine_cls,
+        patch(
+            "source.InvoiceAppController.BatchWorker",
+            side_effect=lambda after, run_in_background: BatchWorker(
+                after=after, run_in_background=False
+            ),
+        ) as mock_worker_cls,
     ):
 
+        # Export in the saved format, rather than any set for the test run
+        monkeypatch.delenv(EXPORT_FORMAT_ENV_VAR, raising=False)
+
         # Grab the instance each patched class returns when constructed
         mock_arg_provider = mock_arg_provider_cls.return_value
         mock_file_io = mock_file_io_cls.return_value
@@ -75,6 +106,7 @@ def controller():
             arg_provider=mock_arg_provider,
             file_io_cls=mock_file_io_cls,
             file_io=mock_file_io,
+            cache_cls=mock_cache_cls,
             processor_cls=mock_processor_cls,
             processor=mock_processor,
             display_cls=mock_display_cls,
@@ -83,8 +115,14 @@ def controller():
             settings_repo=mock_settings_repo,
             coordinator_cls=mock_coordinator_cls,
             coordinator=mock_coordinator,
-            invoice_cls=mock_invoice_cls,
-            invoice=mock_invoice_cls.return_value,
+            manifest_cls=mock_manifest_cls,
+            results_db_cls=mock_results_db_cls,
+            results_db=mock_results_db_cls.return_value,
+            search_index_cls=mock_search_cls,
+            search_index=mock_search_cls.return_value,
+            engine_cls=mock_engine_cls,
+            engine=mock_engine_cls.return_value,
+            worker_cls=mock_worker_cls,
         )
 
 
@@ -102,7 +140,12 @@ def test_init_constructs_and_wires_collaborators(controller):
 
     # Each collaborator should have been constructed exactly once
     controller.arg_provider_cls.assert_called_once_with()
-    controller.file_io_cls.assert_called_once_with()
+
+    # The file_io controller is given the page text cache
+    controller.cache_cls.assert_called_once_with()
+    controller.file_io_cls.assert_called_once_with(
+        page_text_cache=controller.cache_cls.return_value
+    )
 
     # The processor is wired with the file_io controller and the criteria pulled
     # off of it
@@ -113,20 +156,44 @@ def test_init_constructs_and_wires_collaborators(controller):
         shipping_criteria=["SHIPPING"],
     )
 
+    # The batch engine parses invoices with the same file_io controller and processor,
+    # skipping any invoices its manifest has an up to date result for
+    controller.manifest_cls.assert_called_once_with()
+    controller.engine_cls.assert_called_once_with(
+        file_io_controller=controller.file_io,
+        invoice_processor=controller.processor,
+        manifest=controller.manifest_cls.return_value,
+        stage_timings=controller.controller.stage_timings,
+    )
+
+    # Processed invoices are kept in the results database
+    controller.results_db_cls.assert_called_once_with()
+    controller.search_index_cls.assert_called_once_with()
+
     # The display is wired with the controller's process callback, the file IO
     # controller's text-file reader, the controller's config save handler, the
-    # controller's settings save handler, the file IO controller's invoice copier,
-    # and the persisted settings to restore
+    # controller's settings save handler, the controller's invoice importer,
+    # the controller's search handler, and the persisted settings to restore
     controller.display_cls.assert_called_once_with(
         title="Invoice Processor",
         window_resolution="750x750",
         process_callback=controller.controller.handle_process_invoice,
+        process_all_callback=controller.controller.handle_process_all_invoices,
+        cancel_callback=controller.controller.handle_cancel_processing,
         read_file_callback=controller.file_io.read_text_file,
         save_config_callback=controller.controller.handle_save_config,
         save_settings_callback=controller.controller.handle_save_setting,
-        copy_invoice_callback=controller.file_io.copy_invoice_file,
+        import_invoices_callback=controller.controller.invoice_importer.import_files,
+        search_callback=controller.controller.handle_search,
         check_for_updates_callback=controller.controller.handle_check_for_updates,
         settings={"theme": "Ocean"},
+        stage_timings=controller.controller.stage_timings,
+    )
+
+    # The batch worker hands results back through the display, in the background
+    # since the controller was not built in integration test mode
+    controller.worker_cls.assert_called_once_with(
+        after=controller.display.after, run_in_background=True
     )
 
 
@@ -149,11 +216,52 @@ def test_init_loads_config_files(controller):
     assert controller.controller.sales_reps == {"REP1": "Rep Name"}
 
 
+def test_init_applies_saved_export_format(controller):
+    """
+    Verifies that __init__ applies the saved export format, turning exporting off
+    when none has been saved.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.file_io.set_export_format.assert_called_once_with(EXPORT_FORMAT_NONE)
+
+    controller.file_io.set_export_format.reset_mock()
+    controller.settings_repo.get_all_settings.return_value = {
+        "export_format": EXPORT_FORMAT_CSV
+    }
+    InvoiceAppController()
+
+    controller.file_io.set_export_format.assert_called_once_with(EXPORT_FORMAT_CSV)
+
+
+def test_init_export_format_from_environment(controller, monkeypatch):
+    """
+    Verifies that an export format set in the environment overrides the saved one,
+    so headless integration test runs can choose it.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+        monkeypatch (pytest.fixture): Sets the export format in the environment
+    """
+
+    monkeypatch.setenv(EXPORT_FORMAT_ENV_VAR, EXPORT_FORMAT_JSONL)
+    controller.settings_repo.get_all_settings.return_value = {
+        "export_format": EXPORT_FORMAT_CSV
+    }
+    controller.file_io.set_export_format.reset_mock()
+
+    InvoiceAppController()
+
+    controller.file_io.set_export_format.assert_called_once_with(EXPORT_FORMAT_JSONL)
+
+
 def test_init_wires_error_reporter(controller):
     """
     Verifies that __init__ wires the display's error popup into the file IO
-    controller and settings repository as their error reporter, so file/database
-    failures surface to the user.
+    controller, settings repository and results database as their error reporter,
+    so file/database failures surface to the user.
 
     Args:
         controller (pytest.fixture): Provides the controller and its mocks
@@ -162,6 +270,8 @@ def test_init_wires_error_reporter(controller):
     # The file IO controller and settings repository report errors through the popup
     assert controller.file_io.report_error is controller.display.show_popup
     assert controller.settings_repo.report_error is controller.display.show_popup
+    assert controller.results_db.report_error is controller.display.show_popup
+    assert controller.search_index.report_error is controller.display.show_popup
 
 
 def test_init_builds_the_update_coordinator(controller):
@@ -228,11 +338,60 @@ def test_start_application_resets_files_and_starts_gui(controller):
     # (no manual flag) so being offline never interrupts a launch
     controller.coordinator.start.assert_called_once_with()
 
+    # Invoices added since the last launch are indexed in the background
+    controller.search_index.update_in_background.assert_called_once_with(
+        list_invoices=controller.controller.folder_watcher.list_invoices,
+        read_pages=controller.file_io.read_invoice_text,
+    )
+
     # The GUI main loop is started, and invoices are not processed directly
     controller.display.mainloop.assert_called_once_with()
     controller.display.handle_process_all_invoices.assert_not_called()
 
 
+def test_start_application_cancels_batch_when_window_closes(controller):
+    """
+    Verifies that once the GUI main loop returns, any batch still running in the
+    background is cancelled rather than left to finish with no window to show it.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.controller.batch_worker = MagicMock()
+
+    controller.controller.start_application()
+
+    controller.controller.batch_worker.cancel.assert_called_once_with()
+
+    # The rest of the debug log is written out before the application exits
+    controller.file_io.close_debug_file.assert_called_once_with()
+    controller.results_db.close.assert_called_once_with()
+    controller.search_index.close.assert_called_once_with()
+
+
+def test_start_application_starts_watching_when_chosen(controller):
+    """
+    Verifies that start_application starts watching the Invoices/ folder when the
+    user chose to, with only invoices that land from then on processed.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.controller.watch_folder = True
+    controller.controller.folder_watcher = MagicMock()
+    controller.controller.folder_watcher.poll.return_value = []
+
+    controller.controller.start_application()
+
+    # The invoices already in the folder are recorded, then the folder is checked again
+    controller.controller.folder_watcher.reset.assert_called_once_with()
+    controller.display.after.assert_called_once_with(
+        WATCH_POLL_INTERVAL_MS, controller.controller._poll_invoices_folder
+    )
+
+
 def test_start_application_integration_test_mode_processes_all(controller):
     """
     Verifies that start_application processes all invoices directly (without the
@@ -254,6 +413,11 @@ def test_start_application_integration_test_mode_processes_all(controller):
     # The update check is never started in integration test mode
     controller.coordinator.start.assert_not_called()
 
+    # The rest of the debug log is written out before the application exits
+    controller.file_io.close_debug_file.assert_called_once_with()
+    controller.results_db.close.assert_called_once_with()
+    controller.search_index.close.assert_called_once_with()
+
 
 ###############################################################################
 ###        Tests InvoiceAppController -> handle_check_for_updates()         ###
@@ -279,111 +443,561 @@ def test_handle_check_for_updates_starts_manual_check(controller):
 def test_handle_process_invoice_no_pages_shows_error_and_returns(controller):
     """
     Verifies that handle_process_invoice shows an error popup and returns early
-    when the invoice PDF has no pages.
+    when no pages could be read from the invoice PDF.
 
     Args:
         controller (pytest.fixture): Provides the controller and its mocks
     """
 
-    # The PDF read returns no pages
-    controller.file_io.read_invoice_file.return_value = []
+    # The engine could not read any pages from the PDF
+    controller.engine.process_files.return_value = iter(
+        [BatchResult(invoice_filepath=Path("missing.pdf"), invoice=None)]
+    )
 
     controller.controller.handle_process_invoice(
-        invoice_filepath="missing.pdf", append_output=False
+        invoice_filepath=Path("missing.pdf"), append_output=False
     )
 
-    # An error popup is shown and processing stops before populating the invoice
+    # An error popup is shown and nothing is displayed or written
     controller.display.show_popup.assert_called_once()
-    controller.processor.populate_invoice.assert_not_called()
-    controller.processor.process_invoice.assert_not_called()
+    controller.display.display_invoice_output.assert_not_called()
+    controller.file_io.print_invoice_to_output_file.assert_not_called()
+    controller.results_db.record.assert_not_called()
 
 
-def test_handle_process_invoice_first_page_none_shows_error_and_returns(controller):
+def test_handle_process_invoice_parse_error_shows_only_that_error(controller):
     """
-    Verifies that handle_process_invoice shows an error popup and returns early
-    when the first page of the invoice PDF is None.
+    Verifies that an invoice that raised while being parsed shows only the error
+    it was returned with, not a second popup claiming the PDF had no pages.
 
     Args:
         controller (pytest.fixture): Provides the controller and its mocks
     """
 
-    # The PDF read returns a page list whose first page failed to parse
-    controller.file_io.read_invoice_file.return_value = [None]
+    controller.engine.process_files.return_value = iter(
+        [
+            BatchResult(
+                invoice_filepath=Path("bad.pdf"),
+                invoice=None,
+                errors=[("Processing Error", "unexpected layout")],
+            )
+        ]
+    )
 
     controller.controller.handle_process_invoice(
-        invoice_filepath="bad.pdf", append_output=False
+        invoice_filepath=Path("bad.pdf"), append_output=False
     )
 
-    # An error popup is shown and processing stops before populating the invoice
-    controller.display.show_popup.assert_called_once()
-    controller.processor.populate_invoice.assert_not_called()
+    controller.display.show_popup.assert_called_once_with(
+        title="Processing Error", message="unexpected layout"
+    )
+    controller.display.display_invoice_output.assert_not_called()
+    controller.file_io.print_invoice_to_output_file.assert_not_called()
 
 
 def test_handle_process_invoice_full_flow_totals_match(controller):
     """
     Verifies the full happy-path flow: when the calculated total matches the
-    listed total, the invoice is populated, processed, displayed, and written to
-    the output file with no mismatch popup.
+    listed total, the invoice is parsed, displayed, and written to the output
+    file with no mismatch popup.
 
     Args:
         controller (pytest.fixture): Provides the controller and its mocks
     """
 
-    # A single valid page is read, and the totals match
-    controller.file_io.read_invoice_file.return_value = ["page one text"]
-    controller.invoice.total = Decimal("10.00")
-    controller.invoice.listed_total = Decimal("10.00")
+    # The engine parses an invoice whose totals match
+    invoice = SimpleNamespace(
+        total=Decimal("10.00"), listed_total=Decimal("10.00"), order_number="S12345"
+    )
+    controller.engine.process_files.return_value = iter(
+        [BatchResult(invoice_filepath=Path("invoice.pdf"), invoice=invoice)]
+    )
 
     controller.controller.handle_process_invoice(
-        invoice_filepath="invoice.pdf", append_output=True
+        invoice_filepath=Path("invoice.pdf"), append_output=True
     )
 
-    # The processor is asked to populate and process the invoice
-    controller.processor.populate_invoice.assert_called_once_with(
-        invoice=controller.invoice,
+    # The engine is asked to parse just this invoice with the loaded configs
+    controller.engine.process_files.assert_called_once_with(
+        invoice_filepaths=[Path("invoice.pdf")],
         sales_reps=controller.controller.sales_reps,
         payment_terms=controller.controller.payment_terms,
     )
-    controller.processor.process_invoice.assert_called_once_with(
-        invoice=controller.invoice
-    )
 
     # The output is displayed and written, honoring the append_output flag
     controller.display.display_invoice_output.assert_called_once_with(
-        invoice=controller.invoice, append_output=True
+        invoice=invoice, append_output=True
     )
     controller.file_io.print_invoice_to_output_file.assert_called_once_with(
-        invoice=controller.invoice, append_output=True
+        invoice=invoice, append_output=True
+    )
+    controller.file_io.export_invoice.assert_called_once_with(
+        invoice=invoice, append_output=True
+    )
+    controller.results_db.record.assert_called_once_with(
+        invoice_filepath=Path("invoice.pdf"), invoice=invoice
     )
 
-    # No mismatch popup is shown when the totals match
+    # No popup is shown and no mismatch is listed when the totals match
     controller.display.show_popup.assert_not_called()
+    controller.display.show_total_mismatch.assert_not_called()
+    controller.display.show_mismatch_summary.assert_called_once_with(
+        "All 1 calculated totals match the listed totals"
+    )
 
 
-def test_handle_process_invoice_total_mismatch_shows_popup(controller):
+def test_handle_process_invoice_total_mismatch_is_listed(controller):
     """
-    Verifies that handle_process_invoice shows a mismatch error popup when the
-    calculated total does not match the listed total, while still writing output.
+    Verifies that handle_process_invoice lists a total mismatch in the mismatch
+    panel, and summarizes it when the batch ends, rather than showing a popup
+    that would hold up the batch, while still writing output.
 
     Args:
         controller (pytest.fixture): Provides the controller and its mocks
     """
 
-    # A single valid page is read, but the totals disagree
-    controller.file_io.read_invoice_file.return_value = ["page one text"]
-    controller.invoice.total = Decimal("10.00")
-    controller.invoice.listed_total = Decimal("9.99")
+    # The engine parses an invoice whose totals disagree
+    invoice = SimpleNamespace(
+        total=Decimal("10.00"),
+        listed_total=Decimal("9.99"),
+        order_number="S12345",
+        customer_name="Acme",
+    )
+    controller.engine.process_files.return_value = iter(
+        [BatchResult(invoice_filepath=Path("invoice.pdf"), invoice=invoice)]
+    )
 
     controller.controller.handle_process_invoice(
-        invoice_filepath="invoice.pdf", append_output=False
+        invoice_filepath=Path("invoice.pdf"), append_output=False
     )
 
-    # A mismatch popup is shown, and the output is still written
-    controller.display.show_popup.assert_called_once()
+    # The mismatch is listed, one cent out, and no popup is shown
+    controller.display.show_popup.assert_not_called()
+    mismatch = controller.display.show_total_mismatch.call_args.args[0]
+    assert (mismatch.order_number, mismatch.difference_cents) == ("S12345", 1)
+
+    # The batch's mismatches are summarized once it finishes
+    controller.display.show_mismatch_summary.assert_called_once_with(
+        "1 of 1 calculated totals do not match the listed total, by 1¢ in all "
+        "(at most 1¢ on one invoice)"
+    )
+
+    # The output is still written
     controller.file_io.print_invoice_to_output_file.assert_called_once_with(
-        invoice=controller.invoice, append_output=False
+        invoice=invoice, append_output=False
+    )
+
+
+def test_handle_process_invoice_reports_batch_progress(controller):
+    """
+    Verifies that processing an invoice drives the display's progress: the batch is
+    announced, progress is reported after the invoice, and the batch is finished.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.engine.process_files.return_value = iter(
+        [BatchResult(invoice_filepath=Path("missing.pdf"), invoice=None)]
+    )
+
+    controller.controller.handle_process_invoice(
+        invoice_filepath=Path("missing.pdf"), append_output=False
+    )
+
+    controller.display.show_batch_started.assert_called_once_with(total=1)
+    assert controller.display.show_batch_progress.call_args.args[0].completed == 1
+    progress, cancelled = controller.display.show_batch_finished.call_args.args
+    assert (progress.completed, progress.total, cancelled) == (1, 1, False)
+
+    # The batch's results are streamed through one handle, and committed as it finishes
+    controller.file_io.begin_results_batch.assert_called_once_with()
+    controller.file_io.end_results_batch.assert_called_once_with()
+
+    # The batch's invoices are written to the results database as it finishes
+    controller.results_db.flush.assert_called_once_with()
+
+
+@patch("source.InvoiceAppController.STAGE_TIMINGS_PATH")
+def test_handle_process_invoice_records_stage_timings(
+    mock_stage_timings_path, controller
+):
+    """
+    Verifies that while stage timings are on, the timings a worker recorded are kept
+    along with the time taken to display and write the invoice, and the summary is
+    written out as the batch finishes.
+
+    Args:
+        mock_stage_timings_path (unittest.mock.MagicMock): Mocks the STAGE_TIMINGS_PATH constant
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    invoice = SimpleNamespace(
+        total=Decimal("1.00"), listed_total=Decimal("1.00"), order_number="S11111"
+    )
+    controller.engine.process_files.return_value = iter(
+        [
+            BatchResult(
+                invoice_filepath=Path("a.pdf"),
+                invoice=invoice,
+                stage_timings=[("read_invoice_file", 0.5)],
+            )
+        ]
+    )
+    stage_timings = controller.controller.stage_timings
+    stage_timings.enabled = True
+    stage_timings.record("process_invoice", 9.0)
+
+    with patch.object(stage_timings, "dump") as mock_dump:
+        controller.controller.handle_process_invoice(
+            invoice_filepath=Path("a.pdf"), append_output=False
+        )
+
+    # The previous batch's timings are forgotten, and this batch's are written out
+    assert [stage for stage, _seconds in stage_timings.samples] == [
+        "read_invoice_file",
+        "display_invoice_output",
+        "print_invoice_to_output_file",
+    ]
+    mock_dump.assert_called_once_with(mock_stage_timings_path)
+
+
+def test_handle_process_invoice_skips_stage_timings_when_off(controller):
+    """
+    Verifies that while stage timings are off, nothing is timed or written out.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.engine.process_files.return_value = iter(
+        [BatchResult(invoice_filepath=Path("missing.pdf"), invoice=None)]
+    )
+    stage_timings = controller.controller.stage_timings
+
+    with patch.object(stage_timings, "dump") as mock_dump:
+        controller.controller.handle_process_invoice(
+            invoice_filepath=Path("missing.pdf"), append_output=False
+        )
+
+    assert stage_timings.samples == []
+    mock_dump.assert_not_called()
+
+
+def test_handle_process_invoice_profiles_batch(controller):
+    """
+    Verifies that a batch is profiled while it is parsed and output, and that where
+    its profile was written is noted in debug.txt as the batch finishes.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    results = iter([BatchResult(invoice_filepath=Path("missing.pdf"), invoice=None)])
+    controller.engine.process_files.return_value = results
+
+    profiler = MagicMock()
+    profiler.iterate.side_effect = lambda iterable: iterable
+    profiler.call.side_effect = lambda function, **kwargs: function(**kwargs)
+    profiler.stop.return_value = [Path("logs/profiles/batch.collapsed")]
+    controller.controller.batch_profiler = profiler
+
+    controller.controller.handle_process_invoice(
+        invoice_filepath=Path("missing.pdf"), append_output=False
+    )
+
+    profiler.start.assert_called_once_with()
+    profiler.iterate.assert_called_once_with(results)
+    assert profiler.call.call_args.kwargs["result"].invoice_filepath == Path(
+        "missing.pdf"
+    )
+    profiler.stop.assert_called_once_with(PROFILES_DIR)
+    controller.file_io.print_to_debug_file.assert_any_call(
+        contents=f"Wrote the batch's profile to {Path('logs/profiles/batch.collapsed')}\n"
+    )
+
+
+def test_handle_process_invoice_reports_batch_memory(controller):
+    """
+    Verifies that the memory each invoice leaves behind is noted once it is output,
+    and that the batch's memory report is written as it finishes.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.engine.process_files.return_value = iter(
+        [BatchResult(invoice_filepath=Path("missing.pdf"), invoice=None)]
+    )
+
+    memory_report = MagicMock()
+    memory_report.stop.return_value = MEMORY_REPORT_PATH
+    controller.controller.memory_report = memory_report
+
+    controller.controller.handle_process_invoice(
+        invoice_filepath=Path("missing.pdf"), append_output=False
+    )
+
+    memory_report.start.assert_called_once_with()
+    memory_report.record_invoice.assert_called_once_with(Path("missing.pdf"))
+    memory_report.stop.assert_called_once_with(MEMORY_REPORT_PATH)
+    controller.file_io.print_to_debug_file.assert_any_call(
+        contents=f"Wrote the batch's memory report to {MEMORY_REPORT_PATH}\n"
+    )
+
+
+def test_handle_process_invoice_memory_report_write_error_shows_popup(controller):
+    """
+    Verifies that a memory report that cannot be written is shown as a file error,
+    and the batch still finishes.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.engine.process_files.return_value = iter([])
+
+    controller.controller.memory_report = MagicMock()
+    controller.controller.memory_report.stop.side_effect = OSError("disk full")
+
+    controller.controller.handle_process_invoice(
+        invoice_filepath=Path("missing.pdf"), append_output=False
+    )
+
+    controller.display.show_popup.assert_called_once_with(
+        title="File Error",
+        message=f"Could not write the memory report to {MEMORY_REPORT_PATH}: disk full",
+    )
+    controller.display.show_batch_finished.assert_called_once()
+
+
+###############################################################################
+###       Tests InvoiceAppController -> handle_process_all_invoices()       ###
+###############################################################################
+@patch("source.InvoiceAppController.INVOICES_PATH")
+def test_handle_process_all_invoices_parses_in_filename_order(
+    mock_invoices_path, controller
+):
+    """
+    Verifies that handle_process_all_invoices hands every invoice in the folder to
+    the batch engine sorted by name, regardless of the order the folder lists them.
+
+    Args:
+        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    # The folder lists its invoices out of order
+    mock_invoices_path.resolve.return_value.iterdir.return_value = [
+        Path("S0-22222.pdf"),
+        Path("s0-11111.pdf"),
+        Path("S0-33333.pdf"),
+    ]
+    controller.engine.process_files.return_value = iter([])
+
+    controller.controller.handle_process_all_invoices()
+
+    # The engine receives the invoices in filename order along with the loaded configs
+    controller.engine.process_files.assert_called_once_with(
+        invoice_filepaths=[
+            Path("s0-11111.pdf"),
+            Path("S0-22222.pdf"),
+            Path("S0-33333.pdf"),
+        ],
+        sales_reps=controller.controller.sales_reps,
+        payment_terms=controller.controller.payment_terms,
+    )
+
+    # Once the batch finishes, its invoices are indexed in the background
+    controller.search_index.update_in_background.assert_called_once_with(
+        list_invoices=controller.controller.folder_watcher.list_invoices,
+        read_pages=controller.file_io.read_invoice_text,
+    )
+
+
+@patch("source.InvoiceAppController.INVOICES_PATH")
+def test_handle_process_all_invoices_outputs_each_result_in_order(
+    mock_invoices_path, controller
+):
+    """
+    Verifies that handle_process_all_invoices replays each result's buffered debug
+    messages and errors, then displays and appends every parsed invoice in the
+    order the engine yields them.
+
+    Args:
+        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    mock_invoices_path.resolve.return_value.iterdir.return_value = []
+
+    first = SimpleNamespace(
+        total=Decimal("1.00"), listed_total=Decimal("1.00"), order_number="S11111"
+    )
+    second = SimpleNamespace(
+        total=Decimal("2.00"), listed_total=Decimal("2.00"), order_number="S22222"
+    )
+    controller.engine.process_files.return_value = iter(
+        [
+            BatchResult(
+                invoice_filepath=Path("a.pdf"),
+                invoice=first,
+                debug_messages=["Processing invoice: a.pdf with 1 pages."],
+            ),
+            BatchResult(invoice_filepath=Path("b.pdf"), invoice=second),
+        ]
+    )
+
+    controller.controller.handle_process_all_invoices()
+
+    # Each invoice is displayed and appended to results.txt, in order
+    controller.display.display_invoice_output.assert_has_calls(
+        [
+            call(invoice=first, append_output=True),
+            call(invoice=second, append_output=True),
+        ]
+    )
+    controller.file_io.print_invoice_to_output_file.assert_has_calls(
+        [
+            call(invoice=first, append_output=True),
+            call(invoice=second, append_output=True),
+        ]
+    )
+    controller.file_io.export_invoice.assert_has_calls(
+        [
+            call(invoice=first, append_output=True),
+            call(invoice=second, append_output=True),
+        ]
     )
 
+    # The worker's buffered debug message is written before the completion notice
+    assert controller.file_io.print_to_debug_file.call_args_list[:2] == [
+        call(contents="Processing invoice: a.pdf with 1 pages."),
+        call(contents="Processed all sales for invoice: a.pdf\n"),
+    ]
+
+    # The debug log is flushed at the end of each invoice, without waiting on the disk
+    assert controller.file_io.flush_debug_file.call_args_list == [call(wait=False)] * 2
+
+
+@patch("source.InvoiceAppController.INVOICES_PATH")
+def test_handle_process_all_invoices_reports_worker_errors(
+    mock_invoices_path, controller
+):
+    """
+    Verifies that errors a worker buffered while reading an invoice are shown to
+    the user, without a second no-pages error for the unreadable invoice.
+
+    Args:
+        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    mock_invoices_path.resolve.return_value.iterdir.return_value = []
+    controller.engine.process_files.return_value = iter(
+        [
+            BatchResult(
+                invoice_filepath=Path("bad.pdf"),
+                invoice=None,
+                errors=[("File Error", "Could not read the invoice PDF")],
+            ),
+        ]
+    )
+
+    controller.controller.handle_process_all_invoices()
+
+    # Only the buffered error is shown, as it already says why there is no invoice
+    controller.display.show_popup.assert_called_once_with(
+        title="File Error", message="Could not read the invoice PDF"
+    )
+    controller.display.display_invoice_output.assert_not_called()
+
+
+@patch("source.InvoiceAppController.INVOICES_PATH")
+def test_handle_process_all_invoices_reports_unexpected_errors(
+    mock_invoices_path, controller
+):
+    """
+    Verifies that an unexpected error raised while the batch is being parsed is
+    shown to the user as a processing error, and the batch still finishes.
+
+    Args:
+        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    mock_invoices_path.resolve.return_value.iterdir.return_value = [Path("a.pdf")]
+    controller.engine.process_files.side_effect = RuntimeError("pool broke")
+
+    controller.controller.handle_process_all_invoices()
+
+    controller.display.show_popup.assert_called_once_with(
+        title="Processing Error",
+        message="An error occurred while processing invoices: pool broke",
+    )
+    controller.display.show_batch_finished.assert_called_once()
+
+
+@patch("source.InvoiceAppController.INVOICES_PATH")
+def test_handle_process_all_invoices_ignored_while_batch_running(
+    mock_invoices_path, controller
+):
+    """
+    Verifies that a second batch is not started while one is still running.
+
+    Args:
+        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    mock_invoices_path.resolve.return_value.iterdir.return_value = []
+    controller.controller.batch_worker.is_running = True
+
+    controller.controller.handle_process_all_invoices()
+
+    controller.display.show_batch_started.assert_not_called()
+    controller.engine.process_files.assert_not_called()
+
+
+###############################################################################
+###         Tests InvoiceAppController -> handle_cancel_processing()        ###
+###############################################################################
+def test_handle_cancel_processing_cancels_batch(controller):
+    """
+    Verifies that the Cancel button's handler asks the batch worker to stop.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.controller.batch_worker = MagicMock()
+
+    controller.controller.handle_cancel_processing()
+
+    controller.controller.batch_worker.cancel.assert_called_once_with()
+
+
+###############################################################################
+###              Tests InvoiceAppController -> handle_search()              ###
+###############################################################################
+def test_handle_search_only_queries_the_index(controller):
+    """
+    Verifies that handle_search returns the results of searching what is already
+    indexed, without indexing anything on the GUI thread.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.search_index.search.return_value = ["result"]
+
+    results = controller.controller.handle_search("BRACKET")
+
+    controller.search_index.search.assert_called_once_with("BRACKET")
+    controller.search_index.update.assert_not_called()
+    controller.search_index.update_in_background.assert_not_called()
+    assert results == ["result"]
+
 
 ###############################################################################
 ###            Tests InvoiceAppController -> handle_save_config()           ###
@@ -498,3 +1112,156 @@ def test_handle_save_setting_delegates_to_repository(controller):
     controller.settings_repo.save_setting.assert_called_once_with(
         key="theme", value="Forest"
     )
+
+
+def test_handle_save_setting_applies_export_format(controller):
+    """
+    Verifies that saving the export format also applies it to the file IO
+    controller, so it takes effect without a restart.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.file_io.set_export_format.reset_mock()
+
+    controller.controller.handle_save_setting("export_format", EXPORT_FORMAT_CSV)
+
+    controller.settings_repo.save_setting.assert_called_once_with(
+        key="export_format", value=EXPORT_FORMAT_CSV
+    )
+    controller.file_io.set_export_format.assert_called_once_with(EXPORT_FORMAT_CSV)
+
+
+def test_handle_save_setting_starts_and_stops_watching(controller):
+    """
+    Verifies that turning the watch folder setting on starts checking the Invoices/
+    folder straight away, and turning it off cancels the next check.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.controller.folder_watcher = MagicMock()
+    controller.controller.folder_watcher.poll.return_value = []
+
+    controller.controller.handle_save_setting("watch_folder", WATCH_FOLDER_ON)
+
+    controller.settings_repo.save_setting.assert_called_once_with(
+        key="watch_folder", value=WATCH_FOLDER_ON
+    )
+    assert controller.controller.watch_folder is True
+    controller.controller.folder_watcher.reset.assert_called_once_with()
+    controller.controller.folder_watcher.poll.assert_called_once_with()
+
+    controller.controller.handle_save_setting("watch_folder", WATCH_FOLDER_OFF)
+
+    assert controller.controller.watch_folder is False
+    controller.display.after_cancel.assert_called_once_with(
+        controller.display.after.return_value
+    )
+
+
+def test_handle_save_setting_turns_stage_timings_on_and_off(controller):
+    """
+    Verifies that the stage timings setting is persisted and turns timing on and off
+    for the next invoices processed.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.controller.handle_save_setting("stage_timings", STAGE_TIMINGS_ON)
+
+    controller.settings_repo.save_setting.assert_called_once_with(
+        key="stage_timings", value=STAGE_TIMINGS_ON
+    )
+    assert controller.controller.stage_timings.enabled is True
+
+    controller.controller.handle_save_setting("stage_timings", STAGE_TIMINGS_OFF)
+
+    assert controller.controller.stage_timings.enabled is False
+
+
+###############################################################################
+###         Tests InvoiceAppController -> _poll_invoices_folder()           ###
+###############################################################################
+def test_poll_invoices_folder_processes_new_invoices(controller):
+    """
+    Verifies that new invoices found in the Invoices/ folder are processed as a batch
+    appended to the output, and the folder is checked again afterwards.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.controller.folder_watcher = MagicMock()
+    controller.controller.folder_watcher.poll.return_value = [
+        Path("S0-11111.pdf"),
+        Path("S0-22222.pdf"),
+    ]
+    controller.engine.process_files.return_value = iter([])
+
+    controller.controller._poll_invoices_folder()
+
+    controller.display.show_batch_started.assert_called_once_with(total=2)
+    controller.engine.process_files.assert_called_once_with(
+        invoice_filepaths=[Path("S0-11111.pdf"), Path("S0-22222.pdf")],
+        sales_reps=controller.controller.sales_reps,
+        payment_terms=controller.controller.payment_terms,
+    )
+    assert controller.controller.watched_invoices == []
+    controller.display.after.assert_called_once_with(
+        WATCH_POLL_INTERVAL_MS, controller.controller._poll_invoices_folder
+    )
+
+
+def test_poll_invoices_folder_waits_for_running_batch(controller):
+    """
+    Verifies that invoices found while a batch is running wait for it to finish,
+    and are processed by the first check after it has.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.controller.folder_watcher = MagicMock()
+    controller.controller.folder_watcher.poll.side_effect = [[Path("S0-11111.pdf")], []]
+    controller.engine.process_files.return_value = iter([])
+
+    controller.controller.batch_worker.is_running = True
+    controller.controller._poll_invoices_folder()
+
+    controller.engine.process_files.assert_not_called()
+    assert controller.controller.watched_invoices == [Path("S0-11111.pdf")]
+
+    controller.controller.batch_worker.is_running = False
+    controller.controller._poll_invoices_folder()
+
+    assert controller.engine.process_files.call_args.kwargs["invoice_filepaths"] == [
+        Path("S0-11111.pdf")
+    ]
+    assert controller.controller.watched_invoices == []
+
+
+def test_poll_invoices_folder_keeps_watching_after_error(controller):
+    """
+    Verifies that a folder that cannot be checked is noted in debug.txt and checked
+    again next time, rather than stopping the watch.
+
+    Args:
+        controller (pytest.fixture): Provides the controller and its mocks
+    """
+
+    controller.controller.folder_watcher = MagicMock()
+    controller.controller.folder_watcher.poll.side_effect = OSError("drive offline")
+
+    controller.controller._poll_invoices_folder()
+
+    controller.engine.process_files.assert_not_called()
+    assert "drive offline" in controller.file_io.print_to_debug_file.call_args.kwargs[
+        "contents"
+    ]
+    controller.display.after.assert_called_once_with(
+        WATCH_POLL_INTERVAL_MS, controller.controller._poll_invoices_folder
+    )
@@ -1,10 +1,14 @@
 import tkinter as tk
 import pytest
+from decimal import Decimal
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import patch, call, MagicMock
+from unittest.mock import DEFAULT, call, patch, MagicMock
 
 from source.Invoice import Invoice
+from source.MismatchReport import TotalMismatch
+from source.InvoiceSearchIndex import SearchResult
+from source.BatchWorker import BatchProgress
 from source.gui.InvoiceAppDisplay import InvoiceAppDisplay
 from fishbowl_common.gui import (
     DARK,
@@ -18,6 +22,9 @@ from source.constants import (
     PAYMENT_TERMS_PATH,
     SALES_REPS_PATH,
     COST_CRITERIA_PATH,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_NONE,
+    GUI_UPDATE_INTERVAL_MS,
 )
 
 
@@ -44,7 +51,7 @@ def display(request):
     Builds an InvoiceAppDisplay in complete isolation from tkinter: the real
     Tk.__init__ is neutralized, the inherited Tk methods the constructor calls
     (title/geometry/resizable/configure/config) are mocked, and every widget
-    class is replaced so no real window or widgets are created. The patches stay
+    class (including the ttk progress bar and its style) is replaced so no real window or widgets are created. The patches stay
     active for the duration of each test so methods that reconfigure widgets
     (apply_theme/_apply_font) also run without a real display.
 
@@ -57,9 +64,10 @@ def display(request):
     Returns:
         types.SimpleNamespace: Holds the constructed display (`display`), the
             mocked Tk methods (`title`, `geometry`, `resizable`, `configure`,
-            `config`), the mocked ArgumentProvider instance (`arg_provider`), and
-            the callbacks passed at construction (`process_callback`,
-            `read_file_callback`, `save_config_callback`, `save_settings_callback`).
+            `config`, `after`), the mocked ArgumentProvider instance
+            (`arg_provider`), and the callbacks passed at construction (`process_callback`,
+            `process_all_callback`, `cancel_callback`, `read_file_callback`,
+            `save_config_callback`, `save_settings_callback`).
     """
 
     # Settings supplied indirectly by a test, or None when not parametrized
@@ -72,17 +80,31 @@ def display(request):
         patch.object(InvoiceAppDisplay, "resizable") as mock_resizable,
         patch.object(InvoiceAppDisplay, "configure") as mock_configure,
         patch.object(InvoiceAppDisplay, "config") as mock_config,
+        patch.object(InvoiceAppDisplay, "after") as mock_after,
         patch("source.gui.InvoiceAppDisplay.ArgumentProvider") as mock_arg_cls,
-        patch("source.gui.InvoiceAppDisplay.tk.StringVar"),
+        patch.multiple(
+            "source.gui.InvoiceAppDisplay.tk", StringVar=DEFAULT, BooleanVar=DEFAULT
+        ) as mock_tk_vars,
         patch("source.gui.InvoiceAppDisplay.tk.Menu", side_effect=_distinct_widget),
         patch("source.gui.InvoiceAppDisplay.tk.Label", side_effect=_distinct_widget),
         patch("source.gui.InvoiceAppDisplay.tk.Frame", side_effect=_distinct_widget),
         patch("source.gui.InvoiceAppDisplay.tk.Entry", side_effect=_distinct_widget),
         patch("source.gui.InvoiceAppDisplay.tk.Button", side_effect=_distinct_widget),
+        patch(
+            "source.gui.InvoiceAppDisplay.ttk.Progressbar",
+            side_effect=_distinct_widget,
+        ),
+        patch("source.gui.InvoiceAppDisplay.ttk.Style"),
         patch(
             "source.gui.InvoiceAppDisplay.scrolledtext.ScrolledText",
             side_effect=_distinct_widget,
         ),
+        patch(
+            "source.gui.InvoiceAppDisplay.ResultsTable", side_effect=_distinct_widget
+        ),
+        patch(
+            "source.gui.InvoiceAppDisplay.MismatchPanel", side_effect=_distinct_widget
+        ),
         patch(
             "source.gui.InvoiceAppDisplay.Tooltip", side_effect=_distinct_widget
         ) as mock_tooltip_cls,
@@ -90,18 +112,24 @@ def display(request):
 
         # The callbacks the controller would normally supply; mocks are sufficient
         callback = MagicMock()
+        process_all_callback = MagicMock()
+        cancel_callback = MagicMock()
         read_file_callback = MagicMock()
         save_config_callback = MagicMock()
         save_settings_callback = MagicMock()
-        copy_invoice_callback = MagicMock()
+        import_invoices_callback = MagicMock()
+        search_callback = MagicMock()
         check_for_updates_callback = MagicMock()
 
         built_display = InvoiceAppDisplay(
             process_callback=callback,
+            process_all_callback=process_all_callback,
+            cancel_callback=cancel_callback,
             read_file_callback=read_file_callback,
             save_config_callback=save_config_callback,
             save_settings_callback=save_settings_callback,
-            copy_invoice_callback=copy_invoice_callback,
+            import_invoices_callback=import_invoices_callback,
+            search_callback=search_callback,
             check_for_updates_callback=check_for_updates_callback,
             title="Invoice Processor",
             window_resolution="750x750",
@@ -115,14 +143,19 @@ def display(request):
             resizable=mock_resizable,
             configure=mock_configure,
             config=mock_config,
+            after=mock_after,
             arg_provider=mock_arg_cls.return_value,
             process_callback=callback,
+            process_all_callback=process_all_callback,
+            cancel_callback=cancel_callback,
             read_file_callback=read_file_callback,
             save_config_callback=save_config_callback,
             save_settings_callback=save_settings_callback,
-            copy_invoice_callback=copy_invoice_callback,
+            import_invoices_callback=import_invoices_callback,
+            search_callback=search_callback,
             check_for_updates_callback=check_for_updates_callback,
             tooltip_cls=mock_tooltip_cls,
+            boolean_var_cls=mock_tk_vars["BooleanVar"],
         )
 
 
@@ -157,19 +190,32 @@ def test_init_sets_default_state(display):
     assert display.display.current_theme == DARK
     assert display.display.current_font_family == DEFAULT_FONT_FAMILY
     assert display.display.current_font_size == DEFAULT_FONT_SIZE
+    assert display.display.current_export_format == EXPORT_FORMAT_NONE
 
     # The callbacks and argument provider are stored for later use
     assert display.display.process_callback is display.process_callback
+    assert display.display.process_all_callback is display.process_all_callback
+    assert display.display.cancel_callback is display.cancel_callback
     assert display.display.read_file_callback is display.read_file_callback
     assert display.display.save_config_callback is display.save_config_callback
     assert display.display.save_settings_callback is display.save_settings_callback
-    assert display.display.copy_invoice_callback is display.copy_invoice_callback
+    assert display.display.import_invoices_callback is display.import_invoices_callback
+    assert display.display.search_callback is display.search_callback
     assert display.display.argument_provider is display.arg_provider
 
 
 @pytest.mark.parametrize(
     "display",
-    [{"theme": "Light", "font_family": "Arial", "font_size": "18"}],
+    [
+        {
+            "theme": "Light",
+            "font_family": "Arial",
+            "font_size": "18",
+            "export_format": "CSV",
+            "watch_folder": "on",
+            "stage_timings": "on",
+        }
+    ],
     indirect=True,
 )
 def test_init_restores_persisted_settings(display):
@@ -185,6 +231,10 @@ def test_init_restores_persisted_settings(display):
     assert display.display.current_theme == LIGHT
     assert display.display.current_font_family == "Arial"
     assert display.display.current_font_size == 18
+    assert display.display.current_export_format == EXPORT_FORMAT_CSV
+
+    # Both the watch folder and stage timings checkboxes start ticked
+    assert display.boolean_var_cls.call_args_list == [call(value=True)] * 2
 
 
 @pytest.mark.parametrize("display", [{"theme": "Nonexistent"}], indirect=True)
@@ -213,6 +263,19 @@ def test_init_non_numeric_font_size_falls_back_to_default(display):
     assert display.display.current_font_size == DEFAULT_FONT_SIZE
 
 
+@pytest.mark.parametrize("display", [{"export_format": "XML"}], indirect=True)
+def test_init_unknown_export_format_falls_back_to_none(display):
+    """
+    Verifies that __init__ turns exporting off when the persisted export format is
+    not one of the known formats.
+
+    Args:
+        display (pytest.fixture): Provides the display built with an unknown format
+    """
+
+    assert display.display.current_export_format == EXPORT_FORMAT_NONE
+
+
 ###############################################################################
 ###              Tests InvoiceAppDisplay -> build_widgets()                 ###
 ###############################################################################
@@ -236,13 +299,22 @@ def test_build_widgets_creates_all_widgets(display):
     assert display.display.file_frame is not None
     assert display.display.file_entry is not None
     assert display.display.browse_button is not None
+    assert display.display.search_frame is not None
+    assert display.display.search_entry is not None
+    assert display.display.search_button is not None
     assert display.display.button_frame is not None
     assert display.display.process_invoice_button is not None
     assert display.display.exit_button is not None
     assert display.display.process_all_invoices_button is not None
     assert display.display.discover_invoices_button is not None
     assert display.display.output_label is not None
+    assert display.display.results_table is not None
+    assert display.display.mismatch_panel is not None
     assert display.display.output_box is not None
+    assert display.display.progress_frame is not None
+    assert display.display.progress_bar is not None
+    assert display.display.progress_label is not None
+    assert display.display.cancel_button is not None
 
 
 def test_build_widgets_attaches_menu_bar(display):
@@ -278,12 +350,14 @@ def test_build_widgets_attaches_button_tooltips(display):
         display.display.process_invoice_button,
         display.display.process_all_invoices_button,
         display.display.discover_invoices_button,
+        display.display.search_button,
         display.display.exit_button,
+        display.display.cancel_button,
     ):
         assert tooltip_targets.get(button)
 
     # The tooltips are tracked so they can be restyled on theme/font changes
-    assert len(display.display.tooltips) == 5
+    assert len(display.display.tooltips) == 7
 
 
 ###############################################################################
@@ -334,8 +408,9 @@ def test_handle_browse_button_no_selection(mock_askopenfilename, display):
 ###############################################################################
 def test_display_invoice_output_overwrites_by_default(display):
     """
-    Verifies that display_invoice_output clears the output box and writes the
-    invoice's formatted string when append_output is left at its default False.
+    Verifies that display_invoice_output replaces the results table with the
+    invoice, then clears the output box and writes the invoice's formatted string
+    when append_output is left at its default False.
 
     Args:
         display (pytest.fixture): Provides the display and its mocks
@@ -346,6 +421,10 @@ def test_display_invoice_output_overwrites_by_default(display):
 
     display.display.display_invoice_output(mock_invoice)
 
+    # The table is cleared and given the invoice as its only row
+    display.display.results_table.clear.assert_called_once_with()
+    display.display.results_table.add.assert_called_once_with(mock_invoice)
+
     # The box is cleared, then the formatted invoice is inserted
     display.display.output_box.delete.assert_called_once_with(1.0, tk.END)
     display.display.output_box.insert.assert_called_once_with(
@@ -355,23 +434,34 @@ def test_display_invoice_output_overwrites_by_default(display):
 
 def test_display_invoice_output_appends_when_requested(display):
     """
-    Verifies that display_invoice_output appends a newline and the invoice's
-    formatted string (without clearing) when append_output is True.
+    Verifies that display_invoice_output queues the invoice when append_output is
+    True, and that every invoice queued before the next scheduled update is added
+    to the results table in one go, leaving each unformatted until selected.
 
     Args:
         display (pytest.fixture): Provides the display and its mocks
     """
 
-    mock_invoice = MagicMock(spec=Invoice)
-    mock_invoice.to_formatted_string.return_value = "formatted invoice"
+    mock_invoices = [MagicMock(spec=Invoice) for _ in range(3)]
+
+    for mock_invoice in mock_invoices:
+        display.display.display_invoice_output(mock_invoice, append_output=True)
+
+    # Nothing is drawn until the update scheduled for the first invoice runs
+    display.display.results_table.add_many.assert_not_called()
+    display.after.assert_called_once()
+    delay, scheduled_update = display.after.call_args.args
+    assert delay == GUI_UPDATE_INTERVAL_MS
 
-    display.display.display_invoice_output(mock_invoice, append_output=True)
+    scheduled_update()
 
-    # A separating newline and the formatted invoice are inserted, nothing cleared
+    # The invoices are added as rows together, and nothing is cleared or formatted
+    display.display.results_table.add_many.assert_called_once_with(mock_invoices)
+    display.display.results_table.clear.assert_not_called()
     display.display.output_box.delete.assert_not_called()
-    display.display.output_box.insert.assert_has_calls(
-        [call(tk.END, "\n"), call(tk.END, "formatted invoice")]
-    )
+    display.display.output_box.insert.assert_not_called()
+    for mock_invoice in mock_invoices:
+        mock_invoice.to_formatted_string.assert_not_called()
 
 
 def test_display_invoice_output_no_output_box(display):
@@ -392,6 +482,98 @@ def test_display_invoice_output_no_output_box(display):
     mock_invoice.to_formatted_string.assert_not_called()
 
 
+###############################################################################
+###            Tests InvoiceAppDisplay -> show_invoice_detail()             ###
+###############################################################################
+def test_show_invoice_detail_replaces_output_box(display):
+    """
+    Verifies that show_invoice_detail, which is called when a row of the results
+    table is selected, replaces the output box with the invoice's breakdown.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    mock_invoice = MagicMock(spec=Invoice)
+    mock_invoice.to_formatted_string.return_value = "formatted invoice"
+
+    display.display.show_invoice_detail(mock_invoice)
+
+    display.display.output_box.delete.assert_called_once_with(1.0, tk.END)
+    display.display.output_box.insert.assert_called_once_with(
+        tk.END, "formatted invoice"
+    )
+
+
+###############################################################################
+###                Tests InvoiceAppDisplay -> handle_search()               ###
+###############################################################################
+def test_handle_search_empty_query_does_nothing(display):
+    """
+    Verifies that handle_search does not search when nothing has been typed into
+    the search box.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.search_query.get.return_value = "   "
+
+    display.display.handle_search()
+
+    display.search_callback.assert_not_called()
+    display.display.output_box.insert.assert_not_called()
+
+
+def test_handle_search_lists_results(display):
+    """
+    Verifies that handle_search forwards the typed words to the search callback and
+    replaces the output box with one line per matching page.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.search_query.get.return_value = " BRACKET-00012 "
+    display.search_callback.return_value = [
+        SearchResult(
+            invoice_filepath=Path("Invoices/S12345.pdf"),
+            page_number=2,
+            snippet="1 [BRACKET-00012] galvanized steel",
+        )
+    ]
+
+    display.display.handle_search()
+
+    display.search_callback.assert_called_once_with("BRACKET-00012")
+    display.display.output_box.delete.assert_called_once_with(1.0, tk.END)
+    display.display.output_box.insert.assert_called_once_with(
+        tk.END,
+        'Search results for "BRACKET-00012": 1 match(es)\n'
+        "S12345.pdf, page 2: 1 [BRACKET-00012] galvanized steel\n",
+    )
+
+
+@patch.object(InvoiceAppDisplay, "show_popup")
+def test_handle_search_error_shows_popup(mock_show_popup, display):
+    """
+    Verifies that handle_search shows an error popup, rather than raising, when the
+    search fails.
+
+    Args:
+        mock_show_popup (unittest.mock.MagicMock): Mocks show_popup
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.search_query.get.return_value = "LABOR"
+    display.search_callback.side_effect = FileNotFoundError("Invoices")
+
+    display.display.handle_search()
+
+    mock_show_popup.assert_called_once()
+    display.display.output_box.insert.assert_not_called()
+
+
 ###############################################################################
 ###           Tests InvoiceAppDisplay -> handle_process_invoice()           ###
 ###############################################################################
@@ -442,56 +624,33 @@ def test_handle_process_invoice_forwards_to_callback(mock_show_popup, display):
 ###############################################################################
 ###         Tests InvoiceAppDisplay -> handle_process_all_invoices()        ###
 ###############################################################################
-@patch("source.gui.InvoiceAppDisplay.INVOICES_PATH")
-def test_handle_process_all_invoices_processes_each(mock_invoices_path, display):
+def test_handle_process_all_invoices_forwards_to_callback(display):
     """
-    Verifies that handle_process_all_invoices iterates the invoices directory and
-    forwards each file to the process callback with append_output True.
+    Verifies that handle_process_all_invoices forwards the call to the process
+    all callback, which owns walking the Invoices/ folder.
 
     Args:
-        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
         display (pytest.fixture): Provides the display and its mocks
     """
 
-    # The invoices directory yields two invoice files
-    first_invoice = MagicMock()
-    second_invoice = MagicMock()
-    mock_invoices_path.resolve.return_value.iterdir.return_value = [
-        first_invoice,
-        second_invoice,
-    ]
-
     display.display.handle_process_all_invoices()
 
-    # Each invoice is processed in order, appending to the running output
-    display.process_callback.assert_has_calls(
-        [
-            call(first_invoice, append_output=True),
-            call(second_invoice, append_output=True),
-        ]
-    )
-    assert display.process_callback.call_count == 2
+    display.process_all_callback.assert_called_once_with()
 
 
 @patch.object(InvoiceAppDisplay, "show_popup")
-@patch("source.gui.InvoiceAppDisplay.INVOICES_PATH")
-def test_handle_process_all_invoices_error_shows_popup(
-    mock_invoices_path, mock_show_popup, display
-):
+def test_handle_process_all_invoices_error_shows_popup(mock_show_popup, display):
     """
-    Verifies that handle_process_all_invoices shows an error popup when iterating
-    the invoices directory raises an exception.
+    Verifies that handle_process_all_invoices shows an error popup when processing
+    the invoices raises an exception.
 
     Args:
-        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
         mock_show_popup (unittest.mock.MagicMock): Mocks show_popup
         display (pytest.fixture): Provides the display and its mocks
     """
 
-    # Resolving/iterating the invoices directory fails
-    mock_invoices_path.resolve.return_value.iterdir.side_effect = OSError(
-        "directory unavailable"
-    )
+    # Processing the invoices directory fails
+    display.process_all_callback.side_effect = OSError("directory unavailable")
 
     display.display.handle_process_all_invoices()
 
@@ -499,6 +658,221 @@ def test_handle_process_all_invoices_error_shows_popup(
     mock_show_popup.assert_called_once()
 
 
+###############################################################################
+###                Tests InvoiceAppDisplay -> handle_cancel()               ###
+###############################################################################
+def test_handle_cancel_forwards_to_callback(display):
+    """
+    Verifies that handle_cancel disables the Cancel button so it is not pressed
+    twice, tells the user the batch is stopping, and forwards to the callback.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.handle_cancel()
+
+    display.display.cancel_button.configure.assert_called_with(state="disabled")
+    display.display.progress_label.configure.assert_called_with(
+        text="Cancelling after the current invoice..."
+    )
+    display.cancel_callback.assert_called_once_with()
+
+
+###############################################################################
+###             Tests InvoiceAppDisplay -> show_batch_started()             ###
+###############################################################################
+def test_show_batch_started_disables_processing_and_resets_progress(display):
+    """
+    Verifies that starting a batch disables both process buttons, enables Cancel,
+    and resets the progress bar to the size of the batch.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.show_batch_started(total=12)
+
+    display.display.process_invoice_button.configure.assert_called_with(
+        state="disabled"
+    )
+    display.display.process_all_invoices_button.configure.assert_called_with(
+        state="disabled"
+    )
+    display.display.cancel_button.configure.assert_called_with(state="normal")
+    display.display.progress_bar.configure.assert_called_with(maximum=12, value=0)
+    display.display.progress_label.configure.assert_called_with(
+        text="Processing 0 of 12 invoices..."
+    )
+
+    # The mismatches of the previous batch are cleared
+    display.display.mismatch_panel.clear.assert_called_once_with()
+
+
+###############################################################################
+###             Tests InvoiceAppDisplay -> show_batch_progress()            ###
+###############################################################################
+def test_show_batch_progress_shows_rate_and_eta(display):
+    """
+    Verifies that progress advances the bar and reports the processing rate and
+    the estimated time remaining.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.show_batch_progress(
+        BatchProgress(completed=10, total=610, elapsed=4.0)
+    )
+    display.display.batch_updates.flush_now()
+
+    display.display.progress_bar.configure.assert_called_with(value=10)
+    display.display.progress_label.configure.assert_called_with(
+        text="Processed 10 of 610 invoices  |  2.5 files/sec  |  ETA 4:00"
+    )
+
+
+def test_show_batch_progress_without_eta(display):
+    """
+    Verifies that a placeholder is shown for the ETA before the rate is known.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.show_batch_progress(
+        BatchProgress(completed=0, total=3, elapsed=0.0)
+    )
+    display.display.batch_updates.flush_now()
+
+    display.display.progress_label.configure.assert_called_with(
+        text="Processed 0 of 3 invoices  |  0.0 files/sec  |  ETA --:--"
+    )
+
+
+###############################################################################
+###             Tests InvoiceAppDisplay -> show_batch_finished()            ###
+###############################################################################
+def test_show_batch_finished_restores_buttons_and_reports_duration(display):
+    """
+    Verifies that a completed batch re-enables processing, disables Cancel, and
+    reports how long the batch took.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.show_batch_finished(
+        BatchProgress(completed=3, total=3, elapsed=125.4), cancelled=False
+    )
+
+    display.display.process_invoice_button.configure.assert_called_with(
+        state="normal"
+    )
+    display.display.process_all_invoices_button.configure.assert_called_with(
+        state="normal"
+    )
+    display.display.cancel_button.configure.assert_called_with(state="disabled")
+    display.display.progress_label.configure.assert_called_with(
+        text="Processed 3 of 3 invoices in 2:05"
+    )
+
+
+def test_show_batch_finished_reports_cancellation(display):
+    """
+    Verifies that a cancelled batch reports how far it got before stopping.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.show_batch_finished(
+        BatchProgress(completed=1, total=3, elapsed=1.0), cancelled=True
+    )
+
+    display.display.progress_label.configure.assert_called_with(
+        text="Cancelled after 1 of 3 invoices"
+    )
+
+
+def test_show_batch_finished_draws_pending_updates_and_reports_coalescing(display):
+    """
+    Verifies that finishing a batch first draws the results and progress still
+    waiting for the next scheduled update, then reports how many results were
+    drawn in how many screen updates.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.show_batch_started(total=3)
+    mock_invoices = [MagicMock(spec=Invoice) for _ in range(3)]
+    for completed, mock_invoice in enumerate(mock_invoices, start=1):
+        display.display.display_invoice_output(mock_invoice, append_output=True)
+        display.display.show_batch_progress(
+            BatchProgress(completed=completed, total=3, elapsed=1.0)
+        )
+
+    display.display.show_batch_finished(
+        BatchProgress(completed=3, total=3, elapsed=1.0), cancelled=False
+    )
+
+    # The three results and the final progress are drawn in a single update
+    display.display.results_table.add_many.assert_called_once_with(mock_invoices)
+    display.display.progress_bar.configure.assert_called_with(value=3)
+    display.display.progress_label.configure.assert_called_with(
+        text=(
+            "Processed 3 of 3 invoices in 0:01  |  "
+            "3 results drawn in 1 screen updates"
+        )
+    )
+
+
+###############################################################################
+###             Tests InvoiceAppDisplay -> show_total_mismatch()            ###
+###############################################################################
+def test_show_total_mismatch_lists_it_without_a_popup(display):
+    """
+    Verifies that a total mismatch is listed in the mismatch panel, and that no
+    popup is opened that would hold up the batch.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    mismatch = TotalMismatch(
+        invoice_filepath=Path("invoice.pdf"),
+        order_number="S12345",
+        customer_name="Acme",
+        total=Decimal("10.00"),
+        listed_total=Decimal("9.99"),
+    )
+
+    with patch("source.gui.InvoiceAppDisplay.MessageWindow") as mock_window_cls:
+        display.display.show_total_mismatch(mismatch)
+
+    display.display.mismatch_panel.add.assert_called_once_with(mismatch)
+    mock_window_cls.assert_not_called()
+
+
+###############################################################################
+###            Tests InvoiceAppDisplay -> show_mismatch_summary()           ###
+###############################################################################
+def test_show_mismatch_summary_sets_panel_summary(display):
+    """
+    Verifies that the summary of a batch's mismatches is shown in the panel.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.show_mismatch_summary("1 of 3 calculated totals do not match")
+
+    display.display.mismatch_panel.set_summary.assert_called_once_with(
+        "1 of 3 calculated totals do not match"
+    )
+
+
 ###############################################################################
 ###                 Tests InvoiceAppDisplay -> show_popup()                 ###
 ###############################################################################
@@ -554,7 +928,8 @@ def test_show_popup_suppressed_in_integration_mode(mock_window_cls, display):
 ###############################################################################
 def test_handle_clear_resets_state(display):
     """
-    Verifies that handle_clear resets the selected file and clears the output box.
+    Verifies that handle_clear resets the selected file and clears the results
+    table and output box.
 
     Args:
         display (pytest.fixture): Provides the display and its mocks
@@ -562,8 +937,9 @@ def test_handle_clear_resets_state(display):
 
     display.display.handle_clear()
 
-    # The selected file is reset and the output box is emptied
+    # The selected file is reset and the table and output box are emptied
     display.display.selected_file.set.assert_called_once_with("")
+    display.display.results_table.clear.assert_called_once_with()
     display.display.output_box.delete.assert_called_once_with(1.0, tk.END)
 
 
@@ -669,7 +1045,7 @@ def test_handle_sales_reps_opens_editor(mock_window_cls, display):
 def test_handle_discover_invoices_opens_window(mock_window_cls, display):
     """
     Verifies that handle_discover_invoices opens an InvoiceDiscoveryWindow,
-    styled with the active theme/font and wired to the copy invoice callback.
+    styled with the active theme/font and wired to the invoice import callback.
 
     Args:
         mock_window_cls (unittest.mock.MagicMock): Mocks the InvoiceDiscoveryWindow class
@@ -678,14 +1054,14 @@ def test_handle_discover_invoices_opens_window(mock_window_cls, display):
 
     display.display.handle_discover_invoices()
 
-    # The discovery window is opened with the active theme/font and copy callback
+    # The discovery window is opened with the active theme/font and import callback
     mock_window_cls.assert_called_once_with(
         parent=display.display,
         title="Discover Invoices",
         theme=display.display.current_theme,
         font_family=display.display.current_font_family,
         font_size=display.display.current_font_size,
-        copy_callback=display.copy_invoice_callback,
+        import_callback=display.import_invoices_callback,
     )
 
 
@@ -719,6 +1095,31 @@ def test_handle_about_opens_window(mock_window_cls, display):
     )
 
 
+###############################################################################
+###             Tests InvoiceAppDisplay -> handle_performance()             ###
+###############################################################################
+@patch("source.gui.InvoiceAppDisplay.PerformanceWindow")
+def test_handle_performance_opens_window(mock_window_cls, display):
+    """
+    Verifies that handle_performance opens a PerformanceWindow showing the display's
+    stage timings, styled with the active theme/font.
+
+    Args:
+        mock_window_cls (unittest.mock.MagicMock): Mocks the PerformanceWindow class
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.handle_performance()
+
+    mock_window_cls.assert_called_once_with(
+        parent=display.display,
+        stage_timings=display.display.stage_timings,
+        theme=display.display.current_theme,
+        font_family=display.display.current_font_family,
+        font_size=display.display.current_font_size,
+    )
+
+
 ###############################################################################
 ###          Tests InvoiceAppDisplay -> handle_check_for_updates()          ###
 ###############################################################################
@@ -828,18 +1229,18 @@ def test_show_update_available_suppressed_in_integration_mode(mock_window_cls, d
     mock_window_cls.assert_not_called()
 
 
-@patch("source.gui.InvoiceAppDisplay.FileEditorWindow")
+@patch("source.gui.InvoiceAppDisplay.LogViewerWindow")
 @patch("source.gui.InvoiceAppDisplay.RESULTS_LOG_PATH")
 def test_handle_results_log_opens_when_present(
     mock_results_path, mock_window_cls, display
 ):
     """
-    Verifies that handle_results_log opens a read-only viewer window when the
-    results log file exists.
+    Verifies that handle_results_log opens a log viewer window on the results log
+    when it exists, without reading the log in full.
 
     Args:
         mock_results_path (unittest.mock.MagicMock): Mocks the RESULTS_LOG_PATH constant
-        mock_window_cls (unittest.mock.MagicMock): Mocks the FileEditorWindow class
+        mock_window_cls (unittest.mock.MagicMock): Mocks the LogViewerWindow class
         display (pytest.fixture): Provides the display and its mocks
     """
 
@@ -848,14 +1249,14 @@ def test_handle_results_log_opens_when_present(
 
     display.display.handle_results_log()
 
-    # The existing results log is read and opened in a read-only viewer window
-    display.read_file_callback.assert_called_once_with(mock_results_path)
-    assert mock_window_cls.call_args.kwargs["file_path"] is mock_results_path
-    assert mock_window_cls.call_args.kwargs["editable"] is False
+    # The existing results log is opened in a log viewer, which reads it itself
+    display.read_file_callback.assert_not_called()
+    assert mock_window_cls.call_args.kwargs["log_path"] is mock_results_path
+    assert mock_window_cls.call_args.kwargs["title"] == "Results Log"
 
 
 @patch.object(InvoiceAppDisplay, "show_popup")
-@patch("source.gui.InvoiceAppDisplay.FileEditorWindow")
+@patch("source.gui.InvoiceAppDisplay.LogViewerWindow")
 @patch("source.gui.InvoiceAppDisplay.RESULTS_LOG_PATH")
 def test_handle_results_log_missing_shows_error(
     mock_results_path, mock_window_cls, mock_show_popup, display
@@ -866,7 +1267,7 @@ def test_handle_results_log_missing_shows_error(
 
     Args:
         mock_results_path (unittest.mock.MagicMock): Mocks the RESULTS_LOG_PATH constant
-        mock_window_cls (unittest.mock.MagicMock): Mocks the FileEditorWindow class
+        mock_window_cls (unittest.mock.MagicMock): Mocks the LogViewerWindow class
         mock_show_popup (unittest.mock.MagicMock): Mocks show_popup
         display (pytest.fixture): Provides the display and its mocks
     """
@@ -881,18 +1282,18 @@ def test_handle_results_log_missing_shows_error(
     mock_window_cls.assert_not_called()
 
 
-@patch("source.gui.InvoiceAppDisplay.FileEditorWindow")
+@patch("source.gui.InvoiceAppDisplay.LogViewerWindow")
 @patch("source.gui.InvoiceAppDisplay.DEBUG_LOG_PATH")
 def test_handle_debug_log_opens_when_present(
     mock_debug_path, mock_window_cls, display
 ):
     """
-    Verifies that handle_debug_log opens a read-only viewer window when the debug
-    log file exists.
+    Verifies that handle_debug_log opens a log viewer window on the debug log when
+    it exists, without reading the log in full.
 
     Args:
         mock_debug_path (unittest.mock.MagicMock): Mocks the DEBUG_LOG_PATH constant
-        mock_window_cls (unittest.mock.MagicMock): Mocks the FileEditorWindow class
+        mock_window_cls (unittest.mock.MagicMock): Mocks the LogViewerWindow class
         display (pytest.fixture): Provides the display and its mocks
     """
 
@@ -901,14 +1302,14 @@ def test_handle_debug_log_opens_when_present(
 
     display.display.handle_debug_log()
 
-    # The existing debug log is read and opened in a read-only viewer window
-    display.read_file_callback.assert_called_once_with(mock_debug_path)
-    assert mock_window_cls.call_args.kwargs["file_path"] is mock_debug_path
-    assert mock_window_cls.call_args.kwargs["editable"] is False
+    # The existing debug log is opened in a log viewer, which reads it itself
+    display.read_file_callback.assert_not_called()
+    assert mock_window_cls.call_args.kwargs["log_path"] is mock_debug_path
+    assert mock_window_cls.call_args.kwargs["title"] == "Debug Log"
 
 
 @patch.object(InvoiceAppDisplay, "show_popup")
-@patch("source.gui.InvoiceAppDisplay.FileEditorWindow")
+@patch("source.gui.InvoiceAppDisplay.LogViewerWindow")
 @patch("source.gui.InvoiceAppDisplay.DEBUG_LOG_PATH")
 def test_handle_debug_log_missing_shows_error(
     mock_debug_path, mock_window_cls, mock_show_popup, display
@@ -919,7 +1320,7 @@ def test_handle_debug_log_missing_shows_error(
 
     Args:
         mock_debug_path (unittest.mock.MagicMock): Mocks the DEBUG_LOG_PATH constant
-        mock_window_cls (unittest.mock.MagicMock): Mocks the FileEditorWindow class
+        mock_window_cls (unittest.mock.MagicMock): Mocks the LogViewerWindow class
         mock_show_popup (unittest.mock.MagicMock): Mocks show_popup
         display (pytest.fixture): Provides the display and its mocks
     """
@@ -1016,6 +1417,11 @@ def test_apply_theme_updates_state_and_widgets(display):
     display.display.output_box.configure.assert_called_once_with(
         bg=LIGHT.bg_entry, fg=LIGHT.fg_text, insertbackground=LIGHT.fg_text
     )
+    display.display.results_table.apply_style.assert_called_once_with(
+        theme=LIGHT,
+        font_family=display.display.current_font_family,
+        font_size=display.display.current_font_size,
+    )
 
     # The chosen theme is persisted by name so it can be restored on next launch
     display.save_settings_callback.assert_called_once_with("theme", LIGHT.name)
@@ -1053,6 +1459,60 @@ def test_apply_font_family_updates_state_and_widgets(display):
     display.save_settings_callback.assert_called_once_with("font_family", "Arial")
 
 
+###############################################################################
+###            Tests InvoiceAppDisplay -> apply_export_format()             ###
+###############################################################################
+def test_apply_export_format_updates_state_and_persists(display):
+    """
+    Verifies that apply_export_format stores the chosen export format and persists
+    it, which is how the controller learns to apply it.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.apply_export_format(EXPORT_FORMAT_CSV)
+
+    assert display.display.current_export_format == EXPORT_FORMAT_CSV
+    display.save_settings_callback.assert_called_once_with("export_format", "CSV")
+
+
+###############################################################################
+###             Tests InvoiceAppDisplay -> apply_watch_folder()             ###
+###############################################################################
+def test_apply_watch_folder_updates_state_and_persists(display):
+    """
+    Verifies that apply_watch_folder ticks the menu checkbox to match and persists
+    the choice, which is how the controller learns to start or stop watching.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.apply_watch_folder(False)
+
+    display.display.watch_folder.set.assert_called_once_with(False)
+    display.save_settings_callback.assert_called_once_with("watch_folder", "off")
+
+
+###############################################################################
+###             Tests InvoiceAppDisplay -> apply_stage_timings()            ###
+###############################################################################
+def test_apply_stage_timings_updates_state_and_persists(display):
+    """
+    Verifies that apply_stage_timings ticks the menu checkbox to match and persists
+    the choice, which is how the controller learns to start or stop timing.
+
+    Args:
+        display (pytest.fixture): Provides the display and its mocks
+    """
+
+    display.display.apply_stage_timings(True)
+
+    display.display.record_stage_timings.set.assert_called_once_with(True)
+    display.save_settings_callback.assert_called_once_with("stage_timings", "on")
+
+
 ###############################################################################
 ###              Tests InvoiceAppDisplay -> apply_font_size()               ###
 ###############################################################################
@@ -1072,6 +1532,9 @@ def test_apply_font_size_updates_state_and_widgets(display):
     display.display.output_box.configure.assert_called_once_with(
         font=(DEFAULT_FONT_FAMILY, 20, "bold")
     )
+    display.display.results_table.apply_style.assert_called_once_with(
+        theme=DARK, font_family=DEFAULT_FONT_FAMILY, font_size=20
+    )
 
     # The chosen size is persisted as a string so it can be restored on next launch
     display.save_settings_callback.assert_called_once_with("font_size", "20")
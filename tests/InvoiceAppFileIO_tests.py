@@ -1,4 +1,6 @@
+import json
 import pytest
+from decimal import Decimal
 from pathlib import Path
 from unittest.mock import patch, mock_open, call, MagicMock
 
@@ -8,6 +10,9 @@ from source.constants import (
     SALES_REPS_PATH,
     PAYMENT_TERMS_PATH,
     COST_CRITERIA_PATH,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSONL,
+    EXPORT_FORMAT_NONE,
 )
 
 
@@ -92,14 +97,18 @@ def test_reset_debug_file_reports_on_error(mock_debug_path, file_io):
 ###############################################################################
 ###              Tests InvoiceAppFileIO -> reset_results_file()             ###
 ###############################################################################
+@patch("source.InvoiceAppFileIO.EXPORT_JSONL_PATH")
+@patch("source.InvoiceAppFileIO.EXPORT_CSV_PATH")
 @patch("source.InvoiceAppFileIO.RESULTS_LOG_PATH")
-def test_reset_results_file_file_exists(mock_results_path, file_io):
+def test_reset_results_file_file_exists(mock_results_path, _mock_csv_path, _mock_jsonl_path, file_io):
     """
     Tests that reset_results_file() ensures the log directory exists and deletes
     the results log file when it is present.
 
     Args:
         mock_results_path (unittest.mock.MagicMock): Mocks the RESULTS_LOG_PATH constant
+        _mock_csv_path (unittest.mock.MagicMock): Mocks the EXPORT_CSV_PATH constant
+        _mock_jsonl_path (unittest.mock.MagicMock): Mocks the EXPORT_JSONL_PATH constant
         file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
     """
 
@@ -113,14 +122,18 @@ def test_reset_results_file_file_exists(mock_results_path, file_io):
     mock_results_path.unlink.assert_called_once_with()
 
 
+@patch("source.InvoiceAppFileIO.EXPORT_JSONL_PATH")
+@patch("source.InvoiceAppFileIO.EXPORT_CSV_PATH")
 @patch("source.InvoiceAppFileIO.RESULTS_LOG_PATH")
-def test_reset_results_file_file_doesnt_exist(mock_results_path, file_io):
+def test_reset_results_file_file_doesnt_exist(mock_results_path, _mock_csv_path, _mock_jsonl_path, file_io):
     """
     Tests that reset_results_file() does not delete the results log file when it
     does not exist, while still ensuring the log directory exists.
 
     Args:
         mock_results_path (unittest.mock.MagicMock): Mocks the RESULTS_LOG_PATH constant
+        _mock_csv_path (unittest.mock.MagicMock): Mocks the EXPORT_CSV_PATH constant
+        _mock_jsonl_path (unittest.mock.MagicMock): Mocks the EXPORT_JSONL_PATH constant
         file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
     """
 
@@ -134,14 +147,18 @@ def test_reset_results_file_file_doesnt_exist(mock_results_path, file_io):
     mock_results_path.unlink.assert_not_called()
 
 
+@patch("source.InvoiceAppFileIO.EXPORT_JSONL_PATH")
+@patch("source.InvoiceAppFileIO.EXPORT_CSV_PATH")
 @patch("source.InvoiceAppFileIO.RESULTS_LOG_PATH")
-def test_reset_results_file_reports_on_error(mock_results_path, file_io):
+def test_reset_results_file_reports_on_error(mock_results_path, _mock_csv_path, _mock_jsonl_path, file_io):
     """
     Tests that reset_results_file() fails gracefully, surfacing the failure through
     the error reporter instead of raising when the filesystem operation fails.
 
     Args:
         mock_results_path (unittest.mock.MagicMock): Mocks the RESULTS_LOG_PATH constant
+        _mock_csv_path (unittest.mock.MagicMock): Mocks the EXPORT_CSV_PATH constant
+        _mock_jsonl_path (unittest.mock.MagicMock): Mocks the EXPORT_JSONL_PATH constant
         file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
     """
 
@@ -154,47 +171,112 @@ def test_reset_results_file_reports_on_error(mock_results_path, file_io):
     file_io.report_error.assert_called_once()
 
 
+def test_reset_results_file_keeps_export_from_repeating_across_launches(tmp_path):
+    """
+    Tests that the export is reset along with results.txt at each launch, so
+    processing every invoice again after relaunching does not export them twice.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    results_path = tmp_path / "results.txt"
+    csv_path = tmp_path / "results.csv"
+    jsonl_path = tmp_path / "results.jsonl"
+    invoice = Invoice(customer_name="Alice", total=Decimal("385.10"))
+
+    with (
+        patch("source.InvoiceAppFileIO.RESULTS_LOG_PATH", results_path),
+        patch("source.InvoiceAppFileIO.EXPORT_CSV_PATH", csv_path),
+        patch("source.InvoiceAppFileIO.EXPORT_JSONL_PATH", jsonl_path),
+        patch("source.InvoiceExporter.EXPORT_CSV_PATH", csv_path),
+    ):
+        # Each launch resets the results, then processes all invoices, appending each
+        for _launch in range(2):
+            file_io = InvoiceAppFileIO(report_error=MagicMock())
+            file_io.reset_results_file()
+            file_io.set_export_format(EXPORT_FORMAT_CSV)
+
+            file_io.begin_results_batch()
+            file_io.print_invoice_to_output_file(invoice, append_output=True)
+            file_io.export_invoice(invoice, append_output=True)
+            file_io.end_results_batch()
+
+            file_io.report_error.assert_not_called()
+
+    assert results_path.read_text() == invoice.to_formatted_string()
+    assert csv_path.read_text().count("385.10") == 1
+
+
 ###############################################################################
 ###             Tests InvoiceAppFileIO -> print_to_debug_file()             ###
 ###############################################################################
-@patch("builtins.open", new_callable=mock_open)
-@patch("source.InvoiceAppFileIO.DEBUG_LOG_PATH")
-def test_print_to_debug_file_appends(mock_debug_path, mock_file, file_io):
+def test_print_to_debug_file_appends(file_io, tmp_path):
     """
-    Tests that print_to_debug_file() ensures the log directory exists, opens the
-    debug log in append mode, and writes the contents with a trailing newline.
+    Tests that print_to_debug_file() hands the contents to the debug log writer, which
+    creates the log directory and appends the contents with a trailing newline.
 
     Args:
-        mock_debug_path (unittest.mock.MagicMock): Mocks the DEBUG_LOG_PATH constant
-        mock_file (unittest.mock.MagicMock): Mocks the built-in open()
         file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+        tmp_path (Path): Temporary directory provided by pytest
     """
 
+    file_io.debug_log.log_path = tmp_path / "logs" / "debug.txt"
+
     file_io.print_to_debug_file("some debug message")
+    file_io.print_to_debug_file("another debug message")
+    file_io.flush_debug_file()
 
-    # The directory is ensured and the contents are appended
-    mock_debug_path.parent.mkdir.assert_called_once_with(parents=True, exist_ok=True)
-    mock_file.assert_called_once_with(file=mock_debug_path, mode="a")
-    mock_file().write.assert_called_once_with("some debug message\n")
+    # The contents are appended once the log is flushed, one line per message
+    assert file_io.debug_log.log_path.read_text() == (
+        "some debug message\nanother debug message\n"
+    )
+
+    file_io.close_debug_file()
 
 
 @patch("builtins.open", side_effect=OSError("disk full"))
-@patch("source.InvoiceAppFileIO.DEBUG_LOG_PATH")
-def test_print_to_debug_file_reports_on_error(mock_debug_path, _mock_file, file_io):
+def test_print_to_debug_file_reports_on_error(_mock_file, file_io, tmp_path):
     """
     Tests that print_to_debug_file() fails gracefully, surfacing the failure
     through the error reporter instead of raising when the write fails.
 
     Args:
-        mock_debug_path (unittest.mock.MagicMock): Mocks the DEBUG_LOG_PATH constant
         _mock_file (unittest.mock.MagicMock): Mocks the built-in open() to raise
         file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+        tmp_path (Path): Temporary directory provided by pytest
     """
 
+    file_io.debug_log.log_path = tmp_path / "debug.txt"
+
     # No exception is raised, and the failure is reported to the user
     file_io.print_to_debug_file("some debug message")
+    file_io.flush_debug_file()
     file_io.report_error.assert_called_once()
 
+    file_io.close_debug_file()
+
+
+@patch("source.InvoiceAppFileIO.DEBUG_LOG_PATH")
+def test_reset_debug_file_closes_debug_log_first(mock_debug_path, file_io):
+    """
+    Tests that reset_debug_file() writes out and closes the debug log before deleting
+    it, since an open file cannot be deleted on Windows.
+
+    Args:
+        mock_debug_path (unittest.mock.MagicMock): Mocks the DEBUG_LOG_PATH constant
+        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+    """
+
+    mock_debug_path.is_file.return_value = True
+    file_io.debug_log = MagicMock()
+    file_io.debug_log.close.side_effect = lambda: mock_debug_path.unlink.assert_not_called()
+
+    file_io.reset_debug_file()
+
+    file_io.debug_log.close.assert_called_once_with()
+    mock_debug_path.unlink.assert_called_once_with()
+
 
 ###############################################################################
 ###        Tests InvoiceAppFileIO -> print_invoice_to_output_file()         ###
@@ -275,6 +357,117 @@ def test_print_invoice_to_output_file_reports_on_error(
     file_io.report_error.assert_called_once()
 
 
+def test_print_invoice_to_output_file_streams_batch_results(file_io, tmp_path):
+    """
+    Tests that during a batch, invoices printed to the results log are kept out of
+    results.txt until the batch ends, then replace it in one go, keeping the results
+    from before the batch when the batch appends to them.
+
+    Args:
+        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    results_path = tmp_path / "logs" / "results.txt"
+    results_path.parent.mkdir()
+    results_path.write_text("earlier invoice\n")
+
+    invoices = [MagicMock(spec=Invoice) for _ in range(3)]
+    for index, invoice in enumerate(invoices):
+        invoice.to_formatted_string.return_value = f"invoice {index}\n"
+
+    with patch("source.InvoiceAppFileIO.RESULTS_LOG_PATH", results_path):
+        file_io.begin_results_batch()
+
+        for invoice in invoices:
+            file_io.print_invoice_to_output_file(invoice, append_output=True)
+
+        # Nothing reaches results.txt until the batch ends
+        assert results_path.read_text() == "earlier invoice\n"
+
+        file_io.end_results_batch()
+
+    assert results_path.read_text() == (
+        "earlier invoice\ninvoice 0\ninvoice 1\ninvoice 2\n"
+    )
+    assert list(results_path.parent.iterdir()) == [results_path]
+    file_io.report_error.assert_not_called()
+
+
+###############################################################################
+###      Tests InvoiceAppFileIO -> set_export_format() / export_invoice()   ###
+###############################################################################
+def test_export_invoice_without_format_does_nothing(file_io):
+    """
+    Tests that export_invoice() writes nothing when no export format is chosen.
+
+    Args:
+        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+    """
+
+    file_io.set_export_format(EXPORT_FORMAT_NONE)
+
+    with patch("source.InvoiceAppFileIO.InvoiceExporter") as mock_exporter_cls:
+        file_io.export_invoice(MagicMock(spec=Invoice), append_output=True)
+
+    assert file_io.invoice_exporter is None
+    mock_exporter_cls.assert_not_called()
+    file_io.report_error.assert_not_called()
+
+
+def test_set_export_format_unknown_reports_error(file_io):
+    """
+    Tests that set_export_format() turns exporting off, and reports the failure,
+    when given a format that does not exist.
+
+    Args:
+        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+    """
+
+    file_io.set_export_format("XML")
+
+    assert file_io.invoice_exporter is None
+    file_io.report_error.assert_called_once()
+
+
+def test_export_invoice_streams_batch_and_switches_format(file_io, tmp_path):
+    """
+    Tests that a batch's export is committed when the batch ends, and that switching
+    format mid-batch keeps what was exported so far and exports the rest of the
+    batch in the new format.
+
+    Args:
+        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    csv_path = tmp_path / "results.csv"
+    jsonl_path = tmp_path / "results.jsonl"
+    invoice = Invoice(customer_name="Alice", total=Decimal("385.10"))
+
+    with (
+        patch("source.InvoiceAppFileIO.RESULTS_LOG_PATH", tmp_path / "results.txt"),
+        patch("source.InvoiceExporter.EXPORT_CSV_PATH", csv_path),
+        patch("source.InvoiceExporter.EXPORT_JSONL_PATH", jsonl_path),
+    ):
+        file_io.set_export_format(EXPORT_FORMAT_CSV)
+        file_io.begin_results_batch()
+
+        file_io.export_invoice(invoice, append_output=True)
+        file_io.set_export_format(EXPORT_FORMAT_JSONL)
+
+        # The CSV export is committed when the format is switched
+        assert csv_path.read_text().count("385.10") == 1
+
+        file_io.export_invoice(invoice, append_output=True)
+        assert not jsonl_path.exists()
+
+        file_io.end_results_batch()
+
+    assert json.loads(jsonl_path.read_text())["total"] == "385.10"
+    file_io.report_error.assert_not_called()
+
+
 ###############################################################################
 ###              Tests InvoiceAppFileIO -> read_invoice_file()              ###
 ###############################################################################
@@ -298,9 +491,39 @@ def test_read_invoice_file_extracts_each_page(mock_reader, file_io):
 
     pages = file_io.read_invoice_file(Path("invoice.pdf"))
 
-    # The reader is given the invoice path and each page's text is returned in order
+    # The reader is given the invoice path, but no page is extracted until it is read
     mock_reader.assert_called_once_with(stream=Path("invoice.pdf"))
-    assert pages == ["page one", "page two"]
+    assert len(pages) == 2
+    first_page.extract_text.assert_not_called()
+
+    # Each page's text is returned in order
+    assert list(pages) == ["page one", "page two"]
+
+
+@patch("source.InvoiceAppFileIO.pypdf.PdfReader")
+def test_read_invoice_file_reports_page_that_fails_to_extract(mock_reader, file_io):
+    """
+    Tests that a page which fails to extract is reported through the error reporter
+    and reads as None, without affecting the other pages.
+
+    Args:
+        mock_reader (unittest.mock.MagicMock): Mocks pypdf.PdfReader
+        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+    """
+
+    first_page = MagicMock()
+    first_page.extract_text.return_value = "page one"
+    second_page = MagicMock()
+    second_page.extract_text.side_effect = pypdf.errors.PdfReadError("bad stream")
+    mock_reader.return_value.pages = [first_page, second_page]
+
+    pages = file_io.read_invoice_file(Path("invoice.pdf"))
+
+    assert list(pages) == ["page one", None]
+    file_io.report_error.assert_called_once_with(
+        "File Error",
+        "Could not read page 2 of the invoice PDF at invoice.pdf: bad stream",
+    )
 
 
 @patch(
@@ -324,113 +547,170 @@ def test_read_invoice_file_reports_and_returns_empty_on_error(mock_reader, file_
     file_io.report_error.assert_called_once()
 
 
-###############################################################################
-###              Tests InvoiceAppFileIO -> copy_invoice_file()              ###
-###############################################################################
-@patch("source.InvoiceAppFileIO.shutil.copy2")
-@patch("source.InvoiceAppFileIO.INVOICES_PATH")
-def test_copy_invoice_file_copies_new_file(
-    mock_invoices_path, mock_copy2, file_io
-):
+@patch("source.InvoiceAppFileIO.pypdf.PdfReader")
+def test_read_invoice_file_cache_hit_skips_pypdf(mock_reader, tmp_path):
     """
-    Tests that copy_invoice_file() ensures the Invoices/ directory exists and
-    copies the file when no same-named file is already present, returning
-    "copied".
+    Tests that read_invoice_file() returns the cached text of a PDF it has already
+    extracted without running pypdf again.
 
     Args:
-        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
-        mock_copy2 (unittest.mock.MagicMock): Mocks shutil.copy2
-        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+        mock_reader (unittest.mock.MagicMock): Mocks pypdf.PdfReader
+        tmp_path (Path): Temporary directory holding the invoice and the cache
     """
 
-    # No same-named file exists in the destination yet
-    destination = mock_invoices_path.__truediv__.return_value
-    destination.exists.return_value = False
+    invoice_filepath = tmp_path / "invoice.pdf"
+    invoice_filepath.write_bytes(b"%PDF cached")
 
-    result = file_io.copy_invoice_file(Path("Downloads/invoice.pdf"))
+    cache = PageTextCache(cache_dir=tmp_path / "page_cache")
+    cache.store(cache.key_for(b"%PDF cached"), ["page one"])
+    file_io = InvoiceAppFileIO(report_error=MagicMock(), page_text_cache=cache)
 
-    # The directory is ensured, the file is copied, and "copied" is returned
-    mock_invoices_path.mkdir.assert_called_once_with(parents=True, exist_ok=True)
-    mock_copy2.assert_called_once_with(Path("Downloads/invoice.pdf"), destination)
-    assert result == "copied"
+    assert file_io.read_invoice_file(invoice_filepath) == ["page one"]
+    mock_reader.assert_not_called()
 
 
-@patch("source.InvoiceAppFileIO.shutil.copy2")
-@patch("source.InvoiceAppFileIO.INVOICES_PATH")
-def test_copy_invoice_file_exists_without_overwrite(
-    mock_invoices_path, mock_copy2, file_io
-):
+@patch("source.InvoiceAppFileIO.pypdf.PdfReader")
+def test_read_invoice_file_cache_miss_extracts_and_stores(mock_reader, tmp_path):
     """
-    Tests that copy_invoice_file() does not overwrite an existing same-named file
-    when overwrite is False, returning "exists" without copying.
+    Tests that read_invoice_file() extracts a PDF missing from the cache and stores
+    its text, so the next read of the same PDF is a cache hit.
 
     Args:
-        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
-        mock_copy2 (unittest.mock.MagicMock): Mocks shutil.copy2
-        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+        mock_reader (unittest.mock.MagicMock): Mocks pypdf.PdfReader
+        tmp_path (Path): Temporary directory holding the invoice and the cache
     """
 
-    # A same-named file already exists in the destination
-    destination = mock_invoices_path.__truediv__.return_value
-    destination.exists.return_value = True
+    invoice_filepath = tmp_path / "invoice.pdf"
+    invoice_filepath.write_bytes(b"%PDF new")
+
+    page = MagicMock()
+    page.extract_text.return_value = "page one"
+    mock_reader.return_value.pages = [page]
+
+    cache = PageTextCache(cache_dir=tmp_path / "page_cache")
+    file_io = InvoiceAppFileIO(report_error=MagicMock(), page_text_cache=cache)
 
-    result = file_io.copy_invoice_file(Path("Downloads/invoice.pdf"))
+    assert list(file_io.read_invoice_file(invoice_filepath)) == ["page one"]
+    assert file_io.read_invoice_file(invoice_filepath) == ["page one"]
 
-    # No copy is made and "exists" is returned so the caller can confirm
-    mock_copy2.assert_not_called()
-    assert result == "exists"
+    # pypdf only ran for the first read, and was handed the bytes already read
+    mock_reader.assert_called_once()
+    page.extract_text.assert_called_once()
+    assert mock_reader.call_args.kwargs["stream"].getvalue() == b"%PDF new"
+    assert cache.load(cache.key_for(b"%PDF new")) == ["page one"]
 
 
-@patch("source.InvoiceAppFileIO.shutil.copy2")
-@patch("source.InvoiceAppFileIO.INVOICES_PATH")
-def test_copy_invoice_file_overwrites_when_confirmed(
-    mock_invoices_path, mock_copy2, file_io
+@patch("source.InvoiceAppFileIO.pypdf.PdfReader")
+def test_read_invoice_file_partial_cache_extracts_only_missing_pages(
+    mock_reader, tmp_path
 ):
     """
-    Tests that copy_invoice_file() overwrites an existing same-named file when
-    overwrite is True, copying the file and returning "copied".
+    Tests that read_invoice_file() serves the pages already in the cache and only
+    extracts the pages a previous read never needed.
 
     Args:
-        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
-        mock_copy2 (unittest.mock.MagicMock): Mocks shutil.copy2
-        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+        mock_reader (unittest.mock.MagicMock): Mocks pypdf.PdfReader
+        tmp_path (Path): Temporary directory holding the invoice and the cache
+    """
+
+    invoice_filepath = tmp_path / "invoice.pdf"
+    invoice_filepath.write_bytes(b"%PDF partial")
+
+    first_page = MagicMock()
+    second_page = MagicMock()
+    second_page.extract_text.return_value = "page two"
+    mock_reader.return_value.pages = [first_page, second_page]
+
+    # Only the first page was extracted by an earlier read
+    cache = PageTextCache(cache_dir=tmp_path / "page_cache")
+    cache_key = cache.key_for(b"%PDF partial")
+    cache.store(cache_key, ["page one", None])
+    file_io = InvoiceAppFileIO(report_error=MagicMock(), page_text_cache=cache)
+
+    assert list(file_io.read_invoice_file(invoice_filepath)) == ["page one", "page two"]
+
+    # The cached page was not extracted again, and the new page was written through
+    first_page.extract_text.assert_not_called()
+    assert cache.load(cache_key) == ["page one", "page two"]
+
+
+@patch("source.InvoiceAppFileIO.pypdf.PdfReader")
+def test_read_invoice_file_stores_extracted_pages_once(mock_reader, tmp_path):
+    """
+    Tests that read_invoice_file() writes the pages it extracts to the cache once,
+    when the returned pages are closed, rather than after every page.
+
+    Args:
+        mock_reader (unittest.mock.MagicMock): Mocks pypdf.PdfReader
+        tmp_path (Path): Temporary directory holding the invoice and the cache
     """
 
-    # A same-named file exists, but the caller has confirmed an overwrite
-    destination = mock_invoices_path.__truediv__.return_value
-    destination.exists.return_value = True
+    invoice_filepath = tmp_path / "invoice.pdf"
+    invoice_filepath.write_bytes(b"%PDF three pages")
 
-    result = file_io.copy_invoice_file(Path("Downloads/invoice.pdf"), overwrite=True)
+    pages = [MagicMock() for _ in range(3)]
+    for number, page in enumerate(pages, start=1):
+        page.extract_text.return_value = f"page {number}"
+    mock_reader.return_value.pages = pages
 
-    # The file is copied over the existing one and "copied" is returned
-    mock_copy2.assert_called_once_with(Path("Downloads/invoice.pdf"), destination)
-    assert result == "copied"
+    cache = PageTextCache(cache_dir=tmp_path / "page_cache")
+    file_io = InvoiceAppFileIO(report_error=MagicMock(), page_text_cache=cache)
 
+    with patch.object(cache, "store", wraps=cache.store) as mock_store:
+        invoice_pages = file_io.read_invoice_file(invoice_filepath)
+        assert invoice_pages[0] == "page 1"
+        assert invoice_pages[1] == "page 2"
+        mock_store.assert_not_called()
 
-@patch("source.InvoiceAppFileIO.shutil.copy2", side_effect=OSError("disk full"))
-@patch("source.InvoiceAppFileIO.INVOICES_PATH")
-def test_copy_invoice_file_reports_and_returns_error_on_failure(
-    mock_invoices_path, _mock_copy2, file_io
+        invoice_pages.close()
+
+    mock_store.assert_called_once()
+    assert cache.load(cache.key_for(b"%PDF three pages")) == ["page 1", "page 2", None]
+
+
+###############################################################################
+###              Tests InvoiceAppFileIO -> read_invoice_text()              ###
+###############################################################################
+@patch("source.InvoiceAppFileIO.pypdf.PdfReader")
+def test_read_invoice_text_extracts_every_page_without_reporting(
+    mock_reader, file_io
 ):
     """
-    Tests that copy_invoice_file() fails gracefully, surfacing the failure through
-    the error reporter and returning "error" when the copy cannot be completed.
+    Tests that read_invoice_text() extracts every page, reading a page that fails
+    to extract as None without reporting it.
 
     Args:
-        mock_invoices_path (unittest.mock.MagicMock): Mocks the INVOICES_PATH constant
-        _mock_copy2 (unittest.mock.MagicMock): Mocks shutil.copy2 to raise
+        mock_reader (unittest.mock.MagicMock): Mocks pypdf.PdfReader
         file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
     """
 
-    # The destination is clear, but the copy itself fails
-    destination = mock_invoices_path.__truediv__.return_value
-    destination.exists.return_value = False
+    good_page = MagicMock()
+    good_page.extract_text.return_value = "page one"
+    bad_page = MagicMock()
+    bad_page.extract_text.side_effect = pypdf.errors.PdfReadError("corrupt page")
+    mock_reader.return_value.pages = [good_page, bad_page]
 
-    result = file_io.copy_invoice_file(Path("Downloads/invoice.pdf"))
+    assert file_io.read_invoice_text(Path("invoice.pdf")) == ["page one", None]
+    file_io.report_error.assert_not_called()
 
-    # No exception is raised, "error" is returned, and the failure is reported
-    assert result == "error"
-    file_io.report_error.assert_called_once()
+
+@patch("source.InvoiceAppFileIO.pypdf.PdfReader")
+def test_read_invoice_text_raises_on_error(mock_reader, file_io):
+    """
+    Tests that read_invoice_text() raises when the PDF cannot be read, rather than
+    reporting it, so the caller can tell a failed read from an empty PDF.
+
+    Args:
+        mock_reader (unittest.mock.MagicMock): Mocks pypdf.PdfReader
+        file_io (pytest.fixture): Test fixture to create the InvoiceAppFileIO object
+    """
+
+    mock_reader.side_effect = OSError("file is locked")
+
+    with pytest.raises(OSError):
+        file_io.read_invoice_text(Path("invoice.pdf"))
+
+    file_io.report_error.assert_not_called()
 
 
 ###############################################################################
@@ -0,0 +1,587 @@
+import pickle
+import pytest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from source.Invoice import Invoice
+from source.InvoiceAppFileIO import InvoiceAppFileIO
+from source.InvoiceManifest import InvoiceManifest
+from source.InvoiceProcessor import InvoiceProcessor
+from source import InvoiceBatchEngine as batch_engine_module
+from source.InvoiceBatchEngine import (
+    BatchResult,
+    InvoiceBatchEngine,
+    _BufferedFileIO,
+)
+
+
+###############################################################################
+###                   InvoiceBatchEngine -> Test Helpers                    ###
+###############################################################################
+class _InlineExecutor:
+    """
+    Stand-in for ProcessPoolExecutor that runs the pool initializer and every task
+    in the calling process, so the worker code path can be exercised (and its
+    collaborators patched) without starting real processes.
+    """
+
+    def __init__(self, max_workers, initializer, initargs):
+        self.max_workers = max_workers
+        initializer(*initargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def map(self, fn, iterable, chunksize=1):
+        return map(fn, iterable)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.cancelled_futures = cancel_futures
+
+
+###############################################################################
+###                   InvoiceBatchEngine -> Test Fixture                    ###
+###############################################################################
+@pytest.fixture
+def engine():
+    """
+    Returns an InvoiceBatchEngine wired to a mocked File IO Controller and
+    Invoice Processor, limited to a single worker so batches run in-process
+    """
+
+    file_io_controller = MagicMock(spec=InvoiceAppFileIO)
+    file_io_controller.labor_criteria = ["LABOR"]
+    file_io_controller.labor_exclusions = ["NO-LABOR"]
+    file_io_controller.shipping_criteria = ["SHIPPING"]
+    file_io_controller.page_text_cache = None
+
+    return InvoiceBatchEngine(
+        file_io_controller=file_io_controller,
+        invoice_processor=MagicMock(spec=InvoiceProcessor),
+        max_workers=1,
+    )
+
+
+###############################################################################
+###               Tests InvoiceBatchEngine -> parse_invoice()               ###
+###############################################################################
+def test_parse_invoice_no_pages_returns_none(engine):
+    """
+    Verifies that parse_invoice returns None without populating or processing
+    when no pages could be read from the PDF
+
+    Args:
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.file_io_controller.read_invoice_file.return_value = []
+
+    assert engine.parse_invoice(Path("missing.pdf"), {}, []) is None
+    engine.invoice_processor.populate_invoice.assert_not_called()
+    engine.invoice_processor.process_invoice.assert_not_called()
+
+
+def test_parse_invoice_first_page_none_returns_none(engine):
+    """
+    Verifies that parse_invoice returns None when the first page of the PDF is None
+
+    Args:
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.file_io_controller.read_invoice_file.return_value = [None]
+
+    assert engine.parse_invoice(Path("bad.pdf"), {}, []) is None
+    engine.invoice_processor.populate_invoice.assert_not_called()
+
+
+def test_parse_invoice_populates_and_processes(engine):
+    """
+    Verifies that parse_invoice reads the PDF into a new Invoice, then populates
+    and processes it with the supplied configs
+
+    Args:
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.file_io_controller.read_invoice_file.return_value = ["page one"]
+    sales_reps = {"REP1": "Rep Name"}
+    payment_terms = ["Net 30"]
+
+    invoice = engine.parse_invoice(Path("invoice.pdf"), sales_reps, payment_terms)
+
+    # The invoice carries the read pages and was handed to the processor
+    assert isinstance(invoice, Invoice)
+    assert invoice.page_contents == ["page one"]
+    engine.invoice_processor.populate_invoice.assert_called_once_with(
+        invoice=invoice, sales_reps=sales_reps, payment_terms=payment_terms
+    )
+    engine.invoice_processor.process_invoice.assert_called_once_with(invoice=invoice)
+
+    # The read is noted in the debug log
+    engine.file_io_controller.print_to_debug_file.assert_called_once_with(
+        "Processing invoice: invoice.pdf with 1 pages."
+    )
+
+
+def test_parse_invoice_closes_pages_even_if_processing_fails(engine):
+    """
+    Verifies that parse_invoice closes the pages it read, so the text extracted
+    while parsing is saved, even if processing the invoice raises
+
+    Args:
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    pages = MagicMock()
+    pages.__len__.return_value = 1
+    pages.__getitem__.return_value = "page one"
+    engine.file_io_controller.read_invoice_file.return_value = pages
+    engine.invoice_processor.process_invoice.side_effect = ValueError("bad total")
+
+    with pytest.raises(ValueError):
+        engine.parse_invoice(Path("invoice.pdf"), {}, [])
+
+    pages.close.assert_called_once_with()
+
+
+###############################################################################
+###               Tests InvoiceBatchEngine -> process_files()               ###
+###############################################################################
+@patch.object(_BufferedFileIO, "read_invoice_file")
+@patch("source.InvoiceBatchEngine.ProcessPoolExecutor")
+def test_process_files_single_worker_parses_in_process(
+    mock_executor_cls, mock_read, engine
+):
+    """
+    Verifies that an engine limited to one worker parses each invoice in-process,
+    yielding results in input order without starting a pool, and buffers each
+    invoice's debug messages and errors rather than writing them out
+
+    Args:
+        mock_executor_cls (unittest.mock.MagicMock): Mocks ProcessPoolExecutor
+        mock_read (unittest.mock.MagicMock): Mocks the buffered read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    mock_read.side_effect = [["page one"], []]
+
+    with (
+        patch.object(InvoiceProcessor, "populate_invoice") as mock_populate,
+        patch.object(InvoiceProcessor, "process_invoice"),
+    ):
+        results = list(engine.process_files([Path("a.pdf"), Path("b.pdf")], {}, []))
+
+    assert [result.invoice_filepath for result in results] == [
+        Path("a.pdf"),
+        Path("b.pdf"),
+    ]
+    assert results[0].invoice.page_contents == ["page one"]
+    assert results[0].debug_messages == ["Processing invoice: a.pdf with 1 pages."]
+    assert results[1].invoice is None
+    assert results[1].debug_messages == []
+
+    # The invoice was parsed with a processor built from the engine's criteria
+    assert mock_populate.call_count == 1
+
+    # No pool was started, and nothing was written through the engine's File IO
+    mock_executor_cls.assert_not_called()
+    engine.file_io_controller.print_to_debug_file.assert_not_called()
+    engine.file_io_controller.read_invoice_file.assert_not_called()
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file", return_value=[])
+@patch("source.InvoiceBatchEngine.ProcessPoolExecutor")
+def test_process_files_single_invoice_skips_pool(
+    mock_executor_cls, _mock_read, engine
+):
+    """
+    Verifies that a batch of one invoice is parsed in-process even when several
+    workers are allowed, since a pool would only add start-up cost
+
+    Args:
+        mock_executor_cls (unittest.mock.MagicMock): Mocks ProcessPoolExecutor
+        _mock_read (unittest.mock.MagicMock): Mocks the buffered read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.max_workers = 8
+
+    results = list(engine.process_files([Path("a.pdf")], {}, []))
+
+    assert results == [BatchResult(invoice_filepath=Path("a.pdf"), invoice=None)]
+    mock_executor_cls.assert_not_called()
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file")
+@patch("source.InvoiceBatchEngine.ProcessPoolExecutor", _InlineExecutor)
+def test_process_files_pool_buffers_debug_and_errors(mock_read, engine):
+    """
+    Verifies the worker code path: each worker is initialized with the parent's
+    criteria and configs, and the debug messages and errors produced while parsing
+    an invoice are carried back on its BatchResult instead of being written out
+
+    Args:
+        mock_read (unittest.mock.MagicMock): Mocks the worker's read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.max_workers = 2
+
+    # The first invoice reads cleanly, the second fails and reports an error through
+    # the worker's File IO Controller, as the real read_invoice_file would
+    def read_invoice_file(invoice_filepath):
+        if invoice_filepath == Path("bad.pdf"):
+            worker_file_io = batch_engine_module._worker_engine.file_io_controller
+            worker_file_io.report_error("File Error", "Could not read bad.pdf")
+            return []
+        return ["page one"]
+
+    mock_read.side_effect = read_invoice_file
+
+    with (
+        patch.object(InvoiceProcessor, "populate_invoice"),
+        patch.object(InvoiceProcessor, "process_invoice"),
+    ):
+        results = list(
+            engine.process_files(
+                [Path("good.pdf"), Path("bad.pdf")], {"REP1": "Rep"}, ["Net 30"]
+            )
+        )
+
+    # The worker processor was built from the parent's criteria
+    worker_processor = batch_engine_module._worker_engine.invoice_processor
+    assert worker_processor.labor_criteria == ["LABOR"]
+    assert worker_processor.labor_exclusions == ["NO-LABOR"]
+    assert worker_processor.shipping_criteria == ["SHIPPING"]
+
+    # Results arrive in input order with their own buffered output only
+    assert [result.invoice_filepath for result in results] == [
+        Path("good.pdf"),
+        Path("bad.pdf"),
+    ]
+    assert results[0].invoice.page_contents == ["page one"]
+    assert results[0].debug_messages == [
+        "Processing invoice: good.pdf with 1 pages."
+    ]
+    assert results[0].errors == []
+    assert results[1].invoice is None
+    assert results[1].debug_messages == []
+    assert results[1].errors == [("File Error", "Could not read bad.pdf")]
+
+    # Nothing was written through the parent's File IO Controller
+    engine.file_io_controller.print_to_debug_file.assert_not_called()
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file")
+@patch("source.InvoiceBatchEngine.ProcessPoolExecutor", _InlineExecutor)
+def test_process_files_invoice_that_raises_does_not_stop_batch(mock_read, engine):
+    """
+    Verifies that an invoice which raises while being parsed is returned with no
+    invoice and the error recorded on its BatchResult, and that the invoices after
+    it are still parsed
+
+    Args:
+        mock_read (unittest.mock.MagicMock): Mocks the worker's read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.max_workers = 2
+    mock_read.side_effect = lambda invoice_filepath: [f"{invoice_filepath} page"]
+
+    # Processing fails part way through the first invoice only
+    def process_invoice(_processor, invoice):
+        if invoice.page_contents == ["bad.pdf page"]:
+            raise ValueError("unexpected layout")
+
+    with (
+        patch.object(InvoiceProcessor, "populate_invoice"),
+        patch.object(
+            InvoiceProcessor,
+            "process_invoice",
+            autospec=True,
+            side_effect=process_invoice,
+        ),
+    ):
+        results = list(
+            engine.process_files(
+                [Path("bad.pdf"), Path("good.pdf")], {"REP1": "Rep"}, ["Net 30"]
+            )
+        )
+
+    assert [result.invoice_filepath for result in results] == [
+        Path("bad.pdf"),
+        Path("good.pdf"),
+    ]
+    assert results[0].invoice is None
+    assert results[0].errors == [
+        (
+            "Processing Error",
+            "An error occurred while processing bad.pdf: unexpected layout",
+        )
+    ]
+    assert results[1].invoice.page_contents == ["good.pdf page"]
+    assert results[1].errors == []
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file", return_value=["page one"])
+@patch("source.InvoiceBatchEngine.ProcessPoolExecutor", _InlineExecutor)
+def test_process_files_reuses_criteria_matcher_until_criteria_change(
+    _mock_read, engine
+):
+    """
+    Verifies that the criteria matcher is built once for the criteria and shipped
+    to the workers already built, reused by later batches in-process or over the
+    pool, and only built again once the criteria are reloaded
+
+    Args:
+        _mock_read (unittest.mock.MagicMock): Mocks the worker's read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    def worker_matcher():
+        return batch_engine_module._worker_engine.invoice_processor.get_criteria_matcher()
+
+    with (
+        patch.object(InvoiceProcessor, "populate_invoice"),
+        patch.object(InvoiceProcessor, "process_invoice"),
+    ):
+        engine.max_workers = 2
+        list(engine.process_files([Path("a.pdf"), Path("b.pdf")], {}, []))
+        matcher = worker_matcher()
+
+        engine.max_workers = 1
+        with patch("source.InvoiceBatchEngine.CriteriaMatcher") as mock_matcher_cls:
+            list(engine.process_files([Path("a.pdf")], {}, []))
+        mock_matcher_cls.assert_not_called()
+
+        # The criteria are reloaded in place, as parse_cost_criteria_file() does
+        engine.file_io_controller.labor_criteria[:] = ["INSTALL"]
+        engine.max_workers = 2
+        list(engine.process_files([Path("a.pdf"), Path("b.pdf")], {}, []))
+
+    assert matcher.criteria == (("LABOR",), ("NO-LABOR",), ("SHIPPING",))
+    assert worker_matcher() is not matcher
+    assert worker_matcher().criteria == (("INSTALL",), ("NO-LABOR",), ("SHIPPING",))
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file", return_value=["page one"])
+@patch("source.InvoiceBatchEngine.ProcessPoolExecutor", _InlineExecutor)
+def test_process_files_reuses_header_extractor_until_configs_change(
+    _mock_read, engine
+):
+    """
+    Verifies that the header extractor is built once for the sales reps and payment
+    terms and used as it is by the workers, reused by later batches with the same
+    configs, and only built again once the configs are reloaded
+
+    Args:
+        _mock_read (unittest.mock.MagicMock): Mocks the worker's read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.max_workers = 2
+    filepaths = [Path("a.pdf"), Path("b.pdf")]
+
+    def worker_extractor():
+        worker_processor = batch_engine_module._worker_engine.invoice_processor
+        return worker_processor.get_header_extractor(
+            sales_reps=batch_engine_module._worker_sales_reps,
+            payment_terms=batch_engine_module._worker_payment_terms,
+        )
+
+    with (
+        patch.object(InvoiceProcessor, "populate_invoice"),
+        patch.object(InvoiceProcessor, "process_invoice"),
+    ):
+        list(engine.process_files(filepaths, {"REP1": "Rep"}, ["Net 30"]))
+        extractor = worker_extractor()
+
+        # Equal configs, even as new objects, reuse the extractor
+        list(engine.process_files(filepaths, {"REP1": "Rep"}, ["Net 30"]))
+        assert worker_extractor() is extractor
+
+        list(engine.process_files(filepaths, {"REP1": "Rep"}, ["Net 60"]))
+
+    assert extractor.payment_terms == ["Net 30"]
+    assert worker_extractor() is not extractor
+    assert worker_extractor().payment_terms == ["Net 60"]
+
+    # Workers started by spawning receive the extractor pickled, and extract the same
+    shipped = pickle.loads(pickle.dumps(extractor))
+    page = "S12345 Net 30 REP1"
+    assert shipped.extract(text=page) == extractor.extract(text=page)
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file", return_value=["page one"])
+@patch("source.InvoiceBatchEngine.ProcessPoolExecutor", _InlineExecutor)
+def test_process_files_pool_times_stages_when_enabled(_mock_read, engine):
+    """
+    Verifies that while the engine's stage timings are on, each worker times reading,
+    populating and processing an invoice and carries those timings back on its
+    BatchResult, and that nothing is timed while they are off
+
+    Args:
+        _mock_read (unittest.mock.MagicMock): Mocks the worker's read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.max_workers = 2
+
+    with (
+        patch.object(InvoiceProcessor, "populate_invoice"),
+        patch.object(InvoiceProcessor, "process_invoice"),
+    ):
+        untimed = list(engine.process_files([Path("a.pdf"), Path("b.pdf")], {}, []))
+
+        engine.stage_timings.enabled = True
+        timed = list(engine.process_files([Path("a.pdf"), Path("b.pdf")], {}, []))
+
+    assert [result.stage_timings for result in untimed] == [[], []]
+
+    # Each result carries only the timings of its own invoice
+    for result in timed:
+        assert [stage for stage, _seconds in result.stage_timings] == [
+            "read_invoice_file",
+            "populate_invoice",
+            "process_invoice",
+        ]
+        assert all(seconds >= 0 for _stage, seconds in result.stage_timings)
+
+
+def test_process_files_pool_preserves_input_order(engine, tmp_path):
+    """
+    Verifies that a real process pool yields one result per invoice in input
+    order, with each worker's errors carried back on its result
+
+    Args:
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+        tmp_path (Path): Temporary directory for invoice paths that do not exist
+    """
+
+    engine.max_workers = 2
+    invoice_filepaths = [tmp_path / f"S0-{number}.pdf" for number in range(4)]
+
+    results = list(engine.process_files(invoice_filepaths, {}, []))
+
+    # Every missing invoice yields an unparsed result with its read error, in order
+    assert [result.invoice_filepath for result in results] == invoice_filepaths
+    for result in results:
+        assert result.invoice is None
+        assert result.errors[0][0] == "File Error"
+        assert str(result.invoice_filepath) in result.errors[0][1]
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file", return_value=[])
+def test_process_files_closed_early_cancels_queued_invoices(_mock_read, engine):
+    """
+    Verifies that closing the results before the batch is done shuts the pool down
+    with its queued invoices cancelled, so a cancelled batch stops promptly
+
+    Args:
+        _mock_read (unittest.mock.MagicMock): Mocks the worker's read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.max_workers = 2
+    executors = []
+
+    def build_executor(**kwargs):
+        executors.append(_InlineExecutor(**kwargs))
+        return executors[-1]
+
+    with patch("source.InvoiceBatchEngine.ProcessPoolExecutor", build_executor):
+        results = engine.process_files([Path("a.pdf"), Path("b.pdf")], {}, [])
+        next(results)
+        results.close()
+
+    assert executors[0].cancelled_futures is True
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file")
+def test_process_files_parses_only_invoices_missing_from_manifest(mock_read, engine):
+    """
+    Verifies that with a manifest, only the invoices it has no result for are parsed,
+    remembered results are spliced back in input order, and only clean parses are
+    recorded before the manifest is saved
+
+    Args:
+        mock_read (unittest.mock.MagicMock): Mocks the buffered read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    remembered = Invoice(order_number="S11111")
+    engine.manifest = MagicMock(spec=InvoiceManifest)
+    engine.manifest.fingerprint.return_value = "config"
+    engine.manifest.lookup.side_effect = (
+        lambda invoice_filepath, fingerprint: (remembered, ["Processing a.pdf"])
+        if invoice_filepath == Path("a.pdf")
+        else None
+    )
+    mock_read.side_effect = [["page one"], []]
+
+    with (
+        patch.object(InvoiceProcessor, "populate_invoice"),
+        patch.object(InvoiceProcessor, "process_invoice"),
+    ):
+        results = list(
+            engine.process_files(
+                [Path("a.pdf"), Path("b.pdf"), Path("c.pdf")], {"AB": "Alice"}, []
+            )
+        )
+
+    # The fingerprint covers the criteria snapshot and the configs
+    engine.manifest.fingerprint.assert_called_once_with(
+        ["LABOR"], ["NO-LABOR"], ["SHIPPING"], {"AB": "Alice"}, []
+    )
+
+    # a.pdf is spliced in from the manifest; only b.pdf and c.pdf are read
+    assert results[0] == BatchResult(
+        invoice_filepath=Path("a.pdf"),
+        invoice=remembered,
+        debug_messages=["Processing a.pdf"],
+    )
+    assert [result.invoice_filepath for result in results[1:]] == [
+        Path("b.pdf"),
+        Path("c.pdf"),
+    ]
+    assert mock_read.call_count == 2
+
+    # Only b.pdf parsed cleanly, so c.pdf (no pages) is tried again next time
+    engine.manifest.record.assert_called_once_with(
+        invoice_filepath=Path("b.pdf"),
+        invoice=results[1].invoice,
+        debug_messages=results[1].debug_messages,
+        fingerprint="config",
+    )
+    engine.manifest.save.assert_called_once_with()
+
+
+@patch.object(_BufferedFileIO, "read_invoice_file")
+@patch("source.InvoiceBatchEngine.ProcessPoolExecutor")
+def test_process_files_all_remembered_starts_no_pool(
+    mock_executor_cls, mock_read, engine
+):
+    """
+    Verifies that a batch whose invoices are all remembered by the manifest parses
+    nothing and never starts a pool
+
+    Args:
+        mock_executor_cls (unittest.mock.MagicMock): Mocks ProcessPoolExecutor
+        mock_read (unittest.mock.MagicMock): Mocks the buffered read_invoice_file
+        engine (pytest.fixture): The InvoiceBatchEngine under test
+    """
+
+    engine.max_workers = 8
+    engine.manifest = MagicMock(spec=InvoiceManifest)
+    engine.manifest.lookup.return_value = (Invoice(), [])
+
+    results = list(engine.process_files([Path("a.pdf"), Path("b.pdf")], {}, []))
+
+    assert len(results) == 2
+    mock_read.assert_not_called()
+    mock_executor_cls.assert_not_called()
+    engine.manifest.save.assert_called_once_with()
@@ -1,9 +1,11 @@
+import time
 import tkinter as tk
 import pytest
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
+from source.InvoiceImporter import ImportOutcome
 from source.gui.InvoiceDiscoveryWindow import InvoiceDiscoveryWindow
 from fishbowl_common.gui import DARK, DEFAULT_FONT_FAMILY, DEFAULT_FONT_SIZE
 
@@ -22,7 +24,7 @@ def _distinct_widget(*_args, **_kwargs):
     return MagicMock()
 
 
-def _build_window(copy_callback=None):
+def _build_window(import_callback=None):
     """
     Builds an InvoiceDiscoveryWindow in complete isolation from tkinter: the real
     Toplevel.__init__ is neutralized, the inherited methods the constructor calls
@@ -30,16 +32,19 @@ def _build_window(copy_callback=None):
     window or widgets are created.
 
     Args:
-        copy_callback (callable | None): The copy callback to pass through;
+        import_callback (callable | None): The import callback to pass through;
             defaults to a fresh MagicMock when not supplied
 
     Returns:
-        types.SimpleNamespace: Holds the constructed window (`window`) and the
-            copy callback it was built with (`copy_callback`).
+        types.SimpleNamespace: Holds the constructed window (`window`), the import
+            callback it was built with (`import_callback`), and its parent
+            (`parent`), whose after() the import is polled through.
     """
 
-    if copy_callback is None:
-        copy_callback = MagicMock()
+    if import_callback is None:
+        import_callback = MagicMock()
+
+    parent = MagicMock()
 
     with (
         patch.object(tk.Toplevel, "__init__", return_value=None),
@@ -61,15 +66,50 @@ def _build_window(copy_callback=None):
     ):
 
         window = InvoiceDiscoveryWindow(
-            parent=MagicMock(),
+            parent=parent,
             title="Discover Invoices",
             theme=DARK,
             font_family=DEFAULT_FONT_FAMILY,
             font_size=DEFAULT_FONT_SIZE,
-            copy_callback=copy_callback,
+            import_callback=import_callback,
         )
 
-    return SimpleNamespace(window=window, copy_callback=copy_callback)
+    return SimpleNamespace(window=window, import_callback=import_callback, parent=parent)
+
+
+def _run_import(built, timeout=5.0):
+    """
+    Plays the part of the Tk main loop for the import in progress, running each
+    callback scheduled on the parent's after() until the import has finished
+
+    Args:
+        built (types.SimpleNamespace): The window built by _build_window
+        timeout (float): Seconds to wait for the import before giving up
+    """
+
+    deadline = time.monotonic() + timeout
+    polled = 0
+    while built.window.import_worker.is_running and time.monotonic() < deadline:
+        scheduled = built.parent.after.call_args_list
+        if polled < len(scheduled):
+            scheduled[polled].args[1]()
+            polled += 1
+
+
+def _status_lines(built):
+    """
+    Returns every line written to the window's status area
+
+    Args:
+        built (types.SimpleNamespace): The window built by _build_window
+
+    Returns:
+        list[str]: The status lines, in the order written
+    """
+
+    return [
+        c.args[1].rstrip("\n") for c in built.window.status_box.insert.call_args_list
+    ]
 
 
 ###############################################################################
@@ -126,7 +166,7 @@ def test_close_button_is_wired_to_destroy():
             theme=DARK,
             font_family=DEFAULT_FONT_FAMILY,
             font_size=DEFAULT_FONT_SIZE,
-            copy_callback=MagicMock(),
+            import_callback=MagicMock(),
         )
 
         # Find the Close button's construction call and confirm its command is destroy
@@ -193,23 +233,42 @@ def test_handle_browse_cancel_leaves_selection_untouched(mock_ask, _mock_default
 ###############################################################################
 ###                Tests InvoiceDiscoveryWindow -> handle_copy()            ###
 ###############################################################################
-def test_handle_copy_copies_each_pending_file():
+def test_handle_copy_imports_pending_files_in_background():
     """
-    Verifies that handle_copy copies each pending file (without overwriting) and
-    clears the pending selection afterwards.
+    Verifies that handle_copy clears the pending selection and imports every
+    pending file in the background (without overwriting), reporting each outcome
+    and the progress as it arrives, with the Copy button disabled until done.
     """
 
-    copy_callback = MagicMock(return_value="copied")
-    built = _build_window(copy_callback=copy_callback)
+    import_callback = MagicMock(
+        return_value=[
+            ImportOutcome(Path("a.pdf"), "copied"),
+            ImportOutcome(Path("b.pdf"), "identical"),
+        ]
+    )
+    built = _build_window(import_callback=import_callback)
     built.window.pending_files = [Path("a.pdf"), Path("b.pdf")]
 
     built.window.handle_copy()
 
-    # Each file is copied without overwriting, and the selection is cleared
-    copy_callback.assert_any_call(Path("a.pdf"), False)
-    copy_callback.assert_any_call(Path("b.pdf"), False)
+    # The selection is cleared straight away and the Copy button disabled
     assert built.window.pending_files == []
     built.window.selection_var.set.assert_called_with("")
+    built.window.copy_button.configure.assert_called_with(state="disabled")
+
+    _run_import(built)
+
+    # Both files were imported in one call, each outcome is reported, and the
+    # Copy button is enabled again
+    import_callback.assert_called_once_with([Path("a.pdf"), Path("b.pdf")], False)
+    lines = _status_lines(built)
+    assert "Copied a.pdf." in lines
+    assert "Skipped b.pdf (identical copy already present)." in lines
+    assert lines[-1].endswith(": 1 copied, 1 skipped, 0 failed.")
+    assert built.window.progress_label.configure.call_args.kwargs["text"].startswith(
+        "Imported 2 of 2"
+    )
+    built.window.copy_button.configure.assert_called_with(state="normal")
 
 
 def test_handle_copy_no_files_reports_and_does_not_copy():
@@ -218,75 +277,135 @@ def test_handle_copy_no_files_reports_and_does_not_copy():
     files have been selected.
     """
 
-    copy_callback = MagicMock()
-    built = _build_window(copy_callback=copy_callback)
+    import_callback = MagicMock()
+    built = _build_window(import_callback=import_callback)
     built.window.pending_files = []
 
     built.window.handle_copy()
 
-    # No copy is attempted when there is nothing selected
-    copy_callback.assert_not_called()
+    # No import is started when there is nothing selected
+    assert not built.window.import_worker.is_running
+    import_callback.assert_not_called()
 
 
 def test_handle_copy_reports_copy_failure():
     """
-    Verifies that handle_copy reports a failure status (without raising) when the
-    copy callback returns "error", and still clears the pending selection.
+    Verifies that handle_copy reports a file that failed to copy, with the reason,
+    without raising.
     """
 
-    copy_callback = MagicMock(return_value="error")
-    built = _build_window(copy_callback=copy_callback)
+    import_callback = MagicMock(
+        return_value=[ImportOutcome(Path("a.pdf"), "error", "disk full")]
+    )
+    built = _build_window(import_callback=import_callback)
     built.window.pending_files = [Path("a.pdf")]
 
     built.window.handle_copy()
+    _run_import(built)
 
-    # The failed file is still attempted and the selection is cleared afterwards
-    copy_callback.assert_called_once_with(Path("a.pdf"), False)
-    assert built.window.pending_files == []
+    # The failure is reported and counted
+    lines = _status_lines(built)
+    assert "Failed to copy a.pdf: disk full" in lines
+    assert lines[-1].endswith(": 0 copied, 0 skipped, 1 failed.")
 
 
 @patch("source.gui.InvoiceDiscoveryWindow.messagebox.askyesno", return_value=True)
-def test_handle_copy_overwrites_when_confirmed(mock_askyesno):
+def test_handle_copy_overwrites_all_when_confirmed_once(mock_askyesno):
     """
-    Verifies that when a file already exists and the user confirms, handle_copy
-    re-issues the copy with overwrite=True.
+    Verifies that files already existing with different contents are gathered up
+    and the user is asked once, at the end, whether to overwrite them all, and that
+    confirming imports just those files again with overwrite=True.
 
     Args:
         mock_askyesno (unittest.mock.MagicMock): Mocks the overwrite confirmation
     """
 
-    # First call reports the file exists; the confirmed overwrite then succeeds
-    copy_callback = MagicMock(side_effect=["exists", "copied"])
-    built = _build_window(copy_callback=copy_callback)
-    built.window.pending_files = [Path("a.pdf")]
+    # Two files conflict on the first pass; the confirmed overwrite then copies them
+    import_callback = MagicMock(
+        side_effect=[
+            [
+                ImportOutcome(Path("a.pdf"), "exists"),
+                ImportOutcome(Path("b.pdf"), "exists"),
+                ImportOutcome(Path("c.pdf"), "copied"),
+            ],
+            [
+                ImportOutcome(Path("a.pdf"), "copied"),
+                ImportOutcome(Path("b.pdf"), "copied"),
+            ],
+        ]
+    )
+    built = _build_window(import_callback=import_callback)
+    built.window.pending_files = [Path("a.pdf"), Path("b.pdf"), Path("c.pdf")]
 
     built.window.handle_copy()
+    _run_import(built)
 
-    # The user is asked to confirm, then the copy is retried with overwrite=True
+    # One confirmation covers both conflicts, which are then overwritten together
     mock_askyesno.assert_called_once()
-    copy_callback.assert_any_call(Path("a.pdf"), False)
-    copy_callback.assert_any_call(Path("a.pdf"), True)
+    assert "2 invoice(s) already exist" in mock_askyesno.call_args.args[1]
+    assert import_callback.call_args_list[1].args == (
+        [Path("a.pdf"), Path("b.pdf")],
+        True,
+    )
+    assert _status_lines(built)[-1].endswith(": 2 copied, 0 skipped, 0 failed.")
 
 
 @patch("source.gui.InvoiceDiscoveryWindow.messagebox.askyesno", return_value=False)
-def test_handle_copy_skips_when_overwrite_declined(mock_askyesno):
+def test_handle_copy_skips_all_when_overwrite_declined(mock_askyesno):
     """
-    Verifies that when a file already exists and the user declines, handle_copy
-    skips the file and does not re-issue the copy.
+    Verifies that when the user declines the overwrite, every conflicting file is
+    skipped and no further import is started.
 
     Args:
         mock_askyesno (unittest.mock.MagicMock): Mocks the overwrite confirmation
     """
 
-    copy_callback = MagicMock(return_value="exists")
-    built = _build_window(copy_callback=copy_callback)
-    built.window.pending_files = [Path("a.pdf")]
+    import_callback = MagicMock(
+        return_value=[
+            ImportOutcome(Path("a.pdf"), "exists"),
+            ImportOutcome(Path("b.pdf"), "exists"),
+        ]
+    )
+    built = _build_window(import_callback=import_callback)
+    built.window.pending_files = [Path("a.pdf"), Path("b.pdf")]
 
     built.window.handle_copy()
+    _run_import(built)
 
-    # The file is checked once (overwrite=False) and never overwritten
+    # The files are imported once (overwrite=False) and never overwritten
     mock_askyesno.assert_called_once()
-    copy_callback.assert_called_once_with(Path("a.pdf"), False)
+    import_callback.assert_called_once_with([Path("a.pdf"), Path("b.pdf")], False)
+    assert _status_lines(built)[-1] == "Skipped 2 invoice(s) (already exist)."
+    built.window.copy_button.configure.assert_called_with(state="normal")
+
+
+###############################################################################
+###                  Tests InvoiceDiscoveryWindow -> destroy()              ###
+###############################################################################
+@patch("source.gui.InvoiceDiscoveryWindow.messagebox.askyesno")
+@patch.object(tk.Toplevel, "destroy")
+def test_destroy_stops_reporting_import(mock_destroy, mock_askyesno):
+    """
+    Verifies that closing the window during an import closes the window, and that
+    the rest of the import is neither reported nor confirmed.
+
+    Args:
+        mock_destroy (unittest.mock.MagicMock): Mocks Toplevel.destroy
+        mock_askyesno (unittest.mock.MagicMock): Mocks the overwrite confirmation
+    """
+
+    import_callback = MagicMock(return_value=[ImportOutcome(Path("a.pdf"), "exists")])
+    built = _build_window(import_callback=import_callback)
+    built.window.pending_files = [Path("a.pdf")]
+
+    built.window.handle_copy()
+    built.window.destroy()
+    _run_import(built)
+
+    # The window is closed and nothing is written to it afterwards
+    mock_destroy.assert_called_once()
+    mock_askyesno.assert_not_called()
+    assert _status_lines(built) == ["Copying 1 invoice(s)..."]
 
 
 ###############################################################################
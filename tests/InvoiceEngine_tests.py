@@ -0,0 +1,175 @@
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from source.InvoiceAppFileIO import InvoiceAppFileIO
+from source.InvoiceEngine import InvoiceEngine
+
+
+###############################################################################
+###                      InvoiceEngine -> Test Fixture                      ###
+###############################################################################
+@pytest.fixture
+def app_folder(tmp_path, monkeypatch):
+    """
+    Runs the test from an application folder holding a config of each kind
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+        monkeypatch (pytest.MonkeyPatch): Used to change the working directory
+
+    Returns:
+        Path: The application folder
+    """
+
+    monkeypatch.chdir(tmp_path)
+
+    configs = tmp_path / "Configs"
+    configs.mkdir()
+    (configs / "Cost_Criteria.txt").write_text(
+        "LABOR CRITERIA:\nINSTALL\nSHIPPING CRITERIA:\nFREIGHT\n"
+    )
+    (configs / "Payment_Terms.txt").write_text("* Payment terms\nNet 30\n")
+    (configs / "Sales_Reps.txt").write_text("JD=Jane Doe\n")
+
+    return tmp_path
+
+
+###############################################################################
+###                      InvoiceEngine -> Test Helpers                      ###
+###############################################################################
+def _read_pages(invoice_filepath):
+    """
+    Stands in for InvoiceAppFileIO.read_invoice_file(), reading the page text of a
+    fake invoice from its file name. "unreadable.pdf" has no pages
+
+    Args:
+        invoice_filepath (Path): The invoice PDF to read
+
+    Returns:
+        list[str]: The text of each page of the invoice
+    """
+
+    if invoice_filepath.name == "unreadable.pdf":
+        return []
+
+    return [f"Customer: {invoice_filepath.stem}\nS12345\nNet 30 JD\n"]
+
+
+###############################################################################
+###                    Tests InvoiceEngine -> __init__()                    ###
+###############################################################################
+def test_init_loads_configs(app_folder):
+    """
+    Verifies that creating an engine loads the cost criteria, payment terms and
+    sales reps configs, without reporting any errors.
+
+    Args:
+        app_folder (Path): The application folder
+    """
+
+    report_error = MagicMock()
+    engine = InvoiceEngine(report_error=report_error, max_workers=1)
+
+    assert engine.file_io_controller.labor_criteria == ["INSTALL"]
+    assert engine.file_io_controller.shipping_criteria == ["FREIGHT"]
+    assert engine.payment_terms == ["Net 30"]
+    assert engine.sales_reps == {"JD": "Jane Doe"}
+    report_error.assert_not_called()
+
+
+def test_init_reports_missing_configs(tmp_path, monkeypatch):
+    """
+    Verifies that configs that cannot be read are reported and left empty, rather
+    than raising.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+        monkeypatch (pytest.MonkeyPatch): Used to change the working directory
+    """
+
+    monkeypatch.chdir(tmp_path)
+    report_error = MagicMock()
+
+    engine = InvoiceEngine(report_error=report_error, max_workers=1)
+
+    assert engine.payment_terms == []
+    assert engine.sales_reps == {}
+    assert [call.args[0] for call in report_error.call_args_list] == ["Config Error"] * 3
+
+
+###############################################################################
+###                  Tests InvoiceEngine -> process_many()                  ###
+###############################################################################
+@patch.object(InvoiceAppFileIO, "read_invoice_file", side_effect=_read_pages)
+def test_process_many_yields_invoices_in_order_skipping_unreadable(
+    mock_read_invoice_file, app_folder
+):
+    """
+    Verifies that the invoices are processed with the loaded configs and yielded in
+    the order given, and that one that cannot be read is reported and skipped.
+
+    Args:
+        mock_read_invoice_file (unittest.mock.MagicMock): Mocks reading each PDF
+        app_folder (Path): The application folder
+    """
+
+    report_error = MagicMock()
+    engine = InvoiceEngine(report_error=report_error, max_workers=1)
+
+    invoices = list(engine.process_many(["b.pdf", Path("unreadable.pdf"), "a.pdf"]))
+
+    assert [invoice.customer_name for invoice in invoices] == ["b", "a"]
+    assert invoices[0].order_number == "S12345"
+    assert invoices[0].payment_terms == "Net 30"
+    report_error.assert_called_once_with(
+        "Error",
+        "No pages were found in the invoice PDF located at unreadable.pdf.",
+    )
+
+
+###############################################################################
+###                  Tests InvoiceEngine -> process_path()                  ###
+###############################################################################
+@patch.object(InvoiceAppFileIO, "read_invoice_file", side_effect=_read_pages)
+def test_process_path_returns_invoice_or_none(mock_read_invoice_file, app_folder):
+    """
+    Verifies that a single invoice is returned once processed, and that None is
+    returned for one that cannot be read.
+
+    Args:
+        mock_read_invoice_file (unittest.mock.MagicMock): Mocks reading each PDF
+        app_folder (Path): The application folder
+    """
+
+    engine = InvoiceEngine(max_workers=1)
+
+    assert engine.process_path("Acme.pdf").customer_name == "Acme"
+    assert engine.process_path("unreadable.pdf") is None
+
+
+###############################################################################
+###                      Tests InvoiceEngine -> import                      ###
+###############################################################################
+def test_import_does_not_load_gui():
+    """
+    Verifies that importing the engine loads neither tkinter nor fishbowl_common,
+    so the parser can be embedded where no GUI is installed.
+    """
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, source.InvoiceEngine; "
+            "print(sorted({'tkinter', 'fishbowl_common'} & sys.modules.keys()))",
+        ],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == "[]"
@@ -0,0 +1,177 @@
+import json
+import pytest
+from decimal import Decimal
+
+from source.Invoice import Invoice, LineItem
+from source.InvoiceExporter import EXPORT_FIELDS, InvoiceExporter
+from source.constants import EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSONL, LINE_ITEM_LABOR
+
+# Invoice with a comma in its customer name, and a currency value that a float would not hold exactly
+INVOICE = Invoice(
+    customer_name="Acme, Inc.",
+    date="01/02/2024",
+    order_number="S12345",
+    labor_cost=Decimal("0.10"),
+    subtotal=Decimal("0.10"),
+    total=Decimal("0.10"),
+    listed_total=Decimal("0.10"),
+    line_items=[
+        LineItem(
+            line_number=1,
+            description="LABOR install",
+            quantity="1",
+            unit="hr",
+            amount=Decimal("0.10"),
+            category=LINE_ITEM_LABOR,
+            matched_criteria="LABOR",
+        )
+    ],
+    page_contents=["page text"],
+)
+
+
+###############################################################################
+###                     InvoiceExporter -> Test Fixture                     ###
+###############################################################################
+@pytest.fixture
+def export_path(tmp_path):
+    """
+    Returns the path of an export in a temporary log directory
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    return tmp_path / "logs" / "results.export"
+
+
+###############################################################################
+###                 Tests InvoiceExporter -> __init__()                     ###
+###############################################################################
+def test_unknown_format_raises():
+    """
+    Verifies that an exporter cannot be built for a format that does not exist
+    """
+
+    with pytest.raises(ValueError):
+        InvoiceExporter(export_format="XML")
+
+
+###############################################################################
+###              Tests InvoiceExporter -> format_invoice()                  ###
+###############################################################################
+def test_format_invoice_csv_row():
+    """
+    Verifies that an invoice is formatted as one quoted CSV row, with its currency
+    values written exactly and its line items and page text left out
+    """
+
+    exporter = InvoiceExporter(export_format=EXPORT_FORMAT_CSV)
+
+    assert exporter.header == ",".join(EXPORT_FIELDS) + "\n"
+    assert exporter.format_invoice(INVOICE) == (
+        '"Acme, Inc.",01/02/2024,S12345,,,,0.10,0.00,0.00,0.10,0.00,0.10,0.10\n'
+    )
+
+
+def test_format_invoice_json_line():
+    """
+    Verifies that an invoice is formatted as one JSON line holding its fields and
+    line items, with every currency value written exactly as a string
+    """
+
+    exporter = InvoiceExporter(export_format=EXPORT_FORMAT_JSONL)
+
+    record = exporter.format_invoice(INVOICE)
+
+    assert record.endswith("\n") and record.count("\n") == 1
+    values = json.loads(record)
+    assert list(values) == [*EXPORT_FIELDS, "line_items"]
+    assert values["customer_name"] == "Acme, Inc."
+    assert values["labor_cost"] == "0.10"
+    assert values["line_items"] == [
+        {
+            "line_number": 1,
+            "description": "LABOR install",
+            "quantity": "1",
+            "unit": "hr",
+            "amount": "0.10",
+            "category": LINE_ITEM_LABOR,
+            "matched_criteria": "LABOR",
+        }
+    ]
+
+
+###############################################################################
+###                  Tests InvoiceExporter -> export()                      ###
+###############################################################################
+def test_export_writes_header_once(export_path):
+    """
+    Verifies that exporting outside a batch writes the header only at the top of a
+    new export, and that an export that does not append starts over
+
+    Args:
+        export_path (pytest.fixture): Path of the export
+    """
+
+    exporter = InvoiceExporter(export_format=EXPORT_FORMAT_CSV, export_path=export_path)
+    row = exporter.format_invoice(INVOICE)
+
+    exporter.export(invoice=INVOICE, append=True)
+    exporter.export(invoice=INVOICE, append=True)
+    assert export_path.read_text() == exporter.header + row + row
+
+    exporter.export(invoice=INVOICE, append=False)
+    assert export_path.read_text() == exporter.header + row
+
+
+def test_batch_export_is_committed_at_end(export_path):
+    """
+    Verifies that a batch's export is streamed to a temporary file, and only
+    replaces the export file, after the rows exported before it, when it ends
+
+    Args:
+        export_path (pytest.fixture): Path of the export
+    """
+
+    exporter = InvoiceExporter(export_format=EXPORT_FORMAT_CSV, export_path=export_path)
+    row = exporter.format_invoice(INVOICE)
+    exporter.export(invoice=INVOICE, append=False)
+
+    exporter.begin_batch()
+    exporter.export(invoice=INVOICE, append=True)
+    exporter.export(invoice=INVOICE, append=True)
+
+    assert export_path.read_text() == exporter.header + row
+
+    exporter.end_batch()
+
+    assert export_path.read_text() == exporter.header + row * 3
+    assert list(export_path.parent.iterdir()) == [export_path]
+
+
+def test_discarded_batch_leaves_export(export_path):
+    """
+    Verifies that discarding a batch leaves the export file as it was, and that
+    invoices exported afterwards are written to it directly
+
+    Args:
+        export_path (pytest.fixture): Path of the export
+    """
+
+    exporter = InvoiceExporter(
+        export_format=EXPORT_FORMAT_JSONL, export_path=export_path
+    )
+    record = exporter.format_invoice(INVOICE)
+
+    exporter.begin_batch()
+    exporter.export(invoice=INVOICE, append=True)
+    exporter.discard_batch()
+
+    assert not export_path.exists()
+
+    exporter.export(invoice=INVOICE, append=True)
+    exporter.end_batch()
+
+    assert export_path.read_text() == record
+    assert list(export_path.parent.iterdir()) == [export_path]
@@ -0,0 +1,190 @@
+import os
+import pytest
+
+from source.InvoiceFolderWatcher import InvoiceFolderWatcher
+
+
+###############################################################################
+###                  InvoiceFolderWatcher -> Test Fixture                   ###
+###############################################################################
+@pytest.fixture
+def watched(tmp_path):
+    """
+    Returns a watcher on an Invoices/ folder already holding one invoice, driven by
+    a clock the test advances by hand, and already primed with the folder's contents
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+
+    Returns:
+        tuple[InvoiceFolderWatcher, Path, list[float]]: The watcher, the folder it
+            watches, and the clock's current time, which the test may change
+    """
+
+    folder = tmp_path / "Invoices"
+    folder.mkdir()
+    (folder / "existing.pdf").write_bytes(b"%PDF existing")
+
+    now = [0.0]
+    watcher = InvoiceFolderWatcher(
+        folder=folder, settle_seconds=2.0, clock=lambda: now[0]
+    )
+    assert watcher.poll() == []
+
+    return watcher, folder, now
+
+
+###############################################################################
+###                   InvoiceFolderWatcher -> Test Helpers                  ###
+###############################################################################
+def _poll_at(watcher, now, seconds):
+    """
+    Polls the watcher with the clock set to a time
+
+    Args:
+        watcher (InvoiceFolderWatcher): The watcher under test
+        now (list[float]): The clock's current time
+        seconds (float): The time to poll at
+
+    Returns:
+        list[str]: The names of the invoices the poll reported
+    """
+
+    now[0] = seconds
+    return [path.name for path in watcher.poll()]
+
+
+###############################################################################
+###                   Tests InvoiceFolderWatcher -> poll()                  ###
+###############################################################################
+def test_poll_reports_new_invoice_once_it_settles(watched):
+    """
+    Verifies that an invoice already in the folder is never reported, and a new one
+    is reported once, only after it has gone unchanged for the settle time.
+
+    Args:
+        watched (tuple): The watcher, its folder, and its clock
+    """
+
+    watcher, folder, now = watched
+    (folder / "new.pdf").write_bytes(b"%PDF new")
+
+    assert _poll_at(watcher, now, 1.0) == []
+    assert _poll_at(watcher, now, 2.0) == []
+    assert _poll_at(watcher, now, 3.0) == ["new.pdf"]
+    assert _poll_at(watcher, now, 10.0) == []
+
+
+def test_poll_waits_for_invoice_still_being_written(watched):
+    """
+    Verifies that an invoice that keeps growing is not reported until it stops, and
+    that an invoice changed after it was reported is reported again.
+
+    Args:
+        watched (tuple): The watcher, its folder, and its clock
+    """
+
+    watcher, folder, now = watched
+    invoice = folder / "download.pdf"
+
+    invoice.write_bytes(b"%PDF")
+    assert _poll_at(watcher, now, 1.0) == []
+
+    with open(invoice, mode="ab") as f:
+        f.write(b" more of the download")
+    assert _poll_at(watcher, now, 3.5) == []
+    assert _poll_at(watcher, now, 5.0) == []
+    assert _poll_at(watcher, now, 5.5) == ["download.pdf"]
+
+    invoice.write_bytes(b"%PDF a corrected invoice")
+    os.utime(invoice, ns=(1, 1))
+    assert _poll_at(watcher, now, 6.0) == []
+    assert _poll_at(watcher, now, 8.0) == ["download.pdf"]
+
+
+def test_poll_ignores_hidden_and_other_files(watched):
+    """
+    Verifies that files that are not PDFs, and hidden files such as a PDF still
+    being imported through a ".part" file, are never reported, and that reported
+    invoices come back in filename order.
+
+    Args:
+        watched (tuple): The watcher, its folder, and its clock
+    """
+
+    watcher, folder, now = watched
+    (folder / "notes.txt").write_text("not an invoice")
+    (folder / ".b.pdf.part").write_bytes(b"%PDF partial")
+    (folder / "B.PDF").write_bytes(b"%PDF B")
+    (folder / "a.pdf").write_bytes(b"%PDF a")
+
+    _poll_at(watcher, now, 1.0)
+    assert _poll_at(watcher, now, 3.0) == ["a.pdf", "B.PDF"]
+
+
+def test_reset_treats_current_invoices_as_existing(watched):
+    """
+    Verifies that after a reset, the invoices then in the folder are recorded as
+    already there rather than reported, including one that was still settling.
+
+    Args:
+        watched (tuple): The watcher, its folder, and its clock
+    """
+
+    watcher, folder, now = watched
+    (folder / "new.pdf").write_bytes(b"%PDF new")
+    _poll_at(watcher, now, 1.0)
+
+    watcher.reset()
+    assert _poll_at(watcher, now, 2.0) == []
+    assert _poll_at(watcher, now, 5.0) == []
+
+
+def test_poll_of_missing_folder_reports_nothing(tmp_path):
+    """
+    Verifies that a folder that does not exist yet holds no invoices, and that
+    invoices put in it once it is created are reported.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    folder = tmp_path / "Invoices"
+    now = [0.0]
+    watcher = InvoiceFolderWatcher(
+        folder=folder, settle_seconds=2.0, clock=lambda: now[0]
+    )
+
+    assert watcher.poll() == []
+
+    folder.mkdir()
+    (folder / "first.pdf").write_bytes(b"%PDF first")
+    assert _poll_at(watcher, now, 1.0) == []
+    assert _poll_at(watcher, now, 3.0) == ["first.pdf"]
+
+
+###############################################################################
+###              Tests InvoiceFolderWatcher -> list_invoices()              ###
+###############################################################################
+def test_list_invoices_lists_visible_pdfs_in_order(watched):
+    """
+    Verifies that list_invoices lists every visible PDF in filename order, whether
+    or not it has been reported, leaving out hidden files, other files and folders
+
+    Args:
+        watched (pytest.fixture): The watcher, its folder and its clock
+    """
+
+    watcher, folder, _now = watched
+    (folder / "B.PDF").write_bytes(b"%PDF b")
+    (folder / "a.pdf").write_bytes(b"%PDF a")
+    (folder / ".c.pdf.part").write_bytes(b"%PDF partial")
+    (folder / ".hidden.pdf").write_bytes(b"%PDF hidden")
+    (folder / "notes.txt").write_text("notes")
+    (folder / "folder.pdf").mkdir()
+
+    assert watcher.list_invoices() == [
+        folder / "a.pdf",
+        folder / "B.PDF",
+        folder / "existing.pdf",
+    ]
@@ -0,0 +1,187 @@
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from source.InvoiceImporter import ImportOutcome, InvoiceImporter
+
+
+###############################################################################
+###                     InvoiceImporter -> Test Fixture                     ###
+###############################################################################
+@pytest.fixture
+def folders(tmp_path):
+    """
+    Returns a downloads folder holding three invoices, and an Invoices/ folder
+    (not yet created) to import them into
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+
+    Returns:
+        tuple[Path, Path]: The downloads folder and the Invoices/ folder
+    """
+
+    downloads = tmp_path / "Downloads"
+    downloads.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (downloads / name).write_bytes(f"%PDF {name}".encode())
+
+    return downloads, tmp_path / "Invoices"
+
+
+###############################################################################
+###                      InvoiceImporter -> Test Helpers                    ###
+###############################################################################
+def _import(importer, source_paths, overwrite=False):
+    """
+    Imports invoices and returns the status of each, by file name
+
+    Args:
+        importer (InvoiceImporter): The importer under test
+        source_paths (list[Path]): The invoices to import
+        overwrite (bool): Whether to overwrite files with different contents
+
+    Returns:
+        dict[str, str]: The status of each invoice, keyed by file name
+    """
+
+    return {
+        outcome.source_path.name: outcome.status
+        for outcome in importer.import_files(source_paths, overwrite=overwrite)
+    }
+
+
+###############################################################################
+###                 Tests InvoiceImporter -> import_files()                 ###
+###############################################################################
+def test_import_files_copies_new_invoices(folders):
+    """
+    Verifies that invoices not yet in Invoices/ are copied in, creating the folder,
+    with no partial files left behind.
+
+    Args:
+        folders (tuple[Path, Path]): The downloads and Invoices/ folders
+    """
+
+    downloads, invoices_dir = folders
+    importer = InvoiceImporter(invoices_dir=invoices_dir, max_workers=2)
+
+    statuses = _import(importer, sorted(downloads.iterdir()))
+
+    assert statuses == {"a.pdf": "copied", "b.pdf": "copied", "c.pdf": "copied"}
+    assert sorted(os.listdir(invoices_dir)) == ["a.pdf", "b.pdf", "c.pdf"]
+    assert (invoices_dir / "b.pdf").read_bytes() == b"%PDF b.pdf"
+
+
+def test_import_files_skips_identical_and_leaves_different_contents(folders):
+    """
+    Verifies that an invoice already in Invoices/ with the same contents is skipped
+    as "identical", and one with different contents is left untouched as "exists"
+    unless overwriting.
+
+    Args:
+        folders (tuple[Path, Path]): The downloads and Invoices/ folders
+    """
+
+    downloads, invoices_dir = folders
+    invoices_dir.mkdir()
+    (invoices_dir / "a.pdf").write_bytes(b"%PDF a.pdf")
+    (invoices_dir / "b.pdf").write_bytes(b"%PDF older b.pdf")
+
+    importer = InvoiceImporter(invoices_dir=invoices_dir)
+    source_paths = [downloads / "a.pdf", downloads / "b.pdf"]
+
+    assert _import(importer, source_paths) == {"a.pdf": "identical", "b.pdf": "exists"}
+    assert (invoices_dir / "b.pdf").read_bytes() == b"%PDF older b.pdf"
+
+    assert _import(importer, source_paths, overwrite=True) == {
+        "a.pdf": "identical",
+        "b.pdf": "copied",
+    }
+    assert (invoices_dir / "b.pdf").read_bytes() == b"%PDF b.pdf"
+
+
+def test_import_files_copies_only_first_of_same_name(folders, tmp_path):
+    """
+    Verifies that of two selected invoices with the same name, only the first is
+    copied and the second is reported as a duplicate.
+
+    Args:
+        folders (tuple[Path, Path]): The downloads and Invoices/ folders
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    downloads, invoices_dir = folders
+    elsewhere = tmp_path / "Elsewhere"
+    elsewhere.mkdir()
+    (elsewhere / "a.pdf").write_bytes(b"%PDF another a.pdf")
+
+    importer = InvoiceImporter(invoices_dir=invoices_dir)
+    outcomes = list(importer.import_files([downloads / "a.pdf", elsewhere / "a.pdf"]))
+
+    assert ImportOutcome(elsewhere / "a.pdf", "duplicate") in outcomes
+    assert ImportOutcome(downloads / "a.pdf", "copied") in outcomes
+    assert (invoices_dir / "a.pdf").read_bytes() == b"%PDF a.pdf"
+
+
+def test_import_files_reports_failure_without_stopping(folders):
+    """
+    Verifies that an invoice that cannot be copied is reported as an error, with no
+    partial file left in Invoices/, while the rest are still copied.
+
+    Args:
+        folders (tuple[Path, Path]): The downloads and Invoices/ folders
+    """
+
+    downloads, invoices_dir = folders
+    importer = InvoiceImporter(invoices_dir=invoices_dir)
+
+    outcomes = {
+        outcome.source_path.name: outcome
+        for outcome in importer.import_files(
+            [downloads / "a.pdf", downloads / "missing.pdf"]
+        )
+    }
+
+    assert outcomes["a.pdf"].status == "copied"
+    assert outcomes["missing.pdf"].status == "error"
+    assert outcomes["missing.pdf"].error
+    assert os.listdir(invoices_dir) == ["a.pdf"]
+
+
+@patch("source.InvoiceImporter.InvoiceImporter._hash_file")
+def test_import_files_compares_sizes_before_hashing(mock_hash_file, folders):
+    """
+    Verifies that an existing invoice of a different size is told apart without
+    hashing either file, so a large mismatch is never read in full.
+
+    Args:
+        mock_hash_file (unittest.mock.MagicMock): Mocks the content hash
+        folders (tuple[Path, Path]): The downloads and Invoices/ folders
+    """
+
+    downloads, invoices_dir = folders
+    invoices_dir.mkdir()
+    (invoices_dir / "a.pdf").write_bytes(b"%PDF a much longer a.pdf")
+
+    importer = InvoiceImporter(invoices_dir=invoices_dir)
+
+    assert _import(importer, [downloads / "a.pdf"]) == {"a.pdf": "exists"}
+    mock_hash_file.assert_not_called()
+
+
+def test_import_files_with_nothing_to_copy_creates_nothing(folders):
+    """
+    Verifies that importing no invoices yields nothing and does not create the
+    Invoices/ folder.
+
+    Args:
+        folders (tuple[Path, Path]): The downloads and Invoices/ folders
+    """
+
+    _downloads, invoices_dir = folders
+    importer = InvoiceImporter(invoices_dir=invoices_dir)
+
+    assert list(importer.import_files([])) == []
+    assert not invoices_dir.exists()
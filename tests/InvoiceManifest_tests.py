@@ -0,0 +1,360 @@
+import os
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+
+from source.Invoice import Invoice, LineItem
+from source.InvoiceManifest import InvoiceManifest
+from source.constants import LINE_ITEM_LABOR
+
+
+# Line item of the invoice returned by _parsed_invoice()
+LABOR_LINE_ITEM = LineItem(
+    line_number=1,
+    description="LABOR install",
+    quantity="2",
+    unit="hr",
+    amount=Decimal("100.50"),
+    category=LINE_ITEM_LABOR,
+    matched_criteria="LABOR",
+)
+
+
+###############################################################################
+###                    InvoiceManifest -> Test Fixture                      ###
+###############################################################################
+@pytest.fixture
+def manifest(tmp_path):
+    """
+    Returns an InvoiceManifest persisted in a temporary directory
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+    return InvoiceManifest(manifest_path=tmp_path / "data" / "invoice_manifest.jsonl")
+
+
+@pytest.fixture
+def invoice_file(tmp_path):
+    """
+    Returns the path of an invoice PDF written to a temporary directory
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    invoice_filepath = tmp_path / "S0-12345.pdf"
+    invoice_filepath.write_bytes(b"%PDF invoice")
+    return invoice_filepath
+
+
+def _parsed_invoice():
+    """
+    Returns an invoice as it would be after parsing, including its page text
+    """
+
+    return Invoice(
+        customer_name="Alice",
+        order_number="S12345",
+        labor_cost=Decimal("100.50"),
+        total=Decimal("385.00"),
+        listed_total=Decimal("385.00"),
+        line_items=[LABOR_LINE_ITEM],
+        page_contents=["page 1"],
+    )
+
+
+def _parse(manifest, invoice_file, fingerprint="config"):
+    """
+    Looks up invoice_file and records it as parsed, as the batch engine does on a miss
+
+    Args:
+        manifest (InvoiceManifest): The manifest under test
+        invoice_file (Path): The invoice PDF being parsed
+        fingerprint (str): The fingerprint it is parsed with
+    """
+
+    assert manifest.lookup(invoice_file, fingerprint) is None
+    manifest.record(
+        invoice_filepath=invoice_file,
+        invoice=_parsed_invoice(),
+        debug_messages=["Processing invoice"],
+        fingerprint=fingerprint,
+    )
+
+
+###############################################################################
+###                  Tests InvoiceManifest -> fingerprint()                 ###
+###############################################################################
+def test_fingerprint_changes_with_configs_and_versions(manifest):
+    """
+    Verifies that the fingerprint changes when any config, the app version, or the
+    pypdf version changes, since any of them can change how an invoice parses
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+    """
+
+    configs = (["LABOR"], ["NO-LABOR"], ["SHIPPING"], {"AB": "Alice"}, ["Net 30"])
+    fingerprint = manifest.fingerprint(*configs)
+
+    assert manifest.fingerprint(*configs) == fingerprint
+    assert manifest.fingerprint(["LABOR", "INSTALL"], *configs[1:]) != fingerprint
+    assert manifest.fingerprint(*configs[:3], {"AB": "Bob"}, configs[4]) != fingerprint
+
+    with patch("source.InvoiceManifest.VERSION", "0.0.1"):
+        assert manifest.fingerprint(*configs) != fingerprint
+    with patch("source.InvoiceManifest.pypdf.__version__", "1.0.0"):
+        assert manifest.fingerprint(*configs) != fingerprint
+
+
+###############################################################################
+###              Tests InvoiceManifest -> lookup() / record()               ###
+###############################################################################
+def test_lookup_unparsed_invoice_misses(manifest, invoice_file):
+    """
+    Verifies that an invoice that was never recorded must be parsed
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+    """
+
+    assert manifest.lookup(invoice_file, "config") is None
+
+
+def test_lookup_unchanged_invoice_returns_result_without_reading(
+    manifest, invoice_file
+):
+    """
+    Verifies that a recorded invoice whose size and modification time are unchanged
+    is returned as parsed, without its page text, and without being read again
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+    """
+
+    _parse(manifest, invoice_file)
+
+    with patch.object(InvoiceManifest, "_hash_file") as mock_hash:
+        invoice, debug_messages = manifest.lookup(invoice_file, "config")
+
+    mock_hash.assert_not_called()
+    assert invoice == Invoice(
+        customer_name="Alice",
+        order_number="S12345",
+        labor_cost=Decimal("100.50"),
+        total=Decimal("385.00"),
+        listed_total=Decimal("385.00"),
+        line_items=[LABOR_LINE_ITEM],
+    )
+    assert isinstance(invoice.line_items[0], LineItem)
+    assert debug_messages == ["Processing invoice"]
+
+
+def test_lookup_misses_when_invoice_or_config_changes(manifest, invoice_file):
+    """
+    Verifies that editing the invoice, or parsing with different configs, misses
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+    """
+
+    _parse(manifest, invoice_file)
+
+    assert manifest.lookup(invoice_file, "edited config") is None
+
+    invoice_file.write_bytes(b"%PDF edited invoice")
+    assert manifest.lookup(invoice_file, "config") is None
+
+
+def test_lookup_misses_entry_missing_a_field(manifest, invoice_file):
+    """
+    Verifies that an entry recorded before a field was added to Invoice misses, so
+    the invoice is parsed again to fill the field in
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+    """
+
+    _parse(manifest, invoice_file)
+    del manifest._load()[str(invoice_file)]["invoice"]["line_items"]
+
+    assert manifest.lookup(invoice_file, "config") is None
+
+
+def test_lookup_touched_invoice_hits_on_content_hash(manifest, invoice_file):
+    """
+    Verifies that an invoice whose modification time changed but whose contents did
+    not (e.g. copied back into the folder) is still a hit
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+    """
+
+    _parse(manifest, invoice_file)
+
+    stat = invoice_file.stat()
+    os.utime(invoice_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert manifest.lookup(invoice_file, "config") is not None
+
+
+def test_record_skips_invoice_changed_while_parsing(manifest, invoice_file):
+    """
+    Verifies that an invoice edited between being looked up and being recorded is
+    not recorded, since the result may not match its new contents
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+    """
+
+    assert manifest.lookup(invoice_file, "config") is None
+
+    invoice_file.write_bytes(b"%PDF edited while parsing")
+    manifest.record(
+        invoice_filepath=invoice_file,
+        invoice=_parsed_invoice(),
+        debug_messages=[],
+        fingerprint="config",
+    )
+
+    assert manifest.lookup(invoice_file, "config") is None
+
+
+###############################################################################
+###                     Tests InvoiceManifest -> save()                     ###
+###############################################################################
+def test_save_persists_entries_for_the_next_run(manifest, invoice_file):
+    """
+    Verifies that a saved manifest is read back by a new InvoiceManifest
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+    """
+
+    _parse(manifest, invoice_file)
+    manifest.save()
+
+    reloaded = InvoiceManifest(manifest_path=manifest.manifest_path)
+    assert reloaded.lookup(invoice_file, "config") is not None
+
+
+def test_save_appends_only_changed_entries(manifest, invoice_file, tmp_path):
+    """
+    Verifies that saving appends a line for each entry changed since the last save,
+    leaving the lines already saved untouched, and that the last line for an invoice
+    is the one read back
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    other_file = tmp_path / "S0-67890.pdf"
+    other_file.write_bytes(b"%PDF other")
+
+    _parse(manifest, invoice_file)
+    _parse(manifest, other_file)
+    manifest.save()
+    saved_lines = manifest.manifest_path.read_text(encoding="utf-8").splitlines()
+    assert len(saved_lines) == 2
+
+    # Saving with nothing changed writes nothing
+    manifest.save()
+    assert len(manifest.manifest_path.read_text(encoding="utf-8").splitlines()) == 2
+
+    _parse(manifest, invoice_file, fingerprint="new config")
+    with patch("source.InvoiceManifest.Path.exists") as mock_exists:
+        manifest.save()
+
+    # The invoices were not checked for, as nothing was compacted
+    mock_exists.assert_not_called()
+    lines = manifest.manifest_path.read_text(encoding="utf-8").splitlines()
+    assert lines[:2] == saved_lines
+    assert len(lines) == 3
+
+    reloaded = InvoiceManifest(manifest_path=manifest.manifest_path)
+    assert reloaded.lookup(invoice_file, "new config") is not None
+    assert reloaded.lookup(other_file, "config") is not None
+
+
+def test_save_compacts_log_dropping_deleted_invoices(invoice_file, tmp_path):
+    """
+    Verifies that once the log holds too many lines per entry, saving rewrites it
+    with one line per entry, dropping the entries of invoices that no longer exist
+
+    Args:
+        invoice_file (pytest.fixture): An invoice PDF on disk
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    manifest = InvoiceManifest(
+        manifest_path=tmp_path / "invoice_manifest.jsonl", compact_ratio=0
+    )
+    deleted_file = tmp_path / "S0-99999.pdf"
+    deleted_file.write_bytes(b"%PDF deleted")
+
+    for index in range(64):
+        _parse(manifest, invoice_file, fingerprint=f"config {index}")
+        manifest.save()
+    _parse(manifest, deleted_file)
+    deleted_file.unlink()
+    manifest.save()
+
+    assert len(manifest.manifest_path.read_text(encoding="utf-8").splitlines()) == 1
+
+    reloaded = InvoiceManifest(manifest_path=manifest.manifest_path)
+    assert reloaded.lookup(invoice_file, "config 63") is not None
+    assert str(deleted_file) not in reloaded._load()
+
+
+def test_load_skips_torn_last_line_and_rewrites_log(manifest, invoice_file, tmp_path):
+    """
+    Verifies that a line cut short by a crash is skipped when the log is read, and
+    that the next save rewrites the log rather than appending after it
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    _parse(manifest, invoice_file)
+    manifest.save()
+    with open(file=manifest.manifest_path, mode="a", encoding="utf-8") as f:
+        f.write('{"key": "torn')
+
+    other_file = tmp_path / "S0-67890.pdf"
+    other_file.write_bytes(b"%PDF other")
+    reloaded = InvoiceManifest(manifest_path=manifest.manifest_path)
+    _parse(reloaded, other_file)
+    reloaded.save()
+
+    assert manifest.manifest_path.read_text(encoding="utf-8").endswith("\n")
+    reloaded_again = InvoiceManifest(manifest_path=manifest.manifest_path)
+    assert reloaded_again.lookup(invoice_file, "config") is not None
+    assert reloaded_again.lookup(other_file, "config") is not None
+
+
+def test_load_corrupt_manifest_starts_empty(manifest, invoice_file):
+    """
+    Verifies that a manifest that cannot be read is treated as empty rather than
+    stopping the batch
+
+    Args:
+        manifest (pytest.fixture): The InvoiceManifest under test
+        invoice_file (pytest.fixture): An invoice PDF on disk
+    """
+
+    manifest.manifest_path.parent.mkdir(parents=True)
+    manifest.manifest_path.write_text("{not json", encoding="utf-8")
+
+    assert manifest.lookup(invoice_file, "config") is None
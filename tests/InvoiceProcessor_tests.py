@@ -1,11 +1,19 @@
 import pytest
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 from decimal import Decimal
 
 from source.InvoiceProcessor import InvoiceProcessor
 from source.InvoiceAppFileIO import InvoiceAppFileIO
-from source.Invoice import Invoice
-from source.constants import DECIMAL_ZERO
+from source.Invoice import Invoice, LineItem
+from source.LazyInvoicePages import LazyInvoicePages
+from source.processor_utilities import PaymentTableRow
+from source.constants import (
+    DECIMAL_ZERO,
+    LINE_ITEM_LABOR,
+    LINE_ITEM_MATERIAL,
+    LINE_ITEM_SHIPPING,
+)
 
 
 ###############################################################################
@@ -78,34 +86,16 @@ def test_populate_invoice_raises_on_none(invoice_processor):
     assert "Cannot parse a None invoice object" in str(exception)
 
 
-@patch("source.InvoiceProcessor.find_sales_rep", return_value="Rep Name")
-@patch("source.InvoiceProcessor.find_payment_terms", return_value="Net 30")
-@patch("source.InvoiceProcessor.search_text_by_re")
-def test_populate_invoice_populates_fields(
-    mock_search_text_by_re,
-    mock_find_payment_terms,
-    mock_find_sales_rep,
-    invoice_processor,
-    invoice,
-):
+def test_populate_invoice_populates_fields(invoice_processor, invoice):
     """
     Verifies that all expected fields are populated correctly on the invoice
 
     Args:
-        mock_search_text_by_re (unittest.mock.MagicMock): The mocked search_text_by_re function
-        mock_find_payment_terms (unittest.mock.MagicMock): The mocked mock_find_payment_terms function
-        mock_find_sales_rep (unittest.mock.MagicMock): The mocked mock_find_sales_rep function
         invoice_processor (pytest.fixture): Test fixture to create the InvoiceProcessor object
         invoice (pytest.fixture): Test fixture to create the Invoice object
     """
 
-    # Setup mocked return values for sequential calls to search_text_by_re
-    mock_search_text_by_re.side_effect = [
-        "S12345",
-        "01/01/2025",
-        "Customer: Acme Corp",
-        "PO Number: PO12345S",
-    ]
+    invoice.page_contents[0] += "REP1 Net 30\n"
 
     sales_reps = {"REP1": "Rep Name"}
     payment_terms = ["Net 30"]
@@ -114,35 +104,37 @@ def test_populate_invoice_populates_fields(
     invoice_processor.populate_invoice(invoice, sales_reps, payment_terms)
 
     # Verify that each of the following Invoice attributes were populated from the
-    # first page of the invoice with serach_text_by_re() calls
+    # first page of the invoice
     assert invoice.order_number == "S12345"
     assert invoice.date == "01/01/2025"
     assert invoice.customer_name == "Acme Corp"
     assert invoice.po_number == "PO12345"
-
-    # Verify that populate_invoice() was able to populate the payment terms by calling
-    # find_payment_terms()
     assert invoice.payment_terms == "Net 30"
-
-    # Verify that populate_invoice() was able to populate the sales rep by calling
-    # find_sales_rep()
     assert invoice.sales_rep == "Rep Name"
 
-    # Verify that search_text_by_re() was called 4 times, since there are four
-    # Invoice attributes on the first page
-    assert mock_search_text_by_re.call_count == 4
 
-    # Verify that find_payment_terms() was called once, since the payment terms
-    # are on the first page
-    mock_find_payment_terms.assert_called_once_with(
-        text=invoice.page_contents[0], payment_terms=payment_terms
-    )
+###############################################################################
+###             Tests InvoiceProcessor -> get_header_extractor()            ###
+###############################################################################
+def test_get_header_extractor_rebuilds_only_when_configs_reload(invoice_processor):
+    """
+    Verifies that the header extractor is reused for every invoice parsed with the
+    same configs, and rebuilt once the configs are reloaded
 
-    # Verify that find_sales_rep() was called once, since the sales rep is on
-    # the first page
-    mock_find_sales_rep.assert_called_once_with(
-        text=invoice.page_contents[0], sales_reps=sales_reps
-    )
+    Args:
+        invoice_processor (pytest.fixture): Test fixture to create the InvoiceProcessor object
+    """
+
+    sales_reps = {"REP1": "Rep Name"}
+    payment_terms = ["Net 30"]
+
+    extractor = invoice_processor.get_header_extractor(sales_reps, payment_terms)
+    assert invoice_processor.get_header_extractor(sales_reps, payment_terms) is extractor
+
+    # Reloading the configs produces new objects, even if their contents are the same
+    reloaded = invoice_processor.get_header_extractor(dict(sales_reps), payment_terms)
+    assert reloaded is not extractor
+    assert reloaded.sales_reps == sales_reps
 
 
 ###############################################################################
@@ -158,25 +150,25 @@ def test_process_payment_line_skips_subtotal_line(invoice_processor, invoice):
         invoice (pytest.fixture): Test fixture to create the Invoice object
     """
 
-    # Mock the find_ea_cost() and find_hr_cost() class functions
-    invoice_processor.find_ea_cost = MagicMock()
-    invoice_processor.find_hr_cost = MagicMock()
-
-    # Payment line contains the subtotal
-    subtotal_line = "payment line containing subtotal"
+    # Mock the criteria matcher, which should never be reached
+    invoice_processor.get_criteria_matcher = MagicMock()
 
-    # Call process_payment_line() with the subtotal line
-    invoice_processor.process_payment_line(
-        text="some invoice text",
-        line=subtotal_line,
-        invoice=invoice,
-        curr_line_num=2,
+    # Payment line contains the subtotal, and a cost was found for it
+    row = PaymentTableRow(
+        line_number=2,
+        lines=["2 payment line containing subtotal"],
+        quantity="1",
+        unit="ea",
+        amount=Decimal("10.00"),
     )
 
-    # Verify that no functions were called to determine the cost, since the line
-    # contains the subtotal and not a payment item
-    invoice_processor.find_ea_cost.assert_not_called()
-    invoice_processor.find_hr_cost.assert_not_called()
+    # Call process_payment_line() with the subtotal row
+    invoice_processor.process_payment_line(row=row, invoice=invoice)
+
+    # Verify that the row was neither classified nor added, since the line contains
+    # the subtotal and not a payment item
+    invoice_processor.get_criteria_matcher.assert_not_called()
+    assert invoice.subtotal == DECIMAL_ZERO
 
 
 @patch(
@@ -196,28 +188,44 @@ def test_process_payment_line_labor_cost(
         invoice (pytest.fixture): Test fixture to create the Invoice object
     """
 
-    # Mock functions to return a valid quantity cost (find_ea_cost)
-    invoice_processor.find_ea_cost = MagicMock(return_value=Decimal("10.00"))
-    invoice_processor.find_hr_cost = MagicMock(return_value=DECIMAL_ZERO)
-
-    # Mock functions to determine this is a labor cost
-    invoice_processor.search_for_labor_criteria = MagicMock(return_value=True)
-    invoice_processor.search_for_shipping_criteria = MagicMock(
-        return_value=False
-    )
+    # Watch the criteria matcher, which finds the LABOR criteria in the line
+    matcher = invoice_processor.get_criteria_matcher()
+    matcher.match = MagicMock(wraps=matcher.match)
 
-    # Call process_payment_line() with a labor cost line
+    # Call process_payment_line() with a labor cost row listed as a quantity
     invoice_processor.process_payment_line(
-        text="1 LABOR Install\n2 Next Line",
-        line="1 LABOR Install",
+        row=PaymentTableRow(
+            line_number=1,
+            lines=["1 LABOR Install"],
+            description="LABOR Install",
+            quantity="1",
+            unit="ea",
+            amount=Decimal("10.00"),
+        ),
         invoice=invoice,
-        curr_line_num=1,
     )
 
     # Verify that the labor cost was added
     assert invoice.labor_cost == Decimal("10.00")
     assert invoice.subtotal == Decimal("10.00")
 
+    # Verify that the row was recorded as a labor line item, along with the criteria
+    # that made it one
+    assert invoice.line_items == [
+        LineItem(
+            line_number=1,
+            description="LABOR Install",
+            quantity="1",
+            unit="ea",
+            amount=Decimal("10.00"),
+            category=LINE_ITEM_LABOR,
+            matched_criteria="LABOR",
+        )
+    ]
+
+    # Verify that the line was matched against the criteria once
+    matcher.match.assert_called_once()
+
     # Verify that file_io_controller -> print_to_debug_file() was called once
     invoice_processor.file_io_controller.print_to_debug_file.assert_called_once()
 
@@ -247,28 +255,43 @@ def test_process_payment_line_shipping_cost(
         invoice (pytest.fixture): Test fixture to create the Invoice object
     """
 
-    # Mock functions to return a valid hourly cost (find_hr_cost)
-    invoice_processor.find_ea_cost = MagicMock(return_value=DECIMAL_ZERO)
-    invoice_processor.find_hr_cost = MagicMock(return_value=Decimal("20.00"))
+    # Watch the criteria matcher, which finds the SHIPPING criteria in the line
+    matcher = invoice_processor.get_criteria_matcher()
+    matcher.match = MagicMock(wraps=matcher.match)
 
-    # Mock functions to determine this is a shipping cost
-    invoice_processor.search_for_labor_criteria = MagicMock(return_value=False)
-    invoice_processor.search_for_shipping_criteria = MagicMock(
-        return_value=True
-    )
-
-    # Call process_payment_line() with a shipping cost line
+    # Call process_payment_line() with a shipping cost row listed as an hourly rate
     invoice_processor.process_payment_line(
-        text="1 SHIPPING UPS Ground\n2 Next Line",
-        line="1 SHIPPING UPS Ground",
+        row=PaymentTableRow(
+            line_number=1,
+            lines=["1 SHIPPING UPS Ground"],
+            description="SHIPPING UPS Ground",
+            quantity="2",
+            unit="hr",
+            amount=Decimal("20.00"),
+        ),
         invoice=invoice,
-        curr_line_num=1,
     )
 
     # Verify that the shipping cost was added
     assert invoice.shipping_cost == Decimal("20.00")
     assert invoice.subtotal == Decimal("20.00")
 
+    # Verify that the row was recorded as a shipping line item
+    assert invoice.line_items == [
+        LineItem(
+            line_number=1,
+            description="SHIPPING UPS Ground",
+            quantity="2",
+            unit="hr",
+            amount=Decimal("20.00"),
+            category=LINE_ITEM_SHIPPING,
+            matched_criteria="SHIPPING",
+        )
+    ]
+
+    # Verify that the line was matched against the criteria once
+    matcher.match.assert_called_once()
+
     # Verify that file_io_controller -> print_to_debug_file() was called once
     invoice_processor.file_io_controller.print_to_debug_file.assert_called_once()
 
@@ -297,22 +320,21 @@ def test_process_payment_line_material_cost(
         invoice (pytest.fixture): Test fixture to create the Invoice object
     """
 
-    # Mock functions to return a valid quantity cost (find_ea_cost)
-    invoice_processor.find_ea_cost = MagicMock(return_value=Decimal("50.00"))
-    invoice_processor.find_hr_cost = MagicMock(return_value=DECIMAL_ZERO)
-
-    # Mock functions to determine this is neither a labor or shipping cost
-    invoice_processor.search_for_labor_criteria = MagicMock(return_value=False)
-    invoice_processor.search_for_shipping_criteria = MagicMock(
-        return_value=False
-    )
+    # Watch the criteria matcher, which finds neither labor nor shipping criteria
+    matcher = invoice_processor.get_criteria_matcher()
+    matcher.match = MagicMock(wraps=matcher.match)
 
     # Call process_payment_line()
     invoice_processor.process_payment_line(
-        text="1 BRACKETS METAL\n2 Next Line",
-        line="1 BRACKETS METAL",
+        row=PaymentTableRow(
+            line_number=1,
+            lines=["1 BRACKETS METAL"],
+            description="BRACKETS METAL",
+            quantity="5",
+            unit="ea",
+            amount=Decimal("50.00"),
+        ),
         invoice=invoice,
-        curr_line_num=1,
     )
 
     # Verify that the material cost was added since no labor or shipping criteria
@@ -320,6 +342,22 @@ def test_process_payment_line_material_cost(
     assert invoice.material_cost == Decimal("50.00")
     assert invoice.subtotal == Decimal("50.00")
 
+    # Verify that the row was recorded as a material line item, which no criteria matched
+    assert invoice.line_items == [
+        LineItem(
+            line_number=1,
+            description="BRACKETS METAL",
+            quantity="5",
+            unit="ea",
+            amount=Decimal("50.00"),
+            category=LINE_ITEM_MATERIAL,
+            matched_criteria=None,
+        )
+    ]
+
+    # Verify that the line was matched against the criteria once
+    matcher.match.assert_called_once()
+
     #  Verify that file_io_controller -> print_to_debug_file() was called once
     invoice_processor.file_io_controller.print_to_debug_file.assert_called_once()
 
@@ -343,16 +381,10 @@ def test_process_payment_line_skips_if_no_cost_found(
         invoice (pytest.fixture): Test fixture to create the Invoice object
     """
 
-    # Mock functions such that no cost values were found
-    invoice_processor.find_ea_cost = MagicMock(return_value=DECIMAL_ZERO)
-    invoice_processor.find_hr_cost = MagicMock(return_value=DECIMAL_ZERO)
-
-    # Call process_payment_line() with a normal line but no cost
+    # Call process_payment_line() with a normal row but no cost found for it
     invoice_processor.process_payment_line(
-        text="2 COMPONENT LABEL\n3 Next Line",
-        line="2 COMPONENT LABEL",
+        row=PaymentTableRow(line_number=2, lines=["2 COMPONENT LABEL"]),
         invoice=invoice,
-        curr_line_num=2,
     )
 
     # Verify that no values were added to invoice
@@ -360,134 +392,7 @@ def test_process_payment_line_skips_if_no_cost_found(
     assert invoice.material_cost == DECIMAL_ZERO
     assert invoice.labor_cost == DECIMAL_ZERO
     assert invoice.shipping_cost == DECIMAL_ZERO
-
-
-###############################################################################
-###               Tests InvoiceProcessor -> find_ea_cost()                  ###
-###############################################################################
-@patch("source.InvoiceProcessor.search_payment_line")
-@patch(
-    "source.InvoiceProcessor.format_currency",
-    side_effect=lambda value: Decimal(value),
-)
-def test_find_ea_cost_returns_first_valid_cost(
-    _mock_format_currency, mock_search_payment_line, invoice_processor
-):
-    """
-    Verifies that find_ea_cost() returns the first valid quantity cost found in the payment lines
-
-    Args:
-        _mock_format_currency (unittest.mock.MagicMock): Mocked format_currency function
-        mock_search_payment_line (unittest.mock.MagicMock): Mocked search_payment_line function
-        invoice_processor (pytest.fixture): The InvoiceProcessor instance under test
-    """
-
-    # Mock the first call to search_payment_line() to return 45.60
-    mock_search_payment_line.side_effect = [Decimal("45.60")]
-
-    # Create a payment line containing the string
-    payment_lines = "2 anchor bolt ea $45.60"
-
-    # Call find_ea_cost() with the payment line
-    cost = invoice_processor.find_ea_cost(payment_lines)
-
-    # Verify that the correct cost is found
-    assert cost == Decimal("45.60")
-
-
-@patch("source.InvoiceProcessor.search_payment_line")
-@patch(
-    "source.InvoiceProcessor.format_currency",
-    side_effect=lambda value: Decimal(value),
-)
-def test_find_ea_cost_returns_zero_when_no_match(
-    _mock_format_currency, mock_search_payment_line, invoice_processor
-):
-    """
-    Verifies that find_ea_cost() returns the first valid quantity cost found in the payment lines
-
-    Args:
-        _mock_format_currency (unittest.mock.MagicMock): Mocked format_currency function
-        mock_search_payment_line (unittest.mock.MagicMock): Mocked search_payment_line function
-        invoice_processor (pytest.fixture): The InvoiceProcessor instance under test
-    """
-
-    # Mock the first call to search_payment_line() to return DECIMAL_ZERO,
-    # indicating that there was no match for the given regex
-    mock_search_payment_line.side_effect = [DECIMAL_ZERO]
-
-    # Create a payment line containing no valid quantity cost
-    payment_lines = "2 anchor bolt no quantity cost"
-
-    # Call find_ea_cost() with the payment line
-    cost = invoice_processor.find_ea_cost(payment_lines)
-
-    # Verify that no cost was found
-    assert cost == DECIMAL_ZERO
-
-
-###############################################################################
-###               Tests InvoiceProcessor -> find_hr_cost()                  ###
-###############################################################################
-@patch("source.InvoiceProcessor.search_payment_line")
-@patch(
-    "source.InvoiceProcessor.format_currency",
-    side_effect=lambda value: Decimal(value),
-)
-def test_find_hr_cost_returns_first_valid_cost(
-    _mock_format_currency, mock_search_payment_line, invoice_processor
-):
-    """
-    Verifies that find_hr_cost() returns the first valid hourly cost found in the payment lines
-
-    Args:
-        _mock_format_currency (unittest.mock.MagicMock): Mocked format_currency function
-        mock_search_payment_line (unittest.mock.MagicMock): Mocked search_payment_line function
-        invoice_processor (pytest.fixture): The InvoiceProcessor instance under test
-    """
-
-    # Mock the first call to search_payment_line() to return 45.60
-    mock_search_payment_line.side_effect = [Decimal("45.60")]
-
-    # Create a payment line containing the string
-    payment_lines = "UPS shipping hr $45.60"
-
-    # Call find_hr_cost() with the payment line
-    cost = invoice_processor.find_hr_cost(payment_lines)
-
-    # Verify that the correct cost is found
-    assert cost == Decimal("45.60")
-
-
-@patch("source.InvoiceProcessor.search_payment_line")
-@patch(
-    "source.InvoiceProcessor.format_currency",
-    side_effect=lambda value: Decimal(value),
-)
-def test_find_hr_cost_returns_zero_when_no_match(
-    _mock_format_currency, mock_search_payment_line, invoice_processor
-):
-    """
-    Verifies that find_hr_cost() returns the first valid hourly cost found in the payment lines
-
-    Args:
-        _mock_format_currency (unittest.mock.MagicMock): Mocked format_currency function
-        mock_search_payment_line (unittest.mock.MagicMock): Mocked search_payment_line function
-        invoice_processor (pytest.fixture): The InvoiceProcessor instance under test
-    """
-
-    # Mock the first call to search_payment_line() to return DECIMAL_ZERO,
-    # indicating that there was no match for the given regex
-    mock_search_payment_line.side_effect = [DECIMAL_ZERO]
-
-    # Create a payment line containing no valid quantity cost
-    payment_lines = "UPS shipping no hourly cost"
-
-    # Call find_hr_cost() with the payment line
-    cost = invoice_processor.find_hr_cost(payment_lines)
-
-    # Verify that no cost was found
-    assert cost == DECIMAL_ZERO
+    assert invoice.line_items == []
 
 
 ###############################################################################
@@ -513,22 +418,11 @@ def test_process_end_of_invoice_sets_values(
     # Setup: Assume subtotal is already computed
     invoice.subtotal = Decimal("100.00")
 
-    # Simulated end-of-invoice text, typically from PDF page content
-    text = (
-        "Some other content\n"
-        "Total: 100.00\n"
-        "Other Line\n"
-        "$8.50\n"
-        "$108.50\n"
-        "Footer"
-    )
+    # Simulated end-of-invoice lines, starting from the "Total:Subtotal" line
+    lines = ["Total:Subtotal", "$100.00", "$8.50", "$108.50"]
 
-    # Call the method with a known start point
-    invoice_processor.process_end_of_invoice(
-        text=text,
-        starting_line="Total: 100.00",
-        invoice=invoice,
-    )
+    # Call the method with the end of the invoice
+    invoice_processor.process_end_of_invoice(lines=lines, invoice=invoice)
 
     # Verify parsed fields
     assert invoice.sales_tax == Decimal("8.50")
@@ -627,6 +521,31 @@ def test_search_for_shipping_criteria_false(
     assert invoice_processor.search_for_shipping_criteria(line) is False
 
 
+###############################################################################
+###          Tests InvoiceProcessor -> rebuild_criteria_matcher()           ###
+###############################################################################
+def test_rebuild_criteria_matcher_uses_reloaded_criteria(invoice_processor):
+    """
+    Verifies that lines keep being classified with the criteria the matcher was
+    built from while the criteria lists are re-parsed, and with the new criteria
+    once the matcher is rebuilt
+
+    Args:
+        invoice_processor (pytest.fixture): InvoiceProcessor instance under test
+    """
+
+    line = "Line 1 INSTALL unit"
+    assert invoice_processor.search_for_labor_criteria(line) is False
+
+    # Re-parse the criteria in place, as InvoiceAppFileIO.parse_cost_criteria_file() does
+    invoice_processor.labor_criteria.clear()
+    invoice_processor.labor_criteria.append("INSTALL")
+    assert invoice_processor.search_for_labor_criteria(line) is False
+
+    invoice_processor.rebuild_criteria_matcher()
+    assert invoice_processor.search_for_labor_criteria(line) is True
+
+
 ###############################################################################
 ###               Tests InvoiceProcessor -> process_invoice()               ###
 ###############################################################################
@@ -655,3 +574,67 @@ def test_process_invoice_calls_internal_methods(
 
     # Verify that process_end_of_invoice is called exactly once with the correct starting line
     assert mock_process_end.call_count == 1
+
+
+@patch("source.LazyInvoicePages.pypdf.PdfReader")
+def test_process_invoice_stops_after_end_of_invoice(mock_reader, invoice_processor):
+    """
+    Verifies that process_invoice() stops once it has processed the end of the
+    invoice, so pages after it are never extracted
+
+    Args:
+        mock_reader (unittest.mock.MagicMock): Mocks pypdf.PdfReader
+        invoice_processor (pytest.fixture): InvoiceProcessor instance under test
+    """
+
+    # The invoice ends on the second page, and a terms page follows it
+    pdf_pages = [MagicMock(), MagicMock(), MagicMock()]
+    pdf_pages[0].extract_text.return_value = (
+        "Ordered Total Price\n" "1 LABOR install 2 hr 5.00 10.00\n"
+    )
+    pdf_pages[1].extract_text.return_value = (
+        "Ordered Total Price\n"
+        "2 Widget 1 ea 2.00 2.00\n"
+        "Total:Subtotal\n"
+        "$12.00\n"
+        "$1.00\n"
+        "$13.00\n"
+    )
+    pdf_pages[2].extract_text.return_value = "3 Terms and conditions 1 ea 9.00\n"
+    mock_reader.return_value.pages = pdf_pages
+
+    invoice = Invoice(page_contents=LazyInvoicePages(stream=Path("invoice.pdf")))
+
+    invoice_processor.process_invoice(invoice)
+
+    # The totals come from the first two pages only, and the terms page was never read
+    assert invoice.subtotal == Decimal("12.00")
+    assert invoice.total == Decimal("13.00")
+    assert invoice.listed_total == Decimal("13.00")
+    pdf_pages[2].extract_text.assert_not_called()
+
+    # Each costed row is kept on the invoice, so it never has to be parsed again
+    assert [
+        (item.line_number, item.description, item.category, item.amount)
+        for item in invoice.line_items
+    ] == [
+        (1, "LABOR install", LINE_ITEM_LABOR, Decimal("10.00")),
+        (2, "Widget", LINE_ITEM_MATERIAL, Decimal("2.00")),
+    ]
+
+
+@patch.object(InvoiceProcessor, "process_payment_line")
+def test_process_invoice_skips_unreadable_pages(mock_process_line, invoice_processor):
+    """
+    Verifies that process_invoice() skips a page that could not be extracted
+
+    Args:
+        mock_process_line (unittest.mock.MagicMock): Mocked process_payment_line
+        invoice_processor (pytest.fixture): InvoiceProcessor instance under test
+    """
+
+    invoice = Invoice(page_contents=[None, "Ordered Total Price\n1 Widget\n"])
+
+    invoice_processor.process_invoice(invoice)
+
+    assert mock_process_line.call_count == 1
@@ -0,0 +1,326 @@
+import os
+import pytest
+import sqlite3
+import threading
+from unittest.mock import MagicMock, patch
+
+from source.InvoiceSearchIndex import InvoiceSearchIndex, SearchResult
+
+
+###############################################################################
+###                   InvoiceSearchIndex -> Test Fixture                    ###
+###############################################################################
+@pytest.fixture
+def index(tmp_path):
+    """
+    Returns an InvoiceSearchIndex in a temporary directory, with a mock error reporter
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    index = InvoiceSearchIndex(
+        db_path=tmp_path / "data" / "results.db", report_error=MagicMock()
+    )
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def invoices(tmp_path):
+    """
+    Writes two invoice PDFs into a temporary Invoices/ folder, and returns their
+    paths along with a mock page reader returning the text of each of their pages
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    invoices_path = tmp_path / "Invoices"
+    invoices_path.mkdir()
+
+    first = invoices_path / "S12345.pdf"
+    second = invoices_path / "S67890.pdf"
+    first.write_bytes(b"first")
+    second.write_bytes(b"second")
+
+    pages = {
+        first: ["Customer: Acme\n1 BRACKET-00012 galvanized steel", ""],
+        second: ["Customer: Widget Co", "2 LABOR install and commissioning"],
+    }
+    read_pages = MagicMock(side_effect=lambda path: pages[path])
+
+    return [first, second], read_pages
+
+
+###############################################################################
+###                  Tests InvoiceSearchIndex -> update()                   ###
+###############################################################################
+def test_update_only_reads_new_or_changed_invoices(index, invoices):
+    """
+    Verifies that an invoice is only read when it is first indexed or after it has
+    changed, never again while it is unchanged
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, read_pages = invoices
+
+    assert index.update(invoice_filepaths, read_pages) == 2
+    assert index.update(invoice_filepaths, read_pages) == 0
+    assert read_pages.call_count == 2
+
+    # Changing an invoice re-indexes it alone
+    first = invoice_filepaths[0]
+    stat = first.stat()
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert index.update(invoice_filepaths, read_pages) == 1
+    assert read_pages.call_args.args == (first,)
+    assert len(index.search("BRACKET")) == 1
+    index.report_error.assert_not_called()
+
+
+def test_update_drops_removed_invoices(index, invoices):
+    """
+    Verifies that the text of an invoice that no longer exists is no longer found
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, read_pages = invoices
+    index.update(invoice_filepaths, read_pages)
+
+    invoice_filepaths[1].unlink()
+    index.update(invoice_filepaths[:1], read_pages)
+
+    assert index.search("LABOR") == []
+
+
+def test_update_reads_unreadable_invoices_again(index, invoices):
+    """
+    Verifies that an invoice that could not be read, in whole or in part, is not
+    recorded as indexed, so it is read again on the next update without leaving
+    its earlier pages in the index twice
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, _read_pages = invoices
+    first, second = invoice_filepaths
+
+    def read_pages(path):
+        if path == first:
+            raise OSError("locked")
+        return ["2 LABOR install", None]
+
+    assert index.update(invoice_filepaths, read_pages) == 0
+
+    # The page that was read is searchable in the meantime
+    assert len(index.search("LABOR")) == 1
+
+    pages = {first: ["1 BRACKET"], second: ["2 LABOR install", "terms"]}
+    read_pages = MagicMock(side_effect=lambda path: pages[path])
+    assert index.update(invoice_filepaths, read_pages) == 2
+    assert [call.args for call in read_pages.call_args_list] == [(first,), (second,)]
+    assert len(index.search("BRACKET")) == 1
+    assert len(index.search("LABOR")) == 1
+    index.report_error.assert_not_called()
+
+
+def test_update_skips_and_reports_invoice_that_fails_to_extract(index, invoices):
+    """
+    Verifies that an invoice whose text extraction raises something other than a
+    read error (e.g. pypdf's TypeError on a malformed font) is skipped, left to be
+    read again next time and reported, while the invoices after it are indexed
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, _read_pages = invoices
+    first, second = invoice_filepaths
+
+    def read_pages(path):
+        if path == first:
+            raise TypeError("'NumberObject' object is not subscriptable")
+        return ["2 LABOR install"]
+
+    assert index.update(invoice_filepaths, read_pages) == 1
+    assert len(index.search("LABOR")) == 1
+
+    index.report_error.assert_called_once()
+    title, message = index.report_error.call_args.args
+    assert title == "File Error"
+    assert str(first) in message and "NumberObject" in message
+
+    # The invoice that failed is read again on the next update
+    read_pages = MagicMock(return_value=["1 BRACKET"])
+    assert index.update(invoice_filepaths, read_pages) == 1
+    assert read_pages.call_args.args == (first,)
+
+
+def test_update_in_background_keeps_indexing_after_unexpected_error(index, invoices):
+    """
+    Verifies that an unexpected error escaping the background indexer does not
+    leave it marked as running, so later updates still index
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, read_pages = invoices
+    release = threading.Event()
+
+    def list_invoices():
+        release.wait()
+        raise TypeError("unexpected")
+
+    with patch("threading.excepthook"):
+        index.update_in_background(list_invoices=list_invoices, read_pages=read_pages)
+        indexer = index._indexer
+        release.set()
+        indexer.join()
+    assert index._indexer is None
+
+    index.update_in_background(
+        list_invoices=lambda: invoice_filepaths, read_pages=read_pages
+    )
+    index._indexer.join()
+    assert len(index.search("BRACKET")) == 1
+
+
+def test_update_in_background_indexes_off_the_calling_thread(index, invoices):
+    """
+    Verifies that update_in_background lists and indexes the invoices on another
+    thread, and that the invoices are searchable once it has finished
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, read_pages = invoices
+    threads = []
+
+    def list_invoices():
+        threads.append(threading.current_thread())
+        return invoice_filepaths
+
+    index.update_in_background(list_invoices=list_invoices, read_pages=read_pages)
+    index._indexer.join()
+
+    assert threads[0] is not threading.current_thread()
+    assert len(index.search("BRACKET")) == 1
+    index.report_error.assert_not_called()
+
+
+def test_update_in_background_runs_again_when_requested_while_running(
+    index, invoices
+):
+    """
+    Verifies that an update requested while one is running is run once more after
+    it, rather than alongside it
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, read_pages = invoices
+    release = threading.Event()
+    listed = []
+
+    def list_invoices():
+        listed.append(threading.current_thread())
+        release.wait()
+        return invoice_filepaths
+
+    index.update_in_background(list_invoices=list_invoices, read_pages=read_pages)
+    indexer = index._indexer
+    index.update_in_background(list_invoices=list_invoices, read_pages=read_pages)
+    index.update_in_background(list_invoices=list_invoices, read_pages=read_pages)
+
+    release.set()
+    indexer.join()
+
+    assert listed == [indexer, indexer]
+    assert index._indexer is None
+
+
+def test_update_in_background_failure_is_reported_on_callers_thread(index):
+    """
+    Verifies that a failure while indexing in the background is reported on the
+    next search rather than on the background thread
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+    """
+
+    def list_invoices():
+        raise sqlite3.OperationalError("database is locked")
+
+    index.update_in_background(list_invoices=list_invoices, read_pages=MagicMock())
+    index._indexer.join()
+    index.report_error.assert_not_called()
+
+    index.search("BRACKET")
+
+    index.report_error.assert_called_once()
+    assert "database is locked" in index.report_error.call_args.args[1]
+
+
+###############################################################################
+###                  Tests InvoiceSearchIndex -> search()                   ###
+###############################################################################
+def test_search_returns_page_and_snippet(index, invoices):
+    """
+    Verifies that a search returns each matching page with its number and a snippet
+    marking the match, matching part numbers as written and words by prefix
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, read_pages = invoices
+    index.update(invoice_filepaths, read_pages)
+
+    assert index.search("bracket-00012") == [
+        SearchResult(
+            invoice_filepath=invoice_filepaths[0],
+            page_number=1,
+            snippet="Customer: Acme 1 [BRACKET-00012] galvanized steel",
+        )
+    ]
+
+    results = index.search("commission labor")
+    assert [(result.invoice_filepath, result.page_number) for result in results] == [
+        (invoice_filepaths[1], 2)
+    ]
+
+
+def test_search_treats_query_syntax_as_words(index, invoices):
+    """
+    Verifies that quotes and FTS5 operators typed into a search are searched for as
+    words rather than raising a syntax error
+
+    Args:
+        index (pytest.fixture): The InvoiceSearchIndex under test
+        invoices (pytest.fixture): The invoice PDFs and their page reader
+    """
+
+    invoice_filepaths, read_pages = invoices
+    index.update(invoice_filepaths, read_pages)
+
+    assert index.search('Acme" OR (') == []
+    assert index.search("   ") == []
+    index.report_error.assert_not_called()
@@ -34,7 +34,8 @@ def test_invoice_initialization():
     assert invoice.total == DECIMAL_ZERO
     assert invoice.listed_total == DECIMAL_ZERO
 
-    # Check that the list of strings is initialized to an empty list
+    # Check that the lists are initialized to empty lists
+    assert invoice.line_items == []
     assert invoice.page_contents == []
 
 
@@ -0,0 +1,183 @@
+import pickle
+import pypdf
+import pytest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from source.LazyInvoicePages import LazyInvoicePages
+
+
+###############################################################################
+###                    LazyInvoicePages -> Test Fixture                     ###
+###############################################################################
+@pytest.fixture
+def pdf_pages():
+    """
+    Patches pypdf.PdfReader to open a three page PDF, yielding the mocked pages so
+    tests can check which of them were extracted
+    """
+
+    pages = []
+    for number in range(1, 4):
+        page = MagicMock()
+        page.extract_text.return_value = f"page {number}"
+        pages.append(page)
+
+    with patch("source.LazyInvoicePages.pypdf.PdfReader") as mock_reader:
+        mock_reader.return_value.pages = pages
+        yield pages
+
+
+###############################################################################
+###                 Tests LazyInvoicePages -> __getitem__()                 ###
+###############################################################################
+def test_getitem_extracts_only_requested_page_once(pdf_pages):
+    """
+    Verifies that indexing extracts just the requested page, and that reading it
+    again returns the remembered text without extracting it a second time
+
+    Args:
+        pdf_pages (pytest.fixture): The mocked pages of the PDF
+    """
+
+    pages = LazyInvoicePages(stream=Path("invoice.pdf"))
+
+    assert len(pages) == 3
+    assert pages[0] == "page 1"
+    assert pages[0] == "page 1"
+    assert pages[-1] == "page 3"
+
+    pdf_pages[0].extract_text.assert_called_once()
+    pdf_pages[1].extract_text.assert_not_called()
+    pdf_pages[2].extract_text.assert_called_once()
+
+
+def test_getitem_uses_known_pages(pdf_pages):
+    """
+    Verifies that pages supplied up front are returned without being extracted,
+    while pages supplied as None are still extracted on demand
+
+    Args:
+        pdf_pages (pytest.fixture): The mocked pages of the PDF
+    """
+
+    pages = LazyInvoicePages(
+        stream=Path("invoice.pdf"), pages=["cached 1", None, "cached 3"]
+    )
+
+    assert pages[0:3] == ["cached 1", "page 2", "cached 3"]
+    pdf_pages[0].extract_text.assert_not_called()
+    pdf_pages[2].extract_text.assert_not_called()
+
+
+def test_getitem_out_of_range_raises(pdf_pages):
+    """
+    Verifies that indexing past the last page raises IndexError like a list
+
+    Args:
+        pdf_pages (pytest.fixture): The mocked pages of the PDF
+    """
+
+    pages = LazyInvoicePages(stream=Path("invoice.pdf"))
+
+    with pytest.raises(IndexError):
+        pages[3]
+
+
+def test_getitem_reports_page_that_fails_to_extract(pdf_pages):
+    """
+    Verifies that a page which fails to extract is reported once and reads as None,
+    without retrying the extraction each time it is read
+
+    Args:
+        pdf_pages (pytest.fixture): The mocked pages of the PDF
+    """
+
+    error = pypdf.errors.PdfReadError("bad stream")
+    pdf_pages[1].extract_text.side_effect = error
+    on_error = MagicMock()
+
+    pages = LazyInvoicePages(stream=Path("invoice.pdf"), on_error=on_error)
+
+    assert pages[1] is None
+    assert pages[1] is None
+    on_error.assert_called_once_with(1, error)
+    pdf_pages[1].extract_text.assert_called_once()
+
+
+###############################################################################
+###                   Tests LazyInvoicePages -> __iter__()                  ###
+###############################################################################
+def test_iter_extracts_pages_as_reached(pdf_pages):
+    """
+    Verifies that iterating extracts each page only when the iteration reaches it,
+    handing the pages to on_extract once, when the last page has been extracted
+
+    Args:
+        pdf_pages (pytest.fixture): The mocked pages of the PDF
+    """
+
+    on_extract = MagicMock()
+    pages = LazyInvoicePages(stream=Path("invoice.pdf"), on_extract=on_extract)
+
+    iterator = iter(pages)
+    assert next(iterator) == "page 1"
+
+    # Stopping early leaves the later pages unextracted
+    pdf_pages[1].extract_text.assert_not_called()
+    on_extract.assert_not_called()
+
+    assert list(iterator) == ["page 2", "page 3"]
+    on_extract.assert_called_once_with(["page 1", "page 2", "page 3"])
+
+
+###############################################################################
+###                    Tests LazyInvoicePages -> close()                    ###
+###############################################################################
+def test_close_hands_over_pages_extracted_since_last_close(pdf_pages):
+    """
+    Verifies that close() hands the pages extracted so far to on_extract, only if
+    any were extracted since it was last called
+
+    Args:
+        pdf_pages (pytest.fixture): The mocked pages of the PDF
+    """
+
+    on_extract = MagicMock()
+    pages = LazyInvoicePages(stream=Path("invoice.pdf"), on_extract=on_extract)
+
+    pages.close()
+    on_extract.assert_not_called()
+
+    assert pages[0] == "page 1"
+    pages.close()
+    pages.close()
+    on_extract.assert_called_once_with(["page 1", None, None])
+
+    # A page extracted after closing is handed over on the next close
+    assert pages[2] == "page 3"
+    pages.close()
+    on_extract.assert_called_with(["page 1", None, "page 3"])
+    assert on_extract.call_count == 2
+
+
+###############################################################################
+###                 Tests LazyInvoicePages -> __getstate__()                ###
+###############################################################################
+def test_pickle_carries_only_extracted_pages(pdf_pages):
+    """
+    Verifies that a pickled copy, as sent back from a batch worker, keeps the pages
+    extracted so far and reads any others as None
+
+    Args:
+        pdf_pages (pytest.fixture): The mocked pages of the PDF
+    """
+
+    pages = LazyInvoicePages(stream=Path("invoice.pdf"))
+    pages[0]
+
+    copy = pickle.loads(pickle.dumps(pages))
+
+    assert len(copy) == 3
+    assert list(copy) == ["page 1", None, None]
+    assert copy.extracted_pages() == ["page 1", None, None]
@@ -0,0 +1,134 @@
+import pytest
+from unittest.mock import patch
+
+from source.LogFileIndex import LogFileIndex
+
+
+###############################################################################
+###                      LogFileIndex -> Test Fixture                       ###
+###############################################################################
+@pytest.fixture
+def log_path(tmp_path):
+    """
+    Returns a log file holding three lines, the last without a newline
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+
+    Returns:
+        Path: The log file
+    """
+
+    log_path = tmp_path / "debug.txt"
+    log_path.write_bytes(b"first\nsecond\r\nthird")
+    return log_path
+
+
+###############################################################################
+###                     Tests LogFileIndex -> lines()                       ###
+###############################################################################
+def test_lines_reads_any_range(log_path):
+    """
+    Verifies that any range of lines can be read, clipped to the lines indexed,
+    without newlines or Windows line endings, including a last line that has no
+    newline yet.
+
+    Args:
+        log_path (Path): The log file
+    """
+
+    index = LogFileIndex(log_path)
+    assert index.refresh() is True
+
+    assert index.line_count == 3
+    assert index.lines(0, 2) == ["first", "second"]
+    assert index.lines(1, 10) == ["second", "third"]
+    assert index.lines(3, 10) == []
+
+
+###############################################################################
+###                    Tests LogFileIndex -> refresh()                      ###
+###############################################################################
+def test_refresh_indexes_only_what_was_appended(log_path):
+    """
+    Verifies that refresh picks up lines appended since the last refresh,
+    including the rest of a last line that was still being written, and reports
+    no change when nothing was written.
+
+    Args:
+        log_path (Path): The log file
+    """
+
+    index = LogFileIndex(log_path)
+    index.refresh()
+    assert index.refresh() is False
+
+    with open(log_path, mode="ab") as log_file:
+        log_file.write(b" line\nfourth\n")
+
+    assert index.refresh() is True
+    assert index.line_count == 4
+    assert index.lines(2, 2) == ["third line", "fourth"]
+
+
+def test_refresh_starts_over_when_log_is_replaced(log_path, tmp_path):
+    """
+    Verifies that a log replaced by another file, as results.txt is when a batch
+    commits, is indexed again from the start.
+
+    Args:
+        log_path (Path): The log file
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    index = LogFileIndex(log_path)
+    index.refresh()
+
+    replacement = tmp_path / "debug.txt.tmp"
+    replacement.write_bytes(b"new first\nnew second\nnew third\nnew fourth\n")
+    replacement.replace(log_path)
+
+    assert index.refresh() is True
+    assert index.lines(0, 10) == ["new first", "new second", "new third", "new fourth"]
+
+
+@patch("source.LogFileIndex.LOG_INDEX_CHUNK_BYTES", 8)
+def test_refresh_indexes_a_step_at_a_time(tmp_path):
+    """
+    Verifies that a log can be indexed a few bytes at a time across several
+    refreshes, in chunks shorter than some of its lines, with the same result as
+    indexing it all at once.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    log_path = tmp_path / "results.txt"
+    log_path.write_bytes(b"a\nbb\na much longer line\nc\ntail")
+
+    index = LogFileIndex(log_path)
+    index.refresh(max_bytes=4)
+    assert not index.fully_indexed
+    assert index.lines(0, 10) == ["a", "bb"]
+
+    while not index.fully_indexed:
+        index.refresh(max_bytes=4)
+
+    assert index.lines(0, 10) == ["a", "bb", "a much longer line", "c", "tail"]
+
+
+def test_refresh_handles_empty_log(tmp_path):
+    """
+    Verifies that an empty log, which cannot be memory-mapped, has no lines.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    log_path = tmp_path / "debug.txt"
+    log_path.write_bytes(b"")
+
+    index = LogFileIndex(log_path)
+    assert index.refresh() is False
+    assert index.line_count == 0
+    assert index.lines(0, 10) == []
@@ -0,0 +1,229 @@
+import tracemalloc
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from source.MemoryReport import MemoryReport, current_rss, memory_report_requested
+
+
+###############################################################################
+###                       MemoryReport -> Test Fixture                      ###
+###############################################################################
+@pytest.fixture
+def report():
+    """
+    Returns an enabled MemoryReport that samples the resident memory often, making
+    sure tracing is stopped after the test however it ends
+
+    Yields:
+        MemoryReport: The MemoryReport under test
+    """
+
+    memory_report = MemoryReport(enabled=True, top_sites=5, sample_interval=0.001)
+
+    yield memory_report
+
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+###############################################################################
+###                       MemoryReport -> Test Helpers                      ###
+###############################################################################
+def _keep_invoice_text(size):
+    """
+    Stands in for a component that keeps each invoice's text
+
+    Args:
+        size (int): The number of bytes to keep
+
+    Returns:
+        bytearray: The memory kept
+    """
+
+    return bytearray(size)
+
+
+###############################################################################
+###                     Tests memory_report_requested()                     ###
+###############################################################################
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        ([], False),
+        (["--integration-test"], False),
+        (["--integration-test", "--memory-report"], True),
+    ],
+)
+def test_memory_report_requested(argv, expected):
+    """
+    Verifies that the report is only requested by --memory-report.
+
+    Args:
+        argv (list[str]): The command line arguments
+        expected (bool): Whether the report is expected to be requested
+    """
+
+    assert memory_report_requested(argv) is expected
+
+
+###############################################################################
+###                           Tests current_rss()                           ###
+###############################################################################
+def test_current_rss_reads_resident_memory():
+    """
+    Verifies that the resident memory is read as a plausible number of bytes, and
+    that None is returned where it cannot be read.
+    """
+
+    assert current_rss() > 1024 * 1024
+
+    with patch("builtins.open", side_effect=OSError("no /proc here")), patch(
+        "source.MemoryReport.sys.platform", "darwin"
+    ):
+        assert current_rss() is None
+
+
+###############################################################################
+###                      Tests MemoryReport -> disabled                     ###
+###############################################################################
+def test_disabled_report_traces_and_writes_nothing(tmp_path):
+    """
+    Verifies that while disabled, memory is not traced and no report is written.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    memory_report = MemoryReport()
+
+    memory_report.start()
+    memory_report.record_invoice(Path("a.pdf"))
+
+    assert tracemalloc.is_tracing() is False
+    assert memory_report.invoice_deltas == []
+    assert memory_report.stop(tmp_path / "memory_report.txt") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+###############################################################################
+###                  Tests MemoryReport -> record_invoice()                 ###
+###############################################################################
+def test_record_invoice_notes_memory_each_invoice_keeps(report, tmp_path):
+    """
+    Verifies that each invoice is noted with the memory traced since the invoice
+    before it, along with the memory traced after it.
+
+    Args:
+        report (pytest.fixture): The MemoryReport under test
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    report.start()
+
+    kept = []
+    for name, size in (("a.pdf", 2_000_000), ("b.pdf", 0), ("c.pdf", 4_000_000)):
+        kept.append(bytearray(size))
+        report.record_invoice(Path("Invoices") / name)
+
+    (a, a_delta, a_after), (b, b_delta, b_after), (c, c_delta, c_after) = (
+        report.invoice_deltas
+    )
+    assert (a, b, c) == ("a.pdf", "b.pdf", "c.pdf")
+    assert 2_000_000 <= a_delta < 2_100_000
+    assert abs(b_delta) < 100_000
+    assert 4_000_000 <= c_delta < 4_100_000
+    assert b_after == a_after + b_delta
+    assert c_after == b_after + c_delta
+
+    report.stop(tmp_path / "memory_report.txt")
+
+
+###############################################################################
+###                       Tests MemoryReport -> stop()                      ###
+###############################################################################
+def test_stop_writes_report_and_stops_tracing(report, tmp_path):
+    """
+    Verifies that the report lists the peak traced memory, the allocation site that
+    kept the most memory, by file and by line, each invoice and the resident memory
+    sampled over the batch, and that tracing started for the batch is stopped.
+
+    Args:
+        report (pytest.fixture): The MemoryReport under test
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    report.start()
+    kept = [_keep_invoice_text(3_000_000)]
+    report.record_invoice(Path("Invoices/S0-11111.pdf"))
+
+    report_path = report.stop(tmp_path / "logs" / "memory_report.txt")
+
+    assert report_path == tmp_path / "logs" / "memory_report.txt"
+    assert tracemalloc.is_tracing() is False
+    assert len(kept) == 1
+    assert report.rss_samples
+
+    text = report_path.read_text()
+    assert text.startswith("Memory report for a batch of 1 invoice(s), written ")
+    assert "Peak traced memory:     2.9 MiB" in text
+
+    by_file, by_line = (
+        section.splitlines()[1]
+        for section in text.split("\n\n")
+        if section.startswith("Top allocation sites")
+    )
+    assert by_file.strip().startswith("2.9 MiB")
+    assert by_file.endswith("MemoryReport_tests.py")
+    assert "MemoryReport_tests.py:" in by_line
+
+    assert "+2.9 MiB" in text and "S0-11111.pdf" in text
+    assert "Resident memory (RSS) over the batch:" in text
+
+
+def test_stop_leaves_tracing_started_elsewhere_running(report, tmp_path):
+    """
+    Verifies that tracing that was already running before the batch, e.g. with
+    python -X tracemalloc, is left running once the report is written.
+
+    Args:
+        report (pytest.fixture): The MemoryReport under test
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    tracemalloc.start()
+
+    report.start()
+    report.stop(tmp_path / "memory_report.txt")
+
+    assert tracemalloc.is_tracing() is True
+
+
+###############################################################################
+###                   Tests MemoryReport -> _format_bytes()                 ###
+###############################################################################
+@pytest.mark.parametrize(
+    "size, signed, expected",
+    [
+        (0, True, "+0 B"),
+        (512, False, "512 B"),
+        (-512, True, "-512 B"),
+        (40_000, True, "+39.1 KiB"),
+        (-40_000, True, "-39.1 KiB"),
+        (3_000_000, False, "2.9 MiB"),
+        (3_000_000, True, "+2.9 MiB"),
+    ],
+)
+def test_format_bytes_picks_unit_by_size(report, size, signed, expected):
+    """
+    Verifies that sizes are shown in bytes, KiB or MiB by how large they are, so an
+    invoice that keeps a few KiB is not reported as keeping nothing.
+
+    Args:
+        report (pytest.fixture): The MemoryReport under test
+        size (int): The number of bytes
+        signed (bool): Whether the sign of a positive size is shown
+        expected (str): The expected formatted size
+    """
+
+    assert report._format_bytes(size, signed=signed) == expected
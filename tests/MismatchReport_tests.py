@@ -0,0 +1,78 @@
+import pytest
+from decimal import Decimal
+from pathlib import Path
+
+from source.Invoice import Invoice
+from source.MismatchReport import MismatchReport
+
+
+###############################################################################
+###                     MismatchReport -> Test Fixture                      ###
+###############################################################################
+@pytest.fixture
+def report():
+    """
+    Returns a MismatchReport that has checked three invoices, two of which do not
+    match their listed totals
+
+    Returns:
+        MismatchReport: The report
+    """
+
+    report = MismatchReport()
+    for order_number, total, listed_total in (
+        ("S100", "10.00", "9.99"),
+        ("S200", "5.00", "5.00"),
+        ("S300", "20.00", "20.03"),
+    ):
+        report.check(
+            invoice_filepath=Path(f"{order_number}.pdf"),
+            invoice=Invoice(
+                order_number=order_number,
+                customer_name="Acme",
+                total=Decimal(total),
+                listed_total=Decimal(listed_total),
+            ),
+        )
+    return report
+
+
+###############################################################################
+###                      Tests MismatchReport -> check()                    ###
+###############################################################################
+def test_check_keeps_only_mismatches_with_cent_difference(report):
+    """
+    Verifies that only invoices whose totals differ are kept, in the order they
+    were checked, each with its signed difference in cents.
+
+    Args:
+        report (MismatchReport): The report under test
+    """
+
+    assert report.checked_count == 3
+    assert [
+        (mismatch.order_number, mismatch.difference_cents)
+        for mismatch in report.mismatches
+    ] == [("S100", 1), ("S300", -3)]
+    assert report.mismatches[0].invoice_filepath == Path("S100.pdf")
+
+
+###############################################################################
+###                     Tests MismatchReport -> summary()                   ###
+###############################################################################
+def test_summary_reports_count_and_cents(report):
+    """
+    Verifies that the summary gives how many invoices did not match, and by how
+    many cents in all and at most, and that a cleared report starts over.
+
+    Args:
+        report (MismatchReport): The report under test
+    """
+
+    assert report.summary() == (
+        "2 of 3 calculated totals do not match the listed total, by 4¢ in all "
+        "(at most 3¢ on one invoice)"
+    )
+
+    report.clear()
+    assert report.summary() == "All 0 calculated totals match the listed totals"
@@ -0,0 +1,147 @@
+import os
+import pytest
+from unittest.mock import patch
+
+from source.PageTextCache import PageTextCache
+
+
+###############################################################################
+###                      PageTextCache -> Test Fixture                      ###
+###############################################################################
+@pytest.fixture
+def cache(tmp_path):
+    """
+    Returns a PageTextCache rooted in a temporary directory
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+    return PageTextCache(cache_dir=tmp_path / "page_cache", max_bytes=1024 * 1024)
+
+
+###############################################################################
+###                    Tests PageTextCache -> key_for()                     ###
+###############################################################################
+def test_key_for_changes_with_file_contents(cache):
+    """
+    Verifies that the key is stable for identical bytes and changes when the bytes
+    change, so an edited PDF is never served stale text
+
+    Args:
+        cache (pytest.fixture): The PageTextCache under test
+    """
+
+    assert cache.key_for(b"%PDF one") == cache.key_for(b"%PDF one")
+    assert cache.key_for(b"%PDF one") != cache.key_for(b"%PDF two")
+
+
+def test_key_for_changes_with_pypdf_version(cache):
+    """
+    Verifies that upgrading pypdf changes every key, since a new version may
+    extract different text from the same PDF
+
+    Args:
+        cache (pytest.fixture): The PageTextCache under test
+    """
+
+    with patch("source.PageTextCache.pypdf.__version__", "1.0.0"):
+        old_key = cache.key_for(b"%PDF one")
+    with patch("source.PageTextCache.pypdf.__version__", "2.0.0"):
+        new_key = cache.key_for(b"%PDF one")
+
+    assert old_key != new_key
+
+
+###############################################################################
+###                 Tests PageTextCache -> load() / store()                 ###
+###############################################################################
+def test_load_missing_entry_returns_none(cache):
+    """
+    Verifies that looking up a key that was never stored is a cache miss
+
+    Args:
+        cache (pytest.fixture): The PageTextCache under test
+    """
+
+    assert cache.load(cache.key_for(b"%PDF never stored")) is None
+
+
+def test_store_then_load_round_trips_pages(cache):
+    """
+    Verifies that stored page text is returned unchanged by a later load
+
+    Args:
+        cache (pytest.fixture): The PageTextCache under test
+    """
+
+    key = cache.key_for(b"%PDF one")
+    cache.store(key, ["page one", "page two"])
+
+    assert cache.load(key) == ["page one", "page two"]
+
+    # No temporary files are left behind by the atomic write
+    assert [path.suffix for path in cache.cache_dir.iterdir()] == [".json"]
+
+
+def test_load_corrupt_entry_returns_none(cache):
+    """
+    Verifies that an unreadable entry is treated as a miss instead of raising
+
+    Args:
+        cache (pytest.fixture): The PageTextCache under test
+    """
+
+    key = cache.key_for(b"%PDF one")
+    cache.cache_dir.mkdir(parents=True)
+    (cache.cache_dir / f"{key}.json").write_text("{not json")
+
+    assert cache.load(key) is None
+
+
+def test_store_unwritable_directory_is_ignored(cache):
+    """
+    Verifies that a failure to write the cache is silently ignored, since the
+    cache is only an optimization
+
+    Args:
+        cache (pytest.fixture): The PageTextCache under test
+    """
+
+    # A file where the cache directory should be makes every write fail
+    cache.cache_dir.write_text("not a directory")
+
+    cache.store(cache.key_for(b"%PDF one"), ["page one"])
+
+
+###############################################################################
+###                     Tests PageTextCache -> _evict()                     ###
+###############################################################################
+def test_store_evicts_least_recently_used_entries(tmp_path):
+    """
+    Verifies that once the cache grows past its bound, the least recently used
+    entries are evicted first, where a load counts as a use
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    # Each entry is a little over 1 KB, so three entries fit under the 4 KB bound
+    # but a fourth does not
+    cache = PageTextCache(cache_dir=tmp_path / "page_cache", max_bytes=4 * 1024)
+    keys = [cache.key_for(f"%PDF {number}".encode()) for number in range(3)]
+
+    for age, key in enumerate(keys):
+        cache.store(key, ["x" * 1024])
+
+        # Give each entry a distinct, increasing last-used time
+        entry_path = cache.cache_dir / f"{key}.json"
+        os.utime(entry_path, (1000 + age, 1000 + age))
+
+    # Using the oldest entry makes the second entry the least recently used
+    assert cache.load(keys[0]) == ["x" * 1024]
+
+    # A fourth entry pushes the cache over its bound
+    cache.store(cache.key_for(b"%PDF 3"), ["x" * 1024])
+
+    assert cache.load(keys[1]) is None
+    assert cache.load(keys[0]) == ["x" * 1024]
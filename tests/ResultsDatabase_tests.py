@@ -0,0 +1,186 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from source.Invoice import Invoice, LineItem
+from source.ResultsDatabase import ResultsDatabase
+from source.constants import LINE_ITEM_LABOR
+
+
+###############################################################################
+###                     ResultsDatabase -> Test Helpers                     ###
+###############################################################################
+def _invoice(order_number: str, invoice_date: str, total: str = "10.00") -> Invoice:
+    """
+    Builds a processed invoice with a single labor line item
+
+    Args:
+        order_number (str): The invoice's order number
+        invoice_date (str): The invoice's date, as listed on the invoice
+        total (str): The invoice's total
+
+    Returns:
+        Invoice: The processed invoice
+    """
+
+    return Invoice(
+        customer_name="Acme",
+        date=invoice_date,
+        order_number=order_number,
+        sales_rep="Rep Name",
+        payment_terms="Net 30",
+        labor_cost=Decimal(total),
+        total=Decimal(total),
+        line_items=[
+            LineItem(
+                line_number=1,
+                description="LABOR install",
+                quantity="1",
+                unit="hr",
+                amount=Decimal(total),
+                category=LINE_ITEM_LABOR,
+                matched_criteria="LABOR",
+            )
+        ],
+    )
+
+
+###############################################################################
+###                     ResultsDatabase -> Test Fixture                     ###
+###############################################################################
+@pytest.fixture
+def database(tmp_path):
+    """
+    Returns a ResultsDatabase in a temporary directory, writing three invoices per
+    transaction, with a mock error reporter
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    database = ResultsDatabase(
+        db_path=tmp_path / "data" / "results.db",
+        report_error=MagicMock(),
+        batch_size=3,
+    )
+    yield database
+    database.close()
+
+
+###############################################################################
+###              Tests ResultsDatabase -> record() / flush()                ###
+###############################################################################
+def test_record_writes_once_batch_is_full(database):
+    """
+    Verifies that invoices are only written once a batch of them is queued, and
+    that flush() writes whatever is left
+
+    Args:
+        database (pytest.fixture): The ResultsDatabase under test
+    """
+
+    for number in range(4):
+        database.record(
+            Path(f"{number}.pdf"), _invoice(f"S0000{number}", "01/02/2024")
+        )
+
+    count = "SELECT COUNT(*) FROM invoices"
+    assert database._connect().execute(count).fetchone() == (3,)
+
+    database.flush()
+
+    assert database._connect().execute(count).fetchone() == (4,)
+    assert database._connect().execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    database.report_error.assert_not_called()
+
+
+def test_record_replaces_earlier_result(database):
+    """
+    Verifies that processing an invoice again replaces its earlier result and line
+    items, and that currency values read back exactly
+
+    Args:
+        database (pytest.fixture): The ResultsDatabase under test
+    """
+
+    database.record(Path("a.pdf"), _invoice("S12345", "01/02/2024", total="10.00"))
+    database.flush()
+    database.record(Path("a.pdf"), _invoice("S12345", "01/02/2024", total="0.10"))
+
+    records = database.find(order_number="S12345")
+
+    assert len(records) == 1
+    assert records[0].invoice_filepath == Path("a.pdf")
+    assert records[0].invoice == _invoice("S12345", "01/02/2024", total="0.10")
+
+
+def test_flush_reports_failure(database):
+    """
+    Verifies that a failure to write the database is reported rather than raised
+
+    Args:
+        database (pytest.fixture): The ResultsDatabase under test
+    """
+
+    database.db_path.parent.mkdir()
+    database.db_path.mkdir()
+
+    database.record(Path("a.pdf"), _invoice("S12345", "01/02/2024"))
+    database.flush()
+
+    database.report_error.assert_called_once()
+    assert database.report_error.call_args.args[0] == "Database Error"
+
+
+###############################################################################
+###                   Tests ResultsDatabase -> find()                       ###
+###############################################################################
+def test_find_filters_by_fields_and_date_range(database):
+    """
+    Verifies that lookups match every criteria given, with dates compared as dates
+    rather than as MM/DD/YYYY text, and return the oldest invoice first
+
+    Args:
+        database (pytest.fixture): The ResultsDatabase under test
+    """
+
+    database.record(Path("a.pdf"), _invoice("S00001", "12/31/2023"))
+    database.record(Path("b.pdf"), _invoice("S00002", "02/15/2024"))
+    database.record(Path("c.pdf"), _invoice("S00003", "01/10/2024"))
+    database.record(Path("d.pdf"), _invoice("S00004", "not a date"))
+
+    in_range = database.find(
+        customer_name="Acme", start_date=date(2024, 1, 1), end_date=date(2024, 2, 15)
+    )
+
+    assert [record.invoice.order_number for record in in_range] == [
+        "S00003",
+        "S00002",
+    ]
+    assert database.find(sales_rep="Nobody") == []
+    assert len(database.find(payment_terms="Net 30")) == 4
+
+
+def test_find_uses_indexes(database):
+    """
+    Verifies that lookups by each indexed field are answered from its index
+
+    Args:
+        database (pytest.fixture): The ResultsDatabase under test
+    """
+
+    connection = database._connect()
+
+    for column in (
+        "order_number",
+        "customer_name",
+        "invoice_date",
+        "sales_rep",
+        "payment_terms",
+    ):
+        plan = connection.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM invoices WHERE {column} = ?", ("x",)
+        ).fetchall()
+        assert f"USING INDEX invoices_{column}" in plan[0][-1]
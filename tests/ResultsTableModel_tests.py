@@ -0,0 +1,183 @@
+import pytest
+from decimal import Decimal
+
+from source.Invoice import Invoice
+from source.ResultsTableModel import ResultsTableModel
+
+
+###############################################################################
+###                    ResultsTableModel -> Test Helpers                    ###
+###############################################################################
+def _invoice(order_number: str, customer_name: str, invoice_date: str, total: str):
+    """
+    Builds a processed invoice with page text, as the processor would return it
+
+    Args:
+        order_number (str): The invoice's order number
+        customer_name (str): The invoice's customer
+        invoice_date (str): The invoice's date, as listed on the invoice
+        total (str): The invoice's total
+
+    Returns:
+        Invoice: The processed invoice
+    """
+
+    return Invoice(
+        customer_name=customer_name,
+        date=invoice_date,
+        order_number=order_number,
+        total=Decimal(total),
+        page_contents=["page text"],
+    )
+
+
+def _orders(model: ResultsTableModel) -> list[str]:
+    """
+    Returns the order numbers of every row in view, top first
+
+    Args:
+        model (ResultsTableModel): The model to read
+
+    Returns:
+        list[str]: The order numbers
+    """
+
+    return [row.invoice.order_number for row in model.window(0, len(model))]
+
+
+###############################################################################
+###                    ResultsTableModel -> Test Fixture                    ###
+###############################################################################
+@pytest.fixture
+def model():
+    """
+    Returns a ResultsTableModel holding three invoices, added out of order
+
+    Returns:
+        ResultsTableModel: The model
+    """
+
+    model = ResultsTableModel()
+    model.add(_invoice("S200", "Bravo Corp", "02/01/2024", "9.50"))
+    model.add(_invoice("S100", "alpha inc", "12/15/2023", "100.00"))
+    model.add(_invoice("S300", "Charlie LLC", "01/10/2024", "25.00"))
+    return model
+
+
+###############################################################################
+###                      Tests ResultsTableModel -> add()                   ###
+###############################################################################
+def test_add_keeps_order_added_and_drops_page_text(model):
+    """
+    Verifies that, unsorted, rows are shown in the order added, and that a row
+    shows its invoice's values without keeping the invoice's page text alive.
+
+    Args:
+        model (ResultsTableModel): The model under test
+    """
+
+    assert _orders(model) == ["S200", "S100", "S300"]
+
+    row = model.row(0)
+    assert row.values[:3] == ("S200", "02/01/2024", "Bravo Corp")
+    assert row.invoice.page_contents == []
+
+
+def test_add_inserts_in_sorted_position(model):
+    """
+    Verifies that an invoice added to a sorted table lands in its sorted position,
+    and that its position is returned, including when sorted in descending order.
+
+    Args:
+        model (ResultsTableModel): The model under test
+    """
+
+    model.sort(column=6)
+    assert model.add(_invoice("S400", "Delta", "03/03/2024", "50.00")) == 2
+    assert _orders(model) == ["S200", "S300", "S400", "S100"]
+
+    model.sort(column=6, descending=True)
+    assert model.add(_invoice("S500", "Echo", "03/04/2024", "1.00")) == 4
+    assert _orders(model) == ["S100", "S400", "S300", "S200", "S500"]
+
+
+###############################################################################
+###                     Tests ResultsTableModel -> sort()                   ###
+###############################################################################
+def test_sort_uses_typed_keys(model):
+    """
+    Verifies that currency columns sort by amount rather than as text, dates sort
+    by date, and text sorts ignoring case.
+
+    Args:
+        model (ResultsTableModel): The model under test
+    """
+
+    # As text, "100.00" would sort before "25.00" and "9.50"
+    model.sort(column=6)
+    assert _orders(model) == ["S200", "S300", "S100"]
+
+    # As text, "12/15/2023" would sort last
+    model.sort(column=1)
+    assert _orders(model) == ["S100", "S300", "S200"]
+
+    # As text, "alpha inc" would sort after "Charlie LLC"
+    model.sort(column=2, descending=True)
+    assert _orders(model) == ["S300", "S200", "S100"]
+
+    model.sort(column=None)
+    assert _orders(model) == ["S200", "S100", "S300"]
+
+
+###############################################################################
+###                  Tests ResultsTableModel -> set_filter()                ###
+###############################################################################
+def test_set_filter_matches_every_word_in_any_column(model):
+    """
+    Verifies that the filter keeps only the rows containing every word, in any
+    column and ignoring case, that new rows are filtered too, and that clearing
+    the filter shows every row again.
+
+    Args:
+        model (ResultsTableModel): The model under test
+    """
+
+    model.set_filter("CORP 2024")
+    assert _orders(model) == ["S200"]
+    assert model.total_rows == 3
+
+    assert model.add(_invoice("S400", "Delta", "03/03/2024", "50.00")) is None
+    assert len(model) == 1
+
+    model.set_filter("")
+    assert _orders(model) == ["S200", "S100", "S300", "S400"]
+
+
+###############################################################################
+###                    Tests ResultsTableModel -> window()                  ###
+###############################################################################
+def test_window_returns_only_the_rows_requested():
+    """
+    Verifies that window returns just the rows from the given position, clipped
+    to the end of the table, however many rows the table holds.
+
+    Args:
+        None
+    """
+
+    model = ResultsTableModel()
+    for number in range(10_000):
+        model.add(_invoice(f"S{number:05}", "Acme", "01/01/2024", str(number)))
+
+    model.sort(column=6, descending=True)
+
+    assert [row.invoice.order_number for row in model.window(10, 3)] == [
+        "S09989",
+        "S09988",
+        "S09987",
+    ]
+    assert len(model.window(9_998, 12)) == 2
+
+    model.clear()
+    assert len(model) == 0
+    assert model.window(0, 12) == []
@@ -0,0 +1,159 @@
+import pytest
+from unittest.mock import patch
+
+from source.ResultsWriter import ResultsWriter
+
+
+###############################################################################
+###                      ResultsWriter -> Test Fixture                      ###
+###############################################################################
+@pytest.fixture
+def writer(tmp_path):
+    """
+    Returns a ResultsWriter committing to a results log in a temporary directory,
+    which already holds the results of an earlier batch
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    results_path = tmp_path / "logs" / "results.txt"
+    results_path.parent.mkdir()
+    results_path.write_text("earlier invoice\n")
+
+    return ResultsWriter(results_path=results_path)
+
+
+###############################################################################
+###               Tests ResultsWriter -> write() / commit()                 ###
+###############################################################################
+def test_commit_appends_batch_to_existing_results(writer):
+    """
+    Verifies that a batch that appends is committed after the existing results, and
+    that results.txt is untouched until the batch is committed
+
+    Args:
+        writer (pytest.fixture): The ResultsWriter under test
+    """
+
+    writer.write(contents="invoice 1\n", append=True)
+    writer.write(contents="invoice 2\n", append=True)
+
+    assert writer.results_path.read_text() == "earlier invoice\n"
+
+    with patch("source.ResultsWriter.os.fsync") as mock_fsync:
+        writer.commit()
+
+    mock_fsync.assert_called_once()
+    assert writer.results_path.read_text() == "earlier invoice\ninvoice 1\ninvoice 2\n"
+    assert not writer.temp_path.exists()
+
+
+def test_interrupted_batch_leaves_results_whole(writer):
+    """
+    Verifies that a batch that never ended, e.g. because the application was killed,
+    leaves results.txt as it was, and that the next batch starts afresh from it
+    rather than from the interrupted batch's temporary file
+
+    Args:
+        writer (pytest.fixture): The ResultsWriter under test
+    """
+
+    writer.write(contents="invoice 1\n" * 10_000, append=True)
+    writer._file.close()
+
+    assert writer.results_path.read_text() == "earlier invoice\n"
+
+    next_writer = ResultsWriter(results_path=writer.results_path)
+    next_writer.write(contents="invoice 2\n", append=True)
+    next_writer.commit()
+
+    assert writer.results_path.read_text() == "earlier invoice\ninvoice 2\n"
+
+
+def test_write_without_append_replaces_results(writer):
+    """
+    Verifies that a write that does not append replaces both the existing results
+    and anything written earlier in the batch
+
+    Args:
+        writer (pytest.fixture): The ResultsWriter under test
+    """
+
+    writer.write(contents="invoice 1\n", append=False)
+    writer.commit()
+    assert writer.results_path.read_text() == "invoice 1\n"
+
+    writer.write(contents="invoice 2\n", append=True)
+    writer.write(contents="invoice 3\n", append=False)
+    writer.commit()
+    assert writer.results_path.read_text() == "invoice 3\n"
+
+
+def test_header_is_written_only_to_empty_results(writer):
+    """
+    Verifies that a header is written ahead of the contents when the results would
+    otherwise be empty, but not after existing results or earlier writes
+
+    Args:
+        writer (pytest.fixture): The ResultsWriter under test
+    """
+
+    writer.write(contents="invoice 1\n", append=True, header="columns\n")
+    writer.write(contents="invoice 2\n", append=False, header="columns\n")
+    writer.write(contents="invoice 3\n", append=True, header="columns\n")
+    writer.commit()
+
+    assert writer.results_path.read_text() == "columns\ninvoice 2\ninvoice 3\n"
+
+
+def test_commit_without_writes_leaves_results(writer):
+    """
+    Verifies that committing a batch that wrote nothing leaves results.txt as it was
+
+    Args:
+        writer (pytest.fixture): The ResultsWriter under test
+    """
+
+    writer.commit()
+
+    assert writer.results_path.read_text() == "earlier invoice\n"
+
+
+def test_failed_commit_leaves_results(writer):
+    """
+    Verifies that a batch whose results cannot be moved into place never leaves a
+    partly written results.txt behind, and can be discarded
+
+    Args:
+        writer (pytest.fixture): The ResultsWriter under test
+    """
+
+    writer.write(contents="invoice 1\n", append=True)
+
+    with patch("source.ResultsWriter.os.replace", side_effect=OSError("in use")):
+        with pytest.raises(OSError):
+            writer.commit()
+
+    writer.discard()
+
+    assert writer.results_path.read_text() == "earlier invoice\n"
+    assert not writer.temp_path.exists()
+
+
+###############################################################################
+###                    Tests ResultsWriter -> discard()                     ###
+###############################################################################
+def test_discard_drops_batch(writer):
+    """
+    Verifies that discarding a batch drops its results and its temporary file
+
+    Args:
+        writer (pytest.fixture): The ResultsWriter under test
+    """
+
+    writer.write(contents="invoice 1\n", append=True)
+    writer.discard()
+
+    assert writer.results_path.read_text() == "earlier invoice\n"
+    assert not writer.temp_path.exists()
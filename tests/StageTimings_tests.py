@@ -0,0 +1,149 @@
+import json
+import pytest
+from unittest.mock import patch
+
+from source.StageTimings import StageStats, StageTimings
+
+
+###############################################################################
+###                       StageTimings -> Test Fixture                      ###
+###############################################################################
+@pytest.fixture
+def timings():
+    """
+    Returns a StageTimings with timing turned on and nothing recorded
+    """
+
+    return StageTimings(enabled=True)
+
+
+###############################################################################
+###                       Tests StageTimings -> time()                      ###
+###############################################################################
+@patch("source.StageTimings.time.perf_counter", side_effect=[1.0, 1.25])
+def test_time_records_run_of_stage(_mock_perf_counter, timings):
+    """
+    Verifies that timing a with block records how long it took against its stage.
+
+    Args:
+        _mock_perf_counter (unittest.mock.MagicMock): Mocks the clock
+        timings (pytest.fixture): The StageTimings under test
+    """
+
+    with timings.time("process_invoice"):
+        pass
+
+    assert timings.samples == [("process_invoice", 0.25)]
+
+
+def test_time_records_run_that_raised(timings):
+    """
+    Verifies that a stage that raised is still recorded, and the error is not
+    swallowed.
+
+    Args:
+        timings (pytest.fixture): The StageTimings under test
+    """
+
+    with pytest.raises(ValueError):
+        with timings.time("populate_invoice"):
+            raise ValueError("bad invoice")
+
+    assert [stage for stage, _seconds in timings.samples] == ["populate_invoice"]
+
+
+def test_time_records_nothing_when_disabled():
+    """
+    Verifies that nothing is recorded while timing is off.
+    """
+
+    timings = StageTimings()
+
+    with timings.time("process_invoice"):
+        pass
+
+    assert timings.samples == []
+
+
+###############################################################################
+###                 Tests StageTimings -> extend() / clear()                ###
+###############################################################################
+def test_extend_and_clear(timings):
+    """
+    Verifies that runs timed elsewhere are added after those recorded here, and that
+    clear() forgets them all.
+
+    Args:
+        timings (pytest.fixture): The StageTimings under test
+    """
+
+    timings.record("process_invoice", 1.0)
+    timings.extend([("read_invoice_file", 2.0), ("populate_invoice", 3.0)])
+
+    assert timings.samples == [
+        ("process_invoice", 1.0),
+        ("read_invoice_file", 2.0),
+        ("populate_invoice", 3.0),
+    ]
+
+    timings.clear()
+
+    assert timings.samples == []
+    assert timings.stats() == []
+
+
+###############################################################################
+###                      Tests StageTimings -> stats()                      ###
+###############################################################################
+def test_stats_summarizes_each_stage_in_processing_order(timings):
+    """
+    Verifies that each stage is summarized by its count, total, median, 95th
+    percentile and longest run, with the known stages listed in processing order
+    ahead of any others.
+
+    Args:
+        timings (pytest.fixture): The StageTimings under test
+    """
+
+    # Twenty runs of processing, of 1 to 20 seconds, recorded out of order
+    timings.extend(("process_invoice", float(s)) for s in reversed(range(1, 21)))
+    timings.record("custom_stage", 0.5)
+    timings.record("read_invoice_file", 2.0)
+
+    assert timings.stats() == [
+        StageStats("read_invoice_file", 1, 2.0, 2.0, 2.0, 2.0),
+        StageStats("process_invoice", 20, 210.0, 10.0, 19.0, 20.0),
+        StageStats("custom_stage", 1, 0.5, 0.5, 0.5, 0.5),
+    ]
+
+
+###############################################################################
+###                       Tests StageTimings -> dump()                      ###
+###############################################################################
+def test_dump_writes_stats_as_json(timings, tmp_path):
+    """
+    Verifies that dump() writes the summary of each stage to a JSON file, creating
+    the folder it goes in.
+
+    Args:
+        timings (pytest.fixture): The StageTimings under test
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    timings.record("process_invoice", 0.5)
+    dump_path = tmp_path / "Logs" / "stage_timings.json"
+
+    timings.dump(dump_path)
+
+    assert json.loads(dump_path.read_text()) == {
+        "stages": [
+            {
+                "stage": "process_invoice",
+                "count": 1,
+                "total_seconds": 0.5,
+                "p50_seconds": 0.5,
+                "p95_seconds": 0.5,
+                "max_seconds": 0.5,
+            }
+        ]
+    }
@@ -0,0 +1,93 @@
+import pytest
+from unittest.mock import MagicMock
+
+from source.UpdateCoalescer import UpdateCoalescer
+
+
+###############################################################################
+###                     UpdateCoalescer -> Test Fixture                     ###
+###############################################################################
+@pytest.fixture
+def coalescer():
+    """
+    Returns an UpdateCoalescer with a mock after() and flush callback
+
+    Returns:
+        UpdateCoalescer: The coalescer, with `after` and `flush` as mocks
+    """
+
+    return UpdateCoalescer(after=MagicMock(), flush=MagicMock(), interval_ms=100)
+
+
+###############################################################################
+###                      Tests UpdateCoalescer -> post()                    ###
+###############################################################################
+def test_post_coalesces_updates_into_one_scheduled_flush(coalescer):
+    """
+    Verifies that posting several updates schedules a single flush, which applies
+    them all together in the order posted, and that the counts record it.
+
+    Args:
+        coalescer (UpdateCoalescer): The coalescer under test
+    """
+
+    for update in ("a", "b", "c"):
+        coalescer.post(update)
+
+    coalescer.after.assert_called_once()
+    delay, on_timer = coalescer.after.call_args.args
+    assert delay == 100
+    coalescer.flush.assert_not_called()
+
+    on_timer()
+
+    coalescer.flush.assert_called_once_with(["a", "b", "c"])
+    assert (coalescer.posted_count, coalescer.flush_count) == (3, 1)
+
+    # The next update schedules a new flush
+    coalescer.post("d")
+    assert coalescer.after.call_count == 2
+
+
+###############################################################################
+###                    Tests UpdateCoalescer -> schedule()                  ###
+###############################################################################
+def test_schedule_flushes_without_updates(coalescer):
+    """
+    Verifies that schedule() alone still brings about a flush, with no updates.
+
+    Args:
+        coalescer (UpdateCoalescer): The coalescer under test
+    """
+
+    coalescer.schedule()
+    _delay, on_timer = coalescer.after.call_args.args
+    on_timer()
+
+    coalescer.flush.assert_called_once_with([])
+
+
+###############################################################################
+###                   Tests UpdateCoalescer -> flush_now()                  ###
+###############################################################################
+def test_flush_now_leaves_scheduled_flush_nothing_to_do(coalescer):
+    """
+    Verifies that flush_now() applies the pending updates straight away, that the
+    flush already scheduled then does nothing, and that reset_counts() restarts
+    the counts.
+
+    Args:
+        coalescer (UpdateCoalescer): The coalescer under test
+    """
+
+    coalescer.post("a")
+    coalescer.flush_now()
+    coalescer.flush.assert_called_once_with(["a"])
+
+    _delay, on_timer = coalescer.after.call_args.args
+    on_timer()
+    coalescer.flush_now()
+    coalescer.flush.assert_called_once()
+
+    coalescer.reset_counts()
+    assert (coalescer.posted_count, coalescer.flush_count) == (0, 0)
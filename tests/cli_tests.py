@@ -0,0 +1,311 @@
+import subprocess
+import sys
+import pytest
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+from source import cli
+from source.Invoice import Invoice
+from source.InvoiceBatchEngine import BatchResult
+from source.InvoiceExporter import EXPORT_FIELDS
+
+
+###############################################################################
+###                           cli -> Test Fixture                           ###
+###############################################################################
+@pytest.fixture
+def app_folder(tmp_path, monkeypatch):
+    """
+    Runs the test from an application folder holding empty configs and two invoices,
+    with the Batch Engine mocked out so no PDFs are parsed
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+        monkeypatch (pytest.MonkeyPatch): Used to change the working directory
+
+    Yields:
+        unittest.mock.MagicMock: The mocked InvoiceBatchEngine class
+    """
+
+    monkeypatch.chdir(tmp_path)
+
+    configs = tmp_path / "Configs"
+    configs.mkdir()
+    for name in ("Cost_Criteria.txt", "Payment_Terms.txt", "Sales_Reps.txt"):
+        (configs / name).write_text("")
+
+    invoices = tmp_path / "Invoices"
+    invoices.mkdir()
+    for name in ("b.pdf", "a.pdf"):
+        (invoices / name).write_bytes(b"%PDF")
+
+    with patch("source.cli.PageTextCache", return_value=None), patch(
+        "source.InvoiceEngine.InvoiceBatchEngine"
+    ) as mock_engine_cls:
+        yield mock_engine_cls
+
+
+###############################################################################
+###                           cli -> Test Helpers                           ###
+###############################################################################
+def _result(name, total="10.00", listed_total="10.00"):
+    """
+    Builds the BatchResult of an invoice that was parsed
+
+    Args:
+        name (str): The invoice's file name, also used as its order number
+        total (str): The invoice's calculated total
+        listed_total (str): The invoice's listed total
+
+    Returns:
+        BatchResult: The result, for an invoice in the Invoices/ folder
+    """
+
+    return BatchResult(
+        invoice_filepath=Path("Invoices") / name,
+        invoice=Invoice(
+            order_number=name,
+            total=Decimal(total),
+            listed_total=Decimal(listed_total),
+        ),
+    )
+
+
+###############################################################################
+###                       Tests cli -> find_invoices()                      ###
+###############################################################################
+def test_find_invoices_expands_folders_and_globs(tmp_path):
+    """
+    Verifies that a folder expands to its visible PDFs and a glob pattern to the
+    files it matches, each in filename order, that each invoice is listed once, and
+    that inputs matching nothing are returned.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest
+    """
+
+    folder = tmp_path / "Invoices"
+    (folder / "nested").mkdir(parents=True)
+    for name in ("b.pdf", "A.PDF", ".c.pdf.part", "notes.txt", "nested/d.pdf"):
+        (folder / name).write_bytes(b"%PDF")
+
+    invoice_filepaths, unmatched = cli.find_invoices(
+        [
+            str(folder),
+            str(folder / "**" / "*.pdf"),
+            str(tmp_path / "missing"),
+        ]
+    )
+
+    assert invoice_filepaths == [
+        folder / "A.PDF",
+        folder / "b.pdf",
+        folder / "nested" / "d.pdf",
+    ]
+    assert unmatched == [str(tmp_path / "missing")]
+
+
+###############################################################################
+###                           Tests cli -> main()                           ###
+###############################################################################
+def test_main_writes_text_results_to_stdout_in_order(app_folder, capsys):
+    """
+    Verifies that by default every invoice in Invoices/ is parsed in filename order,
+    with the requested number of workers, and written to stdout as in results.txt.
+
+    Args:
+        app_folder (unittest.mock.MagicMock): The mocked InvoiceBatchEngine class
+        capsys (pytest.CaptureFixture): Captures stdout and stderr
+    """
+
+    results = [_result("a.pdf"), _result("b.pdf")]
+    app_folder.return_value.process_files.return_value = iter(results)
+
+    assert cli.main(["--jobs", "3"]) == 0
+
+    assert app_folder.call_args.kwargs["max_workers"] == 3
+    assert app_folder.return_value.process_files.call_args.kwargs[
+        "invoice_filepaths"
+    ] == [Path("Invoices/a.pdf"), Path("Invoices/b.pdf")]
+
+    captured = capsys.readouterr()
+    assert captured.out == "".join(
+        result.invoice.to_formatted_string() for result in results
+    )
+    assert "All 2 calculated totals match" in captured.err
+
+
+def test_main_writes_csv_to_output_file(app_folder, capsys):
+    """
+    Verifies that --format csv with --output writes the CSV header and one row per
+    invoice to the output file, replacing what it held, and nothing to stdout.
+
+    Args:
+        app_folder (unittest.mock.MagicMock): The mocked InvoiceBatchEngine class
+        capsys (pytest.CaptureFixture): Captures stdout and stderr
+    """
+
+    app_folder.return_value.process_files.return_value = iter(
+        [_result("a.pdf"), _result("b.pdf", listed_total="10.01")]
+    )
+    output = Path("nightly.csv")
+    output.write_text("results of an earlier night\n")
+
+    assert cli.main(["--format", "csv", "--output", str(output)]) == 0
+
+    lines = output.read_text().splitlines()
+    assert lines[0] == ",".join(EXPORT_FIELDS)
+    assert [line.split(",")[2] for line in lines[1:]] == ["a.pdf", "b.pdf"]
+    assert not Path("nightly.csv.tmp").exists()
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "1 of 2 calculated totals do not match" in captured.err
+
+
+def test_main_reports_unreadable_invoice_and_fails(app_folder, capsys):
+    """
+    Verifies that the errors of an invoice that could not be read are written to
+    stderr and fail the run, while the other invoices are still written.
+
+    Args:
+        app_folder (unittest.mock.MagicMock): The mocked InvoiceBatchEngine class
+        capsys (pytest.CaptureFixture): Captures stdout and stderr
+    """
+
+    unreadable = BatchResult(
+        invoice_filepath=Path("Invoices/a.pdf"),
+        errors=[("File Error", "Could not read page 1")],
+    )
+    app_folder.return_value.process_files.return_value = iter(
+        [unreadable, _result("b.pdf")]
+    )
+
+    assert cli.main(["--format", "jsonl"]) == 1
+
+    captured = capsys.readouterr()
+    assert captured.out.count("\n") == 1
+    assert '"order_number": "b.pdf"' in captured.out
+    assert "File Error: Could not read page 1" in captured.err
+    assert "No pages were found" not in captured.err
+
+
+def test_main_reports_invoice_that_failed_to_parse_once(app_folder, capsys):
+    """
+    Verifies that an invoice that raised while being parsed is reported by its own
+    error alone, without also being reported as having no pages.
+
+    Args:
+        app_folder (unittest.mock.MagicMock): The mocked InvoiceBatchEngine class
+        capsys (pytest.CaptureFixture): Captures stdout and stderr
+    """
+
+    failed = BatchResult(
+        invoice_filepath=Path("Invoices/bad.pdf"),
+        errors=[("Processing Error", "unexpected layout")],
+    )
+    app_folder.return_value.process_files.return_value = iter(
+        [failed, _result("b.pdf")]
+    )
+
+    assert cli.main(["--format", "jsonl"]) == 1
+
+    captured = capsys.readouterr()
+    assert '"order_number": "b.pdf"' in captured.out
+    assert captured.err.splitlines() == [
+        "Processing Error: unexpected layout",
+        "All 1 calculated totals match the listed totals",
+    ]
+
+
+def test_main_profile_writes_profile_and_parses_in_process(app_folder, capsys):
+    """
+    Verifies that --profile parses the invoices in-process, whatever --jobs asks for,
+    and writes the run's .pstats and collapsed stacks under logs/profiles/.
+
+    Args:
+        app_folder (unittest.mock.MagicMock): The mocked InvoiceBatchEngine class
+        capsys (pytest.CaptureFixture): Captures stdout and stderr
+    """
+
+    app_folder.return_value.process_files.return_value = iter([_result("a.pdf")])
+
+    assert cli.main(["--jobs", "3", "--profile"]) == 0
+
+    assert app_folder.call_args.kwargs["max_workers"] == 1
+
+    profile_paths = sorted(Path("logs/profiles").iterdir())
+    assert [path.suffix for path in profile_paths] == [".collapsed", ".pstats"]
+
+    captured = capsys.readouterr()
+    assert captured.out == _result("a.pdf").invoice.to_formatted_string()
+    for path in profile_paths:
+        assert f"Profile written to {path}" in captured.err
+
+
+def test_main_memory_report_writes_report_and_parses_in_process(app_folder, capsys):
+    """
+    Verifies that --memory-report parses the invoices in-process and writes a report
+    of the run's memory, listing each invoice, to logs/memory_report.txt.
+
+    Args:
+        app_folder (unittest.mock.MagicMock): The mocked InvoiceBatchEngine class
+        capsys (pytest.CaptureFixture): Captures stdout and stderr
+    """
+
+    app_folder.return_value.process_files.return_value = iter(
+        [_result("a.pdf"), _result("b.pdf")]
+    )
+
+    assert cli.main(["--memory-report"]) == 0
+
+    assert app_folder.call_args.kwargs["max_workers"] == 1
+
+    report = Path("logs/memory_report.txt").read_text()
+    assert "a batch of 2 invoice(s)" in report
+    assert report.index("  a.pdf\n") < report.index("  b.pdf\n")
+
+    captured = capsys.readouterr()
+    assert "Memory report written to logs/memory_report.txt" in captured.err.replace(
+        "\\", "/"
+    )
+
+
+def test_main_rejects_jobs_below_one(app_folder, capsys):
+    """
+    Verifies that fewer than one worker is rejected as a usage error before any
+    invoice is parsed.
+
+    Args:
+        app_folder (unittest.mock.MagicMock): The mocked InvoiceBatchEngine class
+        capsys (pytest.CaptureFixture): Captures stdout and stderr
+    """
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["--jobs", "0"])
+
+    assert exit_info.value.code == 2
+    assert "--jobs must be at least 1" in capsys.readouterr().err
+    app_folder.assert_not_called()
+
+
+def test_cli_does_not_import_tkinter():
+    """
+    Verifies that the command line entry point loads without tkinter, so it starts
+    quickly and runs on a machine without a display.
+    """
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, source.cli; print('tkinter' in sys.modules)",
+        ],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == "False"
@@ -307,3 +307,210 @@ def test_find_sales_rep_wrong_format():
     # Verify the correct dict value is returned when searching text for key1
     text = "Text that does not contain any keys in it"
     assert find_sales_rep(text=text, sales_reps=sales_reps) == ""
+
+
+###############################################################################
+###            Tests for processor_utilities -> find_row_cost()             ###
+###############################################################################
+def test_find_row_cost_prefers_quantity_cost():
+    """
+    Tests that the function find_row_cost() takes a cost listed as a quantity over an
+    hourly rate, from the first line of the row that lists a valid cost
+    """
+
+    row = PaymentTableRow(
+        line_number=1,
+        lines=[
+            "1 LABOR install 2 hr $ 50.00 $ 100.00",
+            "3 ea $",
+            "3 ea $ 5.00 $ 1,015.00",
+        ],
+    )
+
+    find_row_cost(row)
+
+    assert (row.quantity, row.unit, row.amount) == ("3", "ea", Decimal("1015.00"))
+
+
+def test_find_row_cost_falls_back_to_hourly_cost():
+    """
+    Tests that the function find_row_cost() takes an hourly rate when no quantity
+    cost is listed, and leaves the row without a cost when neither is listed
+    """
+
+    row = PaymentTableRow(line_number=1, lines=["1 UPS shipping", "2 hr $ 45.60"])
+    find_row_cost(row)
+    assert (row.quantity, row.unit, row.amount) == ("2", "hr", Decimal("45.60"))
+
+    row = PaymentTableRow(line_number=2, lines=["2 COMPONENT LABEL"])
+    find_row_cost(row)
+    assert (row.quantity, row.unit, row.amount) == ("", "", DECIMAL_ZERO)
+
+
+def test_find_row_cost_fills_description():
+    """
+    Tests that the function find_row_cost() describes a row by its numbered line,
+    without the number it is listed under or a cost listed on the same line
+    """
+
+    row = PaymentTableRow(line_number=12, lines=["12 UPS Ground 1 ea $ 9.50 $ 9.50"])
+    find_row_cost(row)
+    assert row.description == "UPS Ground"
+
+    row = PaymentTableRow(line_number=3, lines=["3 BRACKET-00003 steel", "2 ea $ 4.00"])
+    find_row_cost(row)
+    assert row.description == "BRACKET-00003 steel"
+
+
+###############################################################################
+###          Tests for processor_utilities -> scan_payment_table()          ###
+###############################################################################
+def test_scan_payment_table_groups_rows_and_stops_at_end():
+    """
+    Tests that the function scan_payment_table() skips everything before the table,
+    groups continuation lines with their row, reads numbers out of sequence as part
+    of the row above, and stops at the end of the invoice
+    """
+
+    page = (
+        "1 Header line that is not in the table\n"
+        "Ordered Total Price\n"
+        "1 Widget\n"
+        "3 ea $ 2.00 $ 6.00\n"
+        "2 LABOR install 2 hr $ 5.00 $ 10.00\n"
+        "Total:Subtotal\n"
+        "$16.00\n"
+        "$1.00\n"
+        "$17.00\n"
+        "Footer\n"
+    )
+
+    records = list(scan_payment_table(pages=[page, "3 Terms 1 ea $ 9.00"]))
+
+    assert records == [
+        PaymentTableRow(
+            line_number=1,
+            lines=["1 Widget", "3 ea $ 2.00 $ 6.00"],
+            description="Widget",
+            quantity="3",
+            unit="ea",
+            amount=Decimal("6.00"),
+        ),
+        PaymentTableRow(
+            line_number=2,
+            lines=["2 LABOR install 2 hr $ 5.00 $ 10.00"],
+            description="LABOR install",
+            quantity="2",
+            unit="hr",
+            amount=Decimal("10.00"),
+        ),
+        PaymentTableEnd(lines=["Total:Subtotal", "$16.00", "$1.00", "$17.00"]),
+    ]
+
+
+def test_scan_payment_table_rows_end_at_page_boundary():
+    """
+    Tests that the function scan_payment_table() ends a row at the end of its page,
+    skips pages that could not be extracted, and keeps numbering across pages
+    """
+
+    pages = [
+        "Ordered Total Price\n1 Widget 1 ea $ 2.00 $ 2.00\nPage 1 of 3\n",
+        None,
+        "Ordered Total Price\n2 Bolt\n4 ea $ 1.00 $ 4.00\n",
+    ]
+
+    records = list(scan_payment_table(pages=pages))
+
+    assert [(row.line_number, row.lines) for row in records] == [
+        (1, ["1 Widget 1 ea $ 2.00 $ 2.00", "Page 1 of 3"]),
+        (2, ["2 Bolt", "4 ea $ 1.00 $ 4.00"]),
+    ]
+    assert [row.amount for row in records] == [Decimal("2.00"), Decimal("4.00")]
+
+
+###############################################################################
+###           Tests for processor_utilities -> HeaderExtractor              ###
+###############################################################################
+def test_header_extractor_matches_separate_searches():
+    """
+    Tests that HeaderExtractor finds the same header fields as searching for each of
+    them separately, with the fixed fields taking their first match and the payment
+    terms and sales reps taking the first entry in config order, wherever it appears
+    """
+
+    payment_terms = ["Net 30", "Net"]
+    sales_reps = {"key1": "value1", "S1": "value2"}
+
+    text = (
+        "Customer: Acme Corp\n"
+        "PO Number: PO12345S\n"
+        "Date 01/01/2025 Ship 02/02/2025\n"
+        "S12345 Net\n"
+        "Terms Net 30 key1\n"
+    )
+
+    header = HeaderExtractor(payment_terms=payment_terms, sales_reps=sales_reps).extract(
+        text=text
+    )
+
+    assert header == InvoiceHeader(
+        order_number=search_text_by_re(text=text, regex=r"S(\d{5})"),
+        date="01/01/2025",
+        customer_name="Acme Corp",
+        po_number="PO12345",
+        payment_terms=find_payment_terms(text=text, payment_terms=payment_terms),
+        sales_rep=find_sales_rep(text=text, sales_reps=sales_reps),
+    )
+    assert header.payment_terms == "Net 30"
+
+    # "S1" appears inside the order number, before "key1", but "key1" comes first
+    assert header.sales_rep == "value1"
+
+
+def test_header_extractor_missing_fields():
+    """
+    Tests that HeaderExtractor returns an empty string for every field not found,
+    including when there are no payment terms or sales reps to search for
+    """
+
+    header = HeaderExtractor(payment_terms=[], sales_reps={}).extract(
+        text="Text that does not contain any header fields"
+    )
+
+    assert header == InvoiceHeader()
+
+
+def test_header_extractor_searches_grouped_entries_separately():
+    """
+    Tests that HeaderExtractor still finds config entries that contain groups of
+    their own, by searching for them separately
+    """
+
+    payment_terms = ["(Net|Due) 30"]
+    sales_reps = {"(key)1": "value1"}
+
+    extractor = HeaderExtractor(payment_terms=payment_terms, sales_reps=sales_reps)
+    header = extractor.extract(text="S12345 Due 30 key1")
+
+    assert header.order_number == "S12345"
+    assert header.payment_terms == "(Net|Due) 30"
+    assert header.sales_rep == "value1"
+
+
+def test_header_extractor_searches_entries_that_break_combined_regex_separately():
+    """
+    Tests that HeaderExtractor falls back to searching for the config entries
+    separately when an entry that is valid on its own, such as one starting with a
+    global flag, cannot be compiled into the combined regex
+    """
+
+    payment_terms = ["(?i)Net 30"]
+    sales_reps = {"key1": "value1"}
+
+    extractor = HeaderExtractor(payment_terms=payment_terms, sales_reps=sales_reps)
+    header = extractor.extract(text="S12345 NET 30 key1")
+
+    assert header.order_number == "S12345"
+    assert header.payment_terms == "(?i)Net 30"
+    assert header.sales_rep == "value1"